@@ -0,0 +1 @@
+# Делает папку benchmarks Python-пакетом
@@ -0,0 +1,8 @@
+# benchmarks/__main__.py
+# Запуск набора бенчмарков: python -m benchmarks [имена] [--quick] [--save-baseline] 📊
+
+import sys
+
+from benchmarks.suite import main
+
+sys.exit(main())
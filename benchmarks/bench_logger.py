@@ -0,0 +1,129 @@
+# benchmarks/bench_logger.py
+# Замер записи app.html: прежний HtmlFileHandler в каждом логгере против общего пакетного конвейера ⏱️
+
+import os
+import re
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+
+from utils.logger import AsyncLog, HtmlFileHandler, HtmlFormatter, html_sink
+
+# Типичная строка лога приложения: кириллица, эмодзи, путь
+MESSAGE = "📄 Документ %d сохранён: \\\\192.168.1.98\\project\\Проект %d\\089.049 (PWOM) Руководство.docx"
+
+
+def _loggers(count: int, handler_factory) -> list:
+    """count логгеров без распространения, как их настраивает LoggerManager"""
+    loggers = []
+    for i in range(count):
+        logger = logging.getLogger(f"bench_logger.{id(handler_factory)}.{i}")
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        for handler in logger.handlers[:]:
+            logger.removeHandler(handler)
+        logger.addHandler(handler_factory())
+        loggers.append(logger)
+    return loggers
+
+
+def _emit(loggers: list, records: int, warn_every: int) -> None:
+    count = len(loggers)
+    for i in range(records):
+        logger = loggers[i % count]
+        if warn_every and i % warn_every == 0:
+            logger.warning(MESSAGE, i, i % 150)
+        else:
+            logger.info(MESSAGE, i, i % 150)
+
+
+def _close(loggers: list) -> None:
+    for logger in loggers:
+        for handler in logger.handlers[:]:
+            handler.close()
+            logger.removeHandler(handler)
+
+
+def _check(folder: str) -> dict:
+    """Сколько строк и заголовков во всех файлах лога (включая ротированные)"""
+    lines = headers = files = 0
+    for name in os.listdir(folder):
+        with open(os.path.join(folder, name), "r", encoding="utf-8") as f:
+            text = f.read()
+        files += 1
+        lines += len(re.findall(r'<div class="log ', text))
+        headers += text.count("<!DOCTYPE html>")
+    return {"files": files, "lines": lines, "headers": headers}
+
+
+def run(records: int = 100_000, loggers: int = 8, max_bytes: int = 5 * 1024 * 1024,
+        warn_every: int = 1000, legacy: bool = True) -> dict:
+    """
+    Пишет records строк через loggers логгеров в лог во временной папке.
+
+    :param max_bytes: порог ротации (меньше — чаще ротация)
+    :param warn_every: каждая N-я запись — WARNING (сбрасывается сразу)
+    :param legacy: замерять и прежний хендлер
+    :return: словарь с результатами: время вызовов в потоке приложения и до записи на диск
+    """
+    tmp = tempfile.mkdtemp(prefix="bench_logger_")
+    results = {"records": records, "loggers": loggers}
+    formatter = HtmlFormatter(datefmt="%Y-%m-%d %H:%M:%S")
+    try:
+        if legacy:
+            folder = os.path.join(tmp, "legacy")
+            os.mkdir(folder)
+            path = os.path.join(folder, "app.html")
+
+            def legacy_handler():
+                handler = HtmlFileHandler(path, maxBytes=max_bytes, backupCount=1000, encoding="utf-8")
+                handler.setFormatter(formatter)
+                return handler
+
+            group = _loggers(loggers, legacy_handler)
+            start = time.perf_counter()
+            _emit(group, records, warn_every)
+            results["legacy_s"] = time.perf_counter() - start
+            _close(group)
+            results["legacy"] = _check(folder)
+
+        folder = os.path.join(tmp, "async")
+        os.mkdir(folder)
+        pipeline = AsyncLog([html_sink(os.path.join(folder, "app.html"), max_bytes=max_bytes, backup_count=1000)])
+        group = _loggers(loggers, lambda: pipeline.handler)
+        start = time.perf_counter()
+        _emit(group, records, warn_every)
+        results["async_emit_s"] = time.perf_counter() - start
+        pipeline.stop()
+        results["async_s"] = time.perf_counter() - start
+        for logger in group:
+            logger.removeHandler(pipeline.handler)
+        results["async"] = _check(folder)
+        return results
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Бенчмарк HTML-лога")
+    parser.add_argument("--records", type=int, default=100_000, help="число записей")
+    parser.add_argument("--loggers", type=int, default=8, help="число логгеров (модулей)")
+    parser.add_argument("--max-bytes", type=int, default=5 * 1024 * 1024, help="порог ротации, байт")
+    parser.add_argument("--warn-every", type=int, default=1000, help="каждая N-я запись — WARNING (0 — без них)")
+    parser.add_argument("--no-legacy", action="store_true", help="не замерять прежний хендлер")
+    args = parser.parse_args()
+
+    res = run(args.records, args.loggers, args.max_bytes, args.warn_every, legacy=not args.no_legacy)
+    n = res["records"]
+    a = res["async"]
+    print(f"📊 Записей: {n}, логгеров: {res['loggers']}")
+    print(f"🚚 Конвейер: вызовы {res['async_emit_s']:.2f} с ({n / res['async_emit_s']:.0f} записей/с), "
+          f"до диска {res['async_s']:.2f} с ({n / res['async_s']:.0f} записей/с)")
+    print(f"   файлов {a['files']}, строк {a['lines']}, заголовков {a['headers']}")
+    if "legacy_s" in res:
+        b = res["legacy"]
+        print(f"🐢 Прежний хендлер: {res['legacy_s']:.2f} с ({n / res['legacy_s']:.0f} записей/с), "
+              f"ускорение ×{res['legacy_s'] / res['async_s']:.1f}")
+        print(f"   файлов {b['files']}, строк {b['lines']}, заголовков {b['headers']}")
@@ -0,0 +1,95 @@
+# benchmarks/bench_paged_model.py
+# Замер PagedTableModel на синтетических проектах: подгрузка страниц, произвольный доступ, память ⏱️
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import tracemalloc
+from contextlib import contextmanager
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from benchmarks.synthetic import SyntheticData, Scale
+from db_init.project_base.models_project_base import Base, ProjectBase
+
+COLUMNS = [
+    ("name", "Проект", False, True),
+    ("status", "Статус", False, False),
+    ("owner", "Ответственный", False, True),
+    ("proj_type", "Тип", False, False),
+    ("start_date", "Начало", False, False),
+    ("end_date", "Окончание", True, False),
+]
+
+
+def run(rows: int = 100_000, page_size: int = 200, cache_pages: int = 32, probes: int = 2000) -> dict:
+    """
+    Листает rows проектов до конца, затем читает случайные строки (вытесненные страницы).
+
+    :return: словарь с результатами
+    """
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6 import QtWidgets
+    from utils.paged_table_model import PagedTableModel, PagedColumn
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])  # noqa: F841
+    with tempfile.TemporaryDirectory(prefix="bench_paged_") as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.sqlite3')}")
+        Base.metadata.create_all(engine, tables=[ProjectBase.__table__])
+        data = SyntheticData(Scale(4, 13, 14, 10, rows, rows))
+        with engine.begin() as conn:
+            conn.execute(insert(ProjectBase.__table__), list(data.projects()))
+
+        @contextmanager
+        def session_factory():
+            with Session(engine) as session:
+                yield session
+
+        model = PagedTableModel(ProjectBase, [PagedColumn(*c) for c in COLUMNS], page_size=page_size,
+                                cache_pages=cache_pages, session_factory=session_factory)
+        tracemalloc.start()
+        start = time.perf_counter()
+        pages = 0
+        while model.canFetchMore():
+            model.fetchMore()
+            pages += 1
+        scroll_s = time.perf_counter() - start
+
+        rnd = random.Random(1)
+        start = time.perf_counter()
+        for _ in range(probes):
+            model.data(model.index(rnd.randrange(model.rowCount()), rnd.randrange(len(COLUMNS))))
+        random_s = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        model.sort(0)
+        start = time.perf_counter()
+        model.set_filter("Танкер 1")
+        filter_s = time.perf_counter() - start
+        results = {
+            "rows": rows, "pages": pages, "scroll_s": scroll_s,
+            "page_ms": scroll_s / pages * 1000, "random_s": random_s, "random_ms": random_s / probes * 1000,
+            "filter_s": filter_s, "peak_mb": peak / 1024 ** 2,
+        }
+        engine.dispose()
+        return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Бенчмарк ленивой табличной модели")
+    parser.add_argument("--rows", type=int, default=100_000, help="число проектов")
+    parser.add_argument("--page-size", type=int, default=200, help="строк на странице")
+    parser.add_argument("--cache-pages", type=int, default=32, help="страниц в LRU-кэше")
+    args = parser.parse_args()
+
+    res = run(args.rows, args.page_size, args.cache_pages)
+    print(f"📊 Проектов: {res['rows']}, страниц: {res['pages']}")
+    print(f"📜 Прокрутка до конца: {res['scroll_s']:.2f} с ({res['page_ms']:.2f} мс на страницу)")
+    print(f"🎯 Случайные ячейки: {res['random_ms']:.2f} мс в среднем")
+    print(f"🔍 Фильтр по подстроке: {res['filter_s'] * 1000:.1f} мс")
+    print(f"🧠 Пик памяти модели: {res['peak_mb']:.1f} МБ")
@@ -0,0 +1,96 @@
+# benchmarks/bench_repository.py
+# Замер CRUD-операций BaseRepository и get_or_create на временной SQLite ⏱️
+#
+# Все репозитории проекта наследуют одинаковый BaseRepository (create/update/delete с flush
+# на каждую запись, get_or_create через get_by_field), поэтому замер идёт на FileHash —
+# таблице с уникальным полем path, которая импортируется без остальных моделей.
+
+import os
+import time
+import argparse
+import tempfile
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from db_init.documents.models_documents import Base, FileHash
+from db_init.documents.crud_documents import BaseRepository
+
+
+def _row(i: int) -> dict:
+    return {"size": 1000 + i, "mtime_ns": 1_700_000_000_000_000_000 + i, "partial_hash": f"{i:064x}"}
+
+
+def _timed(results: dict, key: str, func) -> None:
+    start = time.perf_counter()
+    func()
+    results[key] = time.perf_counter() - start
+
+
+def run(rows: int = 10_000) -> dict:
+    """
+    Прогоняет по rows операций каждого вида в одной сессии.
+
+    :return: словарь с результатами: секунды на каждый вид операций
+    """
+    with tempfile.TemporaryDirectory(prefix="bench_repo_") as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.sqlite3')}")
+        Base.metadata.create_all(engine, tables=[FileHash.__table__])
+        results = {"rows": rows}
+        with Session(engine, autoflush=False) as session:
+            repo = BaseRepository(FileHash, session)
+            ids = []
+
+            def create():
+                for i in range(rows):
+                    ids.append(repo.create(path=f"/project/{i:07d}.docx", **_row(i)).id)
+                session.commit()
+
+            def get_by_id():
+                session.expunge_all()
+                for id_ in ids:
+                    repo.get_by_id(id_)
+
+            def get_by_field():
+                for i in range(rows):
+                    repo.get_by_field("path", f"/project/{i:07d}.docx")
+
+            def update():
+                for i, id_ in enumerate(ids):
+                    repo.update(repo.get_by_id(id_), size=i)
+                session.commit()
+
+            def get_or_create():
+                # половина путей уже есть (обновление), половина новые (создание)
+                for i in range(rows // 2, rows // 2 + rows):
+                    repo.get_or_create("path", f"/project/{i:07d}.docx", **_row(i))
+                session.commit()
+
+            def get_all():
+                session.expunge_all()
+                results["get_all_rows"] = len(repo.get_all())
+
+            def delete():
+                for instance in repo.get_all():
+                    repo.delete(instance)
+                session.commit()
+
+            for key, func in (("create_s", create), ("get_by_id_s", get_by_id), ("get_by_field_s", get_by_field),
+                              ("update_s", update), ("get_or_create_s", get_or_create), ("get_all_s", get_all),
+                              ("delete_s", delete)):
+                _timed(results, key, func)
+        engine.dispose()
+        return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Бенчмарк BaseRepository")
+    parser.add_argument("--rows", type=int, default=10_000, help="число записей")
+    args = parser.parse_args()
+
+    res = run(args.rows)
+    n = res["rows"]
+    print(f"📊 Записей: {n}, после get_or_create: {res['get_all_rows']}")
+    for key in ("create", "get_by_id", "get_by_field", "update", "get_or_create", "get_all", "delete"):
+        seconds = res[f"{key}_s"]
+        print(f"   {key:<14} {seconds:8.3f} с  {seconds / n * 1e6:8.1f} мкс/запись")
@@ -0,0 +1,145 @@
+# benchmarks/bench_save_tree.py
+# Замер structure/save_tree на синтетическом дереве (~100k записей) ⏱️
+
+import os
+import time
+import shutil
+import argparse
+import tempfile
+from fnmatch import fnmatch
+from pathlib import Path
+
+from structure.save_tree import GitIgnoreMatcher, save_tree
+
+# Типичный .gitignore проекта: имена, расширения, привязанные к корню пути, «**» и исключения
+PATTERNS = [
+    "__pycache__/",
+    "*.py[cod]",
+    "*.log",
+    "!important.log",
+    ".venv/",
+    "build/",
+    "/dist",
+    "*.tmp",
+    "docs/**/*.bak",
+    "node_modules/",
+    "*.sqlite3",
+    "logs/",
+    "cache/**",
+]
+
+
+def make_tree(root: str, entries: int = 100_000, fanout: int = 10, files_per_dir: int = 40) -> int:
+    """
+    Создаёт синтетическое дерево примерно из entries записей.
+    Часть папок и файлов попадает под PATTERNS, чтобы было что отсекать.
+
+    :return: фактическое число созданных записей
+    """
+    names = ["report.docx", "calc.xlsx", "main.py", "main.pyc", "run.log", "important.log", "draft.tmp", "spec.pdf"]
+    ignored_dirs = ["__pycache__", "build", "cache"]
+    created = 0
+    queue = [root]
+    index = 0
+    while queue and created < entries:
+        current = queue.pop(0)
+        for i in range(files_per_dir):
+            if created >= entries:
+                break
+            open(os.path.join(current, f"{i:03d}_{names[i % len(names)]}"), "wb").close()
+            created += 1
+        for i in range(fanout):
+            if created >= entries:
+                break
+            name = ignored_dirs[index % len(ignored_dirs)] if index % 7 == 0 else f"dir_{index:05d}"
+            index += 1
+            path = os.path.join(current, name)
+            os.mkdir(path)
+            created += 1
+            queue.append(path)
+    return created
+
+
+def legacy_save_tree(start_path: str, out_file: str, ignore_patterns: list[str]) -> None:
+    """Прежняя реализация: fnmatch по каждому шаблону и каждой части пути"""
+    def is_ignored(path: Path, project_root: Path) -> bool:
+        relative = path.relative_to(project_root)
+        for pattern in ignore_patterns:
+            if fnmatch(str(relative), pattern) or any(fnmatch(part, pattern) for part in relative.parts):
+                return True
+        return False
+
+    base_path = Path(start_path)
+    with open(out_file, "w", encoding="utf-8") as f:
+        for root, dirs, files in os.walk(base_path):
+            root_path = Path(root)
+            level = len(root_path.relative_to(base_path).parts)
+            indent = '    ' * level
+            if is_ignored(root_path, base_path):
+                dirs[:] = []
+                continue
+            f.write(f"{indent}📁 {root_path.name}\n")
+            dirs[:] = [d for d in dirs if not is_ignored(root_path / d, base_path)]
+            for file in sorted(files):
+                if is_ignored(root_path / file, base_path):
+                    continue
+                f.write(f"{indent}    📄 {file}\n")
+
+
+def _legacy_patterns() -> list[str]:
+    # прежний загрузчик отрезал «/» по краям и не знал «!»
+    return [p.strip("/") for p in PATTERNS if not p.startswith("!")]
+
+
+def _timed(func, *args, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(entries: int = 100_000, repeat: int = 3, legacy: bool = True) -> dict:
+    """
+    Строит дерево во временной папке и замеряет обход.
+
+    :return: словарь с результатами (секунды, лучшее из repeat)
+    """
+    tmp = tempfile.mkdtemp(prefix="bench_tree_")
+    try:
+        root = os.path.join(tmp, "tree")
+        os.mkdir(root)
+        created = make_tree(root, entries)
+        out = os.path.join(tmp, "out")
+
+        results = {"entries": created}
+        start = time.perf_counter()
+        matcher = GitIgnoreMatcher(PATTERNS)
+        results["compile_s"] = time.perf_counter() - start
+        results["text_s"] = _timed(save_tree, root, out + ".txt", matcher, "text", repeat=repeat)
+        results["json_s"] = _timed(save_tree, root, out + ".json", matcher, "json", repeat=repeat)
+        with open(out + ".txt", "r", encoding="utf-8") as f:
+            results["lines"] = sum(1 for _ in f)
+        if legacy:
+            results["legacy_text_s"] = _timed(legacy_save_tree, root, out + ".legacy", _legacy_patterns(), repeat=1)
+        return results
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Бенчмарк save_tree")
+    parser.add_argument("--entries", type=int, default=100_000, help="размер синтетического дерева")
+    parser.add_argument("--repeat", type=int, default=3, help="число повторов замера")
+    parser.add_argument("--no-legacy", action="store_true", help="не замерять прежнюю реализацию")
+    args = parser.parse_args()
+
+    res = run(args.entries, args.repeat, legacy=not args.no_legacy)
+    print(f"📊 Записей в дереве: {res['entries']}, строк в выводе: {res['lines']}")
+    print(f"⚙️ Компиляция шаблонов: {res['compile_s'] * 1000:.2f} мс")
+    print(f"📝 Текст: {res['text_s']:.3f} с")
+    print(f"🧾 JSON:  {res['json_s']:.3f} с")
+    if "legacy_text_s" in res:
+        print(f"🐢 Прежняя реализация: {res['legacy_text_s']:.3f} с "
+              f"(ускорение ×{res['legacy_text_s'] / res['text_s']:.1f})")
@@ -0,0 +1,47 @@
+# benchmarks/bench_search.py
+# Замер SearchIndex на синтетических заказчиках: построение индекса и набор запроса по буквам ⏱️
+
+import time
+import argparse
+
+from benchmarks.synthetic import SyntheticData, Scale
+from utils.search_index import SearchIndex
+
+
+def run(rows: int = 100_000, query: str = "северный флот 12") -> dict:
+    """
+    Строит индекс по rows заказчикам (полное и краткое имя) и набирает query по одной букве,
+    как при вводе в поле: каждый следующий запрос продолжает предыдущий.
+
+    :return: словарь с результатами
+    """
+    data = SyntheticData(Scale(0, 0, 0, rows, 0, 0))
+    items = [(c["name"], c["id"], c["short_name"]) for c in data.customers()]
+
+    start = time.perf_counter()
+    index = SearchIndex(items)
+    build_s = time.perf_counter() - start
+
+    keystrokes = []
+    for n in range(1, len(query) + 1):
+        began = time.perf_counter()
+        hits = index.search(query[:n])
+        keystrokes.append(time.perf_counter() - began)
+    return {
+        "rows": rows, "build_s": build_s, "typing_s": sum(keystrokes),
+        "first_key_s": keystrokes[0], "worst_key_s": max(keystrokes), "last_key_s": keystrokes[-1],
+        "hits": len(hits),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Бенчмарк поиска при вводе")
+    parser.add_argument("--rows", type=int, default=100_000, help="число заказчиков")
+    parser.add_argument("--query", default="северный флот 12", help="набираемый запрос")
+    args = parser.parse_args()
+
+    res = run(args.rows, args.query)
+    print(f"📊 Заказчиков: {res['rows']}, индекс построен за {res['build_s'] * 1000:.0f} мс")
+    print(f"⌨️ Набор запроса: {res['typing_s'] * 1000:.0f} мс, худшая буква {res['worst_key_s'] * 1000:.1f} мс, "
+          f"последняя {res['last_key_s'] * 1000:.1f} мс")
+    print(f"🔎 Найдено: {res['hits']}")
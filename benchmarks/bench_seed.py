@@ -0,0 +1,109 @@
+# benchmarks/bench_seed.py
+# Замер всех функций seed_* на временной SQLite: первый прогон (вставка) и повторные (поиск/обновление) ⏱️
+
+import io
+import os
+import sys
+import time
+import inspect
+import argparse
+import tempfile
+import importlib
+from contextlib import redirect_stdout
+
+from sqlalchemy import create_engine
+
+from benchmarks.bench_session import bound_session_local
+
+# Модули с seed-функциями в порядке наполнения из db_init/new_vessel_proj/seed.py
+SEED_MODULES = [
+    "db_init.company.seed_company",
+    "db_init.seed_proj_attr",
+    "db_init.catalogs.seed_catalogs",
+]
+
+
+def discover(modules=SEED_MODULES) -> tuple:
+    """
+    Находит seed-функции модулей в порядке их объявления.
+
+    :return: (список (модуль, имя, функция), словарь модуль -> ошибка импорта)
+    """
+    found, errors = [], {}
+    for name in modules:
+        try:
+            module = importlib.import_module(name)
+        except Exception as e:
+            errors[name] = f"{type(e).__name__}: {e}"
+            continue
+        funcs = [
+            func for attr, func in inspect.getmembers(module, inspect.isfunction)
+            if attr.startswith("seed_") and func.__module__ == module.__name__
+        ]
+        funcs.sort(key=lambda func: func.__code__.co_firstlineno)
+        found.extend((name, func.__name__, func) for func in funcs)
+    return found, errors
+
+
+def run(repeat: int = 10) -> dict:
+    """
+    Прогоняет найденные seed-функции на пустой БД, затем ещё repeat раз на заполненной.
+
+    :return: словарь с результатами: секунды по каждой функции, ошибки импорта и выполнения
+    :raises RuntimeError: если не выполнилась ни одна seed-функция
+    """
+    from db_init.base import Base
+
+    seeds, errors = discover()
+    results = {"repeat": repeat, "seeds": len(seeds), "errors": errors}
+    with tempfile.TemporaryDirectory(prefix="bench_seed_") as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.sqlite3')}")
+        Base.metadata.create_all(engine)
+        # seed_company и seed_proj_attr пишут через модели new_vessel_proj со своей Base
+        # (proj_types, жизненные циклы, шаблоны есть только там), как db_init/new_vessel_proj/seed.py
+        legacy = sys.modules.get("db_init.new_vessel_proj.models")
+        if legacy is not None:
+            legacy.Base.metadata.create_all(engine)
+        failed = set()
+        with bound_session_local(engine), redirect_stdout(io.StringIO()):
+            for rnd in range(repeat + 1):
+                key_suffix = "first_s" if rnd == 0 else "repeat_s"
+                for module, name, func in seeds:
+                    key = f"{module.rpartition('.')[2]}.{name}"
+                    if key in failed:
+                        continue
+                    start = time.perf_counter()
+                    try:
+                        func()
+                    except Exception as e:
+                        failed.add(key)
+                        errors[key] = f"{type(e).__name__}: {e}"
+                        continue
+                    elapsed = time.perf_counter() - start
+                    results[f"{key}.{key_suffix}"] = results.get(f"{key}.{key_suffix}", 0.0) + elapsed
+        engine.dispose()
+    if not any(key.endswith(".first_s") for key in results):
+        # замерять нечего: без ошибки набор отчитался бы об успехе, не измерив ни одной функции
+        details = "; ".join(f"{where}: {error}" for where, error in errors.items())
+        raise RuntimeError(f"Ни одна seed-функция не выполнилась (найдено {len(seeds)})" + (f": {details}" if details else ""))
+    for key in list(results):
+        if key.endswith(".repeat_s") and repeat:
+            results[key] /= repeat
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Бенчмарк seed-функций")
+    parser.add_argument("--repeat", type=int, default=10, help="число повторных прогонов на заполненной БД")
+    args = parser.parse_args()
+
+    res = run(args.repeat)
+    print(f"📊 Seed-функций: {res['seeds']}, повторов: {res['repeat']}")
+    for key, value in res.items():
+        if key.endswith(".first_s"):
+            name = key[:-len(".first_s")]
+            again = res.get(f"{name}.repeat_s")
+            print(f"🌱 {name:<40} первый {value * 1000:8.1f} мс"
+                  + (f", повторный {again * 1000:8.1f} мс" if again is not None else ""))
+    for name, error in res["errors"].items():
+        print(f"⚠️ {name}: {error}")
@@ -0,0 +1,66 @@
+# benchmarks/bench_session.py
+# Замер открытия и закрытия сессий через db_init.session.get_db на временной SQLite ⏱️
+
+import os
+import time
+import argparse
+import tempfile
+from contextlib import contextmanager
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+
+from db_init.session import SessionLocal, get_db
+
+
+@contextmanager
+def bound_session_local(engine: Engine):
+    """Временно перенаправляет фабрику SessionLocal (и всё, что через неё работает) на engine"""
+    previous = SessionLocal.kw.get("bind")
+    SessionLocal.configure(bind=engine)
+    try:
+        yield engine
+    finally:
+        SessionLocal.configure(bind=previous)
+
+
+def run(sessions: int = 10_000) -> dict:
+    """
+    Открывает sessions сессий подряд, в каждой — один короткий запрос.
+
+    :return: словарь с результатами: get_db против голой SessionLocal()
+    """
+    with tempfile.TemporaryDirectory(prefix="bench_session_") as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.sqlite3')}")
+        query = text("SELECT 1")
+        results = {"sessions": sessions}
+        with bound_session_local(engine):
+            start = time.perf_counter()
+            for _ in range(sessions):
+                with get_db() as session:
+                    session.execute(query)
+            results["get_db_s"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for _ in range(sessions):
+                session = SessionLocal()
+                session.execute(query)
+                session.commit()
+                session.close()
+            results["raw_s"] = time.perf_counter() - start
+        results["get_db_per_s"] = sessions / results["get_db_s"]
+        engine.dispose()
+        return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Бенчмарк сессий get_db")
+    parser.add_argument("--sessions", type=int, default=10_000, help="число сессий")
+    args = parser.parse_args()
+
+    res = run(args.sessions)
+    n = res["sessions"]
+    print(f"📊 Сессий: {n}")
+    print(f"📂 get_db:       {res['get_db_s']:.3f} с ({res['get_db_per_s']:.0f} сессий/с)")
+    print(f"⚙️ SessionLocal: {res['raw_s']:.3f} с ({n / res['raw_s']:.0f} сессий/с), "
+          f"накладные get_db {(res['get_db_s'] - res['raw_s']) / n * 1e6:.1f} мкс/сессия")
@@ -0,0 +1,101 @@
+# benchmarks/bench_xlsx_export.py
+# Замер выгрузки 500k строк индекса документов в .xlsx через utils/xlsx_writer ⏱️
+
+import os
+import time
+import random
+import argparse
+import tempfile
+import resource
+from contextlib import contextmanager
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from db_init.documents.models_documents import Base, Document
+from journal.export import ProjectExporter
+from utils.xlsx_reader import XlsxReader
+
+
+def fill_documents(engine, rows: int, seed: int = 1) -> None:
+    """Заполняет таблицу documents синтетическими файлами двух корней"""
+    rnd = random.Random(seed)
+    exts = ["docx", "xlsx", "pdf", "dwg", "txt"]
+    batch = []
+    with engine.begin() as conn:
+        for i in range(rows):
+            root = "/project" if i % 3 else "/archive"
+            project = f"{root}/{rnd.randrange(400):03d} Проект"
+            ext = exts[i % len(exts)]
+            name = f"089.{i % 1000:03d} Документ {i}.{ext}"
+            batch.append({
+                "path": f"{project}/{name}", "root": root, "parent": project, "name": name, "ext": ext,
+                "is_dir": False, "size": rnd.randrange(1 << 24), "mtime_ns": 1_700_000_000_000_000_000 + i,
+            })
+            if len(batch) == 20_000:
+                conn.execute(insert(Document), batch)
+                batch.clear()
+        for root in ("/project", "/archive"):
+            for p in range(400):
+                path = f"{root}/{p:03d} Проект"
+                batch.append({"path": path, "root": root, "parent": root, "name": f"{p:03d} Проект", "ext": "",
+                              "is_dir": True, "size": 0, "mtime_ns": 1_700_000_000_000_000_000})
+        conn.execute(insert(Document), batch)
+
+
+def _max_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run(rows: int = 500_000, verify: bool = False) -> dict:
+    """
+    Готовит SQLite с rows документами и выгружает её в .xlsx.
+
+    :return: словарь с результатами
+    """
+    with tempfile.TemporaryDirectory(prefix="bench_xlsx_") as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.sqlite3')}")
+        Base.metadata.create_all(engine, tables=[Document.__table__])
+        start = time.perf_counter()
+        fill_documents(engine, rows)
+        fill_s = time.perf_counter() - start
+
+        @contextmanager
+        def session_factory():
+            with Session(engine) as session:
+                yield session
+
+        out = os.path.join(tmp, "export.xlsx")
+        rss_before = _max_rss_mb()
+        start = time.perf_counter()
+        counts = ProjectExporter("/project", "/archive", session_factory=session_factory).export(out)
+        export_s = time.perf_counter() - start
+        results = {
+            "rows": sum(counts.values()),
+            "fill_s": fill_s,
+            "export_s": export_s,
+            "rows_per_s": sum(counts.values()) / export_s,
+            "file_mb": os.path.getsize(out) / 1024 ** 2,
+            "rss_growth_mb": _max_rss_mb() - rss_before,
+        }
+        if verify:
+            with XlsxReader(out) as book:
+                results["read_back"] = sum(
+                    sum(1 for _ in book.iter_rows(sheet, min_row=2)) for sheet in book.sheet_names
+                )
+        engine.dispose()
+        return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Бенчмарк выгрузки в .xlsx")
+    parser.add_argument("--rows", type=int, default=500_000, help="число строк документов")
+    parser.add_argument("--verify", action="store_true", help="перечитать книгу и сверить число строк")
+    args = parser.parse_args()
+
+    res = run(args.rows, args.verify)
+    print(f"📊 Строк выгружено: {res['rows']} (подготовка БД {res['fill_s']:.1f} с)")
+    print(f"📝 Выгрузка: {res['export_s']:.1f} с, {res['rows_per_s']:.0f} строк/с, файл {res['file_mb']:.1f} МБ")
+    print(f"🧠 Рост пикового RSS: {res['rss_growth_mb']:.1f} МБ")
+    if "read_back" in res:
+        print(f"🔁 Прочитано обратно: {res['read_back']}")
@@ -0,0 +1,283 @@
+# benchmarks/suite.py
+# Набор бенчмарков проекта: прогон по размерам данных, результаты в JSON, сравнение с базовой линией 📊
+#
+# Каждый бенчмарк — функция run(...) из модуля benchmarks/bench_*.py; размер данных передаётся
+# в её именованный параметр (rows, entries, records…). Сравниваются только замеры времени:
+# ключи «*_s» (меньше — лучше) и «*_per_s» (больше — лучше).
+
+import os
+import json
+import time
+import platform
+import sqlite3
+import argparse
+import importlib
+import subprocess
+import traceback
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+BASELINE_FILE = os.path.join(RESULTS_DIR, "baseline.json")
+# Допустимое замедление относительно базовой линии (0.2 — на 20%)
+DEFAULT_THRESHOLD = 0.2
+# Замеры короче этого не сравниваются: на них сравнение — шум таймера
+MIN_SECONDS = 0.01
+
+
+class Benchmark(NamedTuple):
+    module: str
+    param: str
+    sizes: Tuple[int, ...]
+    options: dict = {}
+    threshold: Optional[float] = None
+    description: str = ""
+
+
+BENCHMARKS: Dict[str, Benchmark] = {
+    "repository": Benchmark("bench_repository", "rows", (1_000, 10_000),
+                            description="CRUD и get_or_create BaseRepository"),
+    "seed": Benchmark("bench_seed", "repeat", (1, 10),
+                      description="все seed_* на пустой и заполненной БД"),
+    "session": Benchmark("bench_session", "sessions", (1_000, 10_000),
+                         description="открытие/закрытие сессий get_db"),
+    "save_tree": Benchmark("bench_save_tree", "entries", (10_000, 100_000), {"repeat": 3, "legacy": False},
+                           description="save_tree на синтетическом дереве"),
+    "logger": Benchmark("bench_logger", "records", (10_000, 100_000), {"legacy": False}, threshold=0.3,
+                        description="пропускная способность лога"),
+    "xlsx_export": Benchmark("bench_xlsx_export", "rows", (10_000, 100_000),
+                             description="выгрузка индекса документов в .xlsx"),
+    "synthetic": Benchmark("synthetic", "rows", (10_000, 1_000_000),
+                           description="генерация синтетической базы"),
+    "paged_model": Benchmark("bench_paged_model", "rows", (10_000, 100_000),
+                             description="прокрутка и произвольный доступ PagedTableModel"),
+    "search": Benchmark("bench_search", "rows", (10_000, 100_000),
+                        description="поиск при вводе по справочнику заказчиков"),
+}
+
+
+def flatten(results: dict, prefix: str = "") -> Dict[str, float]:
+    """Числовые значения результата, вложенные словари — через точку"""
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def is_timing(metric: str) -> bool:
+    return metric.endswith("_s")
+
+
+def higher_is_better(metric: str) -> bool:
+    return metric.endswith("_per_s")
+
+
+def _best(runs: List[Dict[str, float]]) -> Dict[str, float]:
+    """Лучший из повторов по каждому замеру времени, остальное — из первого прогона"""
+    best = dict(runs[0])
+    for metric in best:
+        if is_timing(metric):
+            values = [r[metric] for r in runs if metric in r]
+            best[metric] = max(values) if higher_is_better(metric) else min(values)
+    return best
+
+
+def run_case(bench: Benchmark, size: int, repeat: int = 1) -> dict:
+    """
+    Прогоняет один бенчмарк на одном размере в текущем процессе.
+
+    :return: {"metrics": {...}} или {"error": "..."} — при ошибке импорта или выполнения
+    """
+    try:
+        module = importlib.import_module(f"benchmarks.{bench.module}")
+        # разогрев на малом размере: импорты, компиляция запросов SQLAlchemy, кэши
+        module.run(**{bench.param: max(1, min(size, bench.sizes[0]) // 10)}, **bench.options)
+        runs = []
+        for _ in range(repeat):
+            result = module.run(**{bench.param: size}, **bench.options)
+            runs.append(flatten(result))
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}", "traceback": traceback.format_exc(limit=5)}
+    case = {"metrics": _best(runs)}
+    errors = result.get("errors")
+    if errors:
+        case["errors"] = errors
+    return case
+
+
+def run_isolated(bench: Benchmark, size: int, repeat: int = 1) -> dict:
+    """
+    run_case в отдельном чистом процессе: модели, логгеры и кэши одного бенчмарка
+    не влияют на следующий, а падение процесса не обрывает весь набор.
+    """
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        try:
+            return pool.submit(run_case, bench, size, repeat).result()
+        except Exception as e:
+            return {"error": f"{type(e).__name__}: {e}"}
+
+
+def environment() -> dict:
+    """Сведения о машине и версии кода: без них результаты разных прогонов не сравнить"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=10,
+            cwd=os.path.dirname(RESULTS_DIR),
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ""
+    try:
+        import sqlalchemy
+        sqlalchemy_version = sqlalchemy.__version__
+    except ImportError:
+        sqlalchemy_version = ""
+    return {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "sqlite": sqlite3.sqlite_version,
+        "sqlalchemy": sqlalchemy_version,
+    }
+
+
+def run_suite(names: List[str], sizes: Optional[List[int]] = None, quick: bool = False,
+              repeat: int = 1, progress=print) -> dict:
+    """
+    Прогоняет бенчмарки names на их размерах (или на sizes).
+
+    :param quick: только наименьший размер каждого бенчмарка
+    :param progress: функция вывода хода прогона
+    :return: {"meta": ..., "cases": {"имя[размер]": {...}}}
+    """
+    cases = {}
+    for name in names:
+        bench = BENCHMARKS[name]
+        bench_sizes = sizes or (bench.sizes[:1] if quick else bench.sizes)
+        for size in bench_sizes:
+            key = f"{name}[{size}]"
+            progress(f"⏱️ {key} …")
+            start = time.perf_counter()
+            case = run_isolated(bench, size, repeat)
+            case["wall_s"] = time.perf_counter() - start
+            cases[key] = case
+            if "error" in case:
+                progress(f"   ❌ {case['error']}")
+            else:
+                progress(f"   ✅ {case['wall_s']:.1f} с")
+            for where, error in case.get("errors", {}).items():
+                progress(f"   ⚠️ {where}: {error}")
+    return {"meta": environment(), "cases": cases}
+
+
+def compare(current: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> List[dict]:
+    """
+    Сравнивает замеры времени с базовой линией.
+
+    :param threshold: допустимое ухудшение по умолчанию (у бенчмарка может быть своё)
+    :return: строки сравнения: case, metric, baseline, current, change (доля), regression
+    """
+    rows = []
+    for key, case in current["cases"].items():
+        base_case = baseline.get("cases", {}).get(key)
+        if not base_case or "metrics" not in case or "metrics" not in base_case:
+            continue
+        name = key.partition("[")[0]
+        bench = BENCHMARKS.get(name)
+        limit = bench.threshold if bench and bench.threshold is not None else threshold
+        for metric, value in case["metrics"].items():
+            old = base_case["metrics"].get(metric)
+            if not is_timing(metric) or old is None or not old or not value:
+                continue
+            if higher_is_better(metric):
+                change = old / value - 1
+                noise = False
+            else:
+                change = value / old - 1
+                noise = max(value, old) < MIN_SECONDS
+            rows.append({
+                "case": key, "metric": metric, "baseline": old, "current": value, "change": change,
+                "regression": change > limit and not noise,
+            })
+    return rows
+
+
+def format_comparison(rows: List[dict]) -> str:
+    lines = []
+    for row in rows:
+        mark = "🔴" if row["regression"] else ("🟢" if row["change"] < 0 else "⚪")
+        lines.append(
+            f"{mark} {row['case']:<22} {row['metric']:<40} {row['baseline']:>12.4f} → {row['current']:>12.4f} "
+            f"({row['change'] * 100:+.1f}%)"
+        )
+    return "\n".join(lines)
+
+
+def save(results: dict, path: str) -> str:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def load(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Набор бенчмарков PMIS: прогон, сохранение в JSON и сравнение с базовой линией",
+    )
+    parser.add_argument("names", nargs="*", help="какие бенчмарки прогнать (по умолчанию все)")
+    parser.add_argument("--list", action="store_true", help="показать бенчмарки и их размеры")
+    parser.add_argument("--size", type=int, action="append", help="размер данных вместо стандартных (можно несколько)")
+    parser.add_argument("--quick", action="store_true", help="только наименьший размер каждого бенчмарка")
+    parser.add_argument("--repeat", type=int, default=3, help="повторов каждого замера, берётся лучший")
+    parser.add_argument("--out", help="файл результатов (по умолчанию benchmarks/results/<время>.json)")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="файл базовой линии")
+    parser.add_argument("--save-baseline", action="store_true", help="сохранить результаты как базовую линию")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="допустимое замедление, доля (0.2 — на 20%%)")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, bench in BENCHMARKS.items():
+            sizes = ", ".join(str(s) for s in bench.sizes)
+            print(f"{name:<12} {bench.param}={sizes:<16} {bench.description}")
+        return 0
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"неизвестные бенчмарки: {', '.join(unknown)} (см. --list)")
+
+    results = run_suite(args.names or list(BENCHMARKS), args.size, args.quick, args.repeat)
+    out = args.out or os.path.join(RESULTS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}.json")
+    print(f"💾 Результаты: {save(results, out)}")
+
+    code = 0
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        baseline = load(args.baseline)
+        rows = compare(results, baseline, args.threshold)
+        if rows:
+            print(f"📐 Сравнение с базовой линией {baseline['meta'].get('commit') or ''} "
+                  f"({baseline['meta'].get('time')}), порог +{args.threshold * 100:.0f}%:")
+            print(format_comparison(rows))
+        regressions = [row for row in rows if row["regression"]]
+        if regressions:
+            print(f"🔴 Регрессий: {len(regressions)}")
+            code = 1
+        else:
+            print("🟢 Регрессий нет")
+    elif not args.save_baseline:
+        print(f"ℹ️ Базовой линии нет ({args.baseline}); сохранить: --save-baseline")
+    if args.save_baseline:
+        print(f"📌 Базовая линия: {save(results, args.baseline)}")
+    if any("error" in case for case in results["cases"].values()):
+        code = code or 2
+    return code
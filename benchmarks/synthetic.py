@@ -0,0 +1,388 @@
+# benchmarks/synthetic.py
+# Детерминированный генератор синтетических данных для нагрузочных замеров 🏭
+#
+# Наполняет пользователей, отделы, роли, заказчиков, проекты (project_base) и индекс документов
+# в масштабе от 10³ до 10⁶ строк bulk-вставками Core и может построить на диске дерево папок,
+# в точности совпадающее с записями documents (размеры и mtime тоже), — для save_tree,
+# индексатора и наблюдателя. Одно и то же зерно (seed) даёт одни и те же данные.
+
+import os
+import math
+import time
+import random
+import hashlib
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, NamedTuple
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.engine import Engine
+
+from db_init.base import Base
+from db_init.company.models_company import User, Department, Role, user_departments, user_roles
+from db_init.catalogs.models_catalogs import Customer
+from db_init.project_base.models_project_base import ProjectBase
+from db_init.documents.models_documents import Document
+from utils.logger import LoggerManager
+
+# Размер пачки bulk-вставки
+BATCH_SIZE: int = 20_000
+# Показатель закона Ципфа для числа документов в проекте: k-й по величине проект
+# получает долю ~1/k**DOCUMENT_SKEW — несколько крупных проектов и длинный хвост мелких
+DOCUMENT_SKEW: float = 1.0
+# Время изменения файлов: от этой даты и на ~3 года вперёд
+MTIME_BASE_NS: int = 1_600_000_000_000_000_000
+
+# Справочники — те же, что заливают seed-функции
+DEPARTMENTS = ["АУП", "Отдел корпус", "Отдел механика", "Отдел электрика"]
+ROLES = ["Администратор", "Директор", "Соучредитель", "Проектный офис", "Бухгалтер", "Экономист",
+         "Ведущий специалист", "Специалист", "Стажер", "Клиент", "Контрагент", "Гость", "Соискатель"]
+PROJ_TYPES = ["НОВОЕ СУДНО", "ПЕРЕОБОРУДОВАНИЕ", "РАЗВИТИЕ", "АДМИНИСТРАТИВКА"]
+PROJ_STATUSES = ["не начат", "в работе", "отложен", "отменен"]
+
+FIRST_NAMES = ["Алексей", "Андрей", "Виталий", "Владимир", "Дмитрий", "Денис", "Максим", "Олег", "Сергей",
+               "Артем", "Ольга", "Валерия", "Ирина", "Мария", "Наталья", "Елена"]
+LAST_NAMES = ["Дмитриев", "Федюнин", "Сергеев", "Макаров", "Титов", "Дубинин", "Власов", "Михин", "Евстратов",
+              "Райкевич", "Мартенс", "Семуха", "Григорьев", "Иванов", "Кузнецов", "Смирнов"]
+COMPANY_FORMS = ["ООО", "АО", "ПАО", "ФГУП"]
+COMPANY_WORDS = ["Балтийский", "Северный", "Волжский", "Морской", "Речной", "Невский", "Онежский", "Азовский"]
+COMPANY_KINDS = ["судостроительный завод", "флот", "пароходство", "судоходная компания", "верфь", "порт"]
+VESSELS = ["танкер", "сухогруз", "буксир", "паром", "ледокол", "земснаряд", "рыболовное судно", "баржа"]
+
+# Папки внутри проекта и документы в них: (серия, аббревиатура, название, расширения)
+SUBFOLDERS = ["01 Исходные данные", "02 Расчеты", "03 Чертежи", "04 Документация", "05 Переписка"]
+DOCUMENTS = [
+    ("089", "PWOM", "Руководство", ("docx", "pdf")),
+    ("089", "SIP", "Программа испытаний", ("docx", "pdf")),
+    ("100", "LSA-TMA", "Расчет остойчивости", ("xlsx", "pdf")),
+    ("200", "ТО", "Техническое описание", ("docx",)),
+    ("300", "", "Спецификация", ("xlsx",)),
+    ("400", "", "Чертеж общего расположения", ("dwg", "pdf")),
+    ("500", "", "Письмо", ("pdf", "msg")),
+]
+
+
+class Scale(NamedTuple):
+    """Число строк по таблицам"""
+    departments: int
+    roles: int
+    users: int
+    customers: int
+    projects: int
+    documents: int
+
+    @property
+    def total(self) -> int:
+        return sum(self)
+
+
+def scale_for(rows: int) -> Scale:
+    """
+    Раскладывает общий объём rows по таблицам: основную массу даёт индекс документов,
+    справочники растут медленнее (как в реальной базе).
+    """
+    departments = max(len(DEPARTMENTS), rows // 5_000)
+    users = max(14, rows // 200)
+    customers = max(10, rows // 500)
+    projects = max(20, rows // 100)
+    documents = max(projects, rows - departments - len(ROLES) - users - customers - projects)
+    return Scale(departments, len(ROLES), users, customers, projects, documents)
+
+
+def _person(rnd: random.Random) -> tuple:
+    return rnd.choice(FIRST_NAMES), rnd.choice(LAST_NAMES)
+
+
+class SyntheticData:
+    """
+    Генератор строк. Каждая таблица строится своим генератором от зерна seed, поэтому
+    строки одной таблицы не зависят от того, какие таблицы генерировались до неё.
+    """
+
+    def __init__(self, scale: Scale, seed: int = 1, project_root: str = "/project",
+                 archive_root: str = "/archive") -> None:
+        """
+        :param scale: число строк по таблицам
+        :param seed: зерно генератора
+        :param project_root: корень текущих проектов в путях документов
+        :param archive_root: корень архивных проектов
+        """
+        self.scale = scale
+        self.seed = seed
+        self.project_root = os.path.normpath(project_root)
+        self.archive_root = os.path.normpath(archive_root)
+
+    def _random(self, table: str, part: int = 0) -> random.Random:
+        return random.Random(f"{self.seed}:{table}:{part}")
+
+    def departments(self) -> List[dict]:
+        names = DEPARTMENTS + [f"Отдел {i:03d}" for i in range(1, self.scale.departments - len(DEPARTMENTS) + 1)]
+        return [{"id": i, "dep_name": name, "description": ""} for i, name in enumerate(names, 1)]
+
+    def roles(self) -> List[dict]:
+        return [{"id": i, "role_name": name, "description": ""} for i, name in enumerate(ROLES, 1)]
+
+    def users(self) -> Iterator[dict]:
+        rnd = self._random("users")
+        # пароль один на всех: хэшировать миллион раз незачем
+        password_hash = hashlib.sha256(b"12345").hexdigest()
+        start = datetime(2010, 1, 1)
+        for i in range(1, self.scale.users + 1):
+            first, last = _person(rnd)
+            employed = start + timedelta(days=rnd.randrange(5_500))
+            yield {
+                "id": i, "username": f"user{i:06d}", "password_hash": password_hash,
+                "email": f"user{i:06d}@adomat.ru", "first_name": first, "last_name": last,
+                "phone": f"+7{rnd.randrange(9_000_000_000, 10_000_000_000)}", "is_active": rnd.random() > 0.1,
+                "last_login_at": employed + timedelta(days=rnd.randrange(30, 3_000)), "created_at": employed,
+                "date_of_employment": employed,
+            }
+
+    def memberships(self) -> Iterator[tuple]:
+        """(таблица связи, строка): у пользователя один отдел и одна-две роли"""
+        rnd = self._random("memberships")
+        for user_id in range(1, self.scale.users + 1):
+            yield user_departments, {"user_id": user_id, "department_id": rnd.randrange(1, self.scale.departments + 1)}
+            for role_id in rnd.sample(range(1, self.scale.roles + 1), rnd.choice((1, 1, 2))):
+                yield user_roles, {"user_id": user_id, "role_id": role_id}
+
+    def customers(self) -> Iterator[dict]:
+        rnd = self._random("customers")
+        created = datetime(2014, 3, 15)
+        for i in range(1, self.scale.customers + 1):
+            short = f"{rnd.choice(COMPANY_WORDS)} {rnd.choice(COMPANY_KINDS)} №{i}"
+            first, last = _person(rnd)
+            yield {
+                "id": i, "name": f"{rnd.choice(COMPANY_FORMS)} «{short}»", "short_name": short[:50],
+                "inn": f"{rnd.randrange(10 ** 9, 10 ** 10)}", "kpp": f"{rnd.randrange(10 ** 8, 10 ** 9)}",
+                "ogrn": f"{rnd.randrange(10 ** 12, 10 ** 13)}", "contact_person": f"{first} {last}",
+                "phone": f"+7{rnd.randrange(9_000_000_000, 10_000_000_000)}", "email": f"info{i}@customer.ru",
+                "address_legal": f"г. Санкт-Петербург, ул. Заводская, д. {rnd.randrange(1, 200)}",
+                "address_actual": None, "notes": None, "is_active": True,
+                "created_at": created, "updated_at": created,
+            }
+
+    def project_name(self, i: int) -> str:
+        """Имя проекта — оно же имя его папки: «0042 Танкер 42»"""
+        return f"{i:04d} {VESSELS[i % len(VESSELS)].capitalize()} {i}"
+
+    def project_root_of(self, i: int) -> str:
+        """Каждый пятый проект — архивный"""
+        return self.archive_root if i % 5 == 0 else self.project_root
+
+    def projects(self) -> Iterator[dict]:
+        rnd = self._random("projects")
+        start = datetime(2014, 1, 1)
+        for i in range(1, self.scale.projects + 1):
+            first, last = _person(rnd)
+            begin = start + timedelta(days=rnd.randrange(4_000))
+            yield {
+                "id": i, "name": self.project_name(i), "created_at": begin, "start_date": begin,
+                "end_date": begin + timedelta(days=rnd.randrange(60, 900)) if rnd.random() < 0.6 else None,
+                "status": rnd.choice(PROJ_STATUSES), "owner": f"{first} {last}",
+                "is_archive": self.project_root_of(i) == self.archive_root,
+                # первая запись — базовый проект (ProjectBaseRepository.get_base_project)
+                "proj_type": "base" if i == 1 else PROJ_TYPES[rnd.randrange(len(PROJ_TYPES))],
+            }
+
+    def documents(self) -> Iterator[dict]:
+        """
+        Строки индекса в порядке обхода: папка раньше своего содержимого.
+        Документы распределены по проектам неравномерно, как в живом архиве.
+        """
+        for i, count in enumerate(self.document_counts(), 1):
+            yield from self._project_documents(i, count)
+
+    def document_counts(self) -> List[int]:
+        """
+        Число строк индекса по проектам (папка проекта тоже строка): у каждого хотя бы одна,
+        остальное — по закону Ципфа; место проекта в этом ранге случайно, но детерминировано.
+        """
+        projects = self.scale.projects
+        ranks = list(range(1, projects + 1))
+        self._random("document_counts").shuffle(ranks)
+        weights = [rank ** -DOCUMENT_SKEW for rank in ranks]
+        spare = max(0, self.scale.documents - projects)
+        total = sum(weights)
+        counts = [1 + int(spare * w / total) for w in weights]
+        # остаток от округления — самым крупным проектам
+        left = self.scale.documents - sum(counts)
+        for i in sorted(range(projects), key=lambda k: ranks[k])[:max(0, left)]:
+            counts[i] += 1
+        return counts
+
+    def _project_documents(self, i: int, count: int) -> Iterator[dict]:
+        rnd = self._random("documents", i)
+        root = self.project_root_of(i)
+        name = self.project_name(i)
+        folder = os.path.join(root, name)
+        mtime = MTIME_BASE_NS + rnd.randrange(10 ** 17)
+        yield self._row(root, root, name, "", 0, mtime)
+        count -= 1
+        parents = [folder]
+        subfolders = SUBFOLDERS[:max(1, min(len(SUBFOLDERS), count // 10))]
+        if count > len(subfolders):
+            parents = [os.path.join(folder, sub) for sub in subfolders]
+            for sub in subfolders:
+                yield self._row(root, folder, sub, "", 0, mtime)
+            count -= len(subfolders)
+        # random() вместо randrange/choice: на миллионе строк это треть времени генерации
+        rand, gauss, docs = rnd.random, rnd.gauss, len(DOCUMENTS)
+        for n in range(count):
+            series, abbr, title, exts = DOCUMENTS[int(rand() * docs)]
+            ext = exts[int(rand() * len(exts))]
+            file_name = f"{series}.{n % 1000:03d} ({abbr}) {title} {n}.{ext}" if abbr else \
+                f"{series}.{n % 1000:03d} {title} {n}.{ext}"
+            size = int(math.exp(11 + 2 * gauss(0, 1))) % (1 << 26)
+            yield self._row(root, parents[n % len(parents)], file_name, "." + ext, size, mtime + int(rand() * 1e15))
+
+    @staticmethod
+    def _row(root: str, parent: str, name: str, ext: str, size: int, mtime_ns: int) -> dict:
+        """Те же поля, что заполняет indexer.doc_index при обходе; ext пустое — папка"""
+        return {
+            "path": parent + os.sep + name, "root": root, "parent": parent, "name": name,
+            "ext": ext, "is_dir": not ext, "size": size, "mtime_ns": mtime_ns,
+        }
+
+
+def _fast_pragmas(engine: Engine) -> None:
+    """Без журнала и fsync: базу при сбое всё равно проще сгенерировать заново"""
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_conn, _):
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA journal_mode = OFF")
+        cursor.execute("PRAGMA synchronous = OFF")
+        cursor.execute("PRAGMA cache_size = -200000")
+        cursor.close()
+
+
+def _insert(conn, table, rows) -> int:
+    """Bulk-вставка потока строк пачками по BATCH_SIZE"""
+    count = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            conn.execute(insert(table), batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        conn.execute(insert(table), batch)
+        count += len(batch)
+    return count
+
+
+TABLES = [Department.__table__, Role.__table__, User.__table__, user_departments, user_roles,
+          Customer.__table__, ProjectBase.__table__, Document.__table__]
+
+
+def generate(db_path: str, rows: int = 1_000, seed: int = 1, project_root: str = "/project",
+             archive_root: str = "/archive", force: bool = False) -> Dict[str, int]:
+    """
+    Создаёт новую базу SQLite с синтетическими данными.
+
+    :param db_path: файл базы; существующий перезаписывается только при force
+    :param rows: общий объём строк (см. scale_for)
+    :param force: удалить существующий файл
+    :return: число вставленных строк по таблицам
+    """
+    logger = LoggerManager(__name__).get_logger()
+    if os.path.exists(db_path):
+        if not force:
+            raise FileExistsError(f"{db_path} уже существует (перезаписать: force=True)")
+        os.remove(db_path)
+    data = SyntheticData(scale_for(rows), seed, project_root, archive_root)
+    engine = create_engine(f"sqlite:///{db_path}")
+    _fast_pragmas(engine)
+    Base.metadata.create_all(engine, tables=TABLES)
+    counts: Dict[str, int] = {}
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        counts["departments"] = _insert(conn, Department.__table__, data.departments())
+        counts["roles"] = _insert(conn, Role.__table__, data.roles())
+        counts["users"] = _insert(conn, User.__table__, data.users())
+        links: Dict[str, List[dict]] = {user_departments.name: [], user_roles.name: []}
+        for table, row in data.memberships():
+            links[table.name].append(row)
+        counts[user_departments.name] = _insert(conn, user_departments, links[user_departments.name])
+        counts[user_roles.name] = _insert(conn, user_roles, links[user_roles.name])
+        counts["customer"] = _insert(conn, Customer.__table__, data.customers())
+        counts["project_base"] = _insert(conn, ProjectBase.__table__, data.projects())
+        counts["documents"] = _insert(conn, Document.__table__, data.documents())
+    engine.dispose()
+    logger.info(f"🏭 Синтетическая база {db_path}: {sum(counts.values())} строк "
+                f"за {time.perf_counter() - start:.1f} с (seed={seed})")
+    return counts
+
+
+def build_tree(root: str, rows: int = 1_000, seed: int = 1) -> int:
+    """
+    Строит на диске дерево, совпадающее с documents из generate(rows, seed) с корнями
+    root/project и root/archive: файлы разреженные нужного размера, mtime как в индексе.
+
+    :return: число созданных файлов и папок
+    """
+    data = SyntheticData(scale_for(rows), seed, os.path.join(root, "project"), os.path.join(root, "archive"))
+    os.makedirs(data.project_root, exist_ok=True)
+    os.makedirs(data.archive_root, exist_ok=True)
+    created = 0
+    dirs = []
+    for row in data.documents():
+        if row["is_dir"]:
+            os.mkdir(row["path"])
+            dirs.append((row["path"], row["mtime_ns"]))
+        else:
+            with open(row["path"], "wb") as f:
+                f.truncate(row["size"])
+            os.utime(row["path"], ns=(row["mtime_ns"], row["mtime_ns"]))
+        created += 1
+    # mtime папок — после их наполнения, иначе создание файлов его перепишет
+    for path, mtime_ns in reversed(dirs):
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+    return created
+
+
+def run(rows: int = 1_000_000, seed: int = 1) -> dict:
+    """
+    Замер генерации для набора бенчмарков: база во временной папке.
+
+    :return: словарь с результатами
+    """
+    with tempfile.TemporaryDirectory(prefix="bench_synthetic_") as tmp:
+        start = time.perf_counter()
+        counts = generate(os.path.join(tmp, "synthetic.sqlite3"), rows, seed)
+        elapsed = time.perf_counter() - start
+    total = sum(counts.values())
+    return {"rows": total, "documents": counts["documents"], "generate_s": elapsed, "rows_per_s": total / elapsed}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Генератор синтетических данных PMIS")
+    parser.add_argument("db", nargs="?", help="файл новой базы SQLite")
+    parser.add_argument("--rows", type=float, default=1_000, help="общий объём строк, 1e3…1e6")
+    parser.add_argument("--seed", type=int, default=1, help="зерно генератора")
+    parser.add_argument("--tree", help="построить совпадающее дерево папок в этой папке (корни project/ и archive/)")
+    parser.add_argument("--force", action="store_true", help="перезаписать существующую базу")
+    args = parser.parse_args()
+    rows = int(args.rows)
+
+    if not args.db and not args.tree:
+        parser.error("укажите файл базы и/или --tree")
+    scale = scale_for(rows)
+    print(f"📐 Масштаб: {', '.join(f'{k}={v}' for k, v in scale._asdict().items())}")
+    project_root, archive_root = "/project", "/archive"
+    if args.tree:
+        args.tree = os.path.abspath(args.tree)
+        project_root, archive_root = os.path.join(args.tree, "project"), os.path.join(args.tree, "archive")
+        start = time.perf_counter()
+        created = build_tree(args.tree, rows, args.seed)
+        print(f"🌳 Дерево {args.tree}: {created} записей за {time.perf_counter() - start:.1f} с")
+    if args.db:
+        start = time.perf_counter()
+        counts = generate(args.db, rows, args.seed, project_root, archive_root, force=args.force)
+        elapsed = time.perf_counter() - start
+        print(f"🏭 База {args.db}: {sum(counts.values())} строк за {elapsed:.1f} с "
+              f"({sum(counts.values()) / elapsed:.0f} строк/с)")
+        for table, count in counts.items():
+            print(f"   {table:<18} {count}")
@@ -1,4 +1,5 @@
 # settings/settings.py
+import os
 
 
 # ===========================
@@ -14,6 +15,9 @@ class PathSettings:
     # Путь к папке с архивом проектов
     ARCHIVE_FOLDER = r"\\192.168.1.98\03_пароходы_чертежи"
 
+    # Локальная папка со снимками деревьев проектов (structure/snapshot.py)
+    SNAPSHOT_FOLDER = os.path.join(os.path.expanduser("~"), ".pmis", "snapshots")
+
 
 # ===========================
 # 📊 Настройки Excel
@@ -22,6 +26,21 @@ class ExcelSettings:
     # Лист получения данных с ВД проекта
     SOURCE_SHEET = '03 ВД'
 
+    # Поля записи листа ВД и возможные заголовки столбцов (сравнение без учёта регистра)
+    SOURCE_COLUMNS = {
+        "project": ["Проект", "Номер проекта", "Судно"],
+        "doc_number": ["Номер документа", "№ документа", "Обозначение", "Шифр"],
+        "doc_name": ["Наименование", "Наименование документа"],
+        "revision": ["Изм.", "Изменение", "Ревизия"],
+        "status": ["Статус"],
+        "issue_date": ["Дата", "Дата выпуска"],
+        "author": ["Исполнитель", "Разработал"],
+        "note": ["Примечание"],
+    }
+
+    # Сколько первых строк листа просматривать в поисках строки заголовков
+    SOURCE_HEADER_SCAN = 20
+
     # Лист для сохранения списка проектов
     PROJECT_SAVE_SHEET = "projects_all"
 
@@ -30,3 +49,111 @@ class ExcelSettings:
 
     # Лист для сохранения списка документов из папки архива проектов
     ARCHIVE_DOCS_SAVE_SHEET = "archive_docs"
+
+    # Книга выгрузки списков проектов и документов (journal/export.py)
+    EXPORT_PATH = r"\\192.168.1.98\01 табели\02 Журнал\Выгрузка проектов АДОМАТ.xlsx"
+
+    # Локальная папка для копии хвоста книги на время точечной перезаписи листов
+    PATCH_BACKUP_FOLDER = os.path.join(os.path.expanduser("~"), ".pmis", "xlsx_backup")
+
+
+# ===========================
+# 🔎 Полнотекстовый индекс
+# ===========================
+class ContentSettings:
+    # Расширения файлов, из которых извлекается текст
+    EXTENSIONS = (".docx", ".docm", ".dotx", ".xlsx", ".xlsm")
+
+    # Предельное время извлечения текста из одного файла, секунд
+    FILE_TIMEOUT = 30
+
+    # Сколько символов текста одного файла попадает в индекс
+    MAX_CHARS = 2_000_000
+
+    # Число процессов извлечения (None — по числу ядер)
+    WORKERS = None
+
+
+# ===========================
+# 📑 Шаблоны проектов
+# ===========================
+class TemplateSettings:
+    # Сетевая библиотека шаблонов
+    LIBRARY_FOLDER = r"\\192.168.1.98\02 Library\00 Шаблоны"
+
+    # Локальный кэш-зеркало шаблонов
+    CACHE_FOLDER = os.path.join(os.path.expanduser("~"), ".pmis", "template_cache")
+
+    # Предельный объём кэша на диске, байт
+    CACHE_BUDGET = 5 * 1024 ** 3
+
+    # Сколько секунд считать кэш свежим без проверки сетевой папки
+    CACHE_MAX_AGE = 60
+
+    # Поле для подстановки в шаблонах Word: «{{ имя }}» (группа 1 — имя поля)
+    PLACEHOLDER_PATTERN = r"\{\{\s*([\w.]+)\s*\}\}"
+
+    # Число процессов рендера документов (None — по числу ядер)
+    RENDER_WORKERS = None
+
+    # Сколько разобранных шаблонов держать в памяти каждого процесса
+    RENDER_CACHE_SIZE = 64
+
+    # Шаблоны (папки внутри LIBRARY_FOLDER), которые обычно нужны проекту данного типа:
+    # {"НОВОЕ СУДНО": ["<папка шаблона>", ...]}. В proj_templates связи шаблона с типом
+    # проекта нет, поэтому по умолчанию пусто — prefetch грузит только явно переданные пути.
+    PROJECT_TYPE_TEMPLATES = {}
+
+
+# ===========================
+# 🧾 Логирование
+# ===========================
+class LogSettings:
+    # Размер файла app.html до ротации, байт, и число архивных файлов
+    MAX_BYTES = 5 * 1024 * 1024
+    BACKUP_COUNT = 5
+
+    # Писать app.html из фонового потока пачками (False — запись на каждую строку, как раньше)
+    ASYNC = True
+
+    # Пачка сбрасывается на диск, когда набралось столько записей...
+    BATCH_SIZE = 256
+
+    # ...или прошло столько секунд с первой несброшенной записи...
+    FLUSH_INTERVAL = 0.5
+
+    # ...или пришла запись этого уровня и выше
+    FLUSH_LEVEL = "WARNING"
+
+    # Структурированный лог: JSON-строки в logs/app.jsonl (см. utils/log_index.py)
+    JSON = True
+    JSON_FILE = "app.jsonl"
+    JSON_MAX_BYTES = 10 * 1024 * 1024
+    JSON_BACKUP_COUNT = 20
+
+    # Индекс JSON-логов для запросов (внутри папки логов)
+    INDEX_FILE = "logs.sqlite3"
+
+
+# ===========================
+# 🔬 Профилирование
+# ===========================
+class ProfileSettings:
+    # Режим: "cpu" (cProfile), "sample" (сэмплирование стека), "mem" (tracemalloc), "" — выключено.
+    # Задаётся переменной окружения PMIS_PROFILE или флагом --profile в pmis/main.py
+    MODE = os.environ.get("PMIS_PROFILE", "").strip().lower()
+
+    # Папка отчётов внутри папки логов
+    FOLDER = "profile"
+
+    # Участки короче этого (секунд) не сохраняются — чтобы каждый клик не давал файлов
+    MIN_DURATION = 0.05
+
+    # Период сэмплирования стека, секунд
+    SAMPLE_INTERVAL = 0.005
+
+    # Глубина трассировки выделений памяти (tracemalloc)
+    MEM_FRAMES = 25
+
+    # Сколько строк в текстовых отчётах
+    TOP = 40
@@ -1,6 +1,7 @@
 # db_init/catalogs/models.py
 # Определение ORM-моделей и Declarative Base 📦
 
+from datetime import datetime
 from db_init.base import Base
 from sqlalchemy import  Column, Integer, String, Text, Boolean, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
@@ -70,8 +71,8 @@ class Customer(Base):
     created_at: datetime = Column(DateTime, default=datetime.utcnow, nullable=False, comment="Дата создания")
     updated_at: datetime = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False, comment="Дата последнего изменения")
 
-    # связь с проектами (если нужно)
-    projects = relationship("ProjectBase", back_populates="customer")
+    # связь с проектами появится вместе с project_base.customer_id: без внешнего ключа
+    # relationship("ProjectBase") не настраивается и ломает все мапперы Base
 
     def __repr__(self) -> str:
         return f"<Customer(id={self.id}, name={self.name})>"
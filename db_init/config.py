@@ -1,7 +1,15 @@
 # db_init/config.py
 # 📦 Статические настройки проекта
 
+import os
+
 # URL подключения к SQLite БД (файл)
 DATABASE_URL: str = "sqlite:///./adomat_db.sqlite3?timeout=30"
 # Логирование SQL-запросов (для SQLAlchemy echo)
 ECHO_SQL: bool = False
+# Замер SQL-запросов (db_init/sql_profiler.py); включается и переменной окружения PMIS_PROFILE_SQL=1
+PROFILE_SQL: bool = os.environ.get("PMIS_PROFILE_SQL", "") not in ("", "0")
+# Порог медленного запроса, мс: такие запросы пишутся в лог вместе с EXPLAIN QUERY PLAN
+SLOW_QUERY_MS: float = float(os.environ.get("PMIS_SLOW_QUERY_MS", 100))
+# Файл отчёта о запросах в папке логов (пишется при выходе)
+SQL_REPORT_FILE: str = "sql_report.txt"
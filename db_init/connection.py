@@ -4,7 +4,7 @@
 from sqlalchemy import create_engine
 from sqlalchemy.engine import Engine
 from utils.logger import LoggerManager
-from db_init.config import DATABASE_URL, ECHO_SQL  # Статические настройки проекта
+from db_init.config import DATABASE_URL, ECHO_SQL, PROFILE_SQL  # Статические настройки проекта
 
 # Получаем логгер для модуля
 logger = LoggerManager(__name__).get_logger()
@@ -23,5 +23,9 @@ def get_engine(db_url: str = DATABASE_URL) -> Engine:
         echo=ECHO_SQL,
         future=True,
     )
+    if PROFILE_SQL:
+        # слушатели вешаются только здесь: без PROFILE_SQL замер ничего не стоит
+        from db_init.sql_profiler import SqlProfiler
+        SqlProfiler.shared().attach(engine)
     logger.info("✅ Engine успешно создан")
     return engine
@@ -0,0 +1,369 @@
+# db_init/documents/crud_documents.py
+# Реализация CRUD для индекса документов 🔧
+
+import os
+from typing import Type, TypeVar, Generic, Optional, List, Dict, Iterable, Iterator
+from sqlalchemy import select, delete, insert, update, and_, or_, literal, func, text, String
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import NoResultFound
+
+import db_init.documents.models_documents as model
+
+# Определяем обобщённый тип модели
+ModelType = TypeVar('ModelType', bound=model.Base)
+
+# Максимальное число параметров в одном IN (...) для SQLite
+SQLITE_IN_CHUNK: int = 500
+
+
+# базовый репозиторий
+class BaseRepository(Generic[ModelType]):
+    """
+    Базовый репозиторий для общих операций CRUD.
+    :param model: класс модели SQLAlchemy
+    :param session: активная сессия SQLAlchemy
+    """
+    def __init__(self, model: Type[ModelType], session: Session) -> None:
+        self.model = model
+        self.session = session
+
+    def get_all(self) -> List[ModelType]:
+        """Возвращает все записи из таблицы модели"""
+        stmt = select(self.model).order_by(self.model.id)
+        result = self.session.scalars(stmt)
+        return result.all()
+
+    def get_by_id(self, id_: int) -> Optional[ModelType]:
+        """Возвращает запись по первичному ключу или None"""
+        return self.session.get(self.model, id_)
+
+    def get_by_field(self, field_name: str, value) -> Optional[ModelType]:
+        """Возвращает одну запись по значению указанного поля или None"""
+        stmt = select(self.model).filter_by(**{field_name: value})
+        try:
+            return self.session.scalars(stmt).one()
+        except NoResultFound:
+            return None
+
+    def create(self, **kwargs) -> ModelType:
+        """
+        Создаёт и возвращает новую запись.
+        """
+        instance = self.model(**kwargs)
+        self.session.add(instance)
+        self.session.flush()
+        return instance
+
+    def update(self, instance: ModelType, **kwargs) -> ModelType:
+        """Обновляет поля у переданного экземпляра и возвращает его"""
+        for k, v in kwargs.items():
+            setattr(instance, k, v)
+        self.session.flush()
+        return instance
+
+    def delete(self, instance: ModelType) -> None:
+        """Удаляет переданный экземпляр из базы"""
+        self.session.delete(instance)
+        self.session.flush()
+
+    def get_or_create(self, unique_field: str, value, **kwargs) -> ModelType:
+        """
+        Создаёт или обновляет запись по уникальному полю.
+        :param unique_field: имя поля с уникальным ограничением
+        :param value: значение уникального поля для поиска
+        :param kwargs: дополнительные поля для создания или обновления
+        :return: объект модели
+        """
+        existing = self.get_by_field(unique_field, value)
+        if existing:
+            # Удаляем из kwargs те ключи, где значение None, чтобы не затирать существующие значения
+            update_fields = {k: v for k, v in kwargs.items() if v is not None}
+            return self.update(existing, **update_fields)
+        return self.create(**{unique_field: value}, **kwargs)
+
+
+# кэш хэшей файлов
+class FileHashRepository(BaseRepository[model.FileHash]):
+    """Репозиторий для работы с FileHash"""
+
+    def __init__(self, session: Session) -> None:
+        super().__init__(model.FileHash, session)
+
+    def get_by_path(self, path: str) -> Optional[model.FileHash]:
+        return self.get_by_field('path', path)
+
+    def get_cached(self, paths: Iterable[str]) -> Dict[str, tuple]:
+        """
+        Возвращает закэшированные хэши пачкой.
+
+        :param paths: пути к файлам
+        :return: словарь path -> (size, mtime_ns, partial_hash, full_hash)
+        """
+        table = self.model.__table__
+        paths = list(paths)
+        cached: Dict[str, tuple] = {}
+        for i in range(0, len(paths), SQLITE_IN_CHUNK):
+            stmt = select(
+                table.c.path, table.c.size, table.c.mtime_ns, table.c.partial_hash, table.c.full_hash
+            ).where(table.c.path.in_(paths[i:i + SQLITE_IN_CHUNK]))
+            for path, size, mtime_ns, partial, full in self.session.execute(stmt):
+                cached[path] = (size, mtime_ns, partial, full)
+        return cached
+
+    def upsert_many(self, rows: List[dict]) -> None:
+        """
+        Вставляет или обновляет записи кэша одним bulk-запросом.
+
+        :param rows: словари с ключами path, size, mtime_ns, partial_hash, full_hash
+        """
+        if not rows:
+            return
+        stmt = sqlite_insert(self.model.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['path'],
+            set_={
+                'size': stmt.excluded.size,
+                'mtime_ns': stmt.excluded.mtime_ns,
+                'partial_hash': stmt.excluded.partial_hash,
+                'full_hash': stmt.excluded.full_hash,
+                'checked_at': stmt.excluded.checked_at,
+            }
+        )
+        self.session.execute(stmt, rows)
+
+
+# группы дубликатов
+class DuplicateRepository(BaseRepository[model.DuplicateGroup]):
+    """Репозиторий для работы с DuplicateGroup и DuplicateFile"""
+
+    def __init__(self, session: Session) -> None:
+        super().__init__(model.DuplicateGroup, session)
+
+    def replace_all(self, groups: List[dict]) -> None:
+        """
+        Полностью заменяет сохранённые группы дубликатов результатом нового поиска.
+
+        :param groups: словари с ключами full_hash, size, files: [(path, mtime_ns), ...]
+        """
+        self.session.execute(delete(model.DuplicateFile))
+        self.session.execute(delete(model.DuplicateGroup))
+        if not groups:
+            return
+
+        group_rows = [
+            {
+                'full_hash': g['full_hash'],
+                'size': g['size'],
+                'file_count': len(g['files']),
+                'wasted_bytes': g['size'] * (len(g['files']) - 1),
+            }
+            for g in groups
+        ]
+        self.session.execute(insert(model.DuplicateGroup), group_rows)
+
+        # id групп получаем одним запросом, а не по одному на вставку
+        ids = dict(self.session.execute(select(model.DuplicateGroup.full_hash, model.DuplicateGroup.id)).all())
+        file_rows = []
+        for g in groups:
+            newest = max(mtime for _, mtime in g['files'])
+            for path, mtime_ns in g['files']:
+                file_rows.append({
+                    'group_id': ids[g['full_hash']],
+                    'path': path,
+                    'mtime_ns': mtime_ns,
+                    'is_newest': mtime_ns == newest,
+                })
+        self.session.execute(insert(model.DuplicateFile), file_rows)
+
+
+# индекс документов
+class DocumentRepository(BaseRepository[model.Document]):
+    """Репозиторий для работы с Document"""
+
+    def __init__(self, session: Session) -> None:
+        super().__init__(model.Document, session)
+
+    def get_by_path(self, path: str) -> Optional[model.Document]:
+        return self.get_by_field('path', path)
+
+    @staticmethod
+    def _subtree(column, path: str, sep: str = os.sep):
+        """
+        Условие «всё внутри папки path» в виде диапазона строк — использует индекс, в отличие от LIKE.
+        """
+        prefix = path.rstrip(sep) + sep
+        return and_(column > prefix, column < prefix[:-1] + chr(ord(sep) + 1))
+
+    def upsert_many(self, rows: List[dict]) -> None:
+        """
+        Вставляет или обновляет записи индекса одним bulk-запросом.
+
+        :param rows: словари с ключами path, root, parent, name, ext, is_dir, size, mtime_ns
+        """
+        if not rows:
+            return
+        stmt = sqlite_insert(self.model.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['path'],
+            set_={
+                'root': stmt.excluded.root,
+                'parent': stmt.excluded.parent,
+                'name': stmt.excluded.name,
+                'ext': stmt.excluded.ext,
+                'is_dir': stmt.excluded.is_dir,
+                'size': stmt.excluded.size,
+                'mtime_ns': stmt.excluded.mtime_ns,
+                'indexed_at': stmt.excluded.indexed_at,
+            }
+        )
+        self.session.execute(stmt, rows)
+
+    def delete_paths(self, paths: Iterable[str], sep: str = os.sep) -> int:
+        """
+        Удаляет записи вместе со всем содержимым удалённых папок.
+
+        :return: число удалённых записей
+        """
+        table = self.model.__table__
+        deleted = 0
+        for path in paths:
+            stmt = delete(table).where(or_(table.c.path == path, self._subtree(table.c.path, path, sep)))
+            deleted += self.session.execute(stmt).rowcount
+        return deleted
+
+    def move(self, src: str, dst: str, sep: str = os.sep) -> None:
+        """
+        Переносит запись и всё её содержимое на новый путь без повторного обхода диска.
+        """
+        table = self.model.__table__
+        self.delete_paths([dst], sep)
+        tail = len(src) + 1
+        self.session.execute(
+            update(table)
+            .where(self._subtree(table.c.path, src, sep))
+            .values(
+                path=literal(dst).concat(func.substr(table.c.path, tail, type_=String)),
+                parent=literal(dst).concat(func.substr(table.c.parent, tail, type_=String)),
+            )
+        )
+        name = os.path.basename(dst)
+        self.session.execute(
+            update(table)
+            .where(table.c.path == src)
+            .values(
+                path=dst,
+                parent=os.path.dirname(dst),
+                name=name,
+                ext=os.path.splitext(name)[1].lower(),
+            )
+        )
+
+    def delete_missing(self, root: str, seen: set) -> int:
+        """
+        Удаляет записи корня root, которых не оказалось при последнем обходе.
+
+        :return: число удалённых записей
+        """
+        table = self.model.__table__
+        stale = [
+            path for (path,) in self.session.execute(select(table.c.path).where(table.c.root == root))
+            if path not in seen
+        ]
+        for i in range(0, len(stale), SQLITE_IN_CHUNK):
+            self.session.execute(delete(table).where(table.c.path.in_(stale[i:i + SQLITE_IN_CHUNK])))
+        return len(stale)
+
+    def iter_tree(self, root: str) -> Iterator[tuple]:
+        """
+        Отдаёт записи корня для построения снимка без обхода диска.
+
+        :return: итератор (path, parent, name, is_dir, size, mtime_ns)
+        """
+        table = self.model.__table__
+        stmt = select(
+            table.c.path, table.c.parent, table.c.name, table.c.is_dir, table.c.size, table.c.mtime_ns
+        ).where(table.c.root == root)
+        yield from self.session.execute(stmt)
+
+
+# извлечённый текст документов
+class DocumentContentRepository(BaseRepository[model.DocumentContent]):
+    """Репозиторий для DocumentContent и FTS5-таблицы document_fts"""
+
+    def __init__(self, session: Session) -> None:
+        super().__init__(model.DocumentContent, session)
+
+    def get_states(self, root: Optional[str] = None) -> Dict[str, tuple]:
+        """Сохранённые состояния: path -> (id, size, mtime_ns, status)"""
+        table = self.model.__table__
+        stmt = select(table.c.path, table.c.id, table.c.size, table.c.mtime_ns, table.c.status)
+        if root is not None:
+            stmt = stmt.where(table.c.root == root)
+        return {path: (id_, size, mtime_ns, status) for path, id_, size, mtime_ns, status in self.session.execute(stmt)}
+
+    def save(self, row: dict, text_: str) -> None:
+        """
+        Записывает результат извлечения и заменяет текст файла в полнотекстовом индексе.
+
+        :param row: path, root, project, size, mtime_ns, chars, status, error
+        :param text_: извлечённый текст
+        """
+        stmt = sqlite_insert(self.model.__table__).values(**row, extracted_at=func.now())
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['path'],
+            set_={k: stmt.excluded[k] for k in ('root', 'project', 'size', 'mtime_ns', 'chars', 'status', 'error',
+                                                 'extracted_at')},
+        ).returning(self.model.__table__.c.id)
+        id_ = self.session.execute(stmt).scalar_one()
+        self.session.execute(text("DELETE FROM document_fts WHERE rowid = :id"), {'id': id_})
+        if text_:
+            self.session.execute(
+                text("INSERT INTO document_fts (rowid, name, body) VALUES (:id, :name, :body)"),
+                {'id': id_, 'name': os.path.basename(row['path']), 'body': text_},
+            )
+
+    def delete_paths(self, paths: Iterable[str]) -> int:
+        """Удаляет записи и их текст из индекса. Возвращает число удалённых"""
+        table = self.model.__table__
+        paths = list(paths)
+        deleted = 0
+        for i in range(0, len(paths), SQLITE_IN_CHUNK):
+            chunk = paths[i:i + SQLITE_IN_CHUNK]
+            ids = [id_ for (id_,) in self.session.execute(select(table.c.id).where(table.c.path.in_(chunk)))]
+            if ids:
+                self.session.execute(text("DELETE FROM document_fts WHERE rowid = :id"), [{'id': x} for x in ids])
+                deleted += self.session.execute(delete(table).where(table.c.id.in_(ids))).rowcount
+        return deleted
+
+    def search(
+        self,
+        match: str,
+        project: Optional[str] = None,
+        root: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> List[dict]:
+        """
+        Полнотекстовый поиск: лучшие по bm25 (совпадение в имени весит больше), с фрагментом текста.
+
+        :param match: выражение FTS5 MATCH
+        :param project: только папка проекта
+        :param root: только корень индекса
+        """
+        sql = (
+            "SELECT c.path, c.project, c.root, c.size, c.mtime_ns, "
+            "snippet(document_fts, 1, '[', ']', '…', 16) AS snippet, "
+            "bm25(document_fts, 4.0, 1.0) AS rank "
+            "FROM document_fts JOIN document_contents c ON c.id = document_fts.rowid "
+            "WHERE document_fts MATCH :match"
+        )
+        params = {'match': match, 'limit': limit, 'offset': offset}
+        if project is not None:
+            sql += " AND c.project = :project"
+            params['project'] = project
+        if root is not None:
+            sql += " AND c.root = :root"
+            params['root'] = root
+        sql += " ORDER BY rank LIMIT :limit OFFSET :offset"
+        return [dict(r._mapping) for r in self.session.execute(text(sql), params)]
@@ -0,0 +1,43 @@
+# db_init/documents/init_documents.py
+
+from db_init.documents.models_documents import Base
+from db_init.config import DATABASE_URL
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from utils.logger import LoggerManager
+
+
+class DBInitDocuments:
+    """
+    Инициализирует таблицы индекса документов.
+    """
+
+    def __init__(self, db_url: str = DATABASE_URL) -> None:
+        self.logger = LoggerManager(__name__).get_logger()
+        self.db_url: str = db_url
+        self.engine: Engine | None = None
+        self.logger.info(f"🚀 DBInitDocuments создан с URL={self.db_url}")
+
+    def get_engine(self) -> Engine:
+        if self.engine is None:
+            self.engine = create_engine(
+                self.db_url,
+                connect_args={"check_same_thread": False},
+                future=True,
+            )
+            self.logger.info(f"🔌 Engine создан для SQLite: {self.db_url}")
+        return self.engine
+
+    def create_tables(self) -> None:
+        engine = self.get_engine()
+        Base.metadata.create_all(engine)
+        self.logger.info("📦 Таблицы индекса документов успешно созданы")
+
+    def run(self) -> None:
+        self.logger.info("🏁 Запуск инициализации индекса документов...")
+        self.create_tables()
+        self.logger.info("🎉 Индекс документов успешно инициализирован")
+
+
+if __name__ == "__main__":
+    DBInitDocuments().run()
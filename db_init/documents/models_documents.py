@@ -0,0 +1,116 @@
+# db_init/documents/models_documents.py
+# ORM-модели индекса документов: кэш хэшей и группы дубликатов 📦
+
+from db_init.base import Base
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, DateTime, ForeignKey, DDL, event, func
+from sqlalchemy.orm import relationship
+
+
+# кэш хэшей файлов
+class FileHash(Base):
+    """
+    Кэш хэшей файлов. Запись действительна, пока совпадают (path, size, mtime_ns).
+    """
+    __tablename__ = 'file_hashes'
+
+    id: int = Column(Integer, primary_key=True, autoincrement=True)
+    path: str = Column(String(1024), nullable=False, unique=True, comment="Полный путь к файлу")
+    size: int = Column(BigInteger, nullable=False, comment="Размер файла, байт")
+    mtime_ns: int = Column(BigInteger, nullable=False, comment="Время изменения файла, нс")
+    partial_hash: str = Column(String(64), nullable=True, comment="Хэш первого и последнего блоков")
+    full_hash: str = Column(String(64), nullable=True, index=True, comment="Хэш всего содержимого")
+    checked_at = Column(DateTime, server_default=func.now(), nullable=False, comment="Дата последней проверки")
+
+    def __repr__(self) -> str:
+        return f"<FileHash(id={self.id}, path={self.path}, size={self.size})>"
+
+# группа дубликатов
+class DuplicateGroup(Base):
+    """
+    Группа файлов с одинаковым содержимым.
+    """
+    __tablename__ = 'duplicate_groups'
+
+    id: int = Column(Integer, primary_key=True, autoincrement=True)
+    full_hash: str = Column(String(64), nullable=False, unique=True, comment="Хэш содержимого")
+    size: int = Column(BigInteger, nullable=False, comment="Размер одного экземпляра, байт")
+    file_count: int = Column(Integer, nullable=False, comment="Количество копий")
+    wasted_bytes: int = Column(BigInteger, nullable=False, comment="Лишний объём, байт")
+    found_at = Column(DateTime, server_default=func.now(), nullable=False, comment="Дата обнаружения")
+
+    files = relationship("DuplicateFile", back_populates="group", cascade="all, delete-orphan")
+
+    def __repr__(self) -> str:
+        return f"<DuplicateGroup(id={self.id}, file_count={self.file_count}, size={self.size})>"
+
+# файл из группы дубликатов
+class DuplicateFile(Base):
+    """
+    Экземпляр файла внутри группы дубликатов.
+    """
+    __tablename__ = 'duplicate_files'
+
+    id: int = Column(Integer, primary_key=True, autoincrement=True)
+    group_id: int = Column(Integer, ForeignKey('duplicate_groups.id', ondelete="CASCADE"), nullable=False, index=True)
+    path: str = Column(String(1024), nullable=False, comment="Полный путь к файлу")
+    mtime_ns: int = Column(BigInteger, nullable=False, comment="Время изменения файла, нс")
+    is_newest: bool = Column(Boolean, nullable=False, default=False, comment="Самая свежая копия в группе")
+
+    group = relationship("DuplicateGroup", back_populates="files")
+
+    def __repr__(self) -> str:
+        return f"<DuplicateFile(id={self.id}, path={self.path})>"
+
+# документ (файл или папка) в индексе
+class Document(Base):
+    """
+    Индекс файлов и папок в PROJECT_FOLDER и ARCHIVE_FOLDER.
+    """
+    __tablename__ = 'documents'
+
+    id: int = Column(Integer, primary_key=True, autoincrement=True)
+    path: str = Column(String(1024), nullable=False, unique=True, comment="Полный путь")
+    root: str = Column(String(1024), nullable=False, comment="Корневая папка индекса")
+    parent: str = Column(String(1024), nullable=False, index=True, comment="Путь к родительской папке")
+    name: str = Column(String(255), nullable=False, comment="Имя файла или папки")
+    ext: str = Column(String(20), nullable=False, default="", comment="Расширение в нижнем регистре")
+    is_dir: bool = Column(Boolean, nullable=False, default=False, comment="Это папка")
+    size: int = Column(BigInteger, nullable=False, default=0, comment="Размер, байт")
+    mtime_ns: int = Column(BigInteger, nullable=False, comment="Время изменения, нс")
+    indexed_at = Column(DateTime, server_default=func.now(), nullable=False, comment="Дата индексации")
+
+    def __repr__(self) -> str:
+        return f"<Document(id={self.id}, path={self.path})>"
+
+# извлечённый текст документа
+class DocumentContent(Base):
+    """
+    Состояние извлечения текста из файла .docx/.xlsx. Сам текст лежит в FTS5-таблице
+    document_fts (rowid = id); запись действительна, пока совпадают (size, mtime_ns).
+    """
+    __tablename__ = 'document_contents'
+
+    id: int = Column(Integer, primary_key=True, autoincrement=True)
+    path: str = Column(String(1024), nullable=False, unique=True, comment="Полный путь к файлу")
+    root: str = Column(String(1024), nullable=False, index=True, comment="Корневая папка индекса")
+    project: str = Column(String(255), nullable=False, default="", index=True, comment="Папка проекта")
+    size: int = Column(BigInteger, nullable=False, comment="Размер файла, байт")
+    mtime_ns: int = Column(BigInteger, nullable=False, comment="Время изменения файла, нс")
+    chars: int = Column(Integer, nullable=False, default=0, comment="Извлечено символов")
+    status: str = Column(String(20), nullable=False, comment="ok / empty / error / timeout")
+    error: str = Column(String(1024), nullable=True, comment="Текст ошибки извлечения")
+    extracted_at = Column(DateTime, server_default=func.now(), nullable=False, comment="Дата извлечения")
+
+    def __repr__(self) -> str:
+        return f"<DocumentContent(id={self.id}, path={self.path}, status={self.status})>"
+
+
+# полнотекстовый индекс: имя файла и текст, ранжирование bm25
+event.listen(
+    DocumentContent.__table__, "after_create",
+    DDL(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS document_fts USING fts5("
+        "name, body, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+    ),
+)
+event.listen(DocumentContent.__table__, "before_drop", DDL("DROP TABLE IF EXISTS document_fts"))
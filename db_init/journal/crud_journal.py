@@ -0,0 +1,172 @@
+# db_init/journal/crud_journal.py
+# Реализация CRUD для копии журнала учёта документации 🔧
+
+from datetime import datetime
+from typing import Type, TypeVar, Generic, Optional, List, Dict, Iterable
+from sqlalchemy import select, delete, insert, update, bindparam, text
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import NoResultFound
+
+import db_init.journal.models_journal as model
+
+# Определяем обобщённый тип модели
+ModelType = TypeVar('ModelType', bound=model.Base)
+
+# Максимальное число параметров в одном IN (...) для SQLite
+SQLITE_IN_CHUNK: int = 500
+
+
+# базовый репозиторий
+class BaseRepository(Generic[ModelType]):
+    """
+    Базовый репозиторий для общих операций CRUD.
+    :param model: класс модели SQLAlchemy
+    :param session: активная сессия SQLAlchemy
+    """
+    def __init__(self, model: Type[ModelType], session: Session) -> None:
+        self.model = model
+        self.session = session
+
+    def get_all(self) -> List[ModelType]:
+        """Возвращает все записи из таблицы модели"""
+        stmt = select(self.model).order_by(self.model.id)
+        result = self.session.scalars(stmt)
+        return result.all()
+
+    def get_by_id(self, id_: int) -> Optional[ModelType]:
+        """Возвращает запись по первичному ключу или None"""
+        return self.session.get(self.model, id_)
+
+    def get_by_field(self, field_name: str, value) -> Optional[ModelType]:
+        """Возвращает одну запись по значению указанного поля или None"""
+        stmt = select(self.model).filter_by(**{field_name: value})
+        try:
+            return self.session.scalars(stmt).one()
+        except NoResultFound:
+            return None
+
+    def create(self, **kwargs) -> ModelType:
+        """
+        Создаёт и возвращает новую запись.
+        """
+        instance = self.model(**kwargs)
+        self.session.add(instance)
+        self.session.flush()
+        return instance
+
+    def update(self, instance: ModelType, **kwargs) -> ModelType:
+        """Обновляет поля у переданного экземпляра и возвращает его"""
+        for k, v in kwargs.items():
+            setattr(instance, k, v)
+        self.session.flush()
+        return instance
+
+    def delete(self, instance: ModelType) -> None:
+        """Удаляет переданный экземпляр из базы"""
+        self.session.delete(instance)
+        self.session.flush()
+
+
+# строки ведомости документов
+class JournalDocumentRepository(BaseRepository[model.JournalDocument]):
+    """Репозиторий для работы с JournalDocument"""
+
+    def __init__(self, session: Session) -> None:
+        super().__init__(model.JournalDocument, session)
+
+    def get_by_doc_number(self, doc_number: str) -> List[model.JournalDocument]:
+        stmt = select(self.model).where(self.model.doc_number == doc_number).order_by(self.model.row_num)
+        return list(self.session.scalars(stmt))
+
+    def get_row_nums(self) -> Dict[str, int]:
+        """Все сохранённые хэши строк: row_hash -> row_num"""
+        table = self.model.__table__
+        return dict(self.session.execute(select(table.c.row_hash, table.c.row_num)).all())
+
+    def insert_many(self, rows: List[dict]) -> None:
+        """Вставляет строки одним bulk-запросом"""
+        if rows:
+            self.session.execute(insert(self.model.__table__), rows)
+
+    def delete_hashes(self, hashes: Iterable[str]) -> None:
+        """Удаляет строки по хэшам пачками"""
+        table = self.model.__table__
+        hashes = list(hashes)
+        for i in range(0, len(hashes), SQLITE_IN_CHUNK):
+            self.session.execute(delete(table).where(table.c.row_hash.in_(hashes[i:i + SQLITE_IN_CHUNK])))
+
+    def update_row_nums(self, moved: Dict[str, int]) -> None:
+        """Обновляет номера строк, сдвинувшихся на листе (содержимое не менялось)"""
+        if not moved:
+            return
+        table = self.model.__table__
+        stmt = update(table).where(table.c.row_hash == bindparam('h')).values(row_num=bindparam('n'))
+        self.session.connection().execute(stmt, [{'h': h, 'n': n} for h, n in moved.items()])
+
+
+# состояние выгрузки листов
+class ExportStateRepository(BaseRepository[model.ExportWatermark]):
+    """
+    Репозиторий отметок выгрузки и снимков строк.
+    Текущие строки листа складываются во временную таблицу export_stage,
+    после чего diff со снимком и его обновление делаются SQL-запросами целиком на стороне SQLite.
+    """
+
+    def __init__(self, session: Session) -> None:
+        super().__init__(model.ExportWatermark, session)
+
+    def get_watermark(self, book: str, sheet: str) -> Optional[model.ExportWatermark]:
+        stmt = select(self.model).where(self.model.book == book, self.model.sheet == sheet)
+        return self.session.scalars(stmt).one_or_none()
+
+    def ensure_watermark(self, book: str, sheet: str, now: datetime) -> model.ExportWatermark:
+        """Возвращает отметку листа, создавая пустую при первой выгрузке"""
+        return self.get_watermark(book, sheet) or self.create(
+            book=book, sheet=sheet, rows=0, digest="", exported_at=now, checked_at=now
+        )
+
+    def stage_begin(self) -> None:
+        """Создаёт (или очищает) временную таблицу текущих строк листа"""
+        self.session.execute(text(
+            "CREATE TEMP TABLE IF NOT EXISTS export_stage (row_key TEXT PRIMARY KEY, row_hash TEXT NOT NULL)"
+        ))
+        self.session.execute(text("DELETE FROM export_stage"))
+
+    def stage_add(self, rows: List[tuple]) -> None:
+        """Добавляет пачку (ключ, хэш) во временную таблицу"""
+        if rows:
+            self.session.execute(
+                text("INSERT OR REPLACE INTO export_stage (row_key, row_hash) VALUES (:k, :h)"),
+                [{'k': k, 'h': h} for k, h in rows],
+            )
+
+    def stage_diff(self, watermark_id: int) -> Dict[str, int]:
+        """Построчный diff временной таблицы со снимком: added, changed, removed"""
+        params = {'w': watermark_id}
+        added = self.session.execute(text(
+            "SELECT count(*) FROM export_stage s WHERE NOT EXISTS ("
+            "SELECT 1 FROM journal_export_rows e WHERE e.watermark_id = :w AND e.row_key = s.row_key)"
+        ), params).scalar()
+        changed = self.session.execute(text(
+            "SELECT count(*) FROM export_stage s JOIN journal_export_rows e "
+            "ON e.watermark_id = :w AND e.row_key = s.row_key WHERE e.row_hash <> s.row_hash"
+        ), params).scalar()
+        removed = self.session.execute(text(
+            "SELECT count(*) FROM journal_export_rows e WHERE e.watermark_id = :w AND NOT EXISTS ("
+            "SELECT 1 FROM export_stage s WHERE s.row_key = e.row_key)"
+        ), params).scalar()
+        return {'added': added, 'changed': changed, 'removed': removed}
+
+    def stage_apply(self, watermark_id: int) -> None:
+        """Приводит снимок строк к содержимому временной таблицы"""
+        params = {'w': watermark_id}
+        self.session.execute(text(
+            "DELETE FROM journal_export_rows WHERE watermark_id = :w "
+            "AND row_key NOT IN (SELECT row_key FROM export_stage)"
+        ), params)
+        self.session.execute(text(
+            "INSERT INTO journal_export_rows (watermark_id, row_key, row_hash) "
+            "SELECT :w, row_key, row_hash FROM export_stage WHERE true "
+            "ON CONFLICT (watermark_id, row_key) DO UPDATE SET row_hash = excluded.row_hash "
+            "WHERE journal_export_rows.row_hash <> excluded.row_hash"
+        ), params)
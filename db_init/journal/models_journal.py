@@ -0,0 +1,66 @@
+# db_init/journal/models_journal.py
+# ORM-модели копии журнала учёта документации (лист «03 ВД») и состояния выгрузки 📦
+
+from db_init.base import Base
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, UniqueConstraint, func
+
+
+# строка ведомости документов
+class JournalDocument(Base):
+    """
+    Строка листа «03 ВД». Ключ синхронизации — хэш содержимого строки:
+    изменённая строка получает новый хэш и перезаписывается, неизменённые не трогаются.
+    """
+    __tablename__ = 'journal_documents'
+
+    id: int = Column(Integer, primary_key=True, autoincrement=True)
+    row_hash: str = Column(String(40), nullable=False, unique=True, comment="Хэш содержимого строки")
+    row_num: int = Column(Integer, nullable=False, comment="Номер строки на листе")
+    project: str = Column(String(255), nullable=True, index=True, comment="Проект")
+    doc_number: str = Column(String(100), nullable=True, index=True, comment="Номер документа")
+    doc_name: str = Column(String(1024), nullable=True, comment="Наименование документа")
+    revision: str = Column(String(50), nullable=True, comment="Изменение")
+    status: str = Column(String(100), nullable=True, comment="Статус")
+    issue_date = Column(Date, nullable=True, comment="Дата выпуска")
+    author: str = Column(String(255), nullable=True, comment="Исполнитель")
+    note: str = Column(String(1024), nullable=True, comment="Примечание")
+    synced_at = Column(DateTime, server_default=func.now(), nullable=False, comment="Дата синхронизации")
+
+    def __repr__(self) -> str:
+        return f"<JournalDocument(id={self.id}, row={self.row_num}, doc_number={self.doc_number})>"
+
+# отметка последней выгрузки листа
+class ExportWatermark(Base):
+    """
+    Состояние листа книги на момент последней выгрузки: по дайджесту видно,
+    нужно ли переписывать лист, а exported_at служит отметкой выгрузки.
+    """
+    __tablename__ = 'journal_export_watermarks'
+    __table_args__ = (UniqueConstraint('book', 'sheet', name='uq_export_book_sheet'),)
+
+    id: int = Column(Integer, primary_key=True, autoincrement=True)
+    book: str = Column(String(1024), nullable=False, comment="Путь к книге")
+    sheet: str = Column(String(100), nullable=False, comment="Имя листа")
+    rows: int = Column(Integer, nullable=False, default=0, comment="Строк данных на листе")
+    digest: str = Column(String(64), nullable=False, comment="Дайджест содержимого листа")
+    exported_at = Column(DateTime, nullable=False, comment="Дата последней записи листа")
+    checked_at = Column(DateTime, nullable=False, comment="Дата последней сверки")
+
+    def __repr__(self) -> str:
+        return f"<ExportWatermark(book={self.book}, sheet={self.sheet}, rows={self.rows})>"
+
+# строка последней выгрузки листа
+class ExportRow(Base):
+    """
+    Снимок выгруженной строки: ключ (путь) и хэш содержимого — основа построчного diff.
+    """
+    __tablename__ = 'journal_export_rows'
+    __table_args__ = (UniqueConstraint('watermark_id', 'row_key', name='uq_export_row_key'),)
+
+    id: int = Column(Integer, primary_key=True, autoincrement=True)
+    watermark_id: int = Column(Integer, ForeignKey('journal_export_watermarks.id', ondelete="CASCADE"), nullable=False)
+    row_key: str = Column(String(1024), nullable=False, comment="Ключ строки (путь)")
+    row_hash: str = Column(String(40), nullable=False, comment="Хэш содержимого строки")
+
+    def __repr__(self) -> str:
+        return f"<ExportRow(watermark_id={self.watermark_id}, row_key={self.row_key})>"
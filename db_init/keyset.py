@@ -0,0 +1,108 @@
+# db_init/keyset.py
+# Постраничное чтение любой таблицы по ключу (keyset), с сортировкой и фильтром на стороне SQL 📑
+#
+# Страница задаётся не смещением (OFFSET N читает и выбрасывает N строк), а последней
+# парой (значение сортировки, ключ) предыдущей страницы: WHERE (sort, id) > (:v, :id)
+# ORDER BY sort, id LIMIT n. С индексом по колонке сортировки любая страница стоит
+# одинаково, хоть первая, хоть тысячная. NULL идут первыми по возрастанию и последними
+# по убыванию — как в самом SQLite.
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, or_, select, func, tuple_, Table
+from sqlalchemy.orm import Session
+
+# Максимальное число параметров в одном IN (...) для SQLite
+SQLITE_IN_CHUNK: int = 500
+
+
+class KeysetRepository:
+    """
+    Репозиторий постраничного чтения. Работает и с ORM-моделью, и с таблицей Core.
+    :param model: класс модели SQLAlchemy или Table
+    :param session: активная сессия SQLAlchemy
+    :param key: уникальная непустая колонка — последний критерий порядка (обычно id)
+    """
+
+    def __init__(self, model, session: Session, key: str = "id") -> None:
+        self.table: Table = model if isinstance(model, Table) else model.__table__
+        self.session = session
+        self.key = self.table.c[key]
+
+    def column(self, name: str):
+        return self.table.c[name]
+
+    def conditions(self, search: Optional[str] = None, search_columns: Sequence[str] = (),
+                   equals: Optional[Dict[str, Any]] = None) -> list:
+        """
+        Условия фильтра: подстрока search в любой из search_columns и точные совпадения equals
+        (список или кортеж значений — IN).
+        """
+        where = []
+        if search:
+            where.append(or_(*(self.column(name).contains(search, autoescape=True) for name in search_columns)))
+        for name, value in (equals or {}).items():
+            column = self.column(name)
+            if isinstance(value, (list, tuple, set)):
+                where.append(column.in_(list(value)))
+            elif value is None:
+                where.append(column.is_(None))
+            else:
+                where.append(column == value)
+        return where
+
+    def _after(self, sort, after: Tuple[Any, Any], descending: bool):
+        """Условие «строго после (значение, ключ)» в порядке сортировки"""
+        value, key = after
+        if sort is None:
+            return self.key < key if descending else self.key > key
+        if descending:
+            if value is None:
+                return and_(sort.is_(None), self.key < key)
+            return or_(sort.is_(None), tuple_(sort, self.key) < tuple_(value, key))
+        if value is None:
+            return or_(and_(sort.is_(None), self.key > key), sort.is_not(None))
+        return tuple_(sort, self.key) > tuple_(value, key)
+
+    def page(self, columns: Sequence[str], after: Optional[Tuple[Any, Any]] = None, limit: int = 200,
+             sort: Optional[str] = None, descending: bool = False, **filters) -> List[tuple]:
+        """
+        Одна страница строк.
+
+        :param columns: колонки выборки (ключ и колонку сортировки добавлять не нужно)
+        :param after: (значение сортировки, ключ) последней строки предыдущей страницы; None — первая
+        :param sort: колонка сортировки; None — по ключу
+        :param filters: search, search_columns, equals — см. conditions()
+        :return: кортежи (ключ, значение сортировки, *columns)
+        """
+        sort_column = self.column(sort) if sort and sort != self.key.name else None
+        stmt = select(self.key, sort_column if sort_column is not None else self.key,
+                      *(self.column(name) for name in columns))
+        where = self.conditions(**filters)
+        if after is not None:
+            where.append(self._after(sort_column, after, descending))
+        if where:
+            stmt = stmt.where(*where)
+        order = [sort_column, self.key] if sort_column is not None else [self.key]
+        stmt = stmt.order_by(*(c.desc() if descending else c.asc() for c in order)).limit(limit)
+        return [tuple(row) for row in self.session.execute(stmt)]
+
+    def values(self, keys: Iterable[Any], columns: Sequence[str]) -> Dict[Any, tuple]:
+        """Значения columns для набора ключей — дочитывание «ленивых» колонок страницы"""
+        keys = list(keys)
+        result: Dict[Any, tuple] = {}
+        for i in range(0, len(keys), SQLITE_IN_CHUNK):
+            stmt = select(self.key, *(self.column(name) for name in columns)).where(
+                self.key.in_(keys[i:i + SQLITE_IN_CHUNK])
+            )
+            for key, *row in self.session.execute(stmt):
+                result[key] = tuple(row)
+        return result
+
+    def count(self, **filters) -> int:
+        """Число строк под фильтром"""
+        stmt = select(func.count()).select_from(self.table)
+        where = self.conditions(**filters)
+        if where:
+            stmt = stmt.where(*where)
+        return self.session.execute(stmt).scalar_one()
@@ -6,6 +6,8 @@ from sqlalchemy import Table, Column, Integer, String, Text, Boolean, DateTime,
 from sqlalchemy.orm import relationship
 from typing import Optional
 
+Base = declarative_base()
+
 
 # --- Ассоциативные таблицы для many-to-many ---
 user_departments = Table(
@@ -1,10 +1,12 @@
 # db_init/session.py
 # Настройка и создание SQLAlchemy Session 🎛️
 
+import sys
 from typing import Generator, Optional
 from sqlalchemy.orm import sessionmaker, Session
 from db_init.connection import get_engine
 from utils.logger import LoggerManager
+from utils.profiler import Profiler
 from contextlib import contextmanager
 
 # Инициализация логгера для модуля
@@ -29,6 +31,9 @@ def get_db() -> Generator[Session, None, None]:
         ...
     """
     db: Optional[Session] = None
+    profiler = Profiler.shared()
+    # единица работы — участок профилирования с именем вызывающей функции
+    section = profiler.begin(f"db.{sys._getframe(2).f_code.co_qualname}") if profiler.mode else None
     try:
         db = SessionLocal()
         logger.info("📂 New database session opened")
@@ -44,3 +49,4 @@ def get_db() -> Generator[Session, None, None]:
         if db:
             db.close()
             logger.info("🔒 Database session closed")
+        profiler.end(section)
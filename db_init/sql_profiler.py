@@ -0,0 +1,320 @@
+# db_init/sql_profiler.py
+# Замер SQL-запросов на уровне Engine: гистограммы по видам запросов, медленные запросы, отчёт ⏱️
+#
+# Слушатели before/after_cursor_execute и handle_error вешаются на Engine только при PROFILE_SQL,
+# поэтому в обычном режиме накладных расходов нет. Запросы группируются по «форме» —
+# тексту без литералов и с свёрнутыми IN (...) / VALUES (...), — и по месту вызова:
+# методу репозитория, из которого пришёл запрос.
+
+import os
+import re
+import sys
+import time
+import atexit
+import threading
+from types import CodeType
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from db_init.config import SLOW_QUERY_MS, SQL_REPORT_FILE
+from utils.logger import LoggerManager
+
+# Корзины гистограммы: i-я — время до 2**i мкс
+BUCKETS = 32
+# Сколько разных текстов запросов помнить для быстрой нормализации
+SHAPE_CACHE_SIZE = 10_000
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_ROWS = re.compile(r"(\(\?…\))(?:\s*,\s*\(\?…\))+")
+_SPACES = re.compile(r"\s+")
+_EXPLAINABLE = re.compile(r"\s*(?:SELECT|INSERT|UPDATE|DELETE|REPLACE|WITH)\b", re.I)
+
+
+def statement_shape(statement: str) -> str:
+    """Текст запроса без литералов: «IN (?, ?, ?)» -> «IN (?…)», многострочный VALUES — одной группой"""
+    shape = _STRING.sub("?", statement)
+    shape = _NUMBER.sub("?", shape)
+    shape = _IN_LIST.sub("(?…)", shape)
+    shape = _ROWS.sub(r"\1, …", shape)
+    return _SPACES.sub(" ", shape).strip()
+
+
+# Код стандартной библиотеки и SQLAlchemy пропускается при поиске места вызова
+_STDLIB = os.path.dirname(os.__file__)
+_SKIP, _APP = 0, 1
+# code -> (вид, класс, метод); классификация кода делается один раз
+_CODE_KINDS: Dict[CodeType, Tuple[int, str, str]] = {}
+
+
+def _classify(code: CodeType) -> Tuple[int, str, str]:
+    cls, _, method = code.co_qualname.rpartition(".")
+    if cls.endswith("Repository"):
+        return 2, cls, method
+    name = code.co_filename
+    if name.startswith("<") or name == __file__ or "sqlalchemy" in name or (
+            name.startswith(_STDLIB) and "site-packages" not in name):
+        return _SKIP, "", ""
+    return _APP, "", ""
+
+
+# (code, строка) -> подпись места вызова вне репозиториев
+_SITES: Dict[Tuple[CodeType, int], str] = {}
+
+
+def call_site(frame, depth: int = 60) -> str:
+    """
+    Метод репозитория, выполнивший запрос: «UserRepository.create_or_update_user → get_by_field».
+    Если репозитория в стеке нет — первая функция приложения вне SQLAlchemy и стандартной библиотеки.
+    """
+    kinds = _CODE_KINDS
+    outer = inner = None
+    fallback = None
+    while frame is not None and depth:
+        code = frame.f_code
+        kind = kinds.get(code)
+        if kind is None:
+            kind = kinds[code] = _classify(code)
+        if kind[0] == 2:
+            cls = kind[1]
+            if cls.startswith("Base"):
+                owner = frame.f_locals.get("self")
+                cls = type(owner).__name__ if owner is not None else cls
+            if inner is None:
+                inner = kind[2]
+            outer = (cls, kind[2])
+        elif outer is not None:
+            break
+        elif fallback is None and kind[0] == _APP:
+            fallback = frame
+        frame = frame.f_back
+        depth -= 1
+    if outer is not None:
+        cls, method = outer
+        return f"{cls}.{method}" if method == inner else f"{cls}.{method} → {inner}"
+    if fallback is None:
+        return "?"
+    key = (fallback.f_code, fallback.f_lineno)
+    site = _SITES.get(key)
+    if site is None:
+        site = _SITES[key] = f"{fallback.f_globals.get('__name__', '?')}.{key[0].co_qualname}:{key[1]}"
+    return site
+
+
+class _Stat:
+    """Счётчики одного вида запроса из одного места вызова"""
+    __slots__ = ("count", "errors", "total", "max", "buckets")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * BUCKETS
+
+    def add(self, elapsed: float) -> None:
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+        self.buckets[min(int(elapsed * 1e6).bit_length(), BUCKETS - 1)] += 1
+
+    def merge(self, other: "_Stat") -> None:
+        self.count += other.count
+        self.errors += other.errors
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        for i, n in enumerate(other.buckets):
+            self.buckets[i] += n
+
+    def percentile(self, p: float) -> float:
+        """Верхняя граница корзины, в которую попадает p-й перцентиль, секунд"""
+        rank = p * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank and n:
+                return min(2 ** i / 1e6, self.max)
+        return self.max
+
+
+class SqlProfiler:
+    """
+    Сборщик статистики SQL. Один на процесс, подключается к любому числу Engine.
+    """
+    _shared: Optional["SqlProfiler"] = None
+
+    def __init__(self, slow_ms: float = SLOW_QUERY_MS, report_path: Optional[str] = None) -> None:
+        """
+        :param slow_ms: порог медленного запроса, мс
+        :param report_path: файл отчёта при выходе (по умолчанию в папке логов)
+        """
+        self.logger = LoggerManager(__name__).get_logger()
+        self.slow = slow_ms / 1000
+        self.report_path = report_path or os.path.join(LoggerManager.get_log_dir(), SQL_REPORT_FILE)
+        self.stats: Dict[Tuple[str, str], _Stat] = {}
+        self._shapes: Dict[str, str] = {}
+        self._plans: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._engines: List[Engine] = []
+        self._started = time.time()
+        atexit.register(self.write_report)
+
+    @classmethod
+    def shared(cls) -> "SqlProfiler":
+        """Общий сборщик процесса"""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    # --- подключение ---
+
+    def attach(self, engine: Engine) -> Engine:
+        """Вешает слушатели на Engine"""
+        event.listen(engine, "before_cursor_execute", self._before)
+        event.listen(engine, "after_cursor_execute", self._after)
+        event.listen(engine, "handle_error", self._error)
+        self._engines.append(engine)
+        self.logger.info(f"⏱️ Замер SQL включён для {engine.url}, порог медленного запроса {self.slow * 1000:.0f} мс")
+        return engine
+
+    def detach(self, engine: Engine) -> None:
+        event.remove(engine, "before_cursor_execute", self._before)
+        event.remove(engine, "after_cursor_execute", self._after)
+        event.remove(engine, "handle_error", self._error)
+        self._engines.remove(engine)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stats.clear()
+            self._started = time.time()
+
+    # --- слушатели ---
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        stack = getattr(self._local, "starts", None)
+        if stack is None:
+            stack = self._local.starts = []
+        stack.append(time.perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        elapsed = time.perf_counter() - self._local.starts.pop()
+        shape, site = self._record(statement, elapsed)
+        if elapsed >= self.slow:
+            self._log_slow(conn, cursor, statement, parameters, executemany, shape, site, elapsed)
+
+    def _error(self, ctx) -> None:
+        """Запрос упал: after_cursor_execute не будет, поэтому время снимается со стека здесь"""
+        stack = getattr(self._local, "starts", None)
+        # ошибка соединения или сборки запроса приходит без контекста выполнения — замер не начинался
+        if not stack or ctx.execution_context is None or ctx.statement is None:
+            return
+        self._record(ctx.statement, time.perf_counter() - stack.pop(), failed=True)
+
+    def _record(self, statement: str, elapsed: float, failed: bool = False) -> Tuple[str, str]:
+        """Добавляет замер в статистику; возвращает (вид запроса, место вызова)"""
+        shape = self._shapes.get(statement)
+        if shape is None:
+            if len(self._shapes) >= SHAPE_CACHE_SIZE:
+                self._shapes.clear()
+            shape = self._shapes[statement] = statement_shape(statement)
+        site = call_site(sys._getframe(2))
+        key = (shape, site)
+        with self._lock:
+            stat = self.stats.get(key)
+            if stat is None:
+                stat = self.stats[key] = _Stat()
+            stat.add(elapsed)
+            if failed:
+                stat.errors += 1
+        return shape, site
+
+    def _explain(self, conn, cursor, statement: str, parameters, executemany: bool) -> str:
+        """EXPLAIN QUERY PLAN тем же соединением DBAPI; для не-SQLite — пусто"""
+        if conn.dialect.name != "sqlite" or not _EXPLAINABLE.match(statement):
+            return ""
+        params = parameters[0] if executemany and parameters else parameters
+        try:
+            rows = cursor.connection.execute("EXPLAIN QUERY PLAN " + statement, params or ()).fetchall()
+        except Exception as e:
+            return f"(план недоступен: {e})"
+        depth = {0: -1}
+        lines = []
+        for node, parent, _, detail in rows:
+            depth[node] = depth.get(parent, -1) + 1
+            lines.append("  " * depth[node] + detail)
+        return "\n".join(lines)
+
+    def _log_slow(self, conn, cursor, statement, parameters, executemany, shape, site, elapsed) -> None:
+        plan = self._plans.get(shape)
+        if plan is None:
+            plan = self._plans[shape] = self._explain(conn, cursor, statement, parameters, executemany)
+        params = repr(parameters)
+        context = {
+            "site": site,
+            "statement": statement if len(statement) <= 2000 else statement[:2000] + "…",
+            "params": params if len(params) <= 500 else params[:500] + "…",
+            "rows": "executemany" if executemany else cursor.rowcount,
+            "plan": plan,
+        }
+        self.logger.warning(
+            f"🐢 Медленный запрос {elapsed * 1000:.1f} мс в {site}: {_SPACES.sub(' ', statement)[:200]}"
+            + (f"\n{plan}" if plan else ""),
+            extra={"duration": elapsed, "context": context},
+        )
+
+    # --- отчёт ---
+
+    def report(self, top: int = 30) -> str:
+        """Текстовый отчёт: виды запросов по суммарному времени, внутри — места вызова"""
+        with self._lock:
+            items = list(self.stats.items())
+        shapes: Dict[str, _Stat] = {}
+        sites: Dict[str, List[Tuple[str, _Stat]]] = {}
+        for (shape, site), stat in items:
+            shapes.setdefault(shape, _Stat()).merge(stat)
+            sites.setdefault(shape, []).append((site, stat))
+        total = sum(s.total for s in shapes.values())
+        count = sum(s.count for s in shapes.values())
+        errors = sum(s.errors for s in shapes.values())
+        lines = [
+            f"Отчёт о SQL-запросах с {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self._started))}",
+            f"Запросов: {count}, видов: {len(shapes)}, суммарно {total:.3f} с" + (f", с ошибкой {errors}" if errors else ""),
+            "",
+        ]
+        ranked = sorted(shapes.items(), key=lambda kv: kv[1].total, reverse=True)
+        for shape, stat in ranked[:top]:
+            lines.append(
+                f"{stat.total * 1000:10.1f} мс  {stat.count:>7}×  ср. {stat.total / stat.count * 1000:.3f}  "
+                f"p50 ≤{stat.percentile(0.5) * 1000:.3f}  p95 ≤{stat.percentile(0.95) * 1000:.3f}  "
+                f"макс. {stat.max * 1000:.3f} мс" + (f"  ошибок {stat.errors}" if stat.errors else "")
+            )
+            lines.append(f"    {shape if len(shape) <= 300 else shape[:300] + '…'}")
+            for site, site_stat in sorted(sites[shape], key=lambda kv: kv[1].total, reverse=True)[:5]:
+                lines.append(f"      {site_stat.total * 1000:9.1f} мс {site_stat.count:>7}×  {site}")
+            plan = self._plans.get(shape)
+            if plan:
+                lines.extend("      │ " + line for line in plan.splitlines())
+            lines.append("")
+        if len(ranked) > top:
+            lines.append(f"… ещё видов: {len(ranked) - top}")
+        return "\n".join(lines)
+
+    def write_report(self) -> Optional[str]:
+        """Пишет отчёт в файл (вызывается при выходе); None — запросов не было"""
+        if not self.stats:
+            return None
+        try:
+            with open(self.report_path, "w", encoding="utf-8") as f:
+                f.write(self.report())
+        except OSError as e:
+            self.logger.error(f"❌ Не удалось записать отчёт SQL {self.report_path}: {e}")
+            return None
+        count = sum(s.count for s in self.stats.values())
+        total = sum(s.total for s in self.stats.values())
+        self.logger.info(f"📊 Отчёт SQL: {count} запросов за {total:.3f} с -> {self.report_path}")
+        return self.report_path
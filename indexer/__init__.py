@@ -0,0 +1 @@
+# Делает папку indexer Python-пакетом
@@ -0,0 +1,84 @@
+# indexer/changes.py
+# Событие изменения файловой системы и свёртка пачки событий 🔀
+
+import os
+from enum import Enum
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+
+class ChangeKind(str, Enum):
+    """Вид изменения"""
+    CREATED = "created"
+    MODIFIED = "modified"
+    DELETED = "deleted"
+    MOVED = "moved"
+    # очередь событий переполнена — нужен полный обход корня
+    RESCAN = "rescan"
+
+
+class FileChange(NamedTuple):
+    """
+    Изменение одного пути. Для MOVED dest_path — новый путь.
+    """
+    kind: ChangeKind
+    path: str
+    dest_path: Optional[str] = None
+
+
+def _merge(prev: Optional[ChangeKind], new: ChangeKind) -> Optional[ChangeKind]:
+    """
+    Складывает два последовательных изменения одного пути. None — изменения взаимно погасились.
+    """
+    if prev is None:
+        return new
+    if prev == ChangeKind.CREATED:
+        if new == ChangeKind.DELETED:
+            return None
+        return ChangeKind.CREATED
+    if prev == ChangeKind.DELETED and new == ChangeKind.CREATED:
+        return ChangeKind.MODIFIED
+    return new
+
+
+def coalesce(events: Iterable[FileChange]) -> List[FileChange]:
+    """
+    Сворачивает поток событий в минимальную пачку: переносы идут первыми, затем
+    не более одного изменения на путь.
+
+    :param events: события в порядке поступления
+    :return: свёрнутая пачка изменений
+    """
+    pending: Dict[str, ChangeKind] = {}
+    moves: List[Tuple[str, str]] = []
+    rescans: Dict[str, None] = {}
+
+    for ev in events:
+        if ev.kind == ChangeKind.RESCAN:
+            rescans[ev.path] = None
+            continue
+        if ev.kind != ChangeKind.MOVED:
+            merged = _merge(pending.pop(ev.path, None), ev.kind)
+            if merged is not None:
+                pending[ev.path] = merged
+            continue
+
+        src, dst = ev.path, ev.dest_path
+        prev = pending.pop(src, None)
+        # перенос поверх существующего пути отменяет накопленное по нему
+        pending.pop(dst, None)
+        if prev in (ChangeKind.CREATED, ChangeKind.DELETED):
+            # путь появился уже внутри пачки — для индекса это просто создание на новом месте
+            pending[dst] = ChangeKind.CREATED
+            continue
+        moves.append((src, dst))
+        if prev == ChangeKind.MODIFIED:
+            pending[dst] = ChangeKind.MODIFIED
+        # накопленные изменения внутри перенесённой папки переезжают вместе с ней
+        prefix = src + os.sep
+        for path in [p for p in pending if p.startswith(prefix)]:
+            pending[dst + path[len(src):]] = pending.pop(path)
+
+    batch = [FileChange(ChangeKind.RESCAN, root) for root in rescans]
+    batch += [FileChange(ChangeKind.MOVED, src, dst) for src, dst in moves]
+    batch += [FileChange(kind, path) for path, kind in pending.items()]
+    return batch
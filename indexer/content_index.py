@@ -0,0 +1,310 @@
+# indexer/content_index.py
+# Полнотекстовый индекс содержимого .docx/.xlsx в папках проектов и архива 🔎
+#
+# Текст извлекается потоково: XML частей читается из zip порциями и разбирается expat
+# без построения дерева, поэтому память не зависит от размера файла. Извлечение идёт
+# в пуле процессов с ограничением времени на файл; заново разбираются только файлы,
+# у которых изменились (size, mtime_ns), и файлы, извлечение которых в прошлый раз не удалось.
+
+import os
+import re
+import sys
+import time
+import zipfile
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Tuple
+from xml.parsers import expat
+
+from config.settings import ContentSettings, PathSettings
+from utils.logger import LoggerManager
+
+_NS_W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_NS_S = "http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+
+_WORD_PARTS = re.compile(r"^word/(document|header\d*|footer\d*|footnotes|endnotes)\.xml$")
+_SHEET_PARTS = re.compile(r"^xl/worksheets/sheet\d+\.xml$")
+
+# Размер порции XML, подаваемой парсеру
+CHUNK_SIZE = 256 * 1024
+
+# Сколько файлов записывать в БД между фиксациями транзакции
+COMMIT_EVERY = 200
+
+# Статусы неудачного извлечения: такие файлы разбираются заново при каждом обновлении
+FAILED_STATUSES = ("error", "timeout")
+
+# Результат извлечения: (путь, статус, текст, ошибка)
+Extracted = Tuple[str, str, str, Optional[str]]
+
+
+class _Limit(Exception):
+    """Набран предел символов — дальше файл не читается"""
+
+
+def _part_order(name: str) -> tuple:
+    # тело документа и общие строки — первыми: при обрезке по MAX_CHARS в индекс попадает главное
+    return (0 if name in ("word/document.xml", "xl/sharedStrings.xml") else 1, name)
+
+
+def _stream_text(zf: zipfile.ZipFile, part: str, text_tags: set, break_tags: set,
+                 skip_tags: set, out: List[str], state: dict) -> None:
+    """
+    Собирает текст элементов text_tags одной части; после break_tags ставит перевод строки.
+    Содержимое skip_tags (фонетика, удалённый текст) пропускается.
+    """
+    depth = {"skip": 0}
+    deadline, limit = state["deadline"], state["limit"]
+
+    def start(name: str, attrs: dict) -> None:
+        if name in skip_tags:
+            depth["skip"] += 1
+        elif name in text_tags and not depth["skip"]:
+            parser.CharacterDataHandler = collect
+
+    def end(name: str) -> None:
+        if name in skip_tags:
+            depth["skip"] -= 1
+        elif name in text_tags:
+            parser.CharacterDataHandler = None
+        elif name in break_tags and out and out[-1] != "\n":
+            out.append("\n")
+
+    def collect(data: str) -> None:
+        out.append(data)
+        state["chars"] += len(data)
+        if state["chars"] >= limit:
+            raise _Limit()
+
+    parser = expat.ParserCreate(namespace_separator="}")
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+    parser.buffer_text = True
+    with zf.open(part) as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"извлечение дольше {state['timeout']} с")
+            if not chunk:
+                parser.Parse(b"", True)
+                break
+            parser.Parse(chunk, False)
+
+
+def extract_text(path: str, timeout: float = ContentSettings.FILE_TIMEOUT,
+                 max_chars: int = ContentSettings.MAX_CHARS) -> str:
+    """
+    Текст документа Word или книги Excel.
+
+    :param path: файл .docx/.xlsx (и их варианты с макросами и шаблоны)
+    :param timeout: предельное время, секунд (проверяется между порциями XML)
+    :param max_chars: сколько символов собрать, остальное отбрасывается
+    """
+    out: List[str] = []
+    state = {"deadline": time.monotonic() + timeout, "timeout": timeout, "limit": max_chars, "chars": 0}
+    with zipfile.ZipFile(path) as zf:
+        names = sorted(zf.namelist(), key=_part_order)
+        try:
+            for name in names:
+                if _WORD_PARTS.match(name):
+                    _stream_text(zf, name, {_NS_W + "t"}, {_NS_W + "p", _NS_W + "tab", _NS_W + "br"},
+                                 {_NS_W + "delText", _NS_W + "instrText"}, out, state)
+                elif name == "xl/sharedStrings.xml":
+                    _stream_text(zf, name, {_NS_S + "t"}, {_NS_S + "si"}, {_NS_S + "rPh"}, out, state)
+                elif _SHEET_PARTS.match(name):
+                    # в листах <t> встречается только у inline-строк
+                    _stream_text(zf, name, {_NS_S + "t"}, {_NS_S + "c"}, set(), out, state)
+        except _Limit:
+            pass
+    return re.sub(r"\n{2,}", "\n", "".join(out)).strip()
+
+
+def extract_file(job: Tuple[str, float, int]) -> Extracted:
+    """Извлечение для пула процессов: ошибки возвращаются статусом, а не исключением"""
+    path, timeout, max_chars = job
+    try:
+        body = extract_text(path, timeout, max_chars)
+    except TimeoutError as e:
+        return path, "timeout", "", str(e)
+    except Exception as e:
+        # граница пула процессов: исключение отсюда оборвало бы pool.map и весь run() —
+        # битый deflate (zlib.error), шифрованная часть (RuntimeError), неизвестное сжатие и т.п.
+        return path, "error", "", f"{type(e).__name__}: {e}"
+    return path, "ok" if body else "empty", body, None
+
+
+def project_of(root: str, path: str) -> str:
+    """Папка проекта — первый уровень внутри корня"""
+    rel = path[len(root):].lstrip("\\/")
+    parts = re.split(r"[\\/]", rel, maxsplit=1)
+    return parts[0] if len(parts) > 1 else ""
+
+
+def to_match(query: str) -> str:
+    """
+    Обычный поисковый запрос -> выражение FTS5: слова в кавычках (все обязательны),
+    «слово*» — поиск по началу слова.
+    """
+    terms = []
+    for word in re.findall(r"[\w.\-]+\*?", query):
+        prefix = word.endswith("*")
+        word = word.rstrip("*")
+        if word:
+            terms.append('"' + word.replace('"', '""') + '"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+class ContentIndexer:
+    """
+    Поддерживает полнотекстовый индекс: берёт файлы из таблицы documents (или обходит диск),
+    извлекает текст изменившихся файлов в пуле процессов и пишет его в FTS5.
+    """
+
+    def __init__(
+        self,
+        roots: Optional[List[str]] = None,
+        workers: Optional[int] = ContentSettings.WORKERS,
+        timeout: float = ContentSettings.FILE_TIMEOUT,
+        max_chars: int = ContentSettings.MAX_CHARS,
+        session_factory=None,
+    ) -> None:
+        """
+        :param roots: корневые папки, по умолчанию PROJECT_FOLDER и ARCHIVE_FOLDER
+        :param workers: число процессов извлечения
+        :param timeout: предельное время на файл, секунд
+        :param max_chars: предел текста одного файла
+        :param session_factory: контекстный менеджер сессии; по умолчанию db_init.session.get_db
+        """
+        self.logger = LoggerManager(__name__).get_logger()
+        self.roots = [os.path.normpath(r) for r in (roots or [PathSettings.PROJECT_FOLDER, PathSettings.ARCHIVE_FOLDER])]
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.max_chars = max_chars
+        if session_factory is None:
+            from db_init.documents.init_documents import DBInitDocuments
+            from db_init.session import get_db
+            DBInitDocuments().create_tables()
+            session_factory = get_db
+        self.session_factory = session_factory
+
+    def _candidates(self, session, root: str, walk: bool) -> Iterator[Tuple[str, int, int]]:
+        """Файлы корня с подходящими расширениями: (путь, размер, mtime_ns)"""
+        if walk:
+            from indexer.duplicates import iter_files
+            for path, size, mtime_ns in iter_files(root):
+                if path.lower().endswith(ContentSettings.EXTENSIONS):
+                    yield path, size, mtime_ns
+            return
+        from sqlalchemy import select
+        from db_init.documents.models_documents import Document
+        stmt = select(Document.path, Document.size, Document.mtime_ns).where(
+            Document.root == root, Document.is_dir.is_(False), Document.ext.in_(ContentSettings.EXTENSIONS),
+        )
+        yield from session.execute(stmt)
+
+    def run(self, walk: bool = False) -> dict:
+        """
+        Обновляет индекс.
+
+        :param walk: обходить диск, а не брать список файлов из таблицы documents
+        :return: счётчики: extracted, unchanged, removed, failed
+        """
+        from db_init.documents.crud_documents import DocumentContentRepository
+
+        stats = {"extracted": 0, "unchanged": 0, "removed": 0, "failed": 0}
+        start = time.perf_counter()
+        for root in self.roots:
+            with self.session_factory() as session:
+                repo = DocumentContentRepository(session)
+                known = repo.get_states(root)
+                todo = []
+                seen = set()
+                unchanged = 0
+                for path, size, mtime_ns in self._candidates(session, root, walk):
+                    seen.add(path)
+                    state = known.get(path)
+                    # неудачное извлечение повторяется: таймаут на загруженной шаре — не приговор файлу
+                    if (state is not None and state[1] == size and state[2] == mtime_ns
+                            and state[3] not in FAILED_STATUSES):
+                        unchanged += 1
+                    else:
+                        todo.append((path, size, mtime_ns))
+                stats["unchanged"] += unchanged
+                stats["removed"] += repo.delete_paths(p for p in known if p not in seen)
+                session.commit()
+                self.logger.info(f"📂 {root}: к извлечению {len(todo)}, без изменений {unchanged}")
+                self._extract(repo, root, todo, stats)
+        self.logger.info(
+            f"🎉 Индекс содержимого обновлён за {time.perf_counter() - start:.1f} с: "
+            + ", ".join(f"{k} — {v}" for k, v in stats.items())
+        )
+        return stats
+
+    def _extract(self, repo, root: str, todo: List[Tuple[str, int, int]], stats: dict) -> None:
+        """Извлекает текст пулом процессов и пишет результаты по мере готовности"""
+        if not todo:
+            return
+        meta = {path: (size, mtime_ns) for path, size, mtime_ns in todo}
+        jobs = [(path, self.timeout, self.max_chars) for path, _, _ in todo]
+        if self.workers == 1 or len(jobs) < 4:
+            results = map(extract_file, jobs)
+            pool = None
+        else:
+            pool = ProcessPoolExecutor(max_workers=self.workers)
+            results = pool.map(extract_file, jobs, chunksize=4)
+        try:
+            for n, (path, status, body, error) in enumerate(results, 1):
+                size, mtime_ns = meta[path]
+                if status in FAILED_STATUSES:
+                    stats["failed"] += 1
+                    self.logger.warning(f"⚠️ {path}: {error}")
+                else:
+                    stats["extracted"] += 1
+                repo.save({
+                    'path': path, 'root': root, 'project': project_of(root, path), 'size': size,
+                    'mtime_ns': mtime_ns, 'chars': len(body), 'status': status, 'error': error,
+                }, body)
+                if n % COMMIT_EVERY == 0:
+                    repo.session.commit()
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+
+    def search(self, query: str, project: Optional[str] = None, root: Optional[str] = None,
+               limit: int = 20, raw: bool = False) -> List[dict]:
+        """
+        Поиск по содержимому.
+
+        :param query: слова запроса («слово*» — по началу слова) или выражение FTS5 при raw=True
+        :param project: только папка проекта
+        :param root: только корень индекса
+        :return: [{path, project, root, size, mtime_ns, snippet, rank}], лучшие первыми
+        """
+        from db_init.documents.crud_documents import DocumentContentRepository
+
+        match = query if raw else to_match(query)
+        if not match:
+            return []
+        with self.session_factory() as session:
+            return DocumentContentRepository(session).search(match, project, root, limit)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Полнотекстовый индекс содержимого документов")
+    sub = parser.add_subparsers(dest="command", required=True)
+    index_cmd = sub.add_parser("index", help="обновить индекс")
+    index_cmd.add_argument("roots", nargs="*", help="корневые папки (по умолчанию проекты и архив)")
+    index_cmd.add_argument("--walk", action="store_true", help="обходить диск вместо таблицы documents")
+    index_cmd.add_argument("--workers", type=int, default=ContentSettings.WORKERS, help="число процессов")
+    search_cmd = sub.add_parser("search", help="найти документы")
+    search_cmd.add_argument("query", help="слова запроса")
+    search_cmd.add_argument("--project", help="только папка проекта")
+    search_cmd.add_argument("--limit", type=int, default=20, help="сколько результатов показать")
+    search_cmd.add_argument("--raw", action="store_true", help="запрос — выражение FTS5 MATCH")
+    args = parser.parse_args()
+
+    if args.command == "index":
+        ContentIndexer(args.roots or None, workers=args.workers).run(walk=args.walk)
+    else:
+        for hit in ContentIndexer().search(args.query, args.project, limit=args.limit, raw=args.raw):
+            sys.stdout.write(f"{hit['rank']:8.2f}  {hit['path']}\n          {hit['snippet']}\n")
@@ -0,0 +1,232 @@
+# indexer/doc_codes.py
+# Разбор кодов документов вида «089.049 (PWOM) Название» и индекс для автодополнения 🔢
+#
+# Имена разбираются пачками набором заранее скомпилированных regex; индекс — отсортированный
+# массив ключей (номера и аббревиатуры) с bisect: поиск по префиксу «089.05» или «SIP»
+# стоит микросекунды и не требует дерева объектов в памяти.
+
+import os
+import re
+import sys
+import argparse
+from bisect import bisect_left
+from itertools import repeat
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+# Номер документа: серия из трёх цифр и номер(а) через точку, возможно исполнение «-01»
+_NUMBER = r"(?P<number>\d{3}(?:[.,]\d{2,4})+(?:-\d{1,3})?)"
+# Аббревиатура в скобках: PWOM, LSA-TMA, ТО, SIP
+_ABBR = r"\((?P<abbr>[A-Za-zА-Яа-яЁё][\w\- /]{0,23})\)"
+_SEP = r"[\s\-–—_.]*"
+
+# Набор шаблонов в порядке строгости; побеждает первый совпавший
+_PATTERNS: Tuple[re.Pattern, ...] = (
+    # «089.049 (PWOM) Руководство» — папки библиотеки шаблонов
+    re.compile(rf"^{_NUMBER}{_SEP}{_ABBR}{_SEP}(?P<title>.*)$"),
+    # «089.049 Руководство (PWOM)» — аббревиатура после названия
+    re.compile(rf"^{_NUMBER}{_SEP}(?P<title>.*?)\s*{_ABBR}\s*$"),
+    # «089.049 Руководство» — без аббревиатуры
+    re.compile(rf"^{_NUMBER}{_SEP}(?P<title>.*)$"),
+    # «Проект 120 - 089.049 (PWOM) ...» — код внутри имени архивного файла
+    re.compile(rf"(?:^|[\s_\-]){_NUMBER}{_SEP}(?:{_ABBR})?{_SEP}(?P<title>.*)$"),
+)
+# Дешёвый предфильтр: без «ddd.d» разбирать нечего
+_HAS_NUMBER = re.compile(r"\d{3}[.,]\d")
+_EXT = re.compile(r"\.([A-Za-z0-9]{1,5})$")
+# Расширения, которые отрезаются от имени файла. Любой «.суффикс» отрезать нельзя:
+# «089.049» — это номер, а «Руководство ред.2» — редакция, а не расширение
+DOC_EXTENSIONS = frozenset((
+    "doc", "docx", "docm", "dot", "dotx", "dotm", "rtf", "odt", "txt", "pdf",
+    "xls", "xlsx", "xlsm", "xlsb", "xlt", "xltx", "xltm", "ods", "csv", "xml",
+    "ppt", "pptx", "vsd", "vsdx", "dwg", "dxf", "msg", "eml",
+    "jpg", "jpeg", "png", "tif", "tiff", "bmp", "zip", "rar", "7z",
+))
+
+
+class DocCode(NamedTuple):
+    """
+    Разобранный код документа. number нормализован («089,049» -> «089.049»),
+    abbr — в верхнем регистре.
+    """
+    number: str
+    abbr: str
+    title: str
+    name: str
+    path: str = ""
+
+    @property
+    def series(self) -> str:
+        """Серия — первые три цифры номера"""
+        return self.number[:3]
+
+
+def parse_name(name: str, path: str = "", is_dir: Optional[bool] = None) -> Optional[DocCode]:
+    """
+    Разбирает имя файла или папки.
+
+    :param name: имя (без пути)
+    :param path: полный путь, сохраняется в DocCode
+    :param is_dir: папка ли это; у папки расширения нет, у файла (и при None) отрезается
+                   только расширение из DOC_EXTENSIONS
+    :return: DocCode или None, если кода в имени нет
+    """
+    if not _HAS_NUMBER.search(name):
+        return None
+    stem = name
+    if not is_dir:
+        ext = _EXT.search(name)
+        if ext is not None and ext.group(1).lower() in DOC_EXTENSIONS:
+            stem = name[:ext.start()]
+    for pattern in _PATTERNS:
+        m = pattern.search(stem)
+        if m is not None:
+            abbr = m.groupdict().get("abbr") or ""
+            title = m.group("title").strip(" -–—_.")
+            return DocCode(m.group("number").replace(",", "."), abbr.strip().upper(), title, name, path)
+    return None
+
+
+def parse_names(names: Iterable[str], paths: Optional[Iterable[str]] = None,
+                dirs: Optional[Iterable[bool]] = None) -> List[Optional[DocCode]]:
+    """
+    Пакетный разбор: один проход по массиву имён, повторяющиеся имена разбираются один раз.
+
+    :param names: имена файлов/папок
+    :param paths: соответствующие полные пути (если нужны в результате)
+    :param dirs: соответствующие признаки «это папка» (см. parse_name)
+    :return: список той же длины, None — для имён без кода
+    """
+    memo: Dict[Tuple[str, Optional[bool]], Optional[DocCode]] = {}
+    has_number = _HAS_NUMBER.search
+    result: List[Optional[DocCode]] = []
+    append = result.append
+    paths = repeat("") if paths is None else paths
+    dirs = repeat(None) if dirs is None else dirs
+    for name, path, is_dir in zip(names, paths, dirs):
+        if not has_number(name):
+            append(None)
+            continue
+        key = (name, is_dir)
+        if key in memo:
+            code = memo[key]
+        else:
+            code = memo[key] = parse_name(name, "", is_dir)
+        append(code._replace(path=path) if code is not None and path else code)
+    return result
+
+
+def normalize_query(text: str) -> str:
+    """Запрос к индексу: верхний регистр, «,» -> «.», без скобок и краевых пробелов"""
+    return text.strip().strip("()").replace(",", ".").upper()
+
+
+class CodeIndex:
+    """
+    Отсортированный индекс кодов: ключи — номер и аббревиатура каждого документа.
+    Поиск по префиксу — два bisect по массиву ключей.
+    """
+
+    def __init__(self, codes: Iterable[DocCode]) -> None:
+        self.items: List[DocCode] = [c for c in codes if c is not None]
+        pairs = []
+        for i, code in enumerate(self.items):
+            pairs.append((code.number, i))
+            if code.abbr:
+                pairs.append((code.abbr, i))
+        pairs.sort()
+        self._keys: List[str] = [k for k, _ in pairs]
+        self._refs: List[int] = [i for _, i in pairs]
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def complete(self, prefix: str, limit: int = 20) -> List[DocCode]:
+        """
+        Кандидаты по префиксу номера или аббревиатуры: «089.05», «SIP», «lsa».
+
+        :param prefix: начало ключа
+        :param limit: сколько кандидатов вернуть
+        """
+        key = normalize_query(prefix)
+        if not key:
+            return []
+        keys = self._keys
+        lo = bisect_left(keys, key)
+        hi = bisect_left(keys, key + "\uffff", lo)
+        seen = set()
+        out = []
+        for k in range(lo, hi):
+            ref = self._refs[k]
+            if ref not in seen:
+                seen.add(ref)
+                out.append(self.items[ref])
+                if len(out) >= limit:
+                    break
+        return out
+
+    def exact(self, key: str) -> List[DocCode]:
+        """Документы с точно таким номером или аббревиатурой"""
+        key = normalize_query(key)
+        lo = bisect_left(self._keys, key)
+        hi = lo
+        while hi < len(self._keys) and self._keys[hi] == key:
+            hi += 1
+        return [self.items[self._refs[k]] for k in range(lo, hi)]
+
+    def keys(self, prefix: str = "") -> Iterator[str]:
+        """Различные ключи с данным префиксом (для выпадающего списка)"""
+        key = normalize_query(prefix)
+        lo = bisect_left(self._keys, key)
+        last = None
+        for k in range(lo, len(self._keys)):
+            value = self._keys[k]
+            if not value.startswith(key):
+                break
+            if value != last:
+                last = value
+                yield value
+
+    @classmethod
+    def from_folder(cls, folder: str) -> "CodeIndex":
+        """Индекс по именам папок первого уровня — например, библиотеки шаблонов"""
+        with os.scandir(folder) as it:
+            entries = [(e.name, e.path, e.is_dir()) for e in it]
+        return cls(parse_name(name, path, is_dir) for name, path, is_dir in entries)
+
+    @classmethod
+    def from_documents(cls, session, root: Optional[str] = None) -> "CodeIndex":
+        """Индекс по таблице documents (имена файлов и папок)"""
+        from sqlalchemy import select
+        from db_init.documents.models_documents import Document
+
+        stmt = select(Document.name, Document.path, Document.is_dir)
+        if root is not None:
+            stmt = stmt.where(Document.root == root)
+        names: List[str] = []
+        paths: List[str] = []
+        dirs: List[bool] = []
+        for name, path, is_dir in session.execute(stmt.execution_options(yield_per=10000)):
+            names.append(name)
+            paths.append(path)
+            dirs.append(bool(is_dir))
+        return cls(parse_names(names, paths, dirs))
+
+
+if __name__ == "__main__":
+    from config.settings import TemplateSettings
+
+    parser = argparse.ArgumentParser(description="Поиск документов по коду или аббревиатуре")
+    parser.add_argument("query", help="префикс номера или аббревиатуры, например 089.05 или SIP")
+    parser.add_argument("--folder", default=TemplateSettings.LIBRARY_FOLDER, help="папка с шаблонами")
+    parser.add_argument("--db", action="store_true", help="искать по таблице documents, а не по папке")
+    parser.add_argument("--limit", type=int, default=20, help="сколько кандидатов показать")
+    args = parser.parse_args()
+
+    if args.db:
+        from db_init.session import get_db
+        with get_db() as session:
+            index = CodeIndex.from_documents(session)
+    else:
+        index = CodeIndex.from_folder(args.folder)
+    for code in index.complete(args.query, args.limit):
+        sys.stdout.write(f"{code.number:<12} {code.abbr:<10} {code.title}  [{code.path}]\n")
@@ -0,0 +1,140 @@
+# indexer/doc_index.py
+# Индекс документов: первичный обход папок и применение пачек изменений 🗂️
+
+import os
+from typing import Iterable, Iterator, List, Optional
+
+from config.settings import PathSettings
+from db_init.session import get_db
+from db_init.documents.init_documents import DBInitDocuments
+from db_init.documents.crud_documents import DocumentRepository
+from indexer.changes import FileChange, ChangeKind
+from utils.logger import LoggerManager
+
+# Размер пачки при bulk-вставке в индекс
+BATCH_SIZE: int = 5000
+
+
+def _row(root: str, path: str, is_dir: bool, size: int, mtime_ns: int) -> dict:
+    """Строка таблицы documents для пути"""
+    name = os.path.basename(path)
+    return {
+        'path': path,
+        'root': root,
+        'parent': os.path.dirname(path),
+        'name': name,
+        'ext': "" if is_dir else os.path.splitext(name)[1].lower(),
+        'is_dir': is_dir,
+        'size': 0 if is_dir else size,
+        'mtime_ns': mtime_ns,
+    }
+
+
+def walk_rows(root: str, top: Optional[str] = None) -> Iterator[dict]:
+    """
+    Обходит дерево через os.scandir и отдаёт строки индекса.
+
+    :param root: корень индекса, к которому относятся записи
+    :param top: папка, с которой начинать обход (по умолчанию root)
+    """
+    stack = [top or root]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    if is_dir:
+                        stack.append(entry.path)
+                    yield _row(root, entry.path, is_dir, st.st_size, st.st_mtime_ns)
+        except OSError:
+            continue
+
+
+class DocumentIndexer:
+    """
+    Поддерживает таблицу documents: полный обход корней и точечное применение изменений.
+    """
+
+    def __init__(self, roots: Optional[List[str]] = None) -> None:
+        """
+        :param roots: корневые папки, по умолчанию PROJECT_FOLDER и ARCHIVE_FOLDER
+        """
+        self.logger = LoggerManager(__name__).get_logger()
+        self.roots: List[str] = [os.path.normpath(r) for r in (roots or [PathSettings.PROJECT_FOLDER, PathSettings.ARCHIVE_FOLDER])]
+
+    def root_of(self, path: str) -> Optional[str]:
+        """Возвращает корень индекса, которому принадлежит путь"""
+        for root in self.roots:
+            if path == root or path.startswith(root.rstrip(os.sep) + os.sep):
+                return root
+        return None
+
+    def crawl(self) -> int:
+        """
+        Полный обход всех корней с удалением из индекса пропавших путей.
+
+        :return: число проиндексированных записей
+        """
+        DBInitDocuments().create_tables()
+        total = 0
+        for root in self.roots:
+            self.logger.info(f"📂 Обход {root}")
+            seen: set[str] = set()
+            batch: List[dict] = []
+            with get_db() as session:
+                repo = DocumentRepository(session)
+                for row in walk_rows(root):
+                    seen.add(row['path'])
+                    batch.append(row)
+                    if len(batch) >= BATCH_SIZE:
+                        repo.upsert_many(batch)
+                        batch = []
+                repo.upsert_many(batch)
+                removed = repo.delete_missing(root, seen)
+            total += len(seen)
+            self.logger.info(f"✅ {root}: записей {len(seen)}, удалено устаревших {removed}")
+        return total
+
+    def apply_changes(self, changes: Iterable[FileChange]) -> None:
+        """
+        Применяет пачку изменений в одной транзакции.
+        Для созданных папок индексируется всё их содержимое.
+        """
+        upserts: List[dict] = []
+        deletes: List[str] = []
+        with get_db() as session:
+            repo = DocumentRepository(session)
+            for change in changes:
+                if change.kind == ChangeKind.RESCAN:
+                    continue
+                root = self.root_of(change.dest_path or change.path)
+                if root is None:
+                    continue
+                if change.kind == ChangeKind.DELETED:
+                    deletes.append(change.path)
+                    continue
+                if change.kind == ChangeKind.MOVED:
+                    repo.move(change.path, change.dest_path)
+                    continue
+                try:
+                    st = os.stat(change.path, follow_symlinks=False)
+                except OSError:
+                    # файл успел исчезнуть до применения пачки
+                    deletes.append(change.path)
+                    continue
+                is_dir = os.path.isdir(change.path) and not os.path.islink(change.path)
+                upserts.append(_row(root, change.path, is_dir, st.st_size, st.st_mtime_ns))
+                if is_dir and change.kind == ChangeKind.CREATED:
+                    upserts.extend(walk_rows(root, change.path))
+            repo.delete_paths(deletes)
+            for i in range(0, len(upserts), BATCH_SIZE):
+                repo.upsert_many(upserts[i:i + BATCH_SIZE])
+
+
+if __name__ == "__main__":
+    DocumentIndexer().crawl()
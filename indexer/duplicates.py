@@ -0,0 +1,249 @@
+# indexer/duplicates.py
+# Поиск дубликатов файлов в папках проектов и архива:
+# размер → хэш первого/последнего блоков → полный хэш 🔍
+
+import os
+import argparse
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, Executor
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from config.settings import PathSettings
+from db_init.session import get_db
+from db_init.documents.init_documents import DBInitDocuments
+from db_init.documents.crud_documents import FileHashRepository, DuplicateRepository
+from indexer import hashing
+from utils.logger import LoggerManager
+
+# Меньше этого числа файлов хэшируем в текущем процессе: запуск пула дороже
+POOL_THRESHOLD: int = 32
+
+
+def iter_files(root: str) -> Iterator[Tuple[str, int, int]]:
+    """
+    Обходит дерево через os.scandir без лишних stat-вызовов.
+
+    :param root: корневая папка
+    :return: итератор (путь, размер, mtime_ns)
+    """
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            st = entry.stat(follow_symlinks=False)
+                            yield entry.path, st.st_size, st.st_mtime_ns
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+
+class DuplicateFinder:
+    """
+    Ищет одинаковые файлы в нескольких корневых папках и сохраняет группы дубликатов в БД.
+    Хэши кэшируются по (path, size, mtime_ns), поэтому повторный запуск хэширует только изменённые файлы.
+    """
+
+    def __init__(
+        self,
+        roots: Optional[List[str]] = None,
+        workers: Optional[int] = None,
+        min_size: int = 1,
+    ) -> None:
+        """
+        :param roots: корневые папки, по умолчанию PROJECT_FOLDER и ARCHIVE_FOLDER
+        :param workers: размер пула процессов (None — по числу ядер)
+        :param min_size: файлы меньше этого размера не рассматриваются
+        """
+        self.logger = LoggerManager(__name__).get_logger()
+        self.roots: List[str] = roots or [PathSettings.PROJECT_FOLDER, PathSettings.ARCHIVE_FOLDER]
+        self.workers: Optional[int] = workers
+        self.min_size: int = min_size
+        self._executor: Optional[Executor] = None
+
+    def _hash_many(
+        self,
+        func: Callable[[Tuple[str, int]], Tuple[str, Optional[str]]],
+        items: List[Tuple[str, int]],
+    ) -> Iterator[Tuple[str, Optional[str]]]:
+        """Раздаёт хэширование по пулу процессов или считает на месте для малых объёмов"""
+        if len(items) < POOL_THRESHOLD:
+            return map(func, items)
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        chunksize = max(1, len(items) // ((self.workers or os.cpu_count() or 1) * 4))
+        return self._executor.map(func, items, chunksize=chunksize)
+
+    def scan(self) -> Dict[int, List[Tuple[str, int]]]:
+        """
+        Группирует файлы по размеру и оставляет только размеры, встречающиеся больше одного раза.
+
+        :return: словарь размер -> [(путь, mtime_ns), ...]
+        """
+        by_size: Dict[int, List[Tuple[str, int]]] = defaultdict(list)
+        total = 0
+        for root in self.roots:
+            for path, size, mtime_ns in iter_files(root):
+                total += 1
+                if size >= self.min_size:
+                    by_size[size].append((path, mtime_ns))
+        candidates = {size: files for size, files in by_size.items() if len(files) > 1}
+        self.logger.info(
+            f"📂 Просмотрено файлов: {total}, кандидатов по размеру: {sum(map(len, candidates.values()))}"
+        )
+        return candidates
+
+    def find(self) -> List[dict]:
+        """
+        Выполняет конвейер размер → частичный хэш → полный хэш.
+
+        :return: группы дубликатов: {'full_hash', 'size', 'files': [(путь, mtime_ns), ...]}
+        """
+        by_size = self.scan()
+        # path -> [size, mtime_ns, partial_hash, full_hash]
+        entries: Dict[str, list] = {
+            path: [size, mtime_ns, None, None]
+            for size, files in by_size.items()
+            for path, mtime_ns in files
+        }
+
+        with get_db() as session:
+            cached = FileHashRepository(session).get_cached(entries.keys())
+        for path, (size, mtime_ns, partial, full) in cached.items():
+            entry = entries[path]
+            if entry[0] == size and entry[1] == mtime_ns:
+                entry[2], entry[3] = partial, full
+        self.logger.info(f"🗃️ Из кэша взято хэшей: {sum(1 for e in entries.values() if e[2])}")
+        dirty: set[str] = set()
+
+        try:
+            # 1) частичный хэш для всех кандидатов без кэша
+            need = [(path, e[0]) for path, e in entries.items() if e[2] is None]
+            for path, digest in self._hash_many(hashing.partial_hash, need):
+                entries[path][2] = digest
+                dirty.add(path)
+
+            by_partial: Dict[Tuple[int, str], List[str]] = defaultdict(list)
+            for path, (size, _, partial, _) in entries.items():
+                if partial is not None:
+                    by_partial[(size, partial)].append(path)
+
+            # 2) полный хэш только для совпавших по частичному
+            need = []
+            for (size, partial), paths in by_partial.items():
+                if len(paths) < 2:
+                    continue
+                for path in paths:
+                    entry = entries[path]
+                    if entry[3] is not None:
+                        continue
+                    if hashing.is_small(size):
+                        entry[3] = partial
+                        dirty.add(path)
+                    else:
+                        need.append((path, size))
+            self.logger.info(f"#️⃣ Полное хэширование: {len(need)} файлов")
+            for path, digest in self._hash_many(hashing.full_hash, need):
+                entries[path][3] = digest
+                dirty.add(path)
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+        by_full: Dict[str, List[str]] = defaultdict(list)
+        for (size, partial), paths in by_partial.items():
+            if len(paths) < 2:
+                continue
+            for path in paths:
+                if entries[path][3] is not None:
+                    by_full[entries[path][3]].append(path)
+
+        groups = [
+            {
+                'full_hash': full,
+                'size': entries[paths[0]][0],
+                'files': sorted((path, entries[path][1]) for path in paths),
+            }
+            for full, paths in by_full.items()
+            if len(paths) > 1
+        ]
+        groups.sort(key=lambda g: g['size'] * (len(g['files']) - 1), reverse=True)
+
+        self._update_cache(entries, dirty)
+        return groups
+
+    def _update_cache(self, entries: Dict[str, list], dirty: set) -> None:
+        """Сохраняет в кэш только пересчитанные хэши"""
+        rows = [
+            {
+                'path': path,
+                'size': entries[path][0],
+                'mtime_ns': entries[path][1],
+                'partial_hash': entries[path][2],
+                'full_hash': entries[path][3],
+            }
+            for path in dirty
+            if entries[path][2] is not None
+        ]
+        with get_db() as session:
+            FileHashRepository(session).upsert_many(rows)
+        self.logger.info(f"💾 Кэш хэшей обновлён: {len(rows)} записей")
+
+    def save(self, groups: List[dict]) -> None:
+        """Заменяет группы дубликатов в БД результатом текущего поиска"""
+        with get_db() as session:
+            DuplicateRepository(session).replace_all(groups)
+        self.logger.info(f"💾 Сохранено групп дубликатов: {len(groups)}")
+
+    @staticmethod
+    def write_report(groups: List[dict], out_file: str) -> None:
+        """
+        Пишет текстовый отчёт: группы по убыванию лишнего объёма, самая свежая копия отмечена.
+        """
+        wasted = sum(g['size'] * (len(g['files']) - 1) for g in groups)
+        with open(out_file, "w", encoding="utf-8") as f:
+            f.write(f"Отчёт о дубликатах от {datetime.now():%Y-%m-%d %H:%M}\n")
+            f.write(f"Групп: {len(groups)}, лишний объём: {wasted / 1024 ** 2:.1f} МБ\n\n")
+            for g in groups:
+                newest = max(mtime for _, mtime in g['files'])
+                f.write(
+                    f"🔁 {g['full_hash']}  {g['size'] / 1024 ** 2:.2f} МБ × {len(g['files'])}\n"
+                )
+                for path, mtime_ns in g['files']:
+                    mark = "🆕" if mtime_ns == newest else "  "
+                    stamp = datetime.fromtimestamp(mtime_ns / 1e9)
+                    f.write(f"    {mark} {stamp:%Y-%m-%d %H:%M}  {path}\n")
+                f.write("\n")
+
+    def run(self, report_path: Optional[str] = None) -> List[dict]:
+        """
+        Основная точка входа: поиск, сохранение в БД и отчёт.
+        """
+        self.logger.info(f"🏁 Поиск дубликатов в {self.roots}")
+        DBInitDocuments().create_tables()
+        groups = self.find()
+        self.save(groups)
+        if report_path:
+            self.write_report(groups, report_path)
+            self.logger.info(f"📝 Отчёт сохранён: {report_path}")
+        self.logger.info("🎉 Поиск дубликатов завершён")
+        return groups
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Поиск дубликатов файлов")
+    parser.add_argument("roots", nargs="*", help="корневые папки (по умолчанию проекты и архив)")
+    parser.add_argument("--workers", type=int, default=None, help="размер пула процессов")
+    parser.add_argument("--min-size", type=int, default=1, help="минимальный размер файла, байт")
+    parser.add_argument("--report", default="duplicates_report.txt", help="файл отчёта")
+    args = parser.parse_args()
+
+    DuplicateFinder(args.roots or None, args.workers, args.min_size).run(args.report)
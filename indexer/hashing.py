@@ -0,0 +1,71 @@
+# indexer/hashing.py
+# Хэширование файлов через mmap. Модуль без тяжёлых импортов — его функции уходят в пул процессов #️⃣
+
+import hashlib
+import mmap
+from typing import Optional, Tuple
+
+# Размер блока, который берётся с начала и с конца файла для частичного хэша
+CHUNK_SIZE: int = 64 * 1024
+
+# Размер окна при полном хэшировании
+BLOCK_SIZE: int = 4 * 1024 * 1024
+
+
+def _new_hash() -> "hashlib._Hash":
+    """Создаёт объект хэша, общий для частичного и полного хэширования"""
+    return hashlib.blake2b(digest_size=20)
+
+
+def is_small(size: int) -> bool:
+    """
+    Файл целиком помещается в частичный хэш — его частичный хэш уже является полным.
+    """
+    return size <= 2 * CHUNK_SIZE
+
+
+def partial_hash(item: Tuple[str, int]) -> Tuple[str, Optional[str]]:
+    """
+    Хэширует первый и последний блоки файла.
+
+    :param item: (путь, размер)
+    :return: (путь, hexdigest) или (путь, None) при ошибке чтения
+    """
+    path, size = item
+    h = _new_hash()
+    try:
+        with open(path, 'rb') as f:
+            if is_small(size):
+                h.update(f.read())
+            else:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    h.update(mm[:CHUNK_SIZE])
+                    h.update(mm[-CHUNK_SIZE:])
+    except (OSError, ValueError):
+        return path, None
+    return path, h.hexdigest()
+
+
+def full_hash(item: Tuple[str, int]) -> Tuple[str, Optional[str]]:
+    """
+    Хэширует всё содержимое файла окнами по BLOCK_SIZE через mmap.
+
+    :param item: (путь, размер)
+    :return: (путь, hexdigest) или (путь, None) при ошибке чтения
+    """
+    path, size = item
+    h = _new_hash()
+    try:
+        with open(path, 'rb') as f:
+            if size == 0:
+                return path, h.hexdigest()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                view = memoryview(mm)
+                try:
+                    for offset in range(0, len(mm), BLOCK_SIZE):
+                        h.update(view[offset:offset + BLOCK_SIZE])
+                finally:
+                    view.release()
+    except (OSError, ValueError):
+        return path, None
+    return path, h.hexdigest()
@@ -0,0 +1,499 @@
+# indexer/watcher.py
+# Наблюдатель за файловой системой: держит индекс документов актуальным без повторных обходов 👀
+#
+# На Linux используется inotify, иначе — опрос с проверкой mtime папок.
+
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from config.settings import PathSettings
+from db_init.session import get_db
+from db_init.documents.crud_documents import DocumentRepository
+from db_init.documents.init_documents import DBInitDocuments
+from indexer.changes import FileChange, ChangeKind, coalesce
+from indexer.doc_index import DocumentIndexer
+from utils.logger import LoggerManager
+
+# Подписчик ленты изменений получает свёрнутую и уже применённую к индексу пачку
+Subscriber = Callable[[List[FileChange]], None]
+
+
+class InotifyBackend:
+    """
+    Источник событий на inotify (только Linux).
+    """
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_ISDIR = 0x40000000
+
+    WATCH_MASK = (
+        IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+        | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_ONLYDIR
+    )
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self, roots: List[str], dirs: Optional[Iterable[str]] = None) -> None:
+        """
+        :param roots: корневые папки
+        :param dirs: уже известные папки (из индекса) — чтобы не обходить дерево ради установки watch
+        """
+        self.logger = LoggerManager(__name__).get_logger()
+        self.roots = roots
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd: int = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._paths: Dict[int, str] = {}
+        if dirs is None:
+            for root in roots:
+                self._watch_tree(root)
+        else:
+            for path in [*roots, *dirs]:
+                self._watch(path)
+        self.logger.info(f"👀 inotify: отслеживается папок {len(self._paths)}")
+
+    @staticmethod
+    def available() -> bool:
+        return sys.platform.startswith("linux")
+
+    def _watch(self, path: str) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), self.WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC:
+                self.logger.error("❌ Исчерпан лимит inotify watches (fs.inotify.max_user_watches)")
+            return
+        self._paths[wd] = path
+
+    def _watch_tree(self, top: str, events: Optional[List[FileChange]] = None) -> None:
+        """Ставит watch на папку и всё её поддерево; при events — добавляет события о содержимом"""
+        stack = [top]
+        while stack:
+            current = stack.pop()
+            self._watch(current)
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        if events is not None:
+                            events.append(FileChange(ChangeKind.CREATED, entry.path))
+            except OSError:
+                continue
+
+    def _rename_watches(self, src: str, dst: str) -> None:
+        prefix = src + os.sep
+        for wd, path in self._paths.items():
+            if path == src:
+                self._paths[wd] = dst
+            elif path.startswith(prefix):
+                self._paths[wd] = dst + path[len(src):]
+
+    def read(self, timeout: float) -> List[FileChange]:
+        """
+        Ждёт события не дольше timeout секунд и возвращает их.
+        """
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return []
+        events: List[FileChange] = []
+        moved_from: Dict[int, Tuple[str, bool]] = {}
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, cookie, length = self._EVENT.unpack_from(data, offset)
+                offset += self._EVENT.size
+                name = data[offset:offset + length].rstrip(b"\0")
+                offset += length
+                self._dispatch(wd, mask, cookie, os.fsdecode(name), events, moved_from)
+        # MOVED_FROM без пары — путь ушёл за пределы отслеживаемых папок
+        for path, _ in moved_from.values():
+            events.append(FileChange(ChangeKind.DELETED, path))
+        return events
+
+    def _dispatch(self, wd, mask, cookie, name, events, moved_from) -> None:
+        if mask & self.IN_Q_OVERFLOW:
+            self.logger.warning("⚠️ Переполнение очереди inotify — требуется полный обход")
+            events.extend(FileChange(ChangeKind.RESCAN, root) for root in self.roots)
+            return
+        if mask & self.IN_IGNORED:
+            self._paths.pop(wd, None)
+            return
+        base = self._paths.get(wd)
+        if base is None or mask & self.IN_DELETE_SELF:
+            return
+        path = os.path.join(base, name) if name else base
+        is_dir = bool(mask & self.IN_ISDIR)
+
+        if mask & self.IN_MOVED_FROM:
+            moved_from[cookie] = (path, is_dir)
+        elif mask & self.IN_MOVED_TO:
+            src = moved_from.pop(cookie, None)
+            if src is not None:
+                events.append(FileChange(ChangeKind.MOVED, src[0], path))
+                if is_dir:
+                    self._rename_watches(src[0], path)
+            else:
+                events.append(FileChange(ChangeKind.CREATED, path))
+                if is_dir:
+                    self._watch_tree(path, events)
+        elif mask & self.IN_CREATE:
+            events.append(FileChange(ChangeKind.CREATED, path))
+            if is_dir:
+                # содержимое могло появиться раньше, чем был поставлен watch
+                self._watch_tree(path, events)
+        elif mask & self.IN_DELETE:
+            events.append(FileChange(ChangeKind.DELETED, path))
+        elif mask & (self.IN_CLOSE_WRITE | self.IN_ATTRIB):
+            events.append(FileChange(ChangeKind.MODIFIED, path))
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class PollingBackend:
+    """
+    Переносимый источник событий на опросе.
+    Каждый цикл сравнивает mtime всех известных папок и перечитывает только изменившиеся;
+    изменения содержимого файлов ловятся скользящей проверкой не более stat_budget файлов за цикл.
+    """
+
+    def __init__(
+        self,
+        roots: List[str],
+        interval: float = 5.0,
+        stat_budget: int = 2000,
+        seed: Optional[Iterable[tuple]] = None,
+    ) -> None:
+        """
+        :param roots: корневые папки
+        :param interval: период опроса, сек
+        :param stat_budget: сколько файлов перепроверять за один цикл
+        :param seed: строки индекса (path, parent, name, is_dir, size, mtime_ns) вместо первичного обхода
+        """
+        self.logger = LoggerManager(__name__).get_logger()
+        self.roots = roots
+        self.interval = interval
+        self.stat_budget = stat_budget
+        # папка -> (mtime_ns, {имя: (is_dir, size, mtime_ns)})
+        self._dirs: Dict[str, Tuple[int, Dict[str, Tuple[bool, int, int]]]] = {}
+        self._order: List[str] = []
+        self._order_dirty = True
+        self._cursor = 0
+        self._next_poll = 0.0
+
+        if seed is not None:
+            self._load_seed(seed)
+        else:
+            for root in roots:
+                self._scan_tree(root)
+        self.logger.info(f"👀 Опрос: отслеживается папок {len(self._dirs)}")
+
+    def _load_seed(self, seed: Iterable[tuple]) -> None:
+        mtimes: Dict[str, int] = {}
+        children: Dict[str, Dict[str, Tuple[bool, int, int]]] = {root: {} for root in self.roots}
+        for path, parent, name, is_dir, size, mtime_ns in seed:
+            children.setdefault(parent, {})[name] = (bool(is_dir), size, mtime_ns)
+            if is_dir:
+                mtimes[path] = mtime_ns
+                children.setdefault(path, {})
+        for path, entries in children.items():
+            # у корня нет строки в индексе: -1 заставит перечитать его на первом цикле
+            self._dirs[path] = (mtimes.get(path, -1), entries)
+
+    def _list(self, path: str) -> Optional[Dict[str, Tuple[bool, int, int]]]:
+        entries: Dict[str, Tuple[bool, int, int]] = {}
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        st = entry.stat(follow_symlinks=False)
+                        entries[entry.name] = (entry.is_dir(follow_symlinks=False), st.st_size, st.st_mtime_ns)
+                    except OSError:
+                        continue
+        except OSError:
+            return None
+        return entries
+
+    def _scan_tree(self, top: str) -> None:
+        stack = [top]
+        while stack:
+            current = stack.pop()
+            try:
+                mtime = os.stat(current).st_mtime_ns
+            except OSError:
+                continue
+            entries = self._list(current)
+            if entries is None:
+                continue
+            self._dirs[current] = (mtime, entries)
+            stack.extend(os.path.join(current, n) for n, (d, _, _) in entries.items() if d)
+        self._order_dirty = True
+
+    def _forget_tree(self, top: str) -> None:
+        prefix = top + os.sep
+        for path in [p for p in self._dirs if p == top or p.startswith(prefix)]:
+            del self._dirs[path]
+        self._order_dirty = True
+
+    def _diff_dir(self, path: str, old: Dict[str, tuple], new: Dict[str, tuple], events: List[FileChange]) -> None:
+        removed = {n: old[n] for n in old.keys() - new.keys()}
+        added = {n: new[n] for n in new.keys() - old.keys()}
+
+        # переименование в пределах папки: совпадают (is_dir, size, mtime_ns), и пара однозначна
+        by_key: Dict[tuple, List[str]] = {}
+        for n, attrs in removed.items():
+            by_key.setdefault(attrs, []).append(n)
+        for n in list(added):
+            candidates = by_key.get(added[n])
+            if candidates and len(candidates) == 1:
+                src_name = candidates.pop()
+                src, dst = os.path.join(path, src_name), os.path.join(path, n)
+                events.append(FileChange(ChangeKind.MOVED, src, dst))
+                if added[n][0]:
+                    self._forget_tree(src)
+                    self._scan_tree(dst)
+                del removed[src_name], added[n]
+
+        for n, (is_dir, _, _) in removed.items():
+            events.append(FileChange(ChangeKind.DELETED, os.path.join(path, n)))
+            if is_dir:
+                self._forget_tree(os.path.join(path, n))
+        for n, (is_dir, _, _) in added.items():
+            events.append(FileChange(ChangeKind.CREATED, os.path.join(path, n)))
+            if is_dir:
+                self._scan_tree(os.path.join(path, n))
+        for n in old.keys() & new.keys():
+            if not new[n][0] and old[n] != new[n]:
+                events.append(FileChange(ChangeKind.MODIFIED, os.path.join(path, n)))
+
+    def poll(self) -> List[FileChange]:
+        """Один цикл опроса"""
+        events: List[FileChange] = []
+        for path in list(self._dirs):
+            if path not in self._dirs:
+                continue  # удалена в этом же цикле вместе с родителем
+            mtime, entries = self._dirs[path]
+            try:
+                current = os.stat(path).st_mtime_ns
+            except OSError:
+                continue  # исчезновение папки обработает её родитель
+            if current == mtime:
+                continue
+            fresh = self._list(path)
+            if fresh is None:
+                continue
+            self._dirs[path] = (current, fresh)
+            self._diff_dir(path, entries, fresh, events)
+
+        self._check_files(events)
+        return events
+
+    def _check_files(self, events: List[FileChange]) -> None:
+        """Скользящая перепроверка файлов: правка на месте не меняет mtime папки"""
+        if self._order_dirty:
+            self._order = list(self._dirs)
+            self._order_dirty = False
+            self._cursor %= max(1, len(self._order))
+        budget = self.stat_budget
+        visited = 0
+        while budget > 0 and visited < len(self._order):
+            path = self._order[self._cursor]
+            self._cursor = (self._cursor + 1) % len(self._order)
+            visited += 1
+            if path not in self._dirs:
+                continue
+            _, entries = self._dirs[path]
+            for name, attrs in list(entries.items()):
+                if attrs[0]:
+                    continue
+                budget -= 1
+                try:
+                    st = os.stat(os.path.join(path, name), follow_symlinks=False)
+                except OSError:
+                    continue
+                fresh = (False, st.st_size, st.st_mtime_ns)
+                if fresh != attrs:
+                    entries[name] = fresh
+                    events.append(FileChange(ChangeKind.MODIFIED, os.path.join(path, name)))
+
+    def read(self, timeout: float) -> List[FileChange]:
+        """
+        Ждёт очередной цикл опроса не дольше timeout секунд.
+        """
+        delay = self._next_poll - time.monotonic()
+        if delay > timeout:
+            time.sleep(timeout)
+            return []
+        if delay > 0:
+            time.sleep(delay)
+        self._next_poll = time.monotonic() + self.interval
+        return self.poll()
+
+    def close(self) -> None:
+        self._dirs.clear()
+
+
+class ChangeWatcher:
+    """
+    Служба наблюдения: собирает события, выжидает паузу (debounce), сворачивает пачку,
+    применяет её к индексу документов и рассылает подписчикам.
+    """
+
+    def __init__(
+        self,
+        roots: Optional[List[str]] = None,
+        debounce: float = 1.0,
+        max_latency: float = 10.0,
+        poll_interval: float = 5.0,
+        force_polling: bool = False,
+    ) -> None:
+        """
+        :param roots: корневые папки, по умолчанию PROJECT_FOLDER и ARCHIVE_FOLDER
+        :param debounce: пауза без событий, после которой пачка применяется, сек
+        :param max_latency: максимальная задержка применения при непрерывном потоке событий, сек
+        :param poll_interval: период опроса для переносимого режима, сек
+        :param force_polling: использовать опрос даже при доступном inotify
+        """
+        self.logger = LoggerManager(__name__).get_logger()
+        self.indexer = DocumentIndexer(roots)
+        self.roots = self.indexer.roots
+        self.debounce = debounce
+        self.max_latency = max_latency
+        self.poll_interval = poll_interval
+        self.force_polling = force_polling
+        self._subscribers: List[Subscriber] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(self, callback: Subscriber) -> Callable[[], None]:
+        """
+        Подписывает на ленту изменений. Колбэк вызывается из потока наблюдателя.
+
+        :return: функция отписки
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+        return unsubscribe
+
+    def _load_seed(self) -> List[tuple]:
+        DBInitDocuments().create_tables()
+        with get_db() as session:
+            repo = DocumentRepository(session)
+            return [row for root in self.roots for row in repo.iter_tree(root)]
+
+    def _make_backend(self):
+        seed = self._load_seed()
+        if not seed:
+            # индекс ещё пуст — наблюдение начинается после первичного обхода
+            self.indexer.crawl()
+            seed = self._load_seed()
+        if not self.force_polling and InotifyBackend.available():
+            try:
+                dirs = [path for path, _, _, is_dir, _, _ in seed if is_dir] if seed else None
+                return InotifyBackend(self.roots, dirs)
+            except OSError as e:
+                self.logger.warning(f"⚠️ inotify недоступен ({e}), переключаемся на опрос")
+        return PollingBackend(self.roots, self.poll_interval, seed=seed or None)
+
+    def start(self) -> None:
+        """Запускает наблюдение в фоновом потоке"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="ChangeWatcher", daemon=True)
+        self._thread.start()
+        self.logger.info(f"🚀 Наблюдатель запущен для {self.roots}")
+
+    def stop(self) -> None:
+        """Останавливает наблюдение и дожидается применения последней пачки"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.logger.info("🛑 Наблюдатель остановлен")
+
+    def _loop(self) -> None:
+        backend = self._make_backend()
+        buffer: List[FileChange] = []
+        first = last = 0.0
+        try:
+            while not self._stop.is_set():
+                events = backend.read(timeout=min(self.debounce, 0.5))
+                now = time.monotonic()
+                if events:
+                    if not buffer:
+                        first = now
+                    buffer.extend(events)
+                    last = now
+                if buffer and (now - last >= self.debounce or now - first >= self.max_latency):
+                    self._flush(buffer)
+                    buffer = []
+            if buffer:
+                self._flush(buffer)
+        except Exception:
+            self.logger.exception("Необработанное исключение в наблюдателе")
+            raise
+        finally:
+            backend.close()
+
+    def _flush(self, events: List[FileChange]) -> None:
+        batch = coalesce(events)
+        if not batch:
+            return
+        started = time.perf_counter()
+        if any(c.kind == ChangeKind.RESCAN for c in batch):
+            self.indexer.crawl()
+        else:
+            self.indexer.apply_changes(batch)
+        self.logger.info(
+            f"🔄 Применено изменений: {len(batch)} (событий {len(events)}) за {time.perf_counter() - started:.3f} с"
+        )
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(batch)
+            except Exception:
+                self.logger.exception("Ошибка в подписчике ленты изменений")
+
+
+if __name__ == "__main__":
+    def print_batch(batch) -> None:
+        for change in batch:
+            print(f"{change.kind.value}: {change.path} {change.dest_path or ''}")
+
+    watcher = ChangeWatcher([PathSettings.PROJECT_FOLDER])
+    watcher.subscribe(print_batch)
+    watcher.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        watcher.stop()
@@ -0,0 +1,282 @@
+# init_proj/doc_render.py
+# Заполнение шаблонов Word полями проекта: шаблон разбирается один раз, документы рендерятся пулом процессов 📝
+#
+# Разобранный шаблон — это части .docx, нарезанные на куски текста и имена полей,
+# плюс сырые (уже сжатые) байты остальных частей пакета. Рендер — join строк и
+# дозапись сырых байт, без повторного разбора XML и без пересжатия картинок.
+
+import os
+import re
+import zipfile
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from config.settings import TemplateSettings
+from utils.logger import LoggerManager
+from utils.word_com import _TEXT_PARTS, _text_xml, merge_split_placeholders
+from utils.zip_raw import member_spans, write_raw
+
+# Расширения файлов, которые считаются шаблонами документов
+TEMPLATE_EXTS = (".docx", ".dotx", ".docm", ".dotm")
+
+# Основной тип содержимого шаблона и документа (.dotx -> .docx)
+_CONTENT_TYPES = {
+    "wordprocessingml.template.main+xml": "wordprocessingml.document.main+xml",
+    "ms-word.template.macroEnabledTemplate.main+xml": "ms-word.document.macroEnabled.main+xml",
+}
+_OUT_EXT = {".dotx": ".docx", ".dotm": ".docm"}
+
+
+def _format(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.strftime("%d.%m.%Y") if not (value.hour or value.minute) else value.strftime("%d.%m.%Y %H:%M")
+    if isinstance(value, date):
+        return value.strftime("%d.%m.%Y")
+    if isinstance(value, bool):
+        return "Да" if value else "Нет"
+    return str(value)
+
+
+def model_fields(prefix: str, obj) -> Dict[str, str]:
+    """Все столбцы ORM-объекта как поля «prefix.столбец»"""
+    if obj is None:
+        return {}
+    return {f"{prefix}.{attr.key}": _format(getattr(obj, attr.key, None)) for attr in obj.__mapper__.column_attrs}
+
+
+def project_fields(project, vessel_type=None, class_society=None, customer=None, **extra) -> Dict[str, str]:
+    """
+    Поля подстановки проекта: project.*, vessel_type.*, class_society.*, customer.*
+    и произвольные дополнительные (ключ — имя поля).
+
+    Справочники, не переданные явно, берутся из одноимённых связей проекта, если они есть.
+    """
+    fields = model_fields("project", project)
+    for prefix, obj in (("vessel_type", vessel_type), ("class_society", class_society), ("customer", customer)):
+        fields.update(model_fields(prefix, obj if obj is not None else getattr(project, prefix, None)))
+    fields.update({k: _format(v) for k, v in extra.items()})
+    return fields
+
+
+@dataclass
+class CompiledTemplate:
+    """
+    Шаблон, готовый к рендеру.
+
+    :param parts: часть -> (куски текста, имена полей); кусков на один больше, чем полей
+    :param raw: сырые байты остальных частей в порядке пакета: (ZipInfo, локальный заголовок + данные)
+    :param order: порядок всех частей пакета
+    """
+    path: str
+    parts: Dict[str, Tuple[List[str], List[str]]]
+    raw: Dict[str, Tuple[zipfile.ZipInfo, bytes]]
+    order: List[str]
+    placeholders: frozenset = field(default_factory=frozenset)
+
+    def render_part(self, name: str, values: Mapping[str, str]) -> str:
+        chunks, slots = self.parts[name]
+        out = [chunks[0]]
+        for slot, chunk in zip(slots, chunks[1:]):
+            value = values.get(slot)
+            out.append(_text_xml(value) if value is not None else "{{" + slot + "}}")
+            out.append(chunk)
+        return "".join(out)
+
+    def render(self, values: Mapping[str, str], out_path: str) -> None:
+        """Пишет заполненный документ через временный .part"""
+        part = out_path + ".part"
+        try:
+            with zipfile.ZipFile(part, "w", zipfile.ZIP_DEFLATED, compresslevel=6) as zf:
+                for name in self.order:
+                    if name in self.parts:
+                        zf.writestr(name, self.render_part(name, values))
+                        continue
+                    info, data = self.raw[name]
+                    write_raw(zf, info, [data])
+            os.replace(part, out_path)
+        except BaseException:
+            if os.path.exists(part):
+                os.remove(part)
+            raise
+
+
+def compile_template(path: str, pattern: str = TemplateSettings.PLACEHOLDER_PATTERN) -> CompiledTemplate:
+    """Разбирает шаблон: текстовые части нарезаются по полям, остальные берутся сырыми байтами"""
+    regex = re.compile(pattern)
+    parts: Dict[str, Tuple[List[str], List[str]]] = {}
+    raw: Dict[str, Tuple[zipfile.ZipInfo, bytes]] = {}
+    found = set()
+    with open(path, "rb") as f:
+        blob = f.read()
+    with zipfile.ZipFile(path) as zf:
+        infos = zf.infolist()
+        spans = member_spans(zf)
+        for info in infos:
+            name = info.filename
+            if _TEXT_PARTS.match(name) or name == "[Content_Types].xml":
+                xml = zf.read(name).decode("utf-8")
+                if name == "[Content_Types].xml":
+                    for src, dst in _CONTENT_TYPES.items():
+                        xml = xml.replace(src, dst)
+                    parts[name] = ([xml], [])
+                    continue
+                xml = merge_split_placeholders(xml, regex)
+                chunks, slots = [], []
+                last = 0
+                for m in regex.finditer(xml):
+                    chunks.append(xml[last:m.start()])
+                    slots.append(m.group(1))
+                    last = m.end()
+                chunks.append(xml[last:])
+                parts[name] = (chunks, slots)
+                found.update(slots)
+            else:
+                start, end = spans[name]
+                raw[name] = (info, blob[start:end])
+    return CompiledTemplate(path, parts, raw, [i.filename for i in infos], frozenset(found))
+
+
+@lru_cache(maxsize=TemplateSettings.RENDER_CACHE_SIZE)
+def _cached(path: str, mtime_ns: int, size: int) -> CompiledTemplate:
+    return compile_template(path)
+
+
+def get_template(path: str) -> CompiledTemplate:
+    """Разобранный шаблон из кэша процесса; ключ — путь, mtime и размер, поэтому правка шаблона видна сразу"""
+    st = os.stat(path)
+    return _cached(os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+
+def render_document(template: str, values: Mapping[str, str], out_path: str) -> str:
+    """Заполняет один документ. Функция верхнего уровня — её вызывают процессы пула"""
+    get_template(template).render(values, out_path)
+    return out_path
+
+
+@dataclass
+class RenderJob:
+    """Один документ: шаблон, поля и файл результата"""
+    template: str
+    out_path: str
+    values: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class RenderReport:
+    """Итог пакетного рендера"""
+    rendered: List[str] = field(default_factory=list)
+    failed: List[Tuple[str, str]] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+
+def _render_chunk(jobs: List[RenderJob]) -> Tuple[List[str], List[Tuple[str, str]]]:
+    """Пачка заданий одного процесса: шаблон разбирается один раз на процесс"""
+    done, failed = [], []
+    for job in jobs:
+        try:
+            done.append(render_document(job.template, job.values, job.out_path))
+        except Exception as e:
+            failed.append((job.out_path, f"{type(e).__name__}: {e}"))
+    return done, failed
+
+
+class DocumentRenderer:
+    """
+    Пакетный рендер документов проекта по шаблонам.
+    Задания группируются по шаблону, чтобы каждый процесс пула разбирал шаблон один раз.
+    """
+
+    def __init__(self, workers: Optional[int] = TemplateSettings.RENDER_WORKERS, cache=None) -> None:
+        """
+        :param workers: число процессов (None — по числу ядер; 1 — в текущем процессе)
+        :param cache: TemplateCache — брать шаблоны из локального зеркала, а не с шары
+        """
+        self.logger = LoggerManager(__name__).get_logger()
+        self.workers = workers or os.cpu_count() or 1
+        self.cache = cache
+
+    def render(self, jobs: Iterable[RenderJob]) -> RenderReport:
+        jobs = sorted(jobs, key=lambda j: j.template)
+        report = RenderReport()
+        if not jobs:
+            return report
+        for job in jobs:
+            os.makedirs(os.path.dirname(os.path.abspath(job.out_path)), exist_ok=True)
+        self.logger.info(f"🚀 Рендер документов: {len(jobs)}, процессов {min(self.workers, len(jobs))}")
+
+        if self.workers == 1 or len(jobs) == 1:
+            chunks = [jobs]
+            results = map(_render_chunk, chunks)
+            pool = None
+        else:
+            size = max(1, -(-len(jobs) // (self.workers * 2)))
+            chunks = [jobs[i:i + size] for i in range(0, len(jobs), size)]
+            pool = ProcessPoolExecutor(max_workers=min(self.workers, len(chunks)))
+            results = pool.map(_render_chunk, chunks)
+        try:
+            for done, failed in results:
+                report.rendered.extend(done)
+                report.failed.extend(failed)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        for path, error in report.failed:
+            self.logger.error(f"❌ Не удалось заполнить {path}: {error}")
+        self.logger.info(f"🎉 Документов готово: {len(report.rendered)}, ошибок {len(report.failed)}")
+        return report
+
+    def _template_files(self, template: str) -> List[Tuple[str, str]]:
+        """Файлы шаблона: [(путь, относительный путь)]; папка обходится целиком"""
+        source = os.path.normpath(getattr(template, "proj_template_path", template))
+        if self.cache is not None and os.path.isdir(source):
+            source = self.cache.get(source)
+        if os.path.isfile(source):
+            return [(source, os.path.basename(source))]
+        found = []
+        for dirpath, _, filenames in os.walk(source):
+            for name in filenames:
+                if name.lower().endswith(TEMPLATE_EXTS) and not name.startswith("~$"):
+                    path = os.path.join(dirpath, name)
+                    found.append((path, os.path.join(os.path.basename(source), os.path.relpath(path, source))))
+        return found
+
+    def render_project(self, fields: Mapping[str, str], templates: Iterable, out_dir: str) -> RenderReport:
+        """
+        Документы нового проекта одним пакетом.
+
+        :param fields: поля подстановки (см. project_fields)
+        :param templates: файлы/папки шаблонов или объекты ProjTemplates
+        :param out_dir: папка проекта; структура папок шаблона сохраняется
+        """
+        pattern = re.compile(TemplateSettings.PLACEHOLDER_PATTERN)
+        jobs = []
+        for template in templates:
+            for path, rel in self._template_files(template):
+                stem, ext = os.path.splitext(rel)
+                # поля можно ставить и в имена файлов: «{{project.name}} PWOM.dotx»
+                stem = pattern.sub(lambda m: fields.get(m.group(1), m.group(0)), stem)
+                jobs.append(RenderJob(path, os.path.join(out_dir, stem + _OUT_EXT.get(ext.lower(), ext)), dict(fields)))
+        return self.render(jobs)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Заполнение шаблонов Word полями проекта")
+    parser.add_argument("out_dir", help="папка проекта")
+    parser.add_argument("templates", nargs="+", help="файлы или папки шаблонов")
+    parser.add_argument("--field", action="append", default=[], metavar="ИМЯ=ЗНАЧЕНИЕ", help="поле подстановки")
+    parser.add_argument("--workers", type=int, default=TemplateSettings.RENDER_WORKERS, help="число процессов")
+    args = parser.parse_args()
+
+    values = dict(item.split("=", 1) for item in args.field)
+    result = DocumentRenderer(args.workers).render_project(values, args.templates, args.out_dir)
+    raise SystemExit(0 if result.ok else 1)
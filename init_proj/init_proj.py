@@ -1,8 +1,12 @@
 # init_proj/init_proj.py
+import time  # 😊 замер времени запуска
+_IMPORT_STARTED: float = time.perf_counter()  # 😊 до импорта Qt: отсчёт, если модуль запущен сам по себе
 import sys  # 😊 для работы с аргументами командной строки
 from utils.logger import LoggerManager  # 😊 централизованное логирование
-from PyQt6 import QtWidgets  # 😊 основные виджеты Qt
+from utils.profiler import Profiler, qt_application_class  # 😊 профилирование по требованию
+from PyQt6 import QtWidgets, QtCore  # 😊 основные виджеты Qt
 from init_proj.init_proj_ui import InitWindow  # 😊 импорт главного окна
+from init_proj.startup import StartupOrchestrator  # 😊 фоновая загрузка БД и справочников
 
 
 class InitProj:
@@ -10,13 +14,17 @@ class InitProj:
     Класс инициализации проекта: настройка логирования и запуск GUI.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, startup=None, started: float = None) -> None:
+        """
+        :param startup: начатый участок профилирования запуска (из pmis/main); None — начать здесь
+        :param started: момент начала запуска (time.perf_counter); None — импорт этого модуля
+        """
         # Настройка логирования
         self.logger = LoggerManager(__name__).get_logger()  # 😊 создаём логгер
         self.logger.info("Запуск InitProj")
 
         try:
-            self.gui_run()
+            self.gui_run(startup, started)
         except Exception:
             self.logger.exception("Необработанное исключение при инициализации GUI")  # 😊 логируем стектрейс
             raise  # пробрасываем для внешнего анализа
@@ -29,20 +37,51 @@ class InitProj:
         # TODO: реализовать логику
         pass
 
-    def gui_run(self) -> None:
+    def gui_run(self, startup=None, started: float = None) -> None:
         """
         Создаёт QApplication и показывает главное окно.
         """
-        # Создаём приложение Qt
-        app: QtWidgets.QApplication = QtWidgets.QApplication(sys.argv)  # 😊
+        profiler = Profiler.shared()
+        if startup is None:
+            startup = profiler.begin("startup")
+        marks = {"started": _IMPORT_STARTED if started is None else started, "imports": time.perf_counter()}
+
+        # Создаём приложение Qt (при профилировании — с замером кликов и клавиш)
+        app: QtWidgets.QApplication = qt_application_class()(sys.argv)  # 😊
+        marks["app"] = time.perf_counter()
 
         # Создаём и показываем главное окно
         window: InitWindow = InitWindow()  # 😊
+        marks["window"] = time.perf_counter()
         window.show()  # 😊
+        marks["show"] = time.perf_counter()
 
         self.logger.info("Главное окно отображено")
+        profiler.end(startup)
+        # первый проход цикла событий — окно уже отрисовано: теперь БД и справочники в фоне
+        self.orchestrator = StartupOrchestrator(window)
+
+        def painted() -> None:
+            self.log_startup(marks)
+            self.orchestrator.start()
+
+        QtCore.QTimer.singleShot(0, painted)
         sys.exit(app.exec())  # 😊 старт цикла событий
 
+    def log_startup(self, marks: dict) -> None:
+        """
+        Пишет в лог время запуска по этапам: импорты, QApplication, окно, показ, первая отрисовка.
+        """
+        marks["painted"] = time.perf_counter()
+        names = list(marks)
+        phases = {name: round((marks[name] - marks[prev]) * 1000, 1) for prev, name in zip(names, names[1:])}
+        total = marks["painted"] - marks["started"]
+        self.logger.info(
+            f"🚀 Окно на экране через {total * 1000:.0f} мс: "
+            + ", ".join(f"{name} {ms:.0f}" for name, ms in phases.items()) + " мс",
+            extra={"duration": total, "context": phases},
+        )
+
     def get_data(self) -> None:
         """
         Получение необходимых данных для инициализации.
@@ -0,0 +1,348 @@
+# ui-hash: 23698e8dc17d24f17a24d6b7c8c221e5
+# Сгенерировано из init_proj.ui, не редактировать: правки вносятся в .ui
+# Form implementation generated from reading ui file 'init_proj.ui'
+#
+# Created by: PyQt6 UI code generator 6.9.0
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic6 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt6 import QtCore, QtGui, QtWidgets
+
+
+class Ui_MW_init_proj(object):
+    def setupUi(self, MW_init_proj):
+        MW_init_proj.setObjectName("MW_init_proj")
+        MW_init_proj.resize(1031, 645)
+        self.centralwidget = QtWidgets.QWidget(parent=MW_init_proj)
+        self.centralwidget.setObjectName("centralwidget")
+        self.label = QtWidgets.QLabel(parent=self.centralwidget)
+        self.label.setGeometry(QtCore.QRect(10, 60, 171, 41))
+        font = QtGui.QFont()
+        font.setFamily("Arial Narrow")
+        font.setPointSize(10)
+        font.setBold(True)
+        font.setWeight(75)
+        self.label.setFont(font)
+        self.label.setStyleSheet("/* отступ со всех сторон: */\n"
+"padding: 6px;\n"
+"/* можно также задать рамку, если нужно */\n"
+"border: 1px solid #ccc;\n"
+"border-radius: 3px;\n"
+"")
+        self.label.setFrameShape(QtWidgets.QFrame.Shape.WinPanel)
+        self.label.setObjectName("label")
+        self.label_2 = QtWidgets.QLabel(parent=self.centralwidget)
+        self.label_2.setGeometry(QtCore.QRect(10, 100, 171, 41))
+        font = QtGui.QFont()
+        font.setFamily("Arial Narrow")
+        font.setPointSize(10)
+        font.setBold(True)
+        font.setWeight(75)
+        self.label_2.setFont(font)
+        self.label_2.setStyleSheet("/* отступ со всех сторон: */\n"
+"padding: 6px;\n"
+"/* можно также задать рамку, если нужно */\n"
+"border: 1px solid #ccc;\n"
+"border-radius: 3px;\n"
+"")
+        self.label_2.setFrameShape(QtWidgets.QFrame.Shape.WinPanel)
+        self.label_2.setObjectName("label_2")
+        self.label_3 = QtWidgets.QLabel(parent=self.centralwidget)
+        self.label_3.setGeometry(QtCore.QRect(10, 140, 171, 41))
+        font = QtGui.QFont()
+        font.setFamily("Arial Narrow")
+        font.setPointSize(10)
+        font.setBold(True)
+        font.setWeight(75)
+        self.label_3.setFont(font)
+        self.label_3.setStyleSheet("/* отступ со всех сторон: */\n"
+"padding: 6px;\n"
+"/* можно также задать рамку, если нужно */\n"
+"border: 1px solid #ccc;\n"
+"border-radius: 3px;\n"
+"")
+        self.label_3.setFrameShape(QtWidgets.QFrame.Shape.WinPanel)
+        self.label_3.setObjectName("label_3")
+        self.label_4 = QtWidgets.QLabel(parent=self.centralwidget)
+        self.label_4.setGeometry(QtCore.QRect(10, 180, 171, 41))
+        font = QtGui.QFont()
+        font.setFamily("Arial Narrow")
+        font.setPointSize(10)
+        font.setBold(True)
+        font.setWeight(75)
+        self.label_4.setFont(font)
+        self.label_4.setStyleSheet("/* отступ со всех сторон: */\n"
+"padding: 6px;\n"
+"/* можно также задать рамку, если нужно */\n"
+"border: 1px solid #ccc;\n"
+"border-radius: 3px;\n"
+"")
+        self.label_4.setFrameShape(QtWidgets.QFrame.Shape.WinPanel)
+        self.label_4.setObjectName("label_4")
+        self.label_5 = QtWidgets.QLabel(parent=self.centralwidget)
+        self.label_5.setGeometry(QtCore.QRect(10, 220, 171, 41))
+        font = QtGui.QFont()
+        font.setFamily("Arial Narrow")
+        font.setPointSize(10)
+        font.setBold(True)
+        font.setWeight(75)
+        self.label_5.setFont(font)
+        self.label_5.setStyleSheet("/* отступ со всех сторон: */\n"
+"padding: 6px;\n"
+"/* можно также задать рамку, если нужно */\n"
+"border: 1px solid #ccc;\n"
+"border-radius: 3px;\n"
+"")
+        self.label_5.setFrameShape(QtWidgets.QFrame.Shape.WinPanel)
+        self.label_5.setObjectName("label_5")
+        self.label_6 = QtWidgets.QLabel(parent=self.centralwidget)
+        self.label_6.setGeometry(QtCore.QRect(10, 300, 171, 41))
+        font = QtGui.QFont()
+        font.setFamily("Arial Narrow")
+        font.setPointSize(10)
+        font.setBold(True)
+        font.setWeight(75)
+        self.label_6.setFont(font)
+        self.label_6.setStyleSheet("/* отступ со всех сторон: */\n"
+"padding: 6px;\n"
+"/* можно также задать рамку, если нужно */\n"
+"border: 1px solid #ccc;\n"
+"border-radius: 3px;\n"
+"")
+        self.label_6.setFrameShape(QtWidgets.QFrame.Shape.WinPanel)
+        self.label_6.setObjectName("label_6")
+        self.label_7 = QtWidgets.QLabel(parent=self.centralwidget)
+        self.label_7.setGeometry(QtCore.QRect(10, 340, 171, 41))
+        font = QtGui.QFont()
+        font.setFamily("Arial Narrow")
+        font.setPointSize(10)
+        font.setBold(True)
+        font.setWeight(75)
+        self.label_7.setFont(font)
+        self.label_7.setStyleSheet("/* отступ со всех сторон: */\n"
+"padding: 6px;\n"
+"/* можно также задать рамку, если нужно */\n"
+"border: 1px solid #ccc;\n"
+"border-radius: 3px;\n"
+"")
+        self.label_7.setFrameShape(QtWidgets.QFrame.Shape.WinPanel)
+        self.label_7.setObjectName("label_7")
+        self.PTE_date = QtWidgets.QPlainTextEdit(parent=self.centralwidget)
+        self.PTE_date.setGeometry(QtCore.QRect(180, 60, 371, 41))
+        font = QtGui.QFont()
+        font.setFamily("Arial Narrow")
+        font.setPointSize(10)
+        self.PTE_date.setFont(font)
+        self.PTE_date.setStyleSheet("/* отступ со всех сторон: */\n"
+"padding: 6px;\n"
+"/* можно также задать рамку, если нужно */\n"
+"border: 2px solid #000000;\n"
+"border-radius: 3px;\n"
+"")
+        self.PTE_date.setPlainText("")
+        self.PTE_date.setObjectName("PTE_date")
+        self.PTE_proj_number = QtWidgets.QPlainTextEdit(parent=self.centralwidget)
+        self.PTE_proj_number.setGeometry(QtCore.QRect(180, 100, 371, 41))
+        font = QtGui.QFont()
+        font.setFamily("Arial Narrow")
+        font.setPointSize(10)
+        self.PTE_proj_number.setFont(font)
+        self.PTE_proj_number.setStyleSheet("/* отступ со всех сторон: */\n"
+"padding: 6px;\n"
+"/* можно также задать рамку, если нужно */\n"
+"border: 2px solid #000000;\n"
+"border-radius: 3px;\n"
+"")
+        self.PTE_proj_number.setPlainText("")
+        self.PTE_proj_number.setObjectName("PTE_proj_number")
+        self.PTE_proj_object = QtWidgets.QPlainTextEdit(parent=self.centralwidget)
+        self.PTE_proj_object.setGeometry(QtCore.QRect(180, 140, 371, 41))
+        font = QtGui.QFont()
+        font.setFamily("Arial Narrow")
+        font.setPointSize(10)
+        self.PTE_proj_object.setFont(font)
+        self.PTE_proj_object.setStyleSheet("/* отступ со всех сторон: */\n"
+"padding: 6px;\n"
+"/* можно также задать рамку, если нужно */\n"
+"border: 2px solid #000000;\n"
+"border-radius: 3px;\n"
+"")
+        self.PTE_proj_object.setPlainText("")
+        self.PTE_proj_object.setObjectName("PTE_proj_object")
+        self.PTE_proj_name = QtWidgets.QPlainTextEdit(parent=self.centralwidget)
+        self.PTE_proj_name.setGeometry(QtCore.QRect(180, 180, 371, 41))
+        font = QtGui.QFont()
+        font.setFamily("Arial Narrow")
+        font.setPointSize(10)
+        self.PTE_proj_name.setFont(font)
+        self.PTE_proj_name.setStyleSheet("/* отступ со всех сторон: */\n"
+"padding: 6px;\n"
+"/* можно также задать рамку, если нужно */\n"
+"border: 2px solid #000000;\n"
+"border-radius: 3px;\n"
+"")
+        self.PTE_proj_name.setObjectName("PTE_proj_name")
+        self.PTE_proj_type = QtWidgets.QPlainTextEdit(parent=self.centralwidget)
+        self.PTE_proj_type.setGeometry(QtCore.QRect(180, 220, 371, 41))
+        font = QtGui.QFont()
+        font.setFamily("Arial Narrow")
+        font.setPointSize(10)
+        self.PTE_proj_type.setFont(font)
+        self.PTE_proj_type.setStyleSheet("/* отступ со всех сторон: */\n"
+"padding: 6px;\n"
+"/* можно также задать рамку, если нужно */\n"
+"border: 2px solid #000000;\n"
+"border-radius: 3px;\n"
+"")
+        self.PTE_proj_type.setObjectName("PTE_proj_type")
+        self.PTE_proj_description = QtWidgets.QPlainTextEdit(parent=self.centralwidget)
+        self.PTE_proj_description.setGeometry(QtCore.QRect(180, 300, 371, 41))
+        font = QtGui.QFont()
+        font.setFamily("Arial Narrow")
+        font.setPointSize(10)
+        self.PTE_proj_description.setFont(font)
+        self.PTE_proj_description.setStyleSheet("/* отступ со всех сторон: */\n"
+"padding: 6px;\n"
+"/* можно также задать рамку, если нужно */\n"
+"border: 2px solid #000000;\n"
+"border-radius: 3px;\n"
+"")
+        self.PTE_proj_description.setObjectName("PTE_proj_description")
+        self.PTE_proj_path = QtWidgets.QPlainTextEdit(parent=self.centralwidget)
+        self.PTE_proj_path.setGeometry(QtCore.QRect(180, 340, 371, 41))
+        font = QtGui.QFont()
+        font.setFamily("Arial Narrow")
+        font.setPointSize(10)
+        self.PTE_proj_path.setFont(font)
+        self.PTE_proj_path.setStyleSheet("/* отступ со всех сторон: */\n"
+"padding: 6px;\n"
+"/* можно также задать рамку, если нужно */\n"
+"border: 2px solid #000000;\n"
+"border-radius: 3px;\n"
+"")
+        self.PTE_proj_path.setObjectName("PTE_proj_path")
+        self.pushButton = QtWidgets.QPushButton(parent=self.centralwidget)
+        self.pushButton.setGeometry(QtCore.QRect(560, 140, 201, 41))
+        font = QtGui.QFont()
+        font.setFamily("Arial Narrow")
+        font.setPointSize(10)
+        self.pushButton.setFont(font)
+        self.pushButton.setStyleSheet("background-color: #0078d7;  /* синий фон */\n"
+"    color: white;               /* белый текст */\n"
+"    padding: 6px 12px;          /* отступы внутри */\n"
+"    border: 1px solid #005a9e;  /* тёмно-синяя рамка */\n"
+"    border-radius: 8px;         /* закруглённые углы */")
+        self.pushButton.setObjectName("pushButton")
+        self.pushButton_2 = QtWidgets.QPushButton(parent=self.centralwidget)
+        self.pushButton_2.setGeometry(QtCore.QRect(560, 340, 201, 41))
+        font = QtGui.QFont()
+        font.setFamily("Arial Narrow")
+        font.setPointSize(10)
+        self.pushButton_2.setFont(font)
+        self.pushButton_2.setStyleSheet("background-color: #0078d7;  /* синий фон */\n"
+"    color: white;               /* белый текст */\n"
+"    padding: 6px 12px;          /* отступы внутри */\n"
+"    border: 1px solid #005a9e;  /* тёмно-синяя рамка */\n"
+"    border-radius: 8px;         /* закруглённые углы */")
+        self.pushButton_2.setObjectName("pushButton_2")
+        self.pushButton_3 = QtWidgets.QPushButton(parent=self.centralwidget)
+        self.pushButton_3.setGeometry(QtCore.QRect(560, 100, 201, 41))
+        font = QtGui.QFont()
+        font.setFamily("Arial Narrow")
+        font.setPointSize(10)
+        self.pushButton_3.setFont(font)
+        self.pushButton_3.setStyleSheet("background-color: #0078d7;  /* синий фон */\n"
+"    color: white;               /* белый текст */\n"
+"    padding: 6px 12px;          /* отступы внутри */\n"
+"    border: 1px solid #005a9e;  /* тёмно-синяя рамка */\n"
+"    border-radius: 8px;         /* закруглённые углы */")
+        self.pushButton_3.setObjectName("pushButton_3")
+        self.label_8 = QtWidgets.QLabel(parent=self.centralwidget)
+        self.label_8.setGeometry(QtCore.QRect(10, 260, 171, 41))
+        font = QtGui.QFont()
+        font.setFamily("Arial Narrow")
+        font.setPointSize(10)
+        font.setBold(True)
+        font.setWeight(75)
+        self.label_8.setFont(font)
+        self.label_8.setStyleSheet("/* отступ со всех сторон: */\n"
+"padding: 6px;\n"
+"/* можно также задать рамку, если нужно */\n"
+"border: 1px solid #ccc;\n"
+"border-radius: 3px;\n"
+"")
+        self.label_8.setFrameShape(QtWidgets.QFrame.Shape.WinPanel)
+        self.label_8.setObjectName("label_8")
+        self.comboBox = QtWidgets.QComboBox(parent=self.centralwidget)
+        self.comboBox.setGeometry(QtCore.QRect(180, 260, 371, 41))
+        font = QtGui.QFont()
+        font.setFamily("Arial Narrow")
+        font.setPointSize(10)
+        self.comboBox.setFont(font)
+        self.comboBox.setStyleSheet("/* отступ со всех сторон: */\n"
+"padding: 6px;\n"
+"/* можно также задать рамку, если нужно */\n"
+"border: 2px solid #000000;\n"
+"border-radius: 3px;\n"
+"")
+        self.comboBox.setObjectName("comboBox")
+        self.label_9 = QtWidgets.QLabel(parent=self.centralwidget)
+        self.label_9.setGeometry(QtCore.QRect(10, 410, 171, 41))
+        font = QtGui.QFont()
+        font.setFamily("Arial Narrow")
+        font.setPointSize(10)
+        font.setBold(True)
+        font.setWeight(75)
+        self.label_9.setFont(font)
+        self.label_9.setStyleSheet("/* отступ со всех сторон: */\n"
+"padding: 6px;\n"
+"/* можно также задать рамку, если нужно */\n"
+"border: 1px solid #ccc;\n"
+"border-radius: 3px;\n"
+"")
+        self.label_9.setFrameShape(QtWidgets.QFrame.Shape.WinPanel)
+        self.label_9.setObjectName("label_9")
+        self.pushButton_4 = QtWidgets.QPushButton(parent=self.centralwidget)
+        self.pushButton_4.setGeometry(QtCore.QRect(310, 440, 201, 41))
+        font = QtGui.QFont()
+        font.setFamily("Arial Narrow")
+        font.setPointSize(10)
+        self.pushButton_4.setFont(font)
+        self.pushButton_4.setStyleSheet("background-color: #0078d7;  /* синий фон */\n"
+"    color: white;               /* белый текст */\n"
+"    padding: 6px 12px;          /* отступы внутри */\n"
+"    border: 1px solid #005a9e;  /* тёмно-синяя рамка */\n"
+"    border-radius: 8px;         /* закруглённые углы */")
+        self.pushButton_4.setObjectName("pushButton_4")
+        MW_init_proj.setCentralWidget(self.centralwidget)
+        self.statusbar = QtWidgets.QStatusBar(parent=MW_init_proj)
+        self.statusbar.setObjectName("statusbar")
+        MW_init_proj.setStatusBar(self.statusbar)
+
+        self.retranslateUi(MW_init_proj)
+        QtCore.QMetaObject.connectSlotsByName(MW_init_proj)
+
+    def retranslateUi(self, MW_init_proj):
+        _translate = QtCore.QCoreApplication.translate
+        MW_init_proj.setWindowTitle(_translate("MW_init_proj", "MainWindow"))
+        self.label.setText(_translate("MW_init_proj", "Дата создания проекта"))
+        self.label_2.setText(_translate("MW_init_proj", "№ проекта"))
+        self.label_3.setText(_translate("MW_init_proj", "Объект проекта"))
+        self.label_4.setText(_translate("MW_init_proj", "Название проекта"))
+        self.label_5.setText(_translate("MW_init_proj", "Тип проекта"))
+        self.label_6.setText(_translate("MW_init_proj", "Описание проекта"))
+        self.label_7.setText(_translate("MW_init_proj", "Путь проекта"))
+        self.PTE_date.setPlaceholderText(_translate("MW_init_proj", "Дата создания проекта ДД.ММ.ГГГГ"))
+        self.PTE_proj_number.setPlaceholderText(_translate("MW_init_proj", "XXXXX"))
+        self.PTE_proj_object.setPlaceholderText(_translate("MW_init_proj", "Объект проекта"))
+        self.PTE_proj_name.setPlainText(_translate("MW_init_proj", "Новое судно"))
+        self.PTE_proj_description.setPlainText(_translate("MW_init_proj", "при необходимости..."))
+        self.PTE_proj_path.setPlainText(_translate("MW_init_proj", "\\\\192.168.1.98\\project"))
+        self.pushButton.setText(_translate("MW_init_proj", "Сведения"))
+        self.pushButton_2.setText(_translate("MW_init_proj", "Выбрать путь"))
+        self.pushButton_3.setText(_translate("MW_init_proj", "Открыть журнал"))
+        self.label_8.setText(_translate("MW_init_proj", "Шаблон проекта"))
+        self.label_9.setText(_translate("MW_init_proj", "Путь проекта"))
+        self.pushButton_4.setText(_translate("MW_init_proj", "Выбрать путь"))
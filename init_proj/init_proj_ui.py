@@ -1,11 +1,20 @@
 # init_proj_ui/init_proj_ui.py
 
 import os  # 😊 для работы с путями
-from PyQt6 import uic, QtWidgets  # 😊 Qt Designer UI и виджеты
+from typing import Dict, List  # 😊 аннотации справочников
+from PyQt6 import QtWidgets  # 😊 виджеты
 from utils.logger import LoggerManager  # 😊 централизованное логирование
+from utils.ui_compiler import load_form  # 😊 форма, заранее собранная из .ui
+from utils.task_pool import TaskManager  # 😊 долгие операции в пуле потоков
+from utils.search_completer import SearchCompleter  # 😊 поиск при вводе
 
+# Путь до .ui-файла; собранный из него модуль — init_proj_form.py рядом
+UI_PATH: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "init_proj.ui")
+# Класс формы (Ui_MW_init_proj); пересобирается, если .ui изменился
+Ui_InitWindow = load_form(UI_PATH)
 
-class InitWindow(QtWidgets.QMainWindow):
+
+class InitWindow(QtWidgets.QMainWindow, Ui_InitWindow):
     """
     Главное окно приложения с выпадающим списком (ComboBox).
     """
@@ -14,19 +23,80 @@ class InitWindow(QtWidgets.QMainWindow):
         # Инициализация логера
         self.logger = LoggerManager(__name__).get_logger()  # 😊 создаём логгер для окна
 
-        # Получаем путь до .ui-файла
-        root_dir: str = os.path.abspath(
-            os.path.join(os.path.dirname(__file__), os.pardir)
-        )  # 😊 корень проекта
-
-        ui_path: str = os.path.join(
-            root_dir,
-            "init_proj",
-            "init_proj.ui"
-        )  # 😊 путь до UI
-        uic.loadUi(ui_path, self)  # 😊 загружаем форму
+        self.setupUi(self)  # 😊 строим форму без разбора XML
         self.logger.info("UI загружен для InitWindow")
 
+        # Справочники приходят из фонового потока (init_proj/startup.py); до этого — заглушки
+        self.catalogs: Dict[str, List[tuple]] = {}
+        self.show_placeholders()
+
+        # Долгие операции (папки, шаблоны, журнал) — только через self.tasks.submit(...)
+        self.tasks = TaskManager(parent=self)
+        self.tasks.bind_statusbar(self.statusbar)
+
+        # Поиск при вводе: шаблоны, типы проектов, объект (типы судов и заказчики)
+        self.template_search = SearchCompleter(self.comboBox, self.tasks)
+        self.type_search = SearchCompleter(self.PTE_proj_type, self.tasks)
+        self.object_search = SearchCompleter(self.PTE_proj_object, self.tasks)
+
+    def show_placeholders(self) -> None:
+        """Виджеты, которые ждут справочники, недоступны и подписаны «Загрузка…»"""
+        self.comboBox.clear()
+        self.comboBox.addItem("⏳ Загрузка шаблонов…")
+        self.comboBox.setEnabled(False)
+        self.PTE_proj_type.setReadOnly(True)
+        self.PTE_proj_type.setToolTip("⏳ Загрузка типов проектов…")
+        self.statusbar.showMessage("⏳ Подключение к базе данных…")
+
+    def set_loading(self, title: str, step: int, total: int) -> None:
+        """Ход фоновой загрузки — в строку состояния"""
+        self.statusbar.showMessage(f"⏳ Загрузка: {title} ({step}/{total})…")
+
+    def set_catalog(self, name: str, rows: List[tuple]) -> None:
+        """
+        Справочник загружен: сохраняем и заполняем связанные виджеты.
+
+        :param name: имя справочника (см. init_proj.startup.CATALOGS)
+        :param rows: строки (текст, данные)
+        """
+        self.catalogs[name] = rows
+        if name == "proj_templates":
+            self.comboBox.clear()
+            for title, path in rows:
+                self.comboBox.addItem(title, path)
+            self.comboBox.setEnabled(bool(rows))
+            if not rows:
+                self.comboBox.addItem("Шаблонов нет")
+            self.template_search.set_items(rows)
+        elif name == "proj_types":
+            types = [title for title, _ in rows]
+            self.PTE_proj_type.setReadOnly(False)
+            self.PTE_proj_type.setToolTip("Типы проектов: " + ", ".join(types) if types else "")
+            # поле остаётся пустым — тип выбирает пользователь, варианты только подсказкой
+            self.PTE_proj_type.setPlaceholderText(f"Например: {types[0]}" if types else "")
+            self.type_search.set_items(rows)
+        elif name in ("vessel_types", "customers"):
+            # у заказчика краткое имя ищется наравне с полным
+            objects = [(title, data) for title, data in self.catalogs.get("vessel_types", [])]
+            objects += [(title, short, short) for title, short in self.catalogs.get("customers", [])]
+            self.object_search.set_items(objects)
+
+    def catalog_failed(self, name: str, error: str) -> None:
+        """Справочник не загрузился: виджет снова доступен для ручного ввода"""
+        if name in ("engine", "proj_types"):
+            self.PTE_proj_type.setReadOnly(False)
+            self.PTE_proj_type.setToolTip("")
+        if name in ("engine", "proj_templates"):
+            self.comboBox.clear()
+            self.comboBox.addItem("⚠️ Шаблоны недоступны")
+            self.comboBox.setEnabled(True)  # show_placeholders его отключал
+        if name == "engine":
+            self.statusbar.showMessage(f"⚠️ База данных недоступна: {error}")
+
+    def loading_finished(self, timings: dict) -> None:
+        if "total" in timings:
+            self.statusbar.showMessage(f"✅ Справочники загружены за {timings['total']:.0f} мс", 5000)
+
     #     # Заполняем ComboBox примерами
     #     items: list[str] = ["Москва", "Петербург", "Казань"]
     #     self.comboBox.addItems(items)  # 😊 добавляем пункты
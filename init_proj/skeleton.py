@@ -0,0 +1,228 @@
+# init_proj/skeleton.py
+# Генератор скелета папок проекта по этапам жизненного цикла (NewLifeCycle / RefitLifeCycle) 🏗️
+
+import os
+import re
+import argparse
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import select, table, column
+from sqlalchemy.orm import Session
+
+from config.settings import PathSettings
+from utils.logger import LoggerManager
+from utils.task_token import TaskToken, ensure_token
+
+# Тип проекта -> (таблица жизненного цикла, колонка с названием этапа)
+LIFE_CYCLE_TABLES: Dict[str, Tuple[str, str]] = {
+    "НОВОЕ СУДНО": ("new_life_cycle", "new_life_cycle_name"),
+    "ПЕРЕОБОРУДОВАНИЕ": ("refit_life_cycle", "refit_life_cycle_name"),
+}
+
+# Символы, недопустимые в именах папок Windows
+_INVALID_CHARS = re.compile(r'[\\/:*?"<>|]')
+
+
+def safe_name(name: str) -> str:
+    """Приводит название проекта к допустимому имени папки"""
+    return _INVALID_CHARS.sub("_", name).strip().rstrip(".")
+
+
+def load_stages(session: Session) -> Dict[str, List[str]]:
+    """
+    Читает этапы жизненного цикла из справочников в порядке id.
+
+    :return: тип проекта -> [названия этапов]
+    """
+    stages: Dict[str, List[str]] = {}
+    for proj_type, (table_name, name_column) in LIFE_CYCLE_TABLES.items():
+        t = table(table_name, column("id"), column(name_column))
+        stmt = select(t.c[name_column]).order_by(t.c.id)
+        stages[proj_type] = list(session.scalars(stmt))
+    return stages
+
+
+@dataclass
+class SkeletonReport:
+    """Итог построения скелета"""
+    created: List[str] = field(default_factory=list)
+    existing: List[str] = field(default_factory=list)
+
+
+class SkeletonGenerator:
+    """
+    Строит план папок для проекта (или пачки проектов) и создаёт недостающие папки.
+    Существование проверяется одним чтением каталога на родителя, а не stat на каждую папку;
+    создание идёт по уровням глубины в пуле потоков. Повторный запуск ничего не меняет.
+    """
+
+    def __init__(
+        self,
+        base_dir: str = PathSettings.PROJECT_FOLDER,
+        stages: Optional[Dict[str, List[str]]] = None,
+        workers: int = 16,
+    ) -> None:
+        """
+        :param base_dir: папка, в которой создаются проекты
+        :param stages: тип проекта -> этапы; по умолчанию читаются из БД
+        :param workers: размер пула потоков
+        """
+        self.logger = LoggerManager(__name__).get_logger()
+        self.base_dir = base_dir
+        self.workers = workers
+        if stages is None:
+            from db_init.session import get_db
+            with get_db() as session:
+                stages = load_stages(session)
+        self.stages = stages
+
+    def plan(self, name: str, proj_type: str, extra: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Полный список папок одного проекта.
+
+        :param name: название проекта
+        :param proj_type: тип проекта (ProjType.proj_type_name)
+        :param extra: дополнительные относительные пути внутри каждого этапа
+        """
+        root = os.path.join(self.base_dir, safe_name(name))
+        dirs = [root]
+        if proj_type not in self.stages:
+            self.logger.warning(f"⚠️ Неизвестный тип проекта «{proj_type}» ({name}): этапов нет, только корневая папка")
+        for stage in self.stages.get(proj_type, []):
+            stage_dir = os.path.join(root, stage)
+            dirs.append(stage_dir)
+            dirs.extend(os.path.join(stage_dir, rel) for rel in extra or [])
+        return dirs
+
+    def plan_batch(self, projects: Iterable[Tuple[str, str]], extra: Optional[Iterable[str]] = None) -> List[str]:
+        """План для пачки проектов [(название, тип), ...]"""
+        extra = list(extra or [])
+        dirs: List[str] = []
+        for name, proj_type in projects:
+            dirs.extend(self.plan(name, proj_type, extra))
+        return dirs
+
+    @staticmethod
+    def _existing_children(parent: str) -> Set[str]:
+        """Одно чтение каталога вместо проверки каждой папки"""
+        try:
+            with os.scandir(parent) as it:
+                return {entry.name for entry in it if entry.is_dir()}
+        except FileNotFoundError:
+            return set()
+
+    @staticmethod
+    def _mkdir(path: str) -> bool:
+        try:
+            os.mkdir(path)
+            return True
+        except FileExistsError:
+            return False
+
+    def apply(self, dirs: Iterable[str], dry_run: bool = False, token: Optional[TaskToken] = None) -> SkeletonReport:
+        """
+        Создаёт недостающие папки плана.
+
+        :param dirs: план (порядок не важен, дубликаты допустимы)
+        :param dry_run: ничего не создавать, только вывести план
+        :param token: отмена и прогресс (уровни вложенности); отмена проверяется между уровнями
+        :raises FileNotFoundError: нет папки проектов base_dir
+        """
+        token = ensure_token(token)
+        if not os.path.isdir(self.base_dir):
+            # иначе ошибка всплывёт из пула потоков на первом mkdir, без указания причины
+            self.logger.error(f"❌ Папка проектов недоступна: {self.base_dir}")
+            raise FileNotFoundError(f"Папка проектов недоступна: {self.base_dir}")
+        # недостающие предки тоже попадают в план; base_dir и выше считаются существующими
+        stop: Set[str] = set()
+        d = os.path.normpath(self.base_dir)
+        while d not in stop:
+            stop.add(d)
+            d = os.path.dirname(d)
+        planned: Set[str] = set()
+        for d in dirs:
+            d = os.path.normpath(d)
+            while d not in planned and d not in stop and os.path.dirname(d) != d:
+                planned.add(d)
+                d = os.path.dirname(d)
+
+        by_depth: Dict[int, Dict[str, List[str]]] = defaultdict(lambda: defaultdict(list))
+        for d in planned:
+            by_depth[d.count(os.sep)][os.path.dirname(d)].append(d)
+
+        report = SkeletonReport()
+        missing: Set[str] = set()  # папки, которых нет на диске (созданы нами или будут созданы)
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="skeleton") as pool:
+            for level, depth in enumerate(sorted(by_depth)):
+                token.progress(level, len(by_depth), f"уровень {level + 1}")
+                groups = by_depth[depth]
+                # у отсутствующего родителя детей нет — его каталог не читаем
+                to_list = [p for p in groups if p not in missing]
+                listed = dict(zip(to_list, pool.map(self._existing_children, to_list)))
+
+                to_create = []
+                for parent, children in groups.items():
+                    present = listed.get(parent, set())
+                    for child in children:
+                        if os.path.basename(child) in present:
+                            report.existing.append(child)
+                        else:
+                            to_create.append(child)
+                            missing.add(child)
+
+                if dry_run:
+                    report.created.extend(to_create)
+                    continue
+                for child, created in zip(to_create, pool.map(self._mkdir, to_create)):
+                    (report.created if created else report.existing).append(child)
+
+        if dry_run:
+            self.print_plan(report)
+        self.logger.info(
+            f"🏗️ Скелет проекта{' (dry-run)' if dry_run else ''}: "
+            f"создано {len(report.created)}, уже было {len(report.existing)}"
+        )
+        return report
+
+    @staticmethod
+    def print_plan(report: SkeletonReport) -> None:
+        """Выводит план деревом: «+» — будет создана, «·» — уже есть"""
+        created = set(report.created)
+        for d in sorted(created | set(report.existing)):
+            mark = "+" if d in created else "·"
+            print(f"{mark} {d}")
+
+    def build(
+        self,
+        projects: Iterable[Tuple[str, str]],
+        extra: Optional[Iterable[str]] = None,
+        dry_run: bool = False,
+        token: Optional[TaskToken] = None,
+    ) -> SkeletonReport:
+        """
+        Строит и применяет план для пачки проектов [(название, тип), ...].
+        """
+        return self.apply(self.plan_batch(projects, extra), dry_run=dry_run, token=token)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Создание скелета папок проекта")
+    parser.add_argument("names", nargs="*", help="названия проектов")
+    parser.add_argument("--type", dest="proj_type", default="НОВОЕ СУДНО", help="тип проекта")
+    parser.add_argument("--batch", help="файл со строками «название;тип»")
+    parser.add_argument("--base", default=PathSettings.PROJECT_FOLDER, help="папка проектов")
+    parser.add_argument("--dry-run", action="store_true", help="только показать план")
+    args = parser.parse_args()
+
+    projects = [(name, args.proj_type) for name in args.names]
+    if args.batch:
+        with open(args.batch, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    name, _, proj_type = line.strip().partition(";")
+                    projects.append((name, proj_type or args.proj_type))
+
+    SkeletonGenerator(args.base).build(projects, dry_run=args.dry_run)
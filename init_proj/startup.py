@@ -0,0 +1,134 @@
+# init_proj/startup.py
+# Оркестратор запуска: окно показывается сразу, БД и справочники грузятся в фоновом потоке 🚦
+#
+# Импорт db_init.session создаёт Engine, а запросы справочников на медленной сетевой папке
+# идут секунды — поэтому всё это делается в QThread. Результаты приходят в окно сигналами
+# (соединения между потоками Qt ставит в очередь главного потока), до этого виджеты
+# показывают заглушки.
+
+import os
+import time
+from typing import Dict, List, Tuple
+
+from PyQt6 import QtCore
+
+from config.settings import TemplateSettings
+from utils.logger import LoggerManager
+
+# Справочник -> (заголовок для строки состояния, запрос: первая колонка — текст, вторая — данные)
+CATALOGS: Dict[str, Tuple[str, str]] = {
+    "proj_types": ("типы проектов", "SELECT proj_type_name, description FROM proj_types ORDER BY id"),
+    "vessel_types": ("типы судов", "SELECT vessel_type_name, description FROM vessel_types ORDER BY id"),
+    "class_societys": ("классификационные общества",
+                       "SELECT class_society_name, description FROM class_societys ORDER BY id"),
+    "proj_templates": ("шаблоны проектов",
+                       "SELECT proj_template_name_ru, proj_template_path FROM proj_templates ORDER BY id"),
+    "customers": ("заказчики", "SELECT name, short_name FROM customer ORDER BY name"),
+}
+
+
+def library_templates(folder: str = TemplateSettings.LIBRARY_FOLDER) -> List[tuple]:
+    """Шаблоны — папки библиотеки, если таблицы proj_templates нет: (имя, путь)"""
+    try:
+        with os.scandir(folder) as it:
+            return sorted((e.name, e.path) for e in it if e.is_dir())
+    except OSError:
+        return []
+
+
+class CatalogLoader(QtCore.QObject):
+    """
+    Работает в фоновом потоке: открывает Engine и по очереди читает справочники.
+    """
+    progress = QtCore.pyqtSignal(str, int, int)  # что грузится, номер этапа, всего этапов
+    loaded = QtCore.pyqtSignal(str, list)  # справочник, строки (текст, данные)
+    failed = QtCore.pyqtSignal(str, str)  # справочник (или "engine"), текст ошибки
+    finished = QtCore.pyqtSignal(dict)  # время этапов, мс
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.logger = LoggerManager(__name__).get_logger()
+
+    def run(self) -> None:
+        timings: Dict[str, float] = {}
+        total = len(CATALOGS) + 1
+        start = time.perf_counter()
+        self.progress.emit("подключение к БД", 1, total)
+        try:
+            from sqlalchemy import text
+            from db_init.session import SessionLocal, get_db
+
+            with SessionLocal.kw["bind"].connect():
+                pass
+        except Exception as e:
+            self.logger.error(f"❌ БД недоступна: {e}")
+            self.failed.emit("engine", str(e))
+            self.finished.emit({"engine": round((time.perf_counter() - start) * 1000, 1)})
+            return
+        timings["engine"] = round((time.perf_counter() - start) * 1000, 1)
+        self.logger.info(f"🔌 Engine открыт за {timings['engine']:.0f} мс")
+
+        with get_db() as session:
+            for step, (name, (title, sql)) in enumerate(CATALOGS.items(), 2):
+                self.progress.emit(title, step, total)
+                began = time.perf_counter()
+                try:
+                    rows = [tuple(row) for row in session.execute(text(sql))]
+                except Exception as e:
+                    rows = library_templates() if name == "proj_templates" else None
+                    if rows is None:
+                        self.logger.warning(f"⚠️ Справочник {name} не загружен: {e}")
+                        self.failed.emit(name, str(e))
+                        continue
+                    self.logger.info(f"📁 Таблицы {name} нет, шаблоны взяты из {TemplateSettings.LIBRARY_FOLDER}")
+                timings[name] = round((time.perf_counter() - began) * 1000, 1)
+                self.logger.info(f"📚 Справочник {name}: {len(rows)} строк за {timings[name]:.0f} мс")
+                self.loaded.emit(name, rows)
+        timings["total"] = round((time.perf_counter() - start) * 1000, 1)
+        self.finished.emit(timings)
+
+
+class StartupOrchestrator(QtCore.QObject):
+    """
+    Запускает CatalogLoader в отдельном QThread и передаёт его сигналы окну:
+    window.set_loading(текст, номер, всего), window.set_catalog(имя, строки),
+    window.catalog_failed(имя, ошибка), window.loading_finished(время).
+    """
+
+    def __init__(self, window, parent=None) -> None:
+        super().__init__(parent)
+        self.logger = LoggerManager(__name__).get_logger()
+        self.window = window
+        self.thread = QtCore.QThread()
+        self.thread.setObjectName("startup-loader")
+        self.loader = CatalogLoader()
+        self.loader.moveToThread(self.thread)
+        self.thread.started.connect(self.loader.run)
+        self.loader.progress.connect(window.set_loading)
+        self.loader.loaded.connect(window.set_catalog)
+        self.loader.failed.connect(window.catalog_failed)
+        self.loader.finished.connect(self._finished)
+        self.loader.finished.connect(self.thread.quit)
+        self._started = 0.0
+
+    def start(self) -> None:
+        """Начинает фоновую загрузку; поток завершается сам, а при выходе — дожидается его"""
+        app = QtCore.QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.stop)
+        self._started = time.perf_counter()
+        self.logger.info("🚦 Фоновая загрузка БД и справочников начата")
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.thread.quit()
+        self.thread.wait()
+
+    def _finished(self, timings: dict) -> None:
+        elapsed = time.perf_counter() - self._started
+        self.logger.info(
+            f"✅ Справочники загружены за {elapsed * 1000:.0f} мс: "
+            + ", ".join(f"{name} {ms:.0f}" for name, ms in timings.items()) + " мс",
+            extra={"duration": elapsed, "context": timings},
+        )
+        self.window.loading_finished(timings)
@@ -0,0 +1,298 @@
+# init_proj/template_cache.py
+# Локальное LRU-зеркало сетевой библиотеки шаблонов 🗄️
+#
+# Шаблон копируется с шары при первом использовании, дальше сетевая папка только
+# сверяется с манифестом (размер, mtime), и докачиваются лишь изменившиеся файлы.
+
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from config.settings import TemplateSettings
+from indexer.hashing import full_hash
+from init_proj.template_copy import fast_copy, PART_SUFFIX
+from utils.logger import LoggerManager
+
+
+def scan_manifest(root: str) -> Dict[str, list]:
+    """
+    Строит манифест папки: относительный путь -> [size, mtime_ns].
+    """
+    manifest: Dict[str, list] = {}
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        with os.scandir(current) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    st = entry.stat()
+                    manifest[os.path.relpath(entry.path, root)] = [st.st_size, st.st_mtime_ns]
+    return manifest
+
+
+class TemplateCache:
+    """
+    Кэш-зеркало шаблонов с вытеснением давно не использованных записей при превышении бюджета.
+    """
+    INDEX_FILE = "cache_index.json"
+    MANIFEST_FILE = ".manifest.json"
+
+    def __init__(
+        self,
+        cache_dir: str = TemplateSettings.CACHE_FOLDER,
+        budget: int = TemplateSettings.CACHE_BUDGET,
+        max_age: float = TemplateSettings.CACHE_MAX_AGE,
+        hash_files: bool = False,
+        workers: int = 8,
+    ) -> None:
+        """
+        :param cache_dir: локальная папка кэша
+        :param budget: предельный объём кэша, байт
+        :param max_age: сколько секунд не сверяться с сетевой папкой после последней проверки
+        :param hash_files: хранить в манифесте хэши локальных копий (нужно для verify)
+        :param workers: размер пула потоков для докачки
+        """
+        self.logger = LoggerManager(__name__).get_logger()
+        self.cache_dir = cache_dir
+        self.budget = budget
+        self.max_age = max_age
+        self.hash_files = hash_files
+        self.workers = workers
+        self._lock = threading.RLock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        # закреплённые записи не вытесняются, пока с ними работает копирование
+        self._pins: Dict[str, int] = {}
+        os.makedirs(cache_dir, exist_ok=True)
+        self._index = self._load_index()
+
+    # --- индекс кэша ---
+
+    def _load_index(self) -> dict:
+        path = os.path.join(self.cache_dir, self.INDEX_FILE)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"entries": {}, "stats": {}}
+
+    def _save_index(self) -> None:
+        path = os.path.join(self.cache_dir, self.INDEX_FILE)
+        tmp = path + PART_SUFFIX
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._index, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def _count(self, name: str, value: int = 1) -> None:
+        stats = self._index["stats"]
+        stats[name] = stats.get(name, 0) + value
+
+    @staticmethod
+    def _key(source: str) -> str:
+        normalized = os.path.normcase(os.path.normpath(source))
+        return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:16]
+
+    def local_path(self, source: str) -> str:
+        """Путь локальной копии шаблона (имя папки шаблона сохраняется)"""
+        return os.path.join(self.cache_dir, self._key(source), os.path.basename(os.path.normpath(source)))
+
+    def _manifest_path(self, source: str) -> str:
+        return os.path.join(self.cache_dir, self._key(source), self.MANIFEST_FILE)
+
+    def _load_manifest(self, source: str) -> Dict[str, list]:
+        try:
+            with open(self._manifest_path(source), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    # --- синхронизация ---
+
+    def _fetch_file(self, source: str, rel: str, attrs: list) -> list:
+        src = os.path.join(source, rel)
+        dst = os.path.join(self.local_path(source), rel)
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        fast_copy(src, dst + PART_SUFFIX)
+        os.utime(dst + PART_SUFFIX, ns=(attrs[1], attrs[1]))
+        os.replace(dst + PART_SUFFIX, dst)
+        if self.hash_files:
+            return [*attrs, full_hash((dst, attrs[0]))[1]]
+        return list(attrs)
+
+    def _sync(self, source: str, remote: Dict[str, list], local: Dict[str, list], verify: bool) -> Dict[str, list]:
+        """Докачивает изменившиеся файлы и удаляет исчезнувшие. Возвращает новый манифест"""
+        base = self.local_path(source)
+        changed = [rel for rel, attrs in remote.items() if local.get(rel, [None, None])[:2] != attrs]
+        if verify:
+            for rel, attrs in local.items():
+                if rel in remote and rel not in changed and len(attrs) > 2:
+                    if full_hash((os.path.join(base, rel), attrs[0]))[1] != attrs[2]:
+                        changed.append(rel)
+        removed = [rel for rel in local if rel not in remote]
+
+        manifest = {rel: attrs for rel, attrs in local.items() if rel in remote and rel not in changed}
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="tpl-cache") as pool:
+            for rel, attrs in zip(changed, pool.map(lambda r: self._fetch_file(source, r, remote[r]), changed)):
+                manifest[rel] = attrs
+        for rel in removed:
+            try:
+                os.remove(os.path.join(base, rel))
+            except OSError:
+                pass
+        if changed or removed:
+            with self._lock:
+                self._count("files_fetched", len(changed))
+                self._count("bytes_fetched", sum(remote[rel][0] for rel in changed))
+            self.logger.info(f"🔄 {os.path.basename(base)}: обновлено {len(changed)}, удалено {len(removed)}")
+        return manifest
+
+    def get(self, source: str, verify: bool = False, pin: bool = False) -> str:
+        """
+        Возвращает локальную копию шаблона, при необходимости докачивая изменения.
+
+        :param source: сетевой путь к папке шаблона
+        :param verify: перепроверить хэши локальных файлов (при hash_files=True)
+        :param pin: закрепить запись до вызова unpin()
+        :return: путь к локальной копии
+        """
+        key = self._key(source)
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+            if pin:
+                self._pins[key] = self._pins.get(key, 0) + 1
+        # разные шаблоны синхронизируются параллельно, один и тот же — по очереди
+        with key_lock:
+            with self._lock:
+                entry = self._index["entries"].get(key)
+                now = time.time()
+                if entry and not verify and now - entry["checked_at"] < self.max_age:
+                    self._count("hits")
+                    entry["last_used"] = now
+                    self._save_index()
+                    return self.local_path(source)
+
+            local = self._load_manifest(source)
+            try:
+                remote = scan_manifest(source)
+            except OSError as e:
+                if not entry:
+                    raise
+                # шара недоступна — работаем с последней копией
+                self.logger.warning(f"⚠️ Шаблон недоступен, используется кэш: {source} ({e})")
+                with self._lock:
+                    self._count("offline_hits")
+                    entry["last_used"] = now
+                    self._save_index()
+                return self.local_path(source)
+
+            stale = len(local) != len(remote) or any(
+                local.get(rel, [None, None])[:2] != attrs for rel, attrs in remote.items()
+            )
+            if entry and not stale and not verify:
+                counter = "hits"
+            else:
+                counter = "refreshes" if entry else "misses"
+                os.makedirs(self.local_path(source), exist_ok=True)
+                local = self._sync(source, remote, local, verify)
+                with open(self._manifest_path(source), "w", encoding="utf-8") as f:
+                    json.dump(local, f, ensure_ascii=False)
+
+            with self._lock:
+                self._count(counter)
+                self._index["entries"][key] = {
+                    "source": source,
+                    "size": sum(attrs[0] for attrs in remote.values()),
+                    "last_used": now,
+                    "checked_at": now,
+                }
+                self._evict(keep=key)
+                self._save_index()
+            return self.local_path(source)
+
+    def unpin(self, source: str) -> None:
+        """Снимает закрепление, поставленное get(pin=True)"""
+        key = self._key(source)
+        with self._lock:
+            if self._pins.get(key, 0) > 1:
+                self._pins[key] -= 1
+            else:
+                self._pins.pop(key, None)
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        """Вытесняет давно не использованные шаблоны, пока кэш не уложится в бюджет"""
+        entries = self._index["entries"]
+        total = sum(e["size"] for e in entries.values())
+        for key in sorted(entries, key=lambda k: entries[k]["last_used"]):
+            if total <= self.budget:
+                break
+            if key == keep or key in self._pins:
+                continue
+            total -= entries[key]["size"]
+            self.logger.info(f"🧹 Вытеснен из кэша: {entries[key]['source']}")
+            shutil.rmtree(os.path.join(self.cache_dir, key), ignore_errors=True)
+            del entries[key]
+            self._count("evictions")
+
+    # --- команды ---
+
+    def prefetch(self, project_type: str, extra: Optional[List[str]] = None) -> List[str]:
+        """
+        Заранее загружает шаблоны, которые обычно нужны проекту данного типа.
+
+        :param project_type: тип проекта (ProjType.proj_type_name)
+        :param extra: дополнительные сетевые пути шаблонов
+        :return: локальные пути
+        """
+        names = TemplateSettings.PROJECT_TYPE_TEMPLATES.get(project_type, [])
+        sources = [os.path.join(TemplateSettings.LIBRARY_FOLDER, name) for name in names] + list(extra or [])
+        self.logger.info(f"📥 Предзагрузка шаблонов для «{project_type}»: {len(sources)}")
+        return [self.get(source) for source in sources]
+
+    def stats(self) -> dict:
+        """Статистика кэша"""
+        with self._lock:
+            entries = self._index["entries"]
+            return {
+                "entries": len(entries),
+                "size_bytes": sum(e["size"] for e in entries.values()),
+                "budget_bytes": self.budget,
+                **self._index["stats"],
+            }
+
+    def clear(self) -> None:
+        """Полностью очищает кэш"""
+        with self._lock:
+            for key in list(self._index["entries"]):
+                shutil.rmtree(os.path.join(self.cache_dir, key), ignore_errors=True)
+            self._index = {"entries": {}, "stats": {}}
+            self._save_index()
+        self.logger.info("🧹 Кэш шаблонов очищен")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Локальный кэш шаблонов")
+    sub = parser.add_subparsers(dest="command", required=True)
+    prefetch_cmd = sub.add_parser("prefetch", help="предзагрузить шаблоны для типа проекта")
+    prefetch_cmd.add_argument("project_type", help="тип проекта, например «НОВОЕ СУДНО»")
+    prefetch_cmd.add_argument("templates", nargs="*", help="дополнительные сетевые пути шаблонов")
+    sub.add_parser("stats", help="показать статистику кэша")
+    sub.add_parser("clear", help="очистить кэш")
+    args = parser.parse_args()
+
+    cache = TemplateCache()
+    if args.command == "prefetch":
+        for path in cache.prefetch(args.project_type, args.templates):
+            print(path)
+    elif args.command == "stats":
+        json.dump(cache.stats(), sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        cache.clear()
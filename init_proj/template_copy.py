@@ -0,0 +1,248 @@
+# init_proj/template_copy.py
+# Параллельное копирование шаблонов (ProjTemplates.proj_template_path) в папку нового проекта 📑
+
+import os
+import errno
+import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, List, Optional, Tuple, Union
+
+from utils.logger import LoggerManager
+from utils.task_token import TaskToken, ensure_token
+
+# Допуск сравнения mtime: SMB/FAT хранят время с точностью до 2 секунд
+MTIME_TOLERANCE_NS: int = 2_000_000_000
+
+# Суффикс временного файла: недокопированный файл никогда не выглядит готовым
+PART_SUFFIX: str = ".part"
+
+# Коды ошибок, при которых copy_file_range не поддерживается и нужен обычный путь
+_FALLBACK_ERRNOS = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EBADF, errno.ETXTBSY}
+
+# колбэк прогресса: (скопировано байт, всего байт, обработано файлов, всего файлов, текущий файл)
+ProgressCallback = Callable[[int, int, int, int, str], None]
+
+
+@dataclass
+class CopyReport:
+    """Итог копирования шаблонов"""
+    copied: int = 0
+    skipped: int = 0
+    bytes_copied: int = 0
+    failed: List[Tuple[str, str]] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+
+def _is_same(src_stat: os.stat_result, dst: str) -> bool:
+    """Файл уже скопирован: совпадают размер и mtime"""
+    try:
+        st = os.stat(dst)
+    except OSError:
+        return False
+    return st.st_size == src_stat.st_size and abs(st.st_mtime_ns - src_stat.st_mtime_ns) <= MTIME_TOLERANCE_NS
+
+
+def fast_copy(src: str, dst: str) -> None:
+    """
+    Копирует содержимое файла средствами ядра: os.copy_file_range (Linux, в т.ч. серверное копирование
+    и reflink), иначе shutil.copyfile с его платформенными быстрыми путями (sendfile, fcopyfile, CopyFile2).
+    """
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                size = os.fstat(fsrc.fileno()).st_size
+                copied = 0
+                while copied < size:
+                    n = os.copy_file_range(fsrc.fileno(), fdst.fileno(), min(size - copied, 1 << 30))
+                    if n == 0:
+                        break
+                    copied += n
+            if copied == size:
+                return
+        except OSError as e:
+            if e.errno not in _FALLBACK_ERRNOS:
+                raise
+    shutil.copyfile(src, dst)
+
+
+def _template_path(template) -> str:
+    """Принимает строку пути или объект ProjTemplates"""
+    return getattr(template, "proj_template_path", template)
+
+
+class TemplateCopier:
+    """
+    Копирует выбранные папки шаблонов в папку проекта пулом потоков.
+    Уже совпадающие по размеру и mtime файлы пропускаются, поэтому повторный запуск
+    после сбоя продолжает с места остановки.
+    """
+
+    def __init__(
+        self,
+        workers: int = 8,
+        retries: int = 2,
+        on_progress: Optional[ProgressCallback] = None,
+        cache=None,
+    ) -> None:
+        """
+        :param workers: размер пула потоков (операции сетевые, GIL не мешает)
+        :param retries: число повторов копирования файла при ошибке
+        :param on_progress: колбэк прогресса, вызывается из потока, запустившего copy()
+        :param cache: TemplateCache — копировать из локального зеркала, а не с шары
+        """
+        self.logger = LoggerManager(__name__).get_logger()
+        self.workers = workers
+        self.retries = retries
+        self.on_progress = on_progress
+        self.cache = cache
+
+    def _walk(self, src_root: str, dst_root: str) -> Tuple[List[str], List[Tuple[str, str, os.stat_result]]]:
+        """Собирает папки и файлы одного шаблона: ([папки назначения], [(src, dst, stat)])"""
+        if self.cache is not None:
+            src_root = self.cache.get(src_root, pin=True)
+        dirs = [dst_root]
+        files = []
+        stack = [(src_root, dst_root)]
+        while stack:
+            src, dst = stack.pop()
+            with os.scandir(src) as it:
+                for entry in it:
+                    target = os.path.join(dst, entry.name)
+                    if entry.is_dir(follow_symlinks=False):
+                        dirs.append(target)
+                        stack.append((entry.path, target))
+                    elif entry.is_file():
+                        files.append((entry.path, target, entry.stat()))
+        return dirs, files
+
+    def plan(
+        self,
+        templates: Iterable[Union[str, object]],
+        project_path: str,
+        pool: ThreadPoolExecutor,
+    ) -> Tuple[List[str], List[Tuple[str, str, os.stat_result]]]:
+        """
+        Параллельно обходит шаблоны и строит план копирования.
+
+        :return: ([папки], [(src, dst, stat)])
+        """
+        futures = {}
+        for template in templates:
+            src = os.path.normpath(_template_path(template))
+            dst = os.path.join(project_path, os.path.basename(src))
+            futures[pool.submit(self._walk, src, dst)] = src
+        dirs: List[str] = []
+        files: List[Tuple[str, str, os.stat_result]] = []
+        for future in as_completed(futures):
+            try:
+                d, f = future.result()
+            except OSError as e:
+                self.logger.error(f"❌ Шаблон недоступен {futures[future]}: {e}")
+                raise
+            dirs.extend(d)
+            files.extend(f)
+        return dirs, files
+
+    def _copy_one(self, src: str, dst: str, st: os.stat_result) -> bool:
+        """
+        Копирует один файл через временный .part. Возвращает False, если файл пропущен.
+        """
+        if _is_same(st, dst):
+            return False
+        part = dst + PART_SUFFIX
+        attempt = 0
+        while True:
+            try:
+                fast_copy(src, part)
+                os.utime(part, ns=(st.st_atime_ns, st.st_mtime_ns))
+                os.replace(part, dst)
+                return True
+            except OSError:
+                attempt += 1
+                if attempt > self.retries:
+                    try:
+                        os.remove(part)
+                    except OSError:
+                        pass
+                    raise
+
+    def copy(self, templates: Iterable[Union[str, object]], project_path: str,
+             token: Optional[TaskToken] = None) -> CopyReport:
+        """
+        Копирует шаблоны в папку проекта.
+
+        :param templates: пути к шаблонам или объекты ProjTemplates
+        :param project_path: папка проекта
+        :param token: отмена и прогресс (байты); при отмене недоставленные файлы не копируются
+        :return: CopyReport
+        """
+        templates = list(templates)
+        token = ensure_token(token)
+        report = CopyReport()
+        self.logger.info(f"🚀 Копирование шаблонов: {len(templates)} → {project_path}")
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="tpl-copy") as pool:
+            try:
+                self._copy_all(templates, project_path, pool, report, token)
+            finally:
+                if self.cache is not None:
+                    for template in templates:
+                        self.cache.unpin(os.path.normpath(_template_path(template)))
+
+        self.logger.info(
+            f"🎉 Шаблоны скопированы: новых {report.copied}, пропущено {report.skipped}, "
+            f"ошибок {len(report.failed)}, {report.bytes_copied / 1024 ** 2:.1f} МБ"
+        )
+        return report
+
+    def _copy_all(self, templates: list, project_path: str, pool: ThreadPoolExecutor, report: CopyReport,
+                  token: TaskToken) -> None:
+        """План и копирование всех файлов в общем пуле"""
+        dirs, files = self.plan(templates, project_path, pool)
+        token.check()
+        for d in sorted(set(dirs)):
+            os.makedirs(d, exist_ok=True)
+
+        total_bytes = sum(st.st_size for _, _, st in files)
+        done_bytes = done_files = 0
+        futures = {pool.submit(self._copy_one, src, dst, st): (src, st) for src, dst, st in files}
+        for future in as_completed(futures):
+            src, st = futures[future]
+            try:
+                copied = future.result()
+            except OSError as e:
+                report.failed.append((src, str(e)))
+                self.logger.error(f"❌ Не удалось скопировать {src}: {e}")
+                copied = None
+            if copied:
+                report.copied += 1
+                report.bytes_copied += st.st_size
+            elif copied is False:
+                report.skipped += 1
+            done_files += 1
+            done_bytes += st.st_size
+            if self.on_progress:
+                self.on_progress(done_bytes, total_bytes, done_files, len(files), src)
+            if token.cancelled:
+                # очередь снимается, уже начатые файлы докопируются при выходе из пула
+                for pending in futures:
+                    pending.cancel()
+                self.logger.info(f"⏹️ Копирование отменено: обработано {done_files} из {len(files)} файлов")
+            token.progress(done_bytes, total_bytes, os.path.basename(src))
+
+
+def copy_templates(
+    templates: Iterable[Union[str, object]],
+    project_path: str,
+    on_progress: Optional[ProgressCallback] = None,
+    workers: int = 8,
+    cache=None,
+    token: Optional[TaskToken] = None,
+) -> CopyReport:
+    """
+    Создаёт в папке проекта копии выбранных шаблонов.
+    """
+    return TemplateCopier(workers=workers, on_progress=on_progress, cache=cache).copy(templates, project_path, token)
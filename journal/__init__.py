@@ -0,0 +1 @@
+# Делает папку journal Python-пакетом
@@ -0,0 +1,118 @@
+# journal/export.py
+# Выгрузка индекса документов на листы projects_all / projects_docs / archive_docs 📤
+
+import os
+import time
+import argparse
+from datetime import datetime
+from typing import Iterator, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from config.settings import ExcelSettings, PathSettings
+from utils.logger import LoggerManager
+from utils.xlsx_writer import XlsxWriter
+
+# Сколько строк тянуть из курсора за раз
+YIELD_PER = 5000
+
+PROJECTS_HEADER = ["Проект", "Состояние", "Путь", "Изменён"]
+DOCS_HEADER = ["Проект", "Имя", "Расширение", "Размер, байт", "Изменён", "Путь"]
+
+
+def _mtime(mtime_ns: int) -> datetime:
+    return datetime.fromtimestamp(mtime_ns / 1e9).replace(microsecond=0)
+
+
+def _project_of(root: str, path: str) -> str:
+    """Папка проекта — первый уровень внутри корня"""
+    rel = path[len(root):].lstrip("\\/")
+    return rel.replace("\\", "/").split("/", 1)[0]
+
+
+class ProjectExporter:
+    """
+    Пишет листы выгрузки напрямую из курсора по таблице documents.
+    """
+
+    def __init__(
+        self,
+        project_root: str = PathSettings.PROJECT_FOLDER,
+        archive_root: str = PathSettings.ARCHIVE_FOLDER,
+        session_factory=None,
+    ) -> None:
+        """
+        :param project_root: корень проектов в работе
+        :param archive_root: корень архива
+        :param session_factory: контекстный менеджер сессии; по умолчанию db_init.session.get_db
+        """
+        self.logger = LoggerManager(__name__).get_logger()
+        self.project_root = os.path.normpath(project_root)
+        self.archive_root = os.path.normpath(archive_root)
+        if session_factory is None:
+            from db_init.session import get_db
+            session_factory = get_db
+        self.session_factory = session_factory
+
+    def iter_projects(self, session: Session) -> Iterator[Tuple]:
+        """Папки проектов обоих корней: (проект, состояние, путь, изменён)"""
+        from db_init.documents.models_documents import Document
+
+        for root, state in ((self.project_root, "В работе"), (self.archive_root, "Архив")):
+            stmt = (
+                select(Document.name, Document.path, Document.mtime_ns)
+                .where(Document.parent == root, Document.is_dir.is_(True))
+                .order_by(Document.name)
+                .execution_options(yield_per=YIELD_PER)
+            )
+            for name, path, mtime_ns in session.execute(stmt):
+                yield name, state, path, _mtime(mtime_ns)
+
+    def iter_docs(self, session: Session, root: str) -> Iterator[Tuple]:
+        """Файлы корня: (проект, имя, расширение, размер, изменён, путь)"""
+        from db_init.documents.models_documents import Document
+
+        stmt = (
+            select(Document.path, Document.name, Document.ext, Document.size, Document.mtime_ns)
+            .where(Document.root == root, Document.is_dir.is_(False))
+            .order_by(Document.path)
+            .execution_options(yield_per=YIELD_PER)
+        )
+        for path, name, ext, size, mtime_ns in session.execute(stmt):
+            yield _project_of(root, path), name, ext, size, _mtime(mtime_ns), path
+
+    def export(self, path: Optional[str] = None) -> dict:
+        """
+        Записывает книгу выгрузки.
+
+        :param path: файл .xlsx, по умолчанию ExcelSettings.EXPORT_PATH
+        :return: лист -> число строк
+        """
+        path = path or ExcelSettings.EXPORT_PATH
+        start = time.perf_counter()
+        counts = {}
+        self.logger.info(f"🚀 Выгрузка индекса документов в {path}")
+        with self.session_factory() as session, XlsxWriter(path) as book:
+            counts[ExcelSettings.PROJECT_SAVE_SHEET] = book.write_sheet(
+                ExcelSettings.PROJECT_SAVE_SHEET, PROJECTS_HEADER, self.iter_projects(session)
+            )
+            counts[ExcelSettings.PROJECT_DOCS_SAVE_SHEET] = book.write_sheet(
+                ExcelSettings.PROJECT_DOCS_SAVE_SHEET, DOCS_HEADER, self.iter_docs(session, self.project_root)
+            )
+            counts[ExcelSettings.ARCHIVE_DOCS_SAVE_SHEET] = book.write_sheet(
+                ExcelSettings.ARCHIVE_DOCS_SAVE_SHEET, DOCS_HEADER, self.iter_docs(session, self.archive_root)
+            )
+        self.logger.info(
+            f"🎉 Выгрузка готова за {time.perf_counter() - start:.1f} с: "
+            + ", ".join(f"{sheet} — {n}" for sheet, n in counts.items())
+        )
+        return counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Выгрузка списков проектов и документов в Excel")
+    parser.add_argument("--out", default=ExcelSettings.EXPORT_PATH, help="файл .xlsx")
+    args = parser.parse_args()
+
+    ProjectExporter().export(args.out)
@@ -0,0 +1,184 @@
+# journal/incremental.py
+# Инкрементальное обновление книги выгрузки: переписываются только изменившиеся листы 🩹
+
+import os
+import time
+import hashlib
+import argparse
+from datetime import datetime
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
+
+from config.settings import ExcelSettings
+from journal.export import DOCS_HEADER, PROJECTS_HEADER, ProjectExporter
+from journal.vd_sheet import row_hash
+from utils.logger import LoggerManager
+from utils.xlsx_patch import XlsxPatcher
+from utils.xlsx_writer import SheetBuilder
+
+# Сколько (ключ, хэш) отправлять во временную таблицу за один запрос
+STAGE_BATCH = 5000
+
+
+@dataclass
+class SheetDiff:
+    """Построчные изменения листа относительно прошлой выгрузки"""
+    sheet: str
+    rows: int = 0
+    added: int = 0
+    changed: int = 0
+    removed: int = 0
+    rewritten: bool = False
+
+
+@dataclass
+class IncrementalReport:
+    """Итог инкрементального обновления книги"""
+    sheets: List[SheetDiff] = field(default_factory=list)
+    bytes_written: int = 0
+    seconds: float = 0.0
+    full_export: bool = False
+
+
+class JournalIncrementalSync:
+    """
+    Сверяет листы книги выгрузки с таблицей documents и переписывает в пакете .xlsx
+    только части изменившихся листов. Остальные части остаются байт-в-байт прежними.
+
+    Для каждого листа в БД хранится отметка выгрузки (дайджест и время) и снимок строк
+    «путь -> хэш»: совпавший дайджест означает, что лист не трогается вовсе,
+    а снимок даёт построчный diff для отчёта.
+    """
+
+    def __init__(
+        self,
+        book: str = ExcelSettings.EXPORT_PATH,
+        exporter: Optional[ProjectExporter] = None,
+        session_factory=None,
+        backup_dir: str = ExcelSettings.PATCH_BACKUP_FOLDER,
+    ) -> None:
+        """
+        :param book: книга выгрузки .xlsx
+        :param exporter: источник строк листов; по умолчанию ProjectExporter с той же сессией
+        :param session_factory: контекстный менеджер сессии; по умолчанию db_init.session.get_db
+        :param backup_dir: папка для копии хвоста книги на время записи
+        """
+        self.logger = LoggerManager(__name__).get_logger()
+        self.book = book
+        self.backup_dir = backup_dir
+        if session_factory is None:
+            from db_init.journal.init_journal import DBInitJournal
+            from db_init.session import get_db
+            DBInitJournal().create_tables()
+            session_factory = get_db
+        self.session_factory = session_factory
+        self.exporter = exporter or ProjectExporter(session_factory=session_factory)
+
+    def _sheets(self) -> List[Tuple[str, Sequence[str], Callable, int]]:
+        """Листы книги: (имя, заголовок, источник строк по сессии, индекс столбца-ключа «Путь»)"""
+        ex = self.exporter
+        return [
+            (ExcelSettings.PROJECT_SAVE_SHEET, PROJECTS_HEADER, ex.iter_projects, 2),
+            (ExcelSettings.PROJECT_DOCS_SAVE_SHEET, DOCS_HEADER,
+             lambda s: ex.iter_docs(s, ex.project_root), 5),
+            (ExcelSettings.ARCHIVE_DOCS_SAVE_SHEET, DOCS_HEADER,
+             lambda s: ex.iter_docs(s, ex.archive_root), 5),
+        ]
+
+    def _stage(self, repo, builder: Optional[SheetBuilder], rows: Iterable[Sequence], key: int) -> Tuple[int, str]:
+        """
+        Один проход по строкам листа: во временную таблицу, в builder и в дайджест.
+
+        :return: (число строк, дайджест листа)
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        batch = []
+        count = 0
+        repo.stage_begin()
+        for values in rows:
+            h = row_hash(list(values))
+            digest.update(h.encode("ascii"))
+            batch.append((str(values[key]), h))
+            count += 1
+            if builder is not None:
+                if builder.full:
+                    self.logger.warning(f"⚠️ Лист «{builder.name}» упёрся в предел строк Excel, хвост не записан")
+                    builder = None
+                else:
+                    builder.add_row(values)
+            if len(batch) >= STAGE_BATCH:
+                repo.stage_add(batch)
+                batch.clear()
+        repo.stage_add(batch)
+        return count, digest.hexdigest()
+
+    def run(self) -> IncrementalReport:
+        from db_init.journal.crud_journal import ExportStateRepository
+
+        start = time.perf_counter()
+        report = IncrementalReport()
+        book_key = os.path.normpath(self.book)
+        self.logger.info(f"🚀 Инкрементальное обновление книги {self.book}")
+
+        patcher = XlsxPatcher(self.book, self.backup_dir)
+        if os.path.exists(self.book) and patcher.recover():
+            self.logger.warning("⚠️ Прошлая запись книги прервалась — книга восстановлена из копии хвоста")
+        if not os.path.exists(self.book):
+            self.exporter.export(self.book)
+            report.full_export = True
+
+        builders: List[SheetBuilder] = []
+        try:
+            with self.session_factory() as session:
+                repo = ExportStateRepository(session)
+                styles = patcher.styles() if not report.full_export else None
+                now = datetime.now().replace(microsecond=0)
+
+                for name, header, source, key in self._sheets():
+                    diff = SheetDiff(name)
+                    watermark = repo.ensure_watermark(book_key, name, now)
+                    builder = None
+                    if not report.full_export:
+                        builder = SheetBuilder(name, header, styles=styles)
+                        builders.append(builder)
+                    diff.rows, digest = self._stage(repo, builder, source(session), key)
+                    counts = repo.stage_diff(watermark.id)
+                    diff.added, diff.changed, diff.removed = counts['added'], counts['changed'], counts['removed']
+
+                    if not report.full_export and (digest != watermark.digest or name not in patcher.sheet_parts):
+                        part = patcher.sheet_parts.get(name) or patcher.add_sheet(name)
+                        patcher.replace(part, builder.write_to)
+                        diff.rewritten = True
+                    if diff.rewritten or report.full_export:
+                        repo.stage_apply(watermark.id)
+                        repo.update(watermark, rows=diff.rows, digest=digest, exported_at=now, checked_at=now)
+                    else:
+                        repo.update(watermark, checked_at=now)
+                    report.sheets.append(diff)
+
+                if any(d.rewritten for d in report.sheets):
+                    report.bytes_written = patcher.commit()
+                elif report.full_export:
+                    report.bytes_written = os.path.getsize(self.book)
+        finally:
+            for builder in builders:
+                builder.close()
+
+        report.seconds = time.perf_counter() - start
+        for d in report.sheets:
+            state = "переписан" if d.rewritten else "без изменений"
+            self.logger.info(
+                f"📦 {d.sheet}: {state}, строк {d.rows} (+{d.added} ~{d.changed} -{d.removed})"
+            )
+        self.logger.info(
+            f"🎉 Обновление книги готово за {report.seconds:.1f} с, записано {report.bytes_written / 1024:.1f} КБ"
+        )
+        return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Инкрементальное обновление книги выгрузки проектов")
+    parser.add_argument("--book", default=ExcelSettings.EXPORT_PATH, help="файл .xlsx")
+    args = parser.parse_args()
+
+    JournalIncrementalSync(args.book).run()
@@ -0,0 +1,122 @@
+# journal/sync.py
+# Инкрементальная синхронизация листа «03 ВД» в SQLite по хэшам строк 🔄
+
+import time
+import hashlib
+import argparse
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set
+
+from config.settings import ExcelSettings, PathSettings
+from journal.vd_sheet import iter_records
+from utils.logger import LoggerManager
+from utils.task_token import TaskToken, ensure_token
+
+# Сколько новых строк вставлять за один запрос
+BATCH_SIZE = 2000
+
+
+@dataclass
+class SyncReport:
+    """Итог синхронизации"""
+    inserted: int = 0
+    deleted: int = 0
+    moved: int = 0
+    unchanged: int = 0
+    seconds: float = 0.0
+
+
+class JournalSync:
+    """
+    Переносит строки листа ВД в таблицу journal_documents.
+    Строка определяется хэшем своего содержимого: совпавшие хэши не перезаписываются,
+    новые вставляются, исчезнувшие удаляются. Изменённая строка — это удаление старого
+    хэша и вставка нового.
+    """
+
+    def __init__(
+        self,
+        path: str = PathSettings.PROJECT_LOG,
+        sheet: str = ExcelSettings.SOURCE_SHEET,
+        session_factory=None,
+    ) -> None:
+        """
+        :param path: книга журнала .xlsx
+        :param sheet: имя листа
+        :param session_factory: контекстный менеджер сессии; по умолчанию db_init.session.get_db
+        """
+        self.logger = LoggerManager(__name__).get_logger()
+        self.path = path
+        self.sheet = sheet
+        if session_factory is None:
+            from db_init.journal.init_journal import DBInitJournal
+            from db_init.session import get_db
+            DBInitJournal().create_tables()
+            session_factory = get_db
+        self.session_factory = session_factory
+
+    @staticmethod
+    def _occurrence_key(base: str, n: int) -> str:
+        """Ключ n-го повтора одинаковой строки (первая сохраняет исходный хэш)"""
+        return base if n == 1 else hashlib.blake2b(f"{base}#{n}".encode(), digest_size=16).hexdigest()
+
+    def run(self, token: Optional[TaskToken] = None) -> SyncReport:
+        """
+        :param token: отмена и прогресс (прочитано строк); при отмене транзакция откатывается
+        """
+        from db_init.journal.crud_journal import JournalDocumentRepository
+
+        token = ensure_token(token)
+        start = time.perf_counter()
+        report = SyncReport()
+        self.logger.info(f"🚀 Синхронизация листа «{self.sheet}» из {self.path}")
+        with self.session_factory() as session:
+            repo = JournalDocumentRepository(session)
+            stored = repo.get_row_nums()
+            seen: Set[str] = set()
+            repeats: Dict[str, int] = {}
+            moved: Dict[str, int] = {}
+            batch: List[dict] = []
+
+            for row_num, base_hash, record in iter_records(self.path, self.sheet):
+                token.progress(row_num, 0, f"строка {row_num}")
+                n = repeats.get(base_hash, 0) + 1
+                repeats[base_hash] = n
+                key = self._occurrence_key(base_hash, n)
+                seen.add(key)
+
+                old_row = stored.get(key)
+                if old_row is None:
+                    batch.append({"row_hash": key, "row_num": row_num, **record.as_row()})
+                    if len(batch) >= BATCH_SIZE:
+                        repo.insert_many(batch)
+                        report.inserted += len(batch)
+                        batch.clear()
+                elif old_row != row_num:
+                    moved[key] = row_num
+                else:
+                    report.unchanged += 1
+
+            gone = [h for h in stored if h not in seen]
+            repo.delete_hashes(gone)
+            repo.insert_many(batch)
+            repo.update_row_nums(moved)
+            report.inserted += len(batch)
+            report.deleted = len(gone)
+            report.moved = len(moved)
+
+        report.seconds = time.perf_counter() - start
+        self.logger.info(
+            f"🎉 Журнал синхронизирован за {report.seconds:.2f} с: новых {report.inserted}, "
+            f"удалено {report.deleted}, сдвинуто {report.moved}, без изменений {report.unchanged}"
+        )
+        return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Синхронизация листа ВД журнала в БД")
+    parser.add_argument("--path", default=PathSettings.PROJECT_LOG, help="книга журнала .xlsx")
+    parser.add_argument("--sheet", default=ExcelSettings.SOURCE_SHEET, help="имя листа")
+    args = parser.parse_args()
+
+    JournalSync(args.path, args.sheet).run()
@@ -0,0 +1,115 @@
+# journal/vd_sheet.py
+# Типизированные записи листа «03 ВД» журнала учёта документации 📋
+
+import re
+import json
+import hashlib
+from dataclasses import dataclass, asdict
+from datetime import date, datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from config.settings import ExcelSettings, PathSettings
+from utils.xlsx_reader import XlsxReader
+
+_SPACES = re.compile(r"\s+")
+_DATE_TEXT = re.compile(r"(\d{1,2})\.(\d{1,2})\.(\d{2,4})")
+
+
+@dataclass(frozen=True)
+class VDRecord:
+    """Строка ведомости документов"""
+    project: Optional[str] = None
+    doc_number: Optional[str] = None
+    doc_name: Optional[str] = None
+    revision: Optional[str] = None
+    status: Optional[str] = None
+    issue_date: Optional[date] = None
+    author: Optional[str] = None
+    note: Optional[str] = None
+
+    def as_row(self) -> dict:
+        return asdict(self)
+
+
+def _normalize_header(value) -> str:
+    return _SPACES.sub(" ", str(value)).strip().lower() if value is not None else ""
+
+
+def _as_text(value) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    if isinstance(value, datetime):
+        value = value.date().isoformat()
+    text = str(value).strip()
+    return text or None
+
+
+def _as_date(value) -> Optional[date]:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str):
+        m = _DATE_TEXT.search(value)
+        if m:
+            day, month, year = (int(g) for g in m.groups())
+            try:
+                return date(year + 2000 if year < 100 else year, month, day)
+            except ValueError:
+                return None
+    return None
+
+
+def map_header(values: list, columns: Dict[str, List[str]] = ExcelSettings.SOURCE_COLUMNS) -> Dict[str, int]:
+    """
+    Сопоставляет поля VDRecord столбцам по строке заголовков.
+
+    :return: поле -> индекс столбца (только найденные поля)
+    """
+    aliases = {_normalize_header(a): field for field, names in columns.items() for a in names}
+    mapping: Dict[str, int] = {}
+    for index, value in enumerate(values):
+        field = aliases.get(_normalize_header(value))
+        if field and field not in mapping:
+            mapping[field] = index
+    return mapping
+
+
+def row_hash(values: list) -> str:
+    """Хэш содержимого строки: по всем ячейкам, а не только по распознанным полям"""
+    payload = json.dumps(values, ensure_ascii=False, default=str, separators=(",", ":"))
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def to_record(values: list, mapping: Dict[str, int]) -> VDRecord:
+    """Превращает значения строки в VDRecord по сопоставлению столбцов"""
+    fields = {}
+    for field, index in mapping.items():
+        value = values[index] if index < len(values) else None
+        fields[field] = _as_date(value) if field == "issue_date" else _as_text(value)
+    return VDRecord(**fields)
+
+
+def iter_records(
+    path: str = PathSettings.PROJECT_LOG,
+    sheet: str = ExcelSettings.SOURCE_SHEET,
+) -> Iterator[Tuple[int, str, VDRecord]]:
+    """
+    Потоково читает лист ВД: ищет строку заголовков и отдаёт записи после неё.
+
+    :return: итератор (номер строки, хэш строки, VDRecord)
+    """
+    with XlsxReader(path) as book:
+        mapping: Optional[Dict[str, int]] = None
+        for row_num, values in book.iter_rows(sheet):
+            if mapping is None:
+                candidate = map_header(values)
+                # заголовок — первая строка, где распознано хотя бы два поля
+                if len(candidate) >= 2:
+                    mapping = candidate
+                elif row_num >= ExcelSettings.SOURCE_HEADER_SCAN:
+                    raise ValueError(f"На листе «{sheet}» не найдена строка заголовков ({path})")
+                continue
+            yield row_num, row_hash(values), to_record(values, mapping)
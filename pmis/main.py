@@ -1,7 +1,10 @@
 # pmis/main.py
 # Точка входа: запуск QApplication, чтение конфигов, старт главного окна
+import time
+STARTED: float = time.perf_counter()  # отсчёт времени запуска — до остальных импортов
+import sys
 from utils.logger import LoggerManager
-from init_proj.init_proj import InitProj
+from utils.profiler import Profiler, configure, mode_from_argv
 
 class App:
     """
@@ -16,7 +19,15 @@ class App:
         self.run()
 
     def run(self):
-        init = InitProj()
+        # участок «startup» закрывает InitProj, когда окно показано; импорт GUI входит в него.
+        # Qt и окно импортируются только здесь, ORM, Excel и Word — по мере надобности
+        startup = Profiler.shared().begin("startup")
+        from init_proj.init_proj import InitProj
+        init = InitProj(startup, STARTED)
 
 if __name__ == "__main__":
+    # --profile cpu|sample|mem (или PMIS_PROFILE) включает профилирование, остальные аргументы — для Qt
+    mode, sys.argv = mode_from_argv(sys.argv)
+    if mode:
+        configure(mode)
     app = App()
@@ -1,75 +1,249 @@
 # structure/save_tree.py
 import os
+import re
+import json
+from functools import lru_cache
 from pathlib import Path
-from fnmatch import fnmatch
+from typing import Iterator, Optional, Sequence, TextIO, Tuple, Union
 
 
 def load_gitignore_patterns(gitignore_path: str) -> list[str]:
     """
-    Загружает шаблоны исключений из .gitignore
+    Загружает шаблоны исключений из .gitignore.
+    Строки возвращаются как есть (с «/» и «!»): их смысл разбирает GitIgnoreMatcher.
     """
     patterns = []
     with open(gitignore_path, 'r', encoding='utf-8') as f:
         for line in f:
-            line = line.strip()
+            line = line.rstrip('\n').rstrip()
             if not line or line.startswith('#'):
                 continue
+            patterns.append(line)
+    return patterns
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """
+    Переводит glob из .gitignore в регулярное выражение:
+    «*» и «?» не пересекают «/», «**/» — любое число папок, «/**» — всё содержимое.
+    """
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith('**/', i) and (i == 0 or pattern[i - 1] == '/'):
+            out.append('(?:.*/)?')
+            i += 3
+        elif pattern.startswith('**', i) and i + 2 == n and (i == 0 or pattern[i - 1] == '/'):
+            out.append('.+')
+            i += 2
+        elif c == '*':
+            while i < n and pattern[i] == '*':
+                i += 1
+            out.append('[^/]*')
+        elif c == '?':
+            out.append('[^/]')
+            i += 1
+        elif c == '[':
+            j = pattern.find(']', i + 2 if pattern[i + 1:i + 2] in ('!', '^', ']') else i + 1)
+            if j == -1:
+                out.append(re.escape(c))
+                i += 1
+                continue
+            body = pattern[i + 1:j]
+            if body[:1] in ('!', '^'):
+                body = '^' + body[1:]
+            out.append('[' + body.replace('\\', '\\\\') + ']')
+            i = j + 1
+        elif c == '\\' and i + 1 < n:
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(c))
+            i += 1
+    return ''.join(out)
+
+
+class GitIgnoreMatcher:
+    """
+    Скомпилированный набор правил .gitignore.
 
-            # Убираем хвостовой слэш
-            pattern = line.rstrip('/')
+    Все шаблоны сливаются в два регулярных выражения — для привязанных к корню (содержат «/»)
+    и для совпадающих по имени на любом уровне. Альтернативы идут в обратном порядке,
+    поэтому первое совпадение — это последнее подходящее правило, как того требует
+    семантика «!»-исключений. Папки проверяются с хвостовым «/», что реализует правила вида «build/».
+    """
 
-            # Преобразуем абсолютный путь (начинается с /) → относительный glob-путь
-            if pattern.startswith('/'):
-                pattern = pattern.lstrip('/')
+    def __init__(self, patterns: Sequence[str]) -> None:
+        self.negated: list[bool] = []
+        anchored: list[str] = []
+        basename: list[str] = []
+
+        for index, raw in enumerate(patterns):
+            pattern = raw
+            negate = pattern.startswith('!')
+            if negate:
+                pattern = pattern[1:]
+            elif pattern.startswith('\\!') or pattern.startswith('\\#'):
+                pattern = pattern[1:]
+            dir_only = pattern.endswith('/')
+            pattern = pattern.rstrip('/')
+            if not pattern:
+                self.negated.append(negate)
+                continue
 
-            patterns.append(pattern)
-    return patterns
+            tail = '/' if dir_only else '/?'
+            group = f'(?P<p{index}>'
+            if '/' in pattern:
+                anchored.append(group + _glob_to_regex(pattern.lstrip('/')) + tail + ')')
+            else:
+                basename.append(group + _glob_to_regex(pattern) + tail + ')')
+            self.negated.append(negate)
+
+        self._anchored = re.compile('|'.join(reversed(anchored))) if anchored else None
+        self._basename = re.compile('|'.join(reversed(basename))) if basename else None
+
+    @staticmethod
+    def _rule(match: Optional[re.Match]) -> int:
+        return int(match.lastgroup[1:]) if match else -1
+
+    def match(self, rel_path: str, is_dir: bool) -> bool:
+        """
+        Проверяет путь относительно корня (разделитель «/»).
+
+        :return: True, если путь исключён
+        """
+        suffix = '/' if is_dir else ''
+        rule = -1
+        if self._anchored is not None:
+            rule = self._rule(self._anchored.fullmatch(rel_path + suffix))
+        if self._basename is not None:
+            name = rel_path.rpartition('/')[2]
+            rule = max(rule, self._rule(self._basename.fullmatch(name + suffix)))
+        return rule >= 0 and not self.negated[rule]
+
+    def ignored(self, rel_path: str, is_dir: bool) -> bool:
+        """
+        Как match(), но с учётом папок-предков: содержимое исключённой папки исключено
+        целиком, «!»-правило внутри неё его не возвращает (так же ведёт себя git).
+        """
+        parts = rel_path.split('/')
+        for depth in range(1, len(parts)):
+            if self.match('/'.join(parts[:depth]), True):
+                return True
+        return self.match(rel_path, is_dir)
+
+
+@lru_cache(maxsize=16)
+def _compiled(patterns: Tuple[str, ...]) -> GitIgnoreMatcher:
+    return GitIgnoreMatcher(patterns)
 
 
 def is_ignored(path: Path, patterns: list[str], project_root: Path) -> bool:
     """
     Проверяет, соответствует ли путь одному из паттернов в .gitignore
+    (сам путь или любая из его папок-предков)
     """
-    relative = path.relative_to(project_root)
-    for pattern in patterns:
-        if fnmatch(str(relative), pattern) or any(fnmatch(part, pattern) for part in relative.parts):
-            return True
-    return False
+    relative = path.relative_to(project_root).as_posix()
+    if relative == '.':
+        return False
+    return _compiled(tuple(patterns)).ignored(relative, path.is_dir())
 
 
-def save_tree(start_path: str, out_file: str, ignore_patterns: list[str]) -> None:
+def walk_tree(start_path: str, matcher: GitIgnoreMatcher) -> Iterator[Tuple[str, str, int]]:
     """
-    Рекурсивно сохраняет структуру проекта в файл, игнорируя файлы и папки из .gitignore.
-    Папки отображаются перед файлами.
+    Обходит дерево и отдаёт события ('enter' | 'file' | 'exit', имя, уровень).
+    Исключённые папки отсекаются целиком — их содержимое не читается.
+    Внутри папки сначала идут файлы, затем подпапки; и те и другие по алфавиту.
     """
-    base_path = Path(start_path)
-    with open(out_file, "w", encoding="utf-8") as f:
-        for root, dirs, files in os.walk(base_path):
-            root_path = Path(root)
-            level = len(root_path.relative_to(base_path).parts)
-            indent = '    ' * level
-
-            if is_ignored(root_path, ignore_patterns, base_path):
-                dirs[:] = []
-                continue
-
-            f.write(f"{indent}📁 {root_path.name}\n")
-
-            # Сначала подкаталоги (не выводим отдельно — они попадут при следующем обходе)
-            dirs[:] = [d for d in dirs if not is_ignored(root_path / d, ignore_patterns, base_path)]
+    base = os.path.abspath(start_path)
+    # стек: (абсолютный путь, относительный путь, уровень) или маркер выхода
+    stack: list = [(base, '', 0)]
+    while stack:
+        item = stack.pop()
+        if item[0] is None:
+            yield 'exit', item[1], item[2]
+            continue
+        path, rel, level = item
+        name = os.path.basename(path) or path
+        yield 'enter', name, level
+
+        dirs, files = [], []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    entry_rel = f"{rel}/{entry.name}" if rel else entry.name
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    if matcher.match(entry_rel, is_dir):
+                        continue
+                    (dirs if is_dir else files).append((entry.name, entry.path, entry_rel))
+        except OSError:
+            pass
+
+        for file_name, _, _ in sorted(files):
+            yield 'file', file_name, level + 1
+        stack.append((None, name, level))
+        for dir_name, dir_path, dir_rel in sorted(dirs, reverse=True):
+            stack.append((dir_path, dir_rel, level + 1))
+
+
+def _write_text(events: Iterator[Tuple[str, str, int]], f: TextIO) -> None:
+    for kind, name, level in events:
+        if kind == 'enter':
+            f.write(f"{'    ' * level}📁 {name}\n")
+        elif kind == 'file':
+            f.write(f"{'    ' * level}📄 {name}\n")
+
+
+def _write_json(events: Iterator[Tuple[str, str, int]], f: TextIO) -> None:
+    # потоковая запись вложенного JSON: дерево целиком в памяти не строится
+    need_comma = False
+    for kind, name, _ in events:
+        if kind == 'exit':
+            f.write(']}')
+            need_comma = True
+            continue
+        if need_comma:
+            f.write(',')
+        if kind == 'enter':
+            f.write(f'{{"name":{json.dumps(name, ensure_ascii=False)},"type":"dir","children":[')
+            need_comma = False
+        else:
+            f.write(f'{{"name":{json.dumps(name, ensure_ascii=False)},"type":"file"}}')
+            need_comma = True
+    f.write('\n')
+
+
+def save_tree(
+    start_path: str,
+    out_file: str,
+    ignore_patterns: Union[list[str], GitIgnoreMatcher],
+    fmt: str = "text",
+) -> None:
+    """
+    Рекурсивно сохраняет структуру проекта в файл, игнорируя файлы и папки из .gitignore.
+    Вывод пишется потоково по мере обхода.
 
-            # Затем — файлы
-            for file in sorted(files):
-                file_path = root_path / file
-                if is_ignored(file_path, ignore_patterns, base_path):
-                    continue
-                f.write(f"{indent}    📄 {file}\n")
+    :param fmt: "text" — дерево с эмодзи, "json" — вложенный JSON
+    """
+    matcher = ignore_patterns if isinstance(ignore_patterns, GitIgnoreMatcher) else GitIgnoreMatcher(ignore_patterns)
+    writer = _write_json if fmt == "json" else _write_text
+    with open(out_file, "w", encoding="utf-8", buffering=1024 * 1024) as f:
+        writer(walk_tree(start_path, matcher), f)
 
 
 if __name__ == "__main__":
+    import argparse
+
     here = Path(__file__).resolve().parent
     root = here.parent
+
+    parser = argparse.ArgumentParser(description="Сохранение структуры проекта")
+    parser.add_argument("--format", choices=("text", "json"), default="text")
+    args = parser.parse_args()
+
     gitignore = root / ".gitignore"
     patterns = load_gitignore_patterns(str(gitignore)) if gitignore.exists() else []
 
-    save_tree(str(root), str(here / "project_structure.txt"), patterns)
+    out_name = "project_structure.json" if args.format == "json" else "project_structure.txt"
+    save_tree(str(root), str(here / out_name), patterns, fmt=args.format)
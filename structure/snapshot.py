@@ -0,0 +1,275 @@
+# structure/snapshot.py
+# Снимки дерева папок с Merkle-хэшами и быстрое сравнение снимков 🌳
+#
+# Хэш файла считается по (имя, размер, mtime), хэш папки — по отсортированным
+# (имя, тип, хэш) её детей. Одинаковый хэш папки означает одинаковое поддерево,
+# поэтому diff спускается только туда, где хэши различаются.
+
+import os
+import time
+import sqlite3
+import hashlib
+import argparse
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from config.settings import PathSettings
+from structure.save_tree import GitIgnoreMatcher
+from utils.logger import LoggerManager
+
+SNAPSHOT_EXT = ".snap"
+# Имя снимка — время с микросекундами: имена сортируются по времени и не совпадают
+STAMP_FORMAT = "%Y%m%d-%H%M%S-%f"
+DIGEST_SIZE = 16
+BATCH_SIZE = 5000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS nodes (
+    parent   TEXT NOT NULL,
+    name     TEXT NOT NULL,
+    is_dir   INTEGER NOT NULL,
+    size     INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    hash     BLOB NOT NULL,
+    PRIMARY KEY (parent, name)
+) WITHOUT ROWID;
+"""
+
+
+class SnapshotChange(NamedTuple):
+    """Одно отличие между снимками"""
+    kind: str  # "added" | "removed" | "modified"
+    path: str
+    is_dir: bool
+    old_size: Optional[int] = None
+    new_size: Optional[int] = None
+
+
+def _file_hash(name: str, size: int, mtime_ns: int) -> bytes:
+    return hashlib.blake2b(f"{name}\0{size}\0{mtime_ns}".encode("utf-8"), digest_size=DIGEST_SIZE).digest()
+
+
+def take_snapshot(root: str, out_path: str, ignore: Optional[GitIgnoreMatcher] = None) -> Tuple[int, bytes]:
+    """
+    Обходит дерево и записывает снимок в файл SQLite.
+
+    :param root: корень дерева
+    :param out_path: файл снимка (перезаписывается)
+    :param ignore: правила исключения из save_tree
+    :return: (число записей, хэш корня)
+    """
+    tmp = out_path + ".tmp"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    conn = sqlite3.connect(tmp)
+    conn.executescript("PRAGMA journal_mode=OFF; PRAGMA synchronous=OFF;" + _SCHEMA)
+    batch: List[tuple] = []
+    count = 0
+
+    def flush() -> None:
+        conn.executemany("INSERT INTO nodes VALUES (?, ?, ?, ?, ?, ?)", batch)
+        batch.clear()
+
+    def walk(path: str, rel: str) -> Tuple[int, bytes]:
+        """Возвращает (суммарный размер, хэш) папки; строки детей уходят в batch"""
+        nonlocal count
+        children = []
+        try:
+            with os.scandir(path) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            entries = []
+        for entry in entries:
+            entry_rel = f"{rel}/{entry.name}" if rel else entry.name
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                if ignore is not None and ignore.match(entry_rel, is_dir):
+                    continue
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            if is_dir:
+                size, digest = walk(entry.path, entry_rel)
+            else:
+                size, digest = st.st_size, _file_hash(entry.name, st.st_size, st.st_mtime_ns)
+            batch.append((rel, entry.name, int(is_dir), size, st.st_mtime_ns, digest))
+            children.append((entry.name, is_dir, size, digest))
+            count += 1
+            if len(batch) >= BATCH_SIZE:
+                flush()
+
+        h = hashlib.blake2b(digest_size=DIGEST_SIZE)
+        for name, is_dir, _, digest in children:
+            h.update(name.encode("utf-8"))
+            h.update(b"\0D" if is_dir else b"\0F")
+            h.update(digest)
+        return sum(c[2] for c in children), h.digest()
+
+    try:
+        size, root_hash = walk(root, "")
+        flush()
+        conn.executemany(
+            "INSERT INTO meta VALUES (?, ?)",
+            [
+                ("root", os.path.abspath(root)),
+                ("root_hash", root_hash.hex()),
+                ("size", str(size)),
+                ("created_at", str(time.time())),
+                ("entries", str(count)),
+            ],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp, out_path)
+    return count, root_hash
+
+
+def read_meta(snapshot_path: str) -> Dict[str, str]:
+    """Метаданные снимка: root, root_hash, size, created_at, entries"""
+    conn = sqlite3.connect(f"file:{snapshot_path}?mode=ro", uri=True)
+    try:
+        return dict(conn.execute("SELECT key, value FROM meta"))
+    finally:
+        conn.close()
+
+
+def diff_snapshots(old_path: str, new_path: str) -> Iterator[SnapshotChange]:
+    """
+    Сравнивает два снимка, спускаясь только в поддеревья с разными хэшами.
+    Добавленная или удалённая папка выдаётся одной записью, без содержимого.
+    """
+    conn = sqlite3.connect(f"file:{new_path}?mode=ro", uri=True)
+    try:
+        conn.execute("ATTACH DATABASE ? AS old", (f"file:{old_path}?mode=ro",))
+        query = "SELECT name, is_dir, size, hash FROM {db}.nodes WHERE parent = ?"
+        root_hash = "SELECT value FROM {db}.meta WHERE key = 'root_hash'"
+        if conn.execute(root_hash.format(db="old")).fetchone() == conn.execute(root_hash.format(db="main")).fetchone():
+            return
+
+        stack = [""]
+        while stack:
+            parent = stack.pop()
+            old = {r[0]: r[1:] for r in conn.execute(query.format(db="old"), (parent,))}
+            new = {r[0]: r[1:] for r in conn.execute(query.format(db="main"), (parent,))}
+            subdirs = []
+            for name in sorted(old.keys() | new.keys()):
+                path = f"{parent}/{name}" if parent else name
+                o, n = old.get(name), new.get(name)
+                if o is not None and n is not None and o[2] == n[2]:
+                    continue
+                if o is not None and n is not None and o[0] == n[0]:
+                    if n[0]:
+                        subdirs.append(path)
+                    else:
+                        yield SnapshotChange("modified", path, False, o[1], n[1])
+                    continue
+                if o is not None:
+                    yield SnapshotChange("removed", path, bool(o[0]), old_size=o[1])
+                if n is not None:
+                    yield SnapshotChange("added", path, bool(n[0]), new_size=n[1])
+            stack.extend(reversed(subdirs))
+    finally:
+        conn.close()
+
+
+class SnapshotStore:
+    """
+    Хранилище снимков: для каждого корня — папка с файлами «ГГГГММДД-ЧЧММСС-мкс.snap» (STAMP_FORMAT).
+    """
+
+    def __init__(self, folder: str = PathSettings.SNAPSHOT_FOLDER, ignore: Optional[GitIgnoreMatcher] = None) -> None:
+        """
+        :param folder: папка хранилища
+        :param ignore: правила исключения для новых снимков
+        """
+        self.logger = LoggerManager(__name__).get_logger()
+        self.folder = folder
+        self.ignore = ignore
+
+    def _root_dir(self, root: str) -> str:
+        normalized = os.path.normcase(os.path.abspath(root))
+        key = hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.folder, key)
+
+    def take(self, root: str) -> str:
+        """Делает новый снимок корня. Возвращает путь к файлу"""
+        folder = self._root_dir(root)
+        os.makedirs(folder, exist_ok=True)
+        when = datetime.now()
+        path = os.path.join(folder, when.strftime(STAMP_FORMAT) + SNAPSHOT_EXT)
+        # часы Windows идут шагами по ~15 мс: занятое имя сдвигается на микросекунду вперёд
+        while os.path.exists(path):
+            when += timedelta(microseconds=1)
+            path = os.path.join(folder, when.strftime(STAMP_FORMAT) + SNAPSHOT_EXT)
+        start = time.perf_counter()
+        count, _ = take_snapshot(root, path, self.ignore)
+        self.logger.info(f"📸 Снимок {root}: {count} записей за {time.perf_counter() - start:.2f} с → {path}")
+        return path
+
+    def list(self, root: str) -> List[str]:
+        """Снимки корня от старых к новым"""
+        folder = self._root_dir(root)
+        if not os.path.isdir(folder):
+            return []
+        return [os.path.join(folder, n) for n in sorted(os.listdir(folder)) if n.endswith(SNAPSHOT_EXT)]
+
+    def before(self, root: str, when: datetime) -> Optional[str]:
+        """Последний снимок, сделанный не позже when"""
+        stamp = when.strftime(STAMP_FORMAT) + SNAPSHOT_EXT
+        candidates = [p for p in self.list(root) if os.path.basename(p) <= stamp]
+        return candidates[-1] if candidates else None
+
+    def changes_since(self, root: str, days: float) -> List[SnapshotChange]:
+        """
+        Что изменилось в дереве за последние days дней: новый снимок сравнивается
+        с последним снимком, сделанным до этого срока (или с самым старым из имеющихся).
+        """
+        snapshots = self.list(root)
+        if not snapshots:
+            self.take(root)
+            self.logger.warning(f"⚠️ Для {root} ещё не было снимков — сделан первый, сравнивать не с чем")
+            return []
+        baseline = self.before(root, datetime.fromtimestamp(time.time() - days * 86400)) or snapshots[0]
+        current = self.take(root)
+        start = time.perf_counter()
+        changes = list(diff_snapshots(baseline, current))
+        self.logger.info(
+            f"🔍 Сравнение с {os.path.basename(baseline)}: {len(changes)} изменений "
+            f"за {(time.perf_counter() - start) * 1000:.1f} мс"
+        )
+        return changes
+
+
+def print_changes(changes: List[SnapshotChange]) -> None:
+    """Выводит изменения: «+» добавлено, «-» удалено, «~» изменено"""
+    marks = {"added": "+", "removed": "-", "modified": "~"}
+    for change in changes:
+        icon = "📁" if change.is_dir else "📄"
+        print(f"{marks[change.kind]} {icon} {change.path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Снимки дерева проекта и сравнение")
+    sub = parser.add_subparsers(dest="command", required=True)
+    take_cmd = sub.add_parser("take", help="сделать снимок")
+    take_cmd.add_argument("root", help="папка проекта")
+    take_cmd.add_argument("-o", "--out", help="файл снимка (по умолчанию — в хранилище)")
+    diff_cmd = sub.add_parser("diff", help="сравнить два файла снимков")
+    diff_cmd.add_argument("old")
+    diff_cmd.add_argument("new")
+    since_cmd = sub.add_parser("since", help="что изменилось за последние N дней")
+    since_cmd.add_argument("root", help="папка проекта")
+    since_cmd.add_argument("--days", type=float, default=7)
+    args = parser.parse_args()
+
+    if args.command == "take":
+        if args.out:
+            print(take_snapshot(args.root, args.out)[0])
+        else:
+            print(SnapshotStore().take(args.root))
+    elif args.command == "diff":
+        print_changes(list(diff_snapshots(args.old, args.new)))
+    else:
+        print_changes(SnapshotStore().changes_since(args.root, args.days))
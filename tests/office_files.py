@@ -0,0 +1,111 @@
+# tests/office_files.py
+# Минимальные книги .xlsx и документы .docx для тестов: XML пишется руками, без Office и openpyxl
+
+import zipfile
+from typing import Dict, List, Optional, Sequence
+from xml.sax.saxutils import escape
+
+NS_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+NS_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+NS_PKG_REL = "http://schemas.openxmlformats.org/package/2006/relationships"
+NS_W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+# стиль 1 — дата (встроенный формат 14); шрифты, заливки и границы — как у книги из Excel
+STYLES = (
+    f'<styleSheet xmlns="{NS_MAIN}">'
+    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill><fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="14" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/></cellXfs>'
+    '</styleSheet>'
+)
+
+
+def cell(ref: str, value, kind: Optional[str] = None, style: Optional[int] = None) -> str:
+    """XML ячейки: kind — атрибут t (s, inlineStr, b, d, str); None — число"""
+    attrs = f' r="{ref}"' + (f' t="{kind}"' if kind else "") + (f' s="{style}"' if style is not None else "")
+    if kind == "inlineStr":
+        return f"<c{attrs}><is><t>{escape(str(value))}</t></is></c>"
+    return f"<c{attrs}><v>{escape(str(value))}</v></c>"
+
+
+def row(number: int, cells: Sequence[str]) -> str:
+    return f'<row r="{number}">{"".join(cells)}</row>'
+
+
+def write_xlsx(path: str, sheets: Dict[str, List[str]], shared: Sequence[str] = ()) -> str:
+    """
+    Пишет книгу: лист -> список XML строк (см. row/cell), shared — общие строки.
+    """
+    names = list(sheets)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as z:
+        z.writestr("[Content_Types].xml", (
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            + "".join(
+                f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+                'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+                for i in range(1, len(names) + 1)
+            )
+            + '</Types>'
+        ))
+        z.writestr("_rels/.rels", (
+            f'<Relationships xmlns="{NS_PKG_REL}"><Relationship Id="rId1" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+            'Target="xl/workbook.xml"/></Relationships>'
+        ))
+        z.writestr("xl/workbook.xml", (
+            f'<workbook xmlns="{NS_MAIN}" xmlns:r="{NS_REL}"><sheets>'
+            + "".join(f'<sheet name="{escape(n)}" sheetId="{i}" r:id="rId{i}"/>' for i, n in enumerate(names, 1))
+            + "</sheets></workbook>"
+        ))
+        z.writestr("xl/_rels/workbook.xml.rels", (
+            f'<Relationships xmlns="{NS_PKG_REL}">'
+            + "".join(
+                f'<Relationship Id="rId{i}" Type="{NS_REL}/worksheet" Target="worksheets/sheet{i}.xml"/>'
+                for i in range(1, len(names) + 1)
+            )
+            + f'<Relationship Id="rId{len(names) + 1}" Type="{NS_REL}/styles" Target="styles.xml"/>'
+            + f'<Relationship Id="rId{len(names) + 2}" Type="{NS_REL}/sharedStrings" Target="sharedStrings.xml"/>'
+            + "</Relationships>"
+        ))
+        z.writestr("xl/styles.xml", STYLES)
+        z.writestr("xl/sharedStrings.xml", (
+            f'<sst xmlns="{NS_MAIN}" count="{len(shared)}" uniqueCount="{len(shared)}">'
+            + "".join(f"<si><t>{escape(s)}</t></si>" for s in shared)
+            + "</sst>"
+        ))
+        for i, name in enumerate(names, 1):
+            z.writestr(f"xl/worksheets/sheet{i}.xml", (
+                f'<worksheet xmlns="{NS_MAIN}"><sheetData>{"".join(sheets[name])}</sheetData></worksheet>'
+            ))
+    return path
+
+
+def paragraph(text: str = "") -> str:
+    return f"<w:p><w:r><w:t xml:space=\"preserve\">{escape(text)}</w:t></w:r></w:p>" if text else "<w:p/>"
+
+
+def write_docx(path: str, body: str) -> str:
+    """Пишет документ с телом body (XML внутри <w:body>)"""
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as z:
+        z.writestr("[Content_Types].xml", (
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/word/document.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+            '</Types>'
+        ))
+        z.writestr("_rels/.rels", (
+            f'<Relationships xmlns="{NS_PKG_REL}"><Relationship Id="rId1" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+            'Target="word/document.xml"/></Relationships>'
+        ))
+        z.writestr("word/document.xml", f'<w:document xmlns:w="{NS_W}"><w:body>{body}</w:body></w:document>')
+    return path
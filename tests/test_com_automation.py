@@ -1 +1,141 @@
-# Тесты модулей excel_com/word_com
+# tests/test_com_automation.py
+# Тесты модулей excel_com/word_com: файловые бэкенды OOXML на сгенерированных книгах и документах
+
+import zipfile
+from datetime import date, datetime
+from xml.etree import ElementTree
+
+import pytest
+
+from tests.office_files import NS_W, cell, paragraph, row, write_docx, write_xlsx
+from utils.excel_com import OoxmlWorkbook, open_workbook, split_range
+from utils.word_com import open_document
+from utils.xlsx_reader import XlsxReader
+
+
+def check_docx(path):
+    """Пакет цел, а XML документа разбирается — иначе Word откажется его открыть"""
+    with zipfile.ZipFile(path) as zf:
+        assert zf.testzip() is None
+        xml = zf.read("word/document.xml").decode("utf-8")
+    ElementTree.fromstring(xml)
+    return xml
+
+
+def texts(xml):
+    """Текст абзацев документа по порядку"""
+    root = ElementTree.fromstring(xml)
+    return ["".join(t.text or "" for t in p.iter(f"{{{NS_W}}}t")) for p in root.iter(f"{{{NS_W}}}p")]
+
+
+# --- Excel ---
+
+def test_split_range():
+    assert split_range("D10:B3") == (3, 1, 10, 3)
+    with pytest.raises(ValueError):
+        split_range("3B")
+
+
+def test_write_range(tmp_path):
+    path = write_xlsx(str(tmp_path / "book.xlsx"), {
+        "Данные": [row(1, [cell("A1", "Заголовок", "inlineStr"), cell("C1", 1)])],
+        "Прочее": [row(1, [cell("A1", 7)])],
+    })
+    with open_workbook(path) as book:
+        assert book.sheet_names == ["Данные", "Прочее"]
+        ref = book.write_range("Данные", "B2", [
+            ["текст", 2.5, True],
+            [date(2024, 3, 5), datetime(2024, 3, 5, 10, 30), None],
+        ])
+        assert ref == "B2:D3"
+        assert book.read_range("Данные", "A1:D3")[1] == [None, "текст", 2.5, True]  # до сохранения
+        book.save()
+        assert book.read_range("Данные", "A1:C1") == [["Заголовок", None, 1]]
+        with pytest.raises(KeyError):
+            book.write_range("Нет такого", "A1", [[1]])
+
+    with zipfile.ZipFile(path) as zf:
+        assert zf.testzip() is None
+    with XlsxReader(path) as book:
+        rows = dict(book.iter_rows("Данные"))
+        other = list(book.iter_rows("Прочее"))
+    assert rows[1] == ["Заголовок", None, 1]
+    assert rows[2] == [None, "текст", 2.5, True]
+    assert rows[3] == [None, datetime(2024, 3, 5), datetime(2024, 3, 5, 10, 30)]
+    assert other == [(1, [7])]
+
+
+def test_cell_xml_keeps_style_and_skips_non_finite():
+    cell_xml = OoxmlWorkbook._cell_xml
+    assert cell_xml("A1", float("nan"), None, (1, 2)) == ""
+    assert cell_xml("A1", float("-inf"), "5", (1, 2)) == '<c r="A1" s="5"/>'
+    # своё оформление ячейки (рамки, заливка) не заменяется стилем даты
+    assert cell_xml("A1", date(1900, 1, 1), "5", (1, 2)) == '<c r="A1" s="5"><v>2</v></c>'
+    assert cell_xml("A1", date(1900, 1, 1), None, (1, 2)) == '<c r="A1" s="1"><v>2</v></c>'
+    assert cell_xml("A1", datetime(1900, 1, 1), "0", (1, 2)).startswith('<c r="A1" s="2">')
+
+
+# --- Word ---
+
+def bookmark(name, bm_id, text):
+    return (f'<w:p><w:bookmarkStart w:id="{bm_id}" w:name="{name}"/>'
+            f'<w:r><w:rPr><w:b/></w:rPr><w:t>{text}</w:t></w:r><w:bookmarkEnd w:id="{bm_id}"/></w:p>')
+
+
+def table(rows, mark=None):
+    """Таблица: строки — списки XML абзацев ячеек"""
+    start = f'<w:bookmarkStart w:id="9" w:name="{mark}"/><w:bookmarkEnd w:id="9"/>' if mark else ""
+    body = "".join(
+        "<w:tr>" + "".join(f"<w:tc><w:tcPr/>{start if i == j == 0 else ''}{p}</w:tc>" for j, p in enumerate(cells))
+        + "</w:tr>"
+        for i, cells in enumerate(rows)
+    )
+    return f"<w:tbl><w:tblPr/>{body}</w:tbl>"
+
+
+def test_replace_placeholders_and_bookmarks(tmp_path):
+    path = write_docx(str(tmp_path / "doc.docx"), (
+        paragraph("Проект {{ project.name }}, заказчик {{customer.name}}")
+        + '<w:p><w:r><w:t>Шифр: {{ proj</w:t></w:r><w:r><w:t>ect.code }}</w:t></w:r></w:p>'
+        + paragraph("{{ unknown }}")
+        + bookmark("date", 1, "дата")
+        + bookmark("missing_end", 2, "x").replace('<w:bookmarkEnd w:id="2"/>', "")
+    ))
+    with open_document(path) as doc:
+        assert doc.placeholders() == {"project.name", "customer.name", "project.code", "unknown"}
+        count = doc.replace_placeholders({
+            "project.name": "089", "customer.name": "ООО «Верфь» & Ко", "project.code": "089.000",
+        })
+        assert count == 3
+        assert doc.replace_bookmarks({"date": "05.03.2024", "missing_end": "y", "absent": "z"}) == 1
+        doc.save()
+
+    xml = check_docx(path)
+    assert texts(xml)[:4] == [
+        "Проект 089, заказчик ООО «Верфь» & Ко", "Шифр: 089.000", "{{ unknown }}", "05.03.2024",
+    ]
+    assert "<w:b/>" in xml  # оформление закладки сохранено
+
+
+def test_render_table(tmp_path):
+    path = write_docx(str(tmp_path / "doc.docx"), (
+        table([[paragraph("№"), paragraph("Имя")], [paragraph("1"), paragraph("образец")]])
+        + table([[paragraph("Шифр"), "<w:p/>", '<w:p w:rsidR="00A1"/>']], mark="docs")
+        + table([[paragraph("{{ n }}"), paragraph("{{ name }}")]])
+    ))
+    with open_document(path) as doc:
+        assert doc.render_table([(1, "первый"), (2, "второй\nстрока")]) == 2
+        assert doc.render_table([("089.001", "Спецификация", 3), ("089.002",)], table="docs") == 2
+        assert doc.render_table([{"n": 1, "name": "<a>"}, {"n": 2}], table=2) == 2
+        with pytest.raises(KeyError):
+            doc.render_table([], table="нет")
+        doc.save(str(tmp_path / "out.docx"))
+
+    xml = check_docx(str(tmp_path / "out.docx"))
+    assert texts(xml) == [
+        "№", "Имя", "1", "первый", "2", "второйстрока",
+        "089.001", "Спецификация", "3", "089.002", "", "",
+        "1", "<a>", "2", "{{ name }}",
+    ]
+    assert xml.count('w:name="docs"') == 1
+    assert '<w:p w:rsidR="00A1"><w:r>' in xml
@@ -0,0 +1,85 @@
+# tests/test_content_index.py
+# Тесты полнотекстового индекса: извлечение, поиск и повтор неудачных файлов
+
+import os
+import struct
+import zipfile
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from db_init.documents.init_documents import DBInitDocuments
+from db_init.documents.models_documents import DocumentContent
+from indexer import content_index
+from indexer.content_index import ContentIndexer
+from tests.office_files import paragraph, write_docx
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    init = DBInitDocuments(f"sqlite:///{tmp_path / 'docs.sqlite3'}")
+    init.create_tables()
+
+    @contextmanager
+    def factory():
+        with Session(init.get_engine()) as session:
+            yield session
+            session.commit()
+
+    yield factory
+    init.get_engine().dispose()
+
+
+def test_failed_files_are_retried(tmp_path, session_factory, monkeypatch):
+    root = tmp_path / "projects"
+    (root / "089").mkdir(parents=True)
+    write_docx(str(root / "089" / "spec.docx"), paragraph("Спецификация насоса"))
+    slow = str(root / "089" / "slow.docx")
+    write_docx(slow, paragraph("Руководство по эксплуатации"))
+    indexer = ContentIndexer([str(root)], workers=1, session_factory=session_factory)
+
+    extract = content_index.extract_file
+    monkeypatch.setattr(content_index, "extract_file",
+                        lambda job: (job[0], "timeout", "", "долго") if job[0] == slow else extract(job))
+    first = indexer.run(walk=True)
+    assert (first["extracted"], first["failed"]) == (1, 1)
+    assert indexer.search("насоса")[0]["project"] == "089"
+
+    # файл не менялся, но прошлый раз упёрся в таймаут — разбирается снова
+    monkeypatch.setattr(content_index, "extract_file", extract)
+    second = indexer.run(walk=True)
+    assert (second["extracted"], second["unchanged"], second["failed"]) == (1, 1, 0)
+    assert [os.path.basename(hit["path"]) for hit in indexer.search("эксплуатации")] == ["slow.docx"]
+
+    third = indexer.run(walk=True)
+    assert (third["extracted"], third["unchanged"]) == (0, 2)
+
+
+def corrupt_deflate(path, part):
+    """Портит сжатые данные части: zipfile откроет архив, а распаковка упадёт с zlib.error"""
+    with zipfile.ZipFile(path) as zf:
+        info = zf.getinfo(part)
+    with open(path, "r+b") as f:
+        f.seek(info.header_offset + 26)
+        name_len, extra_len = struct.unpack("<HH", f.read(4))
+        start = info.header_offset + 30 + name_len + extra_len
+        f.seek(start + info.compress_size // 3)
+        f.write(b"\xff" * 8)
+
+
+def test_corrupt_file_is_recorded_as_error(tmp_path, session_factory):
+    root = tmp_path / "projects"
+    (root / "089").mkdir(parents=True)
+    write_docx(str(root / "089" / "good.docx"), paragraph("Целый документ"))
+    bad = str(root / "089" / "bad.docx")
+    write_docx(bad, "".join(paragraph(f"Абзац {i} {'текст ' * (i % 7)}") for i in range(300)))
+    corrupt_deflate(bad, "word/document.xml")
+
+    stats = ContentIndexer([str(root)], workers=1, session_factory=session_factory).run(walk=True)
+    assert (stats["extracted"], stats["failed"]) == (1, 1)
+    with session_factory() as session:
+        status, error = session.execute(
+            select(DocumentContent.status, DocumentContent.error).where(DocumentContent.path == bad)).one()
+    assert status == "error" and error.startswith("error:")  # zlib.error
@@ -0,0 +1,46 @@
+# tests/test_doc_codes.py
+# Тесты разбора кодов документов и индекса по таблице documents
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from db_init.base import Base
+from db_init.documents.models_documents import Document
+from indexer.doc_codes import CodeIndex, parse_name, parse_names
+
+
+def test_parse_name():
+    code = parse_name("089.049 (pwom) Руководство.docx")
+    assert (code.number, code.abbr, code.title) == ("089.049", "PWOM", "Руководство")
+    assert parse_name("089,049 Руководство (SIP).PDF").number == "089.049"
+    assert parse_name("Письмо заказчику.docx") is None
+
+
+def test_dotted_suffix_is_not_extension():
+    assert parse_name("089.049").number == "089.049"
+    assert parse_name("089.049 Руководство ред.2").title == "Руководство ред.2"
+    assert parse_name("089.049 Руководство ред.2.docx").title == "Руководство ред.2"
+    assert parse_name("089.049 Руководство.docx", is_dir=True).title == "Руководство.docx"
+
+
+def test_parse_names_memo_keeps_paths_and_dirs():
+    names = ["089.049 Отчет.pdf", "089.049 Отчет.pdf", "без кода", "089.050 Папка.pdf"]
+    codes = parse_names(names, ["a", "b", "c", "d"], [False, False, False, True])
+    assert [c and c.path for c in codes] == ["a", "b", None, "d"]
+    assert codes[0].title == "Отчет" and codes[3].title == "Папка.pdf"
+    assert parse_names(names)[1].path == ""
+
+
+def test_from_documents(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'docs.sqlite3'}")
+    Base.metadata.create_all(engine, tables=[Document.__table__])
+    rows = [("089.049", True, ""), ("089.050 Спецификация (SPEC).docx", False, ".docx")]
+    with Session(engine) as session:
+        for name, is_dir, ext in rows:
+            session.add(Document(root="R", path=f"R/{name}", parent="R", name=name, ext=ext, is_dir=is_dir,
+                                 size=0, mtime_ns=0))
+        session.commit()
+        index = CodeIndex.from_documents(session, root="R")
+    engine.dispose()
+    assert [c.number for c in index.complete("089.0")] == ["089.049", "089.050"]
+    assert index.exact("spec")[0].path == "R/089.050 Спецификация (SPEC).docx"
@@ -0,0 +1,64 @@
+# tests/test_doc_render.py
+# Тесты заполнения шаблонов Word: поля в тексте, сырые части пакета, пакетный рендер
+
+import os
+import zipfile
+
+from init_proj.doc_render import DocumentRenderer, compile_template, get_template
+from tests.office_files import paragraph, write_docx
+
+IMAGE = bytes(range(256)) * 16
+
+
+def make_template(path):
+    body = (
+        paragraph("Проект {{ project.name }}")
+        # поле, разрезанное Word на три прогона
+        + '<w:p><w:r><w:t>Заказчик: {{ cust</w:t></w:r><w:r><w:t>omer.</w:t></w:r>'
+          '<w:r><w:t>name }}</w:t></w:r></w:p>'
+        + paragraph("Нет значения: {{ project.code }}")
+    )
+    write_docx(path, body)
+    with zipfile.ZipFile(path, "a", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("word/media/image1.png", IMAGE)
+    return path
+
+
+def document_text(path):
+    with zipfile.ZipFile(path) as zf:
+        assert zf.testzip() is None
+        return zf.read("word/document.xml").decode("utf-8")
+
+
+def test_compile_finds_placeholders(tmp_path):
+    template = compile_template(make_template(str(tmp_path / "t.docx")))
+    assert template.placeholders == {"project.name", "customer.name", "project.code"}
+    assert set(template.raw) == {"_rels/.rels", "word/media/image1.png"}
+
+
+def test_render(tmp_path):
+    template = get_template(make_template(str(tmp_path / "t.docx")))
+    out = str(tmp_path / "out.docx")
+    template.render({"project.name": "089 <Буксир>", "customer.name": "ООО «Верфь»"}, out)
+
+    xml = document_text(out)
+    assert "Проект 089 &lt;Буксир&gt;" in xml
+    assert "Заказчик: ООО «Верфь»" in xml
+    assert "{{project.code}}" in xml  # поле без значения остаётся полем
+    assert not os.path.exists(out + ".part")
+    with zipfile.ZipFile(out) as zf:
+        assert zf.read("word/media/image1.png") == IMAGE
+        assert zf.namelist() == ["[Content_Types].xml", "_rels/.rels", "word/document.xml", "word/media/image1.png"]
+
+
+def test_render_project(tmp_path):
+    source = tmp_path / "templates" / "Проект"
+    source.mkdir(parents=True)
+    make_template(str(source / "{{project.name}} PWOM.docx"))
+    out_dir = str(tmp_path / "089")
+
+    report = DocumentRenderer(workers=1).render_project({"project.name": "089"}, [str(source)], out_dir)
+    assert report.ok
+    out = os.path.join(out_dir, "Проект", "089 PWOM.docx")
+    assert report.rendered == [out]
+    assert "Проект 089" in document_text(out)
@@ -0,0 +1,34 @@
+# tests/test_profiler.py
+# Тесты профилировщика: участки режима mem в нескольких потоках
+
+import threading
+import tracemalloc
+
+from utils.profiler import Profiler
+
+
+def test_overlapping_mem_sections(tmp_path):
+    profiler = Profiler("mem", out_dir=str(tmp_path), min_duration=0)
+    started = threading.Event()
+    first_done = threading.Event()
+    results = {}
+
+    def second():
+        section = profiler.begin("второй")
+        started.set()
+        first_done.wait(5)
+        data = [bytearray(1000) for _ in range(100)]
+        results["второй"] = profiler.end(section)
+        del data
+
+    thread = threading.Thread(target=second)
+    section = profiler.begin("первый")
+    thread.start()
+    assert started.wait(5)
+    results["первый"] = profiler.end(section)  # участок другого потока ещё идёт
+    assert tracemalloc.is_tracing()
+    first_done.set()
+    thread.join(5)
+
+    assert all(results[name] for name in ("первый", "второй"))
+    assert not tracemalloc.is_tracing()  # остановил последний участок
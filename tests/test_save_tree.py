@@ -0,0 +1,67 @@
+# tests/test_save_tree.py
+# Тесты правил .gitignore в structure/save_tree
+
+from pathlib import Path
+
+import pytest
+
+from structure.save_tree import GitIgnoreMatcher, is_ignored
+
+
+@pytest.fixture
+def tree(tmp_path: Path) -> Path:
+    for rel in ("node_modules/x/y.py", "build/out.txt", "src/build/gen.py", "src/app.py",
+                "logs/app.log", "logs/keep.log", "docs/a/b/c.md", "main.pyc"):
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("")
+    return tmp_path
+
+
+def test_nested_file_under_ignored_dir(tree: Path) -> None:
+    patterns = ["node_modules/"]
+    assert is_ignored(tree / "node_modules", patterns, tree)
+    assert is_ignored(tree / "node_modules/x", patterns, tree)
+    assert is_ignored(tree / "node_modules/x/y.py", patterns, tree)
+    assert not is_ignored(tree / "src/app.py", patterns, tree)
+
+
+def test_negation(tree: Path) -> None:
+    patterns = ["*.log", "!keep.log"]
+    assert is_ignored(tree / "logs/app.log", patterns, tree)
+    assert not is_ignored(tree / "logs/keep.log", patterns, tree)
+
+
+def test_negation_cannot_reinclude_from_ignored_dir(tree: Path) -> None:
+    patterns = ["logs/", "!keep.log"]
+    assert is_ignored(tree / "logs/keep.log", patterns, tree)
+
+
+def test_double_star() -> None:
+    matcher = GitIgnoreMatcher(["docs/**/*.md", "**/gen.py"])
+    assert matcher.match("docs/a/b/c.md", False)
+    assert matcher.match("docs/c.md", False)
+    assert matcher.match("src/build/gen.py", False)
+    assert matcher.match("gen.py", False)
+    assert not matcher.match("src/c.md", False)
+
+
+def test_dir_only(tree: Path) -> None:
+    matcher = GitIgnoreMatcher(["build/"])
+    assert matcher.match("build", True)
+    assert matcher.match("src/build", True)
+    assert not matcher.match("build", False)
+    assert is_ignored(tree / "src/build/gen.py", ["build/"], tree)
+
+
+def test_anchored(tree: Path) -> None:
+    patterns = ["/build"]
+    assert is_ignored(tree / "build", patterns, tree)
+    assert is_ignored(tree / "build/out.txt", patterns, tree)
+    assert not is_ignored(tree / "src/build", patterns, tree)
+    assert not is_ignored(tree / "src/build/gen.py", patterns, tree)
+
+
+def test_basename_pattern_any_level(tree: Path) -> None:
+    assert is_ignored(tree / "main.pyc", ["*.pyc"], tree)
+    assert not is_ignored(tree, ["*"], tree)
@@ -0,0 +1,46 @@
+# tests/test_search_completer.py
+# Тесты поиска при вводе: большой справочник индексируется и ищется в фоне
+
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+from PyQt6 import QtCore, QtWidgets  # noqa: E402
+
+from utils.search_completer import SYNC_LIMIT, SearchCompleter  # noqa: E402
+from utils.task_pool import TaskManager  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def wait(app, condition, timeout_ms=5000):
+    timer = QtCore.QElapsedTimer()
+    timer.start()
+    while not condition() and timer.elapsed() < timeout_ms:
+        app.processEvents(QtCore.QEventLoop.ProcessEventsFlag.AllEvents, 20)
+    assert condition()
+
+
+def test_background_catalog(app):
+    edit = QtWidgets.QLineEdit()
+    edit.show()  # всплывающий список открывается только у видимого поля
+    tasks = TaskManager(max_threads=2)
+    completer = SearchCompleter(edit, tasks, delay_ms=0)
+    try:
+        items = [(f"Заказчик {i}", i) for i in range(SYNC_LIMIT * 3)]
+        for _ in range(20):  # каждая загрузка заменяет прежнюю; результат последней не теряется
+            completer.set_items(items)
+        wait(app, lambda: completer.index is not None)
+        assert len(completer.index) == len(items)
+
+        for query in ("Заказчик 12", "Заказчик 123", "Заказчик 1234"):
+            edit.setText(query)
+            edit.textEdited.emit(query)
+            wait(app, lambda: completer.model.rowCount() and completer.model.item(0).text() == query)
+        assert completer.model.item(0).data(QtCore.Qt.ItemDataRole.UserRole) == 1234
+    finally:
+        tasks.shutdown()
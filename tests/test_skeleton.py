@@ -0,0 +1,58 @@
+# tests/test_skeleton.py
+# Тесты скелета папок проекта: план по этапам, повторный запуск, dry-run и ошибки входных данных
+
+import os
+
+import pytest
+
+from init_proj.skeleton import SkeletonGenerator
+
+STAGES = {"НОВОЕ СУДНО": ["01 Эскизный", "02 Технический"], "ПЕРЕОБОРУДОВАНИЕ": ["01 Обследование"]}
+
+
+def make(base):
+    return SkeletonGenerator(str(base), stages=STAGES, workers=2)
+
+
+def test_plan(tmp_path):
+    root = os.path.join(str(tmp_path), "089 Буксир_1")
+    assert make(tmp_path).plan("089 Буксир/1", "НОВОЕ СУДНО", ["Чертежи"]) == [
+        root,
+        os.path.join(root, "01 Эскизный"), os.path.join(root, "01 Эскизный", "Чертежи"),
+        os.path.join(root, "02 Технический"), os.path.join(root, "02 Технический", "Чертежи"),
+    ]
+
+
+def test_apply_is_idempotent(tmp_path):
+    generator = make(tmp_path)
+    projects = [("089", "НОВОЕ СУДНО"), ("090", "ПЕРЕОБОРУДОВАНИЕ")]
+    first = generator.build(projects, extra=["Чертежи/Корпус"])
+    assert len(first.created) == 11 and first.existing == []
+    assert os.path.isdir(tmp_path / "089" / "02 Технический" / "Чертежи" / "Корпус")
+
+    second = generator.build(projects, extra=["Чертежи/Корпус"])
+    assert second.created == [] and sorted(second.existing) == sorted(first.created)
+
+
+def test_dry_run_creates_nothing(tmp_path, capsys):
+    (tmp_path / "089").mkdir()
+    report = make(tmp_path).build([("089", "НОВОЕ СУДНО")], dry_run=True)
+    assert report.existing == [os.path.join(str(tmp_path), "089")]
+    assert len(report.created) == 2
+    assert os.listdir(tmp_path / "089") == []
+    assert f"+ {os.path.join(str(tmp_path), '089', '01 Эскизный')}" in capsys.readouterr().out
+
+
+def test_missing_base_dir(tmp_path):
+    generator = make(tmp_path / "нет")
+    with pytest.raises(FileNotFoundError, match="Папка проектов недоступна"):
+        generator.build([("089", "НОВОЕ СУДНО")])
+    assert not os.path.exists(tmp_path / "нет")
+
+
+def test_unknown_type_is_reported(tmp_path, monkeypatch):
+    generator = make(tmp_path)
+    warnings = []
+    monkeypatch.setattr(generator.logger, "warning", warnings.append)
+    assert generator.plan("089", "ЯХТА") == [os.path.join(str(tmp_path), "089")]
+    assert len(warnings) == 1 and "ЯХТА" in warnings[0]
@@ -0,0 +1,38 @@
+# tests/test_sql_profiler.py
+# Тесты замера SQL: формы запросов, учёт упавших запросов
+
+import atexit
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from db_init.sql_profiler import SqlProfiler, statement_shape
+
+
+def test_statement_shape():
+    assert statement_shape("SELECT * FROM t WHERE id IN (1, 2, 3) AND name = 'a''b'") == \
+        "SELECT * FROM t WHERE id IN (?…) AND name = ?"
+
+
+def test_failed_statement_is_counted(tmp_path):
+    profiler = SqlProfiler(slow_ms=10_000, report_path=str(tmp_path / "sql_report.txt"))
+    atexit.unregister(profiler.write_report)
+    engine = profiler.attach(create_engine("sqlite://"))
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM missing"))
+            conn.execute(text("SELECT 2"))
+    finally:
+        profiler.detach(engine)
+        engine.dispose()
+
+    assert profiler._local.starts == []  # время упавшего запроса не осталось на стеке
+    stats = {}
+    for (shape, _), stat in profiler.stats.items():
+        count, errors = stats.get(shape, (0, 0))
+        stats[shape] = (count + stat.count, errors + stat.errors)
+    assert stats == {"SELECT ?": (2, 0), "SELECT * FROM missing": (1, 1)}
+    assert "с ошибкой 1" in profiler.report()
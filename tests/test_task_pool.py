@@ -0,0 +1,103 @@
+# tests/test_task_pool.py
+# Тесты пула фоновых задач: ключи задач, журнал ошибок
+
+import logging
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+from PyQt6 import QtCore  # noqa: E402
+
+from utils.task_pool import TaskManager  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+
+@pytest.fixture
+def tasks(app):
+    manager = TaskManager(max_threads=2)
+    yield manager
+    manager.shutdown()
+
+
+def wait(app, condition, timeout_ms=5000):
+    timer = QtCore.QElapsedTimer()
+    timer.start()
+    while not condition() and timer.elapsed() < timeout_ms:
+        app.processEvents(QtCore.QEventLoop.ProcessEventsFlag.AllEvents, 20)
+    assert condition()
+
+
+def total(items, token=None):
+    return sum(items)
+
+
+def broken(token=None):
+    raise ValueError("сломалось")
+
+
+def echo(value, token=None):
+    return value
+
+
+def test_callbacks_see_fast_tasks(app, tasks):
+    # сигнал handle.signals, подключённый после submit(), быстрая задача успевала испустить раньше
+    received = []
+    for i in range(500):
+        tasks.submit(echo, i, on_finished=received.append)
+    wait(app, lambda: len(received) == 500 and not tasks.active)
+    assert sorted(received) == list(range(500))
+
+
+def test_callbacks_of_merged_and_replaced_tasks(app, tasks):
+    gate = QtCore.QSemaphore()
+
+    def blocked(value, token=None):
+        gate.acquire()
+        return value
+
+    finished, failed = [], []
+    tasks.submit(blocked, 1, key="k", on_finished=lambda r: finished.append(("первый", r)))
+    tasks.submit(blocked, 2, key="k", on_finished=lambda r: finished.append(("повтор", r)))  # слит с первым
+    tasks.submit(broken, key="b", on_failed=failed.append)
+    gate.release(1)
+    wait(app, lambda: len(finished) == 2 and failed)
+    assert finished == [("первый", 1), ("повтор", 1)] and failed == ["сломалось"]
+
+    tasks.submit(blocked, 3, key="k", on_finished=lambda r: finished.append(("старый", r)))
+    tasks.submit(blocked, 4, key="k", replace=True, on_finished=lambda r: finished.append(("новый", r)))
+    gate.release(2)
+    wait(app, lambda: not tasks.active)
+    assert finished[2:] == [("новый", 4)]  # заменённая задача о себе не сообщает
+
+
+def test_unhashable_args_get_own_key(app, tasks):
+    results = []
+    tasks.taskFinished.connect(lambda _key, _title, result: results.append(result))
+    first = tasks.submit(total, [1, 2])
+    second = tasks.submit(total, [1, 2])
+    assert first is not second and first.key != second.key
+    assert tasks.submit(total, (1, 2)).key == (total, ((1, 2),))
+    wait(app, lambda: len(results) == 3)
+    assert results == [3, 3, 3]
+
+
+def test_failure_logged_with_exc_info(app, tasks):
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    logger = logging.getLogger("utils.task_pool")
+    logger.addHandler(handler)
+    try:
+        errors = []
+        tasks.submit(broken, on_failed=errors.append)
+        wait(app, lambda: errors)
+    finally:
+        logger.removeHandler(handler)
+    (record,) = [r for r in records if r.levelno == logging.ERROR]
+    assert record.exc_info[0] is ValueError
+    assert "Traceback" not in record.getMessage()
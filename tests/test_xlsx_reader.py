@@ -0,0 +1,101 @@
+# tests/test_xlsx_reader.py
+# Тесты потокового чтения .xlsx и инкрементальной синхронизации листа ВД
+
+from contextlib import contextmanager
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from db_init.base import Base
+from db_init.journal.models_journal import JournalDocument
+from journal.sync import JournalSync
+from journal.vd_sheet import iter_records
+from tests.office_files import cell, row, write_xlsx
+from utils.xlsx_reader import XlsxReader
+
+SHEET = "03 ВД"
+HEADER = ["Проект", "Номер документа", "Наименование", "Дата"]
+
+
+def vd_rows(docs):
+    """Лист ВД: заголовок общими строками, данные — встроенными строками и датами-числами"""
+    rows = [row(1, [cell(f"{col}1", i, "s") for i, col in enumerate("ABCD")])]
+    for n, (project, number, name, serial) in enumerate(docs, 2):
+        rows.append(row(n, [
+            cell(f"A{n}", project, "inlineStr"), cell(f"B{n}", number, "inlineStr"),
+            cell(f"C{n}", name, "inlineStr"), cell(f"D{n}", serial, style=1),
+        ]))
+    return rows
+
+
+def test_typed_values(tmp_path):
+    path = write_xlsx(str(tmp_path / "book.xlsx"), {"Лист": [
+        row(1, [cell("A1", 0, "s"), cell("B1", "строка", "inlineStr"), cell("C1", 1, "b"), cell("D1", 0, "b")]),
+        row(3, [cell("A3", 45000, style=1), cell("B3", "2024-03-05T10:30:00", "d"), cell("C3", "2024-03-05", "d")]),
+        row(4, [cell("C4", 2.5), cell("F4", 7), cell("G4", "#N/A", "e")]),
+    ]}, shared=["общая"])
+    with XlsxReader(path) as book:
+        rows = list(book.iter_rows("Лист"))
+    assert [n for n, _ in rows] == [1, 3, 4]
+    assert rows[0][1] == ["общая", "строка", True, False]
+    assert rows[1][1] == [datetime(2023, 3, 15), datetime(2024, 3, 5, 10, 30), datetime(2024, 3, 5)]
+    assert rows[2][1] == [None, None, 2.5, None, None, 7, "#N/A"]
+
+
+def test_unknown_sheet(tmp_path):
+    path = write_xlsx(str(tmp_path / "book.xlsx"), {"Лист": []})
+    with XlsxReader(path) as book, pytest.raises(KeyError):
+        list(book.iter_rows("Нет такого"))
+
+
+def test_vd_records(tmp_path):
+    path = write_xlsx(str(tmp_path / "log.xlsx"), {SHEET: vd_rows([("089", "089.049", "Спецификация", 45000)])},
+                      shared=HEADER)
+    (row_num, _, record), = iter_records(path, SHEET)
+    assert row_num == 2
+    assert (record.project, record.doc_number, record.doc_name) == ("089", "089.049", "Спецификация")
+    assert record.issue_date == date(2023, 3, 15)
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'journal.sqlite3'}")
+    Base.metadata.create_all(engine, tables=[JournalDocument.__table__])
+
+    @contextmanager
+    def factory():
+        with Session(engine) as session:
+            yield session
+            session.commit()
+
+    yield factory
+    engine.dispose()
+
+
+def test_sync_writes_only_changed_rows(tmp_path, session_factory):
+    docs = [("089", f"089.{i:03}", f"Документ {i}", 45000 + i) for i in range(10)]
+    path = str(tmp_path / "log.xlsx")
+    write_xlsx(path, {SHEET: vd_rows(docs)}, shared=HEADER)
+
+    first = JournalSync(path, SHEET, session_factory=session_factory).run()
+    assert (first.inserted, first.deleted, first.unchanged) == (10, 0, 0)
+    with session_factory() as session:
+        ids = dict(session.execute(select(JournalDocument.doc_number, JournalDocument.id)).all())
+
+    docs[3] = ("089", "089.003", "Документ 3, изм. 1", 45003)
+    write_xlsx(path, {SHEET: vd_rows(docs)}, shared=HEADER)
+    second = JournalSync(path, SHEET, session_factory=session_factory).run()
+    assert (second.inserted, second.deleted, second.moved, second.unchanged) == (1, 1, 0, 9)
+
+    with session_factory() as session:
+        after = {number: (id_, name) for number, id_, name in session.execute(
+            select(JournalDocument.doc_number, JournalDocument.id, JournalDocument.doc_name))}
+    assert len(after) == 10
+    assert after["089.003"][1] == "Документ 3, изм. 1"
+    assert after["089.003"][0] != ids["089.003"]
+    assert all(after[number][0] == ids[number] for number in ids if number != "089.003")
+
+    third = JournalSync(path, SHEET, session_factory=session_factory).run()
+    assert (third.inserted, third.deleted, third.unchanged) == (0, 0, 10)
@@ -0,0 +1,28 @@
+# tests/test_xlsx_writer.py
+# Тесты потоковой записи .xlsx: результат читается обратно XlsxReader
+
+import math
+import zipfile
+from datetime import date, datetime
+
+from utils.xlsx_reader import XlsxReader
+from utils.xlsx_writer import XlsxWriter
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "out.xlsx")
+    with XlsxWriter(path) as book:
+        book.write_sheet("Проекты", ["Имя", "Число"], [
+            ["Танкер", 1, True, date(2024, 3, 5), datetime(2024, 3, 5, 12, 0)],
+            ["Буксир", math.nan, math.inf, None, 2.5],
+        ])
+    with zipfile.ZipFile(path) as z:
+        assert z.testzip() is None
+        sheet = z.read("xl/worksheets/sheet1.xml").decode()
+    assert "nan" not in sheet and "inf" not in sheet
+    assert '<dimension ref="A1:E3"/>' in sheet
+    with XlsxReader(path) as book:
+        rows = [values for _, values in book.iter_rows("Проекты")]
+    assert rows[0] == ["Имя", "Число"]
+    assert rows[1][:3] == ["Танкер", 1, True]
+    assert rows[2] == ["Буксир", None, None, None, 2.5]
@@ -0,0 +1,75 @@
+# tests/test_zip_raw.py
+# Тесты переноса частей zip сырыми байтами: если zipfile в новом Python изменится, упадут первыми
+
+import zipfile
+
+from tests.office_files import NS_MAIN, cell, row, write_xlsx
+from utils.xlsx_patch import XlsxPatcher
+from utils.xlsx_reader import XlsxReader
+from utils.zip_raw import member_spans, truncate, write_raw
+
+PARTS = {"a.txt": b"first " * 500, "b.bin": bytes(range(256)) * 40, "c.xml": b"<c/>"}
+
+
+def make_zip(path):
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, data in PARTS.items():
+            zf.writestr(name, data)
+    return path
+
+
+def test_raw_copy_into_new_archive(tmp_path):
+    src_path = make_zip(str(tmp_path / "src.zip"))
+    dst_path = str(tmp_path / "dst.zip")
+    blob = open(src_path, "rb").read()
+    with zipfile.ZipFile(src_path) as src, zipfile.ZipFile(dst_path, "w", zipfile.ZIP_DEFLATED) as dst:
+        spans = member_spans(src)
+        assert set(spans) == set(PARTS)
+        dst.writestr("new.txt", b"new")
+        for info in src.infolist():
+            start, end = spans[info.filename]
+            write_raw(dst, info, [blob[start:end]])
+        dst.writestr("last.txt", b"last")
+    with zipfile.ZipFile(dst_path) as zf:
+        assert zf.testzip() is None
+        assert zf.namelist() == ["new.txt", *PARTS, "last.txt"]
+        assert {name: zf.read(name) for name in PARTS} == PARTS
+
+
+def test_truncate_and_append(tmp_path):
+    path = make_zip(str(tmp_path / "book.zip"))
+    blob = open(path, "rb").read()
+    with zipfile.ZipFile(path, "a", zipfile.ZIP_DEFLATED) as zf:
+        spans = member_spans(zf)
+        infos = {info.filename: info for info in zf.infolist()}
+        cut = spans["b.bin"][0]
+        truncate(zf, cut, [infos["a.txt"]])
+        start, end = spans["c.xml"]
+        write_raw(zf, infos["c.xml"], [blob[start:end]])
+        zf.writestr("b.bin", b"replaced")
+    with zipfile.ZipFile(path) as zf:
+        assert zf.testzip() is None
+        assert zf.namelist() == ["a.txt", "c.xml", "b.bin"]
+        assert zf.read("a.txt") == PARTS["a.txt"] and zf.read("c.xml") == PARTS["c.xml"]
+        assert zf.read("b.bin") == b"replaced"
+
+
+def test_patcher_commit(tmp_path):
+    path = write_xlsx(str(tmp_path / "book.xlsx"), {
+        "Первый": [row(1, [cell("A1", "старое", "inlineStr")])],
+        "Второй": [row(1, [cell("A1", 2)])],
+    })
+    patcher = XlsxPatcher(path, backup_dir=str(tmp_path / "backup"))
+    part = patcher.sheet_parts["Первый"]
+    xml = (f'<worksheet xmlns="{NS_MAIN}"><sheetData>'
+           f'{row(1, [cell("A1", "новое", "inlineStr"), cell("B1", 5)])}</sheetData></worksheet>')
+    patcher.replace(part, xml.encode("utf-8"))
+    assert patcher.commit() > 0
+    assert not patcher.recover()  # копия хвоста удалена
+
+    with zipfile.ZipFile(path) as zf:
+        assert zf.testzip() is None
+        assert zf.namelist()[-1] == part
+    with XlsxReader(path) as book:
+        assert list(book.iter_rows("Первый")) == [(1, ["новое", 5])]
+        assert list(book.iter_rows("Второй")) == [(1, [2])]
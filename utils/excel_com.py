@@ -1 +1,263 @@
+# utils/excel_com.py
 # Обёртка над Excel: открытие, запись/чтение, сохранение файлов
+#
+# Интерфейс построен на пакетных операциях: диапазон пишется и читается одним вызовом,
+# а не ячейка за ячейкой — для COM это разница между секундами и минутами.
+# Файловый бэкенд OOXML работает без Excel (Linux, пакетные задания); COM-бэкенд
+# подключается через BACKENDS, не меняя вызывающий код.
+
+import math
+import os
+import re
+import shutil
+import zipfile
+from abc import ABC, abstractmethod
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Type
+
+from utils.logger import LoggerManager
+from utils.xlsx_patch import XlsxPatcher
+from utils.xlsx_reader import XlsxReader, column_index
+from utils.xlsx_writer import column_letter, _clean
+
+_EPOCH = datetime(1899, 12, 30)
+
+_REF = re.compile(r"^([A-Z]+)(\d+)$")
+_SHEET_DATA = re.compile(r"<sheetData\b[^>]*?(?:/>|>(.*?)</sheetData>)", re.S)
+_ROW = re.compile(r"<row\b([^>]*?)(?:/>|>(.*?)</row>)", re.S)
+_CELL = re.compile(r"<c\b([^>]*?)(?:/>|>(.*?)</c>)", re.S)
+_ATTR_R = re.compile(r'\br="([A-Z]*)(\d*)"')
+_ATTR_S = re.compile(r'\bs="(\d+)"')
+_ATTR_SPANS = re.compile(r'\s+spans="[^"]*"')
+_DIMENSION = re.compile(r"<dimension\b[^>]*/>")
+
+
+def split_ref(ref: str) -> Tuple[int, int]:
+    """«B3» -> (строка 3, столбец 1)"""
+    m = _REF.match(ref.upper())
+    if m is None:
+        raise ValueError(f"Некорректная ссылка на ячейку: {ref}")
+    return int(m.group(2)), column_index(m.group(1))
+
+
+def split_range(ref: str) -> Tuple[int, int, int, int]:
+    """«B3:D10» -> (первая строка, первый столбец, последняя строка, последний столбец)"""
+    first, _, last = ref.partition(":")
+    r1, c1 = split_ref(first)
+    r2, c2 = split_ref(last or first)
+    return min(r1, r2), min(c1, c2), max(r1, r2), max(c1, c2)
+
+
+class ExcelBackend(ABC):
+    """
+    Книга Excel с пакетными операциями. Запись копится до save(),
+    поэтому число обращений к Excel/файлу не зависит от числа ячеек.
+    """
+
+    def __enter__(self) -> "ExcelBackend":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    @abstractmethod
+    def sheet_names(self) -> List[str]:
+        ...
+
+    @abstractmethod
+    def write_range(self, sheet: str, top_left: str, rows: Iterable[Sequence]) -> str:
+        """
+        Пишет двумерный диапазон значений (str, int, float, bool, date, datetime, None).
+
+        :param sheet: имя листа
+        :param top_left: левая верхняя ячейка, например «A2»
+        :param rows: строки значений
+        :return: адрес записанного диапазона
+        """
+
+    @abstractmethod
+    def read_range(self, sheet: str, ref: str) -> List[List]:
+        """Значения диапазона «A1:D10» построчно (пустые ячейки — None)"""
+
+    @abstractmethod
+    def save(self, path: Optional[str] = None) -> None:
+        """Сохраняет книгу (по умолчанию поверх исходной)"""
+
+    def close(self) -> None:
+        pass
+
+
+class OoxmlWorkbook(ExcelBackend):
+    """
+    Файловый бэкенд: правит XML листов в пакете .xlsx без Excel.
+    При сохранении переписываются только листы, в которые была запись; стили
+    существующих ячеек сохраняются, поэтому шаблоны с оформлением заполняются как есть.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        :param path: существующая книга .xlsx
+        """
+        self.logger = LoggerManager(__name__).get_logger()
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        self.path = path
+        self._writes: Dict[str, Dict[Tuple[int, int], object]] = {}
+        with XlsxReader(path) as book:
+            self._sheet_parts = book.sheet_parts
+
+    @property
+    def sheet_names(self) -> List[str]:
+        return list(self._sheet_parts)
+
+    def _check_sheet(self, sheet: str) -> None:
+        if sheet not in self._sheet_parts:
+            raise KeyError(f"Лист «{sheet}» не найден в {self.path}")
+
+    def write_range(self, sheet: str, top_left: str, rows: Iterable[Sequence]) -> str:
+        self._check_sheet(sheet)
+        row0, col0 = split_ref(top_left)
+        cells = self._writes.setdefault(sheet, {})
+        last_row, last_col = row0, col0
+        for i, values in enumerate(rows):
+            for j, value in enumerate(values):
+                cells[(row0 + i, col0 + j)] = value
+                last_col = max(last_col, col0 + j)
+            last_row = row0 + i
+        return f"{column_letter(col0)}{row0}:{column_letter(last_col)}{last_row}"
+
+    def read_range(self, sheet: str, ref: str) -> List[List]:
+        self._check_sheet(sheet)
+        r1, c1, r2, c2 = split_range(ref)
+        result = [[None] * (c2 - c1 + 1) for _ in range(r2 - r1 + 1)]
+        with XlsxReader(self.path) as book:
+            for row_num, values in book.iter_rows(sheet, min_row=r1):
+                if row_num > r2:
+                    break
+                for col in range(c1, min(c2 + 1, len(values))):
+                    result[row_num - r1][col - c1] = values[col]
+        # несохранённая запись видна при чтении
+        for (row, col), value in self._writes.get(sheet, {}).items():
+            if r1 <= row <= r2 and c1 <= col <= c2:
+                result[row - r1][col - c1] = value
+        return result
+
+    # --- сохранение ---
+
+    @staticmethod
+    def _cell_xml(ref: str, value, style: Optional[str], date_styles: Tuple[int, int]) -> str:
+        s = f' s="{style}"' if style else ""
+        if value is None or value == "":
+            return f'<c r="{ref}"{s}/>' if style else ""
+        if isinstance(value, bool):
+            return f'<c r="{ref}"{s} t="b"><v>{int(value)}</v></c>'
+        if isinstance(value, float) and not math.isfinite(value):
+            return f'<c r="{ref}"{s}/>' if style else ""  # NaN и бесконечность Excel не принимает
+        if isinstance(value, (int, float)):
+            return f'<c r="{ref}"{s}><v>{value!r}</v></c>'
+        # стиль даты — только ячейке без своего оформления, иначе пропали бы рамки и заливка
+        own = style and style != "0"
+        if isinstance(value, datetime):
+            serial = (value - _EPOCH).total_seconds() / 86400
+            return f'<c r="{ref}" s="{style if own else date_styles[1]}"><v>{serial}</v></c>'
+        if isinstance(value, date):
+            return f'<c r="{ref}" s="{style if own else date_styles[0]}"><v>{(value - _EPOCH.date()).days}</v></c>'
+        return f'<c r="{ref}"{s} t="inlineStr"><is><t xml:space="preserve">{_clean(str(value))}</t></is></c>'
+
+    def _merge_sheet(self, xml: str, cells: Dict[Tuple[int, int], object], date_styles: Tuple[int, int]) -> Tuple[str, bool]:
+        """
+        Вливает записанные ячейки в XML листа.
+
+        :return: (новый XML, были ли затёрты формулы)
+        """
+        m = _SHEET_DATA.search(xml)
+        rows: Dict[int, List] = {}  # номер -> [атрибуты, {столбец: xml ячейки}]
+        prev_row = 0
+        for row in _ROW.finditer(m.group(1) or ""):
+            attrs, body = row.group(1), row.group(2) or ""
+            r = _ATTR_R.search(attrs)
+            num = int(r.group(2)) if r else prev_row + 1
+            prev_row = num
+            row_cells = {}
+            prev_col = -1
+            for cell in _CELL.finditer(body):
+                ref = _ATTR_R.search(cell.group(1))
+                col = column_index(ref.group(1)) if ref else prev_col + 1
+                prev_col = col
+                row_cells[col] = cell.group(0)
+            rows[num] = [attrs, row_cells]
+
+        formulas = False
+        by_row: Dict[int, Dict[int, object]] = {}
+        for (row, col), value in cells.items():
+            by_row.setdefault(row, {})[col] = value
+        for num, values in by_row.items():
+            entry = rows.setdefault(num, [f' r="{num}"', {}])
+            entry[0] = _ATTR_SPANS.sub("", entry[0])
+            for col, value in values.items():
+                old = entry[1].get(col, "")
+                formulas = formulas or "<f" in old
+                style = _ATTR_S.search(old.split(">", 1)[0])
+                cell = self._cell_xml(f"{column_letter(col)}{num}", value, style and style.group(1), date_styles)
+                if cell:
+                    entry[1][col] = cell
+                else:
+                    entry[1].pop(col, None)
+
+        parts = []
+        max_col = 0
+        for num in sorted(rows):
+            attrs, row_cells = rows[num]
+            if row_cells:
+                max_col = max(max_col, max(row_cells))
+            parts.append(f"<row{attrs}>{''.join(row_cells[c] for c in sorted(row_cells))}</row>")
+        data = f"<sheetData>{''.join(parts)}</sheetData>"
+        xml = xml[:m.start()] + data + xml[m.end():]
+        if rows:
+            dimension = f'<dimension ref="A1:{column_letter(max_col)}{max(rows)}"/>'
+            xml = _DIMENSION.sub(dimension, xml, count=1)
+        return xml, formulas
+
+    def save(self, path: Optional[str] = None) -> None:
+        target = path or self.path
+        if os.path.abspath(target) != os.path.abspath(self.path):
+            shutil.copyfile(self.path, target)
+        if not self._writes:
+            return
+        patcher = XlsxPatcher(target)
+        date_style, datetime_style, _ = patcher.styles()
+        formulas = False
+        with zipfile.ZipFile(target) as zf:
+            sources = {sheet: zf.read(self._sheet_parts[sheet]).decode("utf-8") for sheet in self._writes}
+        for sheet, cells in self._writes.items():
+            xml, touched = self._merge_sheet(sources[sheet], cells, (date_style, datetime_style))
+            formulas = formulas or touched
+            patcher.replace(self._sheet_parts[sheet], xml.encode("utf-8"))
+        if formulas:
+            patcher.drop_calc_chain()
+        written = patcher.commit()
+        self.logger.info(
+            f"✅ Книга {target} сохранена: листов {len(self._writes)}, "
+            f"ячеек {sum(map(len, self._writes.values()))}, записано {written / 1024:.1f} КБ"
+        )
+        self.path = target
+        self._writes.clear()
+
+
+# Доступные бэкенды; COM-бэкенд (win32com) регистрируется здесь же
+BACKENDS: Dict[str, Type[ExcelBackend]] = {"ooxml": OoxmlWorkbook}
+
+
+def open_workbook(path: str, backend: str = "ooxml") -> ExcelBackend:
+    """
+    Открывает книгу через выбранный бэкенд.
+
+    :param path: путь к книге
+    :param backend: имя бэкенда из BACKENDS
+    """
+    try:
+        cls = BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Неизвестный бэкенд Excel: {backend}") from None
+    return cls(path)
@@ -0,0 +1,359 @@
+# utils/log_index.py
+# Индекс JSON-логов (logs/app.jsonl и ротированные копии) в SQLite и запросы к нему 🔍
+#
+# Файл опознаётся по хэшу первой строки, поэтому переименование при ротации не сбивает
+# учёт: для каждого файла хранится, сколько байт уже прочитано, и повторный запуск
+# дочитывает только новые строки. Запись строк файла и его смещения — одна транзакция.
+
+import os
+import sys
+import json
+import glob
+import time
+import sqlite3
+import hashlib
+import logging
+import argparse
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from config.settings import LogSettings
+from utils.logger import LoggerManager
+
+BATCH_SIZE = 5000
+# Строка без перевода строки ещё дописывается — её время придёт при следующем проходе
+_FIRST_LINE_LIMIT = 64 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    fingerprint BLOB PRIMARY KEY,
+    name        TEXT NOT NULL,
+    offset      INTEGER NOT NULL,
+    records     INTEGER NOT NULL,
+    ingested_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS records (
+    id       INTEGER PRIMARY KEY,
+    ts       REAL NOT NULL,
+    levelno  INTEGER NOT NULL,
+    level    TEXT NOT NULL,
+    module   TEXT NOT NULL,
+    func     TEXT,
+    line     INTEGER,
+    pid      INTEGER,
+    msg      TEXT NOT NULL,
+    duration REAL,
+    context  TEXT,
+    exc      TEXT
+);
+CREATE INDEX IF NOT EXISTS records_ts ON records (ts);
+CREATE INDEX IF NOT EXISTS records_module_ts ON records (module, ts);
+CREATE INDEX IF NOT EXISTS records_level_ts ON records (levelno, ts);
+"""
+
+# Допустимые группировки stats: имя -> выражение SQL
+GROUPS = {
+    "module": "module",
+    "level": "level",
+    "func": "module || ':' || func",
+    "msg": "msg",
+    "day": "strftime('%Y-%m-%d', ts, 'unixepoch', 'localtime')",
+    "hour": "strftime('%Y-%m-%d %H:00', ts, 'unixepoch', 'localtime')",
+}
+
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
+
+
+def parse_time(value: str, now: Optional[float] = None) -> float:
+    """
+    Время для фильтра: «2026-10-13», «2026-10-13 14:30», ISO 8601
+    или «назад от сейчас»: «90m», «3h», «2d», «1w».
+
+    :return: unix-время
+    """
+    value = value.strip()
+    unit = _UNITS.get(value[-1:].lower())
+    if unit is not None and value[:-1].replace(".", "", 1).isdigit():
+        return (time.time() if now is None else now) - float(value[:-1]) * unit
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise ValueError(f"Не удалось разобрать время «{value}»") from None
+
+
+def _level_no(level: str) -> int:
+    value = logging.getLevelName(str(level).upper())
+    return value if isinstance(value, int) else 0
+
+
+class LogIndex:
+    """
+    Индекс JSON-логов в SQLite: дочитывание файлов, фильтры и агрегаты.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, log_dir: Optional[str] = None) -> None:
+        """
+        :param db_path: файл индекса (по умолчанию logs/logs.sqlite3)
+        :param log_dir: папка с JSON-логами (по умолчанию папка логов приложения)
+        """
+        self.logger = LoggerManager(__name__).get_logger()
+        self.log_dir = log_dir or LoggerManager.get_log_dir()
+        self.db_path = db_path or os.path.join(self.log_dir, LogSettings.INDEX_FILE)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.executescript("PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;" + _SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "LogIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # --- загрузка ---
+
+    def log_files(self, name: str = LogSettings.JSON_FILE) -> List[str]:
+        """Текущий и ротированные файлы лога, от старых к новым"""
+        base = os.path.join(self.log_dir, name)
+        rotated = [p for p in glob.glob(glob.escape(base) + ".*") if p.rsplit(".", 1)[-1].isdigit()]
+        rotated.sort(key=lambda p: int(p.rsplit(".", 1)[-1]), reverse=True)
+        return rotated + ([base] if os.path.exists(base) else [])
+
+    @staticmethod
+    def _fingerprint(path: str) -> Optional[bytes]:
+        with open(path, "rb") as f:
+            first = f.readline(_FIRST_LINE_LIMIT)
+        if not first.endswith(b"\n"):
+            return None
+        return hashlib.blake2b(first, digest_size=16).digest()
+
+    @staticmethod
+    def _row(line: bytes) -> Optional[tuple]:
+        try:
+            data = json.loads(line)
+            context = data.get("context")
+            return (
+                float(data["ts"]),
+                _level_no(data.get("level", "")),
+                data.get("level", ""),
+                data.get("module", ""),
+                data.get("func"),
+                data.get("line"),
+                data.get("pid"),
+                data.get("msg", ""),
+                data.get("duration"),
+                json.dumps(context, ensure_ascii=False) if context else None,
+                data.get("exc"),
+            )
+        except (ValueError, KeyError, TypeError):
+            return None
+
+    def ingest(self, name: str = LogSettings.JSON_FILE) -> Dict[str, int]:
+        """
+        Дочитывает новые строки всех файлов лога.
+
+        :param name: имя текущего файла лога
+        :return: {"files": прочитано файлов, "skipped": без изменений, "records": строк, "bad": битых строк}
+        """
+        stats = {"files": 0, "skipped": 0, "records": 0, "bad": 0}
+        known = {fp: offset for fp, offset in self.conn.execute("SELECT fingerprint, offset FROM files")}
+        insert = "INSERT INTO records (ts, levelno, level, module, func, line, pid, msg, duration, context, exc) " \
+                 "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+        for path in self.log_files(name):
+            try:
+                fingerprint = self._fingerprint(path)
+                size = os.path.getsize(path)
+            except OSError as e:
+                self.logger.warning(f"⚠️ Не удалось прочитать {path}: {e}")
+                continue
+            offset = known.get(fingerprint, 0) if fingerprint is not None else 0
+            if fingerprint is None or offset >= size:
+                stats["skipped"] += 1
+                continue
+            batch: List[tuple] = []
+            added = 0
+            with self.conn:
+                with open(path, "rb") as f:
+                    f.seek(offset)
+                    for line in f:
+                        if not line.endswith(b"\n"):
+                            break
+                        offset += len(line)
+                        row = self._row(line)
+                        if row is None:
+                            stats["bad"] += 1
+                            continue
+                        batch.append(row)
+                        if len(batch) >= BATCH_SIZE:
+                            self.conn.executemany(insert, batch)
+                            added += len(batch)
+                            batch.clear()
+                if batch:
+                    self.conn.executemany(insert, batch)
+                    added += len(batch)
+                self.conn.execute(
+                    "INSERT INTO files VALUES (?, ?, ?, ?, ?) ON CONFLICT (fingerprint) DO UPDATE SET "
+                    "name = excluded.name, offset = excluded.offset, records = records + excluded.records, "
+                    "ingested_at = excluded.ingested_at",
+                    (fingerprint, os.path.basename(path), offset, added, time.time()),
+                )
+            known[fingerprint] = offset
+            stats["files"] += 1
+            stats["records"] += added
+        self.logger.info(
+            f"📥 Логи загружены: файлов {stats['files']}, без изменений {stats['skipped']}, "
+            f"строк {stats['records']}, битых {stats['bad']}"
+        )
+        return stats
+
+    # --- запросы ---
+
+    @staticmethod
+    def _where(since: Optional[float] = None, until: Optional[float] = None, modules: Sequence[str] = (),
+               level: Optional[str] = None, text: Optional[str] = None, context: Optional[Dict[str, str]] = None,
+               timed: bool = False) -> Tuple[str, list]:
+        clauses, params = [], []
+        if since is not None:
+            clauses.append("ts >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("ts < ?")
+            params.append(until)
+        if modules:
+            # модуль и все его подмодули: «db_init» -> db_init, db_init.session, ...
+            parts = []
+            for module in modules:
+                parts.append("(module = ? OR (module >= ? AND module < ?))")
+                params.extend((module, module + ".", module + "/"))
+            clauses.append("(" + " OR ".join(parts) + ")")
+        if level:
+            clauses.append("levelno >= ?")
+            params.append(_level_no(level))
+        if text:
+            clauses.append("msg LIKE ?")
+            params.append(f"%{text}%")
+        for key, value in (context or {}).items():
+            clauses.append("CAST(json_extract(context, ?) AS TEXT) = ?")
+            params.extend((f"$.{key}", value))
+        if timed:
+            clauses.append("duration IS NOT NULL")
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def query(self, limit: Optional[int] = 100, newest_first: bool = False, **filters) -> List[dict]:
+        """
+        Записи по фильтрам.
+
+        :param filters: since, until (unix-время), modules, level (минимальный), text,
+                        context ({ключ: значение}), timed (только с duration)
+        :param limit: сколько записей вернуть (None — все)
+        :param newest_first: сначала новые
+        """
+        where, params = self._where(**filters)
+        sql = (
+            "SELECT ts, level, module, func, line, pid, msg, duration, context, exc FROM records"
+            f"{where} ORDER BY ts {'DESC' if newest_first else 'ASC'}, id"
+        )
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        keys = ("ts", "level", "module", "func", "line", "pid", "msg", "duration", "context", "exc")
+        rows = []
+        for values in self.conn.execute(sql, params):
+            row = dict(zip(keys, values))
+            row["context"] = json.loads(row["context"]) if row["context"] else {}
+            rows.append(row)
+        return rows
+
+    def stats(self, by: str = "module", **filters) -> List[dict]:
+        """
+        Агрегаты по группам: число записей и длительности (count, sum, avg, max).
+
+        :param by: группировка из GROUPS или «context.<ключ>»
+        :param filters: те же фильтры, что у query
+        """
+        params: list = []
+        if by.startswith("context."):
+            expr = "json_extract(context, ?)"
+            params.append("$." + by.split(".", 1)[1])
+        elif by in GROUPS:
+            expr = GROUPS[by]
+        else:
+            raise ValueError(f"Неизвестная группировка: {by}")
+        where, where_params = self._where(**filters)
+        sql = (
+            f"SELECT {expr} AS grp, COUNT(*), COUNT(duration), SUM(duration), AVG(duration), MAX(duration), "
+            f"MIN(ts), MAX(ts) FROM records{where} GROUP BY grp ORDER BY COUNT(*) DESC"
+        )
+        keys = ("group", "count", "timed", "total_s", "avg_s", "max_s", "first", "last")
+        return [dict(zip(keys, values)) for values in self.conn.execute(sql, params + where_params)]
+
+
+def _fmt_time(ts: float) -> str:
+    return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _print_rows(rows: Iterable[dict]) -> None:
+    for row in rows:
+        duration = f" ({row['duration']:.3f} с)" if row["duration"] is not None else ""
+        context = f" {json.dumps(row['context'], ensure_ascii=False)}" if row["context"] else ""
+        sys.stdout.write(f"{_fmt_time(row['ts'])} {row['level']:<8} [{row['module']}] {row['msg']}{duration}{context}\n")
+
+
+def _print_stats(rows: Iterable[dict]) -> None:
+    for row in rows:
+        timing = ""
+        if row["timed"]:
+            timing = f"  Σ {row['total_s']:.3f} с, ср. {row['avg_s']:.3f} с, макс. {row['max_s']:.3f} с ({row['timed']})"
+        sys.stdout.write(f"{str(row['group']):<40} {row['count']:>8}{timing}\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Индекс и поиск по JSON-логам приложения")
+    parser.add_argument("--db", help="файл индекса (по умолчанию в папке логов)")
+    parser.add_argument("--dir", help="папка с логами")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("ingest", help="дочитать новые строки логов в индекс")
+    for command in ("query", "stats"):
+        p = sub.add_parser(command, help="записи по фильтрам" if command == "query" else "агрегаты по группам")
+        p.add_argument("--since", help="с момента: 2026-10-13, «2026-10-13 14:00», 3h, 2d")
+        p.add_argument("--until", help="до момента (не включая)")
+        p.add_argument("--module", action="append", default=[], help="модуль с подмодулями (можно несколько)")
+        p.add_argument("--level", help="минимальный уровень: INFO, WARNING, ERROR")
+        p.add_argument("--text", help="подстрока сообщения")
+        p.add_argument("--context", action="append", default=[], metavar="КЛЮЧ=ЗНАЧЕНИЕ", help="поле контекста")
+        p.add_argument("--timed", action="store_true", help="только записи с длительностью")
+        p.add_argument("--no-ingest", action="store_true", help="не дочитывать логи перед запросом")
+        p.add_argument("--json", action="store_true", help="вывод в JSON")
+        if command == "query":
+            p.add_argument("--limit", type=int, default=100, help="сколько записей показать (0 — все)")
+            p.add_argument("--newest", action="store_true", help="сначала новые")
+        else:
+            p.add_argument("--by", default="module", help=f"группировка: {', '.join(GROUPS)} или context.<ключ>")
+    args = parser.parse_args()
+
+    with LogIndex(args.db, args.dir) as index:
+        if args.command == "ingest" or not args.no_ingest:
+            index.ingest()
+        if args.command != "ingest":
+            filters = {
+                "since": parse_time(args.since) if args.since else None,
+                "until": parse_time(args.until) if args.until else None,
+                "modules": args.module,
+                "level": args.level,
+                "text": args.text,
+                "context": dict(item.split("=", 1) for item in args.context),
+                "timed": args.timed,
+            }
+            if args.command == "query":
+                result = index.query(limit=args.limit or None, newest_first=args.newest, **filters)
+                printer = _print_rows
+            else:
+                result = index.stats(by=args.by, **filters)
+                printer = _print_stats
+            if args.json:
+                json.dump(result, sys.stdout, ensure_ascii=False, indent=1, default=str)
+                sys.stdout.write("\n")
+            else:
+                printer(result)
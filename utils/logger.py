@@ -1,14 +1,23 @@
 # utils/logger.py
 # Центральный менеджер логирования для приложения
 
+import atexit
+import json
 import logging
 import os
+import queue
 import sys
 import textwrap
+import threading
+import time
+from contextlib import contextmanager
 from logging import Logger
-from logging.handlers import RotatingFileHandler
+from typing import Iterator
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from colorama import init as _colorama_init, Fore, Style
 
+from config.settings import LogSettings
+
 _colorama_init(autoreset=True)
 
 
@@ -39,6 +48,16 @@ class HtmlFormatter(logging.Formatter):
 
     def __init__(self, datefmt: str | None = None) -> None:
         super().__init__(fmt="%(message)s", datefmt=datefmt)
+        self._time_cache: tuple[int, str] = (-1, "")
+
+    def formatTime(self, record: logging.LogRecord, datefmt: str | None = None) -> str:
+        # строка времени с точностью до секунды — форматируется один раз за секунду
+        second = int(record.created)
+        cached = self._time_cache
+        if cached[0] != second:
+            cached = (second, super().formatTime(record, datefmt))
+            self._time_cache = cached
+        return cached[1]
 
     def format(self, record: logging.LogRecord) -> str:
         record.message = record.getMessage()
@@ -92,10 +111,289 @@ class HtmlFileHandler(RotatingFileHandler):
         # При следующем emit() снова добавит HEADER 🔄
 
 
+class BatchedFileHandler(RotatingFileHandler):
+    """
+    Файл лога, который пишется пачками из одного потока. 📦
+    Строки копятся в буфере и уходят на диск одним write() + flush(): когда набралась
+    пачка, когда пришла запись уровня flush_level и выше или по таймеру (его ведёт
+    LogListener). HEADER пишется при открытии пустого файла — один раз на файл,
+    в том числе после ротации; размер файла для ротации проверяется раз на пачку.
+    """
+    HEADER = ""
+    FOOTER = ""
+
+    def __init__(self, filename: str, maxBytes: int = 0, backupCount: int = 0, encoding: str | None = None,
+                 batch_size: int = 256, flush_interval: float = 0.5, flush_level: int = logging.WARNING) -> None:
+        """
+        :param batch_size: сколько записей копить до записи на диск
+        :param flush_interval: сколько секунд может ждать несброшенная запись
+        :param flush_level: записи этого уровня и выше сбрасываются сразу
+        """
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.flush_level = flush_level
+        self._buffer: list[str] = []
+        self._first = 0.0
+        super().__init__(filename, maxBytes=maxBytes, backupCount=backupCount, encoding=encoding, delay=True)
+
+    def _open(self):
+        stream = super()._open()
+        if self.HEADER and stream.tell() == 0:
+            stream.write(self.HEADER)
+        return stream
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            if not self._buffer:
+                self._first = time.monotonic()
+            self._buffer.append(self.format(record))
+            if len(self._buffer) >= self.batch_size or record.levelno >= self.flush_level:
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        """Пишет накопленную пачку и при необходимости ротирует файл 💾"""
+        self.acquire()
+        try:
+            if not self._buffer:
+                return
+            data = "".join(self._buffer)
+            self._buffer.clear()
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(data)
+            self.stream.flush()
+            if self.maxBytes and self.stream.tell() >= self.maxBytes:
+                self.doRollover()
+        finally:
+            self.release()
+
+    def flush_due(self) -> float | None:
+        """
+        Сбрасывает пачку, если её время вышло.
+
+        :return: через сколько секунд проверить снова (None — буфер пуст)
+        """
+        if not self._buffer:
+            return None
+        left = self._first + self.flush_interval - time.monotonic()
+        if left > 0:
+            return left
+        self.flush()
+        return None
+
+    def doRollover(self) -> None:
+        # закрываемый файл получает FOOTER, новый откроется с HEADER при следующей пачке
+        if self.FOOTER and self.stream is not None:
+            self.stream.write(self.FOOTER)
+        super().doRollover()
+
+    def close(self) -> None:
+        self.flush()
+        super().close()
+
+
+class BatchedHtmlFileHandler(BatchedFileHandler):
+    """Пакетный app.html с тем же оформлением, что у HtmlFileHandler 📄"""
+    HEADER = HtmlFileHandler.HEADER
+    FOOTER = HtmlFileHandler.FOOTER
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """
+    Запись лога — одна строка JSON. 🧾
+    Поля: ts (unix-время), time, level, module, func, line, pid, msg, а также duration
+    (секунды) и context (словарь), если они переданы через extra или log_duration.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(fmt="%(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": round(record.created, 3),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(record.created)) + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "module": record.name,
+            "func": record.funcName,
+            "line": record.lineno,
+            "pid": record.process,
+            "msg": record.getMessage(),
+        }
+        duration = getattr(record, "duration", None)
+        if duration is not None:
+            data["duration"] = round(float(duration), 6)
+        context = getattr(record, "context", None)
+        if context:
+            data["context"] = context
+        if record.exc_info:
+            data["exc"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str) + "\n"
+
+
+@contextmanager
+def log_duration(logger: Logger, message: str, level: int = logging.INFO, **context) -> Iterator[dict]:
+    """
+    Замеряет блок и пишет одну запись с длительностью и контекстом. ⏱️
+
+        with log_duration(self.logger, "🌱 Заполнение справочников", table="users") as ctx:
+            ctx["rows"] = seed()
+
+    :param message: текст записи
+    :param context: поля контекста; словарь можно дополнить внутри блока
+    """
+    start = time.perf_counter()
+    try:
+        yield context
+    except BaseException:
+        context["failed"] = True
+        logger.log(max(level, logging.ERROR), f"{message}: прервано", exc_info=True,
+                   extra={"duration": time.perf_counter() - start, "context": context}, stacklevel=3)
+        raise
+    logger.log(level, message, extra={"duration": time.perf_counter() - start, "context": context}, stacklevel=3)
+
+
+def html_sink(path: str, max_bytes: int = LogSettings.MAX_BYTES, backup_count: int = LogSettings.BACKUP_COUNT,
+              **batch) -> BatchedHtmlFileHandler:
+    """Пакетный app.html; batch — batch_size, flush_interval, flush_level"""
+    handler = BatchedHtmlFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8",
+                                     **_batch_options(**batch))
+    handler.setLevel(logging.INFO)
+    handler.setFormatter(HtmlFormatter(datefmt="%Y-%m-%d %H:%M:%S"))
+    return handler
+
+
+def json_sink(path: str, max_bytes: int = LogSettings.JSON_MAX_BYTES, backup_count: int = LogSettings.JSON_BACKUP_COUNT,
+              **batch) -> BatchedFileHandler:
+    """Пакетный JSON-lines лог; batch — batch_size, flush_interval, flush_level"""
+    handler = BatchedFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8",
+                                 **_batch_options(**batch))
+    handler.setLevel(logging.INFO)
+    handler.setFormatter(JsonLinesFormatter())
+    return handler
+
+
+def _batch_options(batch_size: int = LogSettings.BATCH_SIZE, flush_interval: float = LogSettings.FLUSH_INTERVAL,
+                   flush_level: int | str = LogSettings.FLUSH_LEVEL) -> dict:
+    if isinstance(flush_level, str):
+        flush_level = logging.getLevelName(flush_level.upper())
+    return {"batch_size": batch_size, "flush_interval": flush_interval, "flush_level": flush_level}
+
+
+class LogListener(QueueListener):
+    """
+    Поток-писатель: забирает записи из очереди и сбрасывает недописанные пачки по таймеру. ⏱️
+    Пока буферы пусты, поток спит на очереди без пробуждений.
+    """
+
+    def __init__(self, log_queue, sinks: list[BatchedFileHandler]) -> None:
+        super().__init__(log_queue, *sinks, respect_handler_level=True)
+        self.sinks = sinks
+
+    def _flush_due(self) -> float | None:
+        waits = [left for left in (sink.flush_due() for sink in self.sinks) if left is not None]
+        return min(waits) if waits else None
+
+    def _monitor(self) -> None:
+        q = self.queue
+        timeout = None
+        while True:
+            try:
+                record = q.get(timeout=timeout)
+            except queue.Empty:
+                timeout = self._flush_due()
+                continue
+            if record is self._sentinel:
+                break
+            self.handle(record)
+            timeout = self._flush_due()
+        for sink in self.sinks:
+            sink.flush()
+
+
+class _LogQueueHandler(QueueHandler):
+    """QueueHandler общего конвейера: поднимает поток-писатель при первой записи"""
+
+    def __init__(self, pipeline: "AsyncLog") -> None:
+        super().__init__(queue.SimpleQueue())
+        self.pipeline = pipeline
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # очередь внутрипроцессная: запись не копируется и форматируется уже в потоке-писателе
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.pipeline.listener is None:
+            if not self.pipeline.start():
+                # конвейер уже остановлен (запись из atexit) — пишем синхронно
+                for sink in self.pipeline.sinks:
+                    sink.handle(record)
+                    sink.flush()
+                return
+        self.queue.put_nowait(record)
+
+
+class AsyncLog:
+    """
+    Конвейер файловых логов, общий для всех логгеров. 🚚
+    В каждом логгере стоит один и тот же QueueHandler: вызывающий поток только кладёт
+    запись в очередь, а файлы (app.html, app.jsonl) пишет один фоновый поток.
+    Поток поднимается при первой записи, останавливается при выходе (atexit) с дозаписью
+    очереди и перезапускается в дочернем процессе после fork.
+    """
+
+    def __init__(self, sinks: list[BatchedFileHandler]) -> None:
+        """
+        :param sinks: пакетные файловые хендлеры (см. html_sink, json_sink)
+        """
+        self.sinks = list(sinks)
+        self.handler = _LogQueueHandler(self)
+        self.handler.setLevel(min(sink.level for sink in self.sinks))
+        self.listener: LogListener | None = None
+        self._lock = threading.Lock()
+        self._stopped = False
+        atexit.register(self.stop)
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def start(self) -> bool:
+        """Поднимает поток-писатель; False — конвейер уже остановлен"""
+        with self._lock:
+            if self._stopped:
+                return False
+            if self.listener is None:
+                listener = LogListener(self.handler.queue, self.sinks)
+                listener.start()
+                self.listener = listener
+            return True
+
+    def stop(self) -> None:
+        """Дописывает очередь, сбрасывает буферы и закрывает файлы 🛑"""
+        with self._lock:
+            self._stopped = True
+            listener, self.listener = self.listener, None
+        if listener is not None:
+            listener.stop()
+        for sink in self.sinks:
+            sink.close()
+
+    def _after_fork(self) -> None:
+        # поток-писатель не переживает fork: дочерний процесс заводит свою очередь и поток
+        self.handler.queue = queue.SimpleQueue()
+        self.listener = None
+        self._lock = threading.Lock()
+        for sink in self.sinks:
+            sink._buffer.clear()
+
+
 class LoggerManager:
     """
-    Менеджер логирования для настройки консольного и HTML логирования. 🎛️
+    Менеджер логирования для настройки консольного, HTML и JSON логирования. 🎛️
+    Файловые хендлеры общие для всех логгеров, чтобы один файл не писали несколько дескрипторов.
     """
+    _file_handlers: list[logging.Handler] | None = None
+    _file_lock = threading.Lock()
 
     def __init__(self, module_name: str) -> None:
         """
@@ -118,10 +416,9 @@ class LoggerManager:
 
     def _setup_handlers(self) -> None:
         """Создает и добавляет хендлеры в логгер. 🛠️"""
-        console_handler = self._create_console_handler()
-        html_handler = self._create_html_handler()
-        self.logger.addHandler(console_handler)
-        self.logger.addHandler(html_handler)
+        self.logger.addHandler(self._create_console_handler())
+        for handler in self._create_file_handlers():
+            self.logger.addHandler(handler)
 
     def _create_console_handler(self) -> logging.Handler:
         """Создает цветной консольный хендлер. 🌈"""
@@ -131,19 +428,31 @@ class LoggerManager:
         handler.setFormatter(ColoredFormatter(fmt, datefmt="%H:%M:%S"))
         return handler
 
-    def _create_html_handler(self) -> logging.Handler:
-        """Создает HTML файл хендлер. 📄"""
-        log_dir = self.get_log_dir()
-        html_path = os.path.join(log_dir, "app.html")
-        handler = HtmlFileHandler(
-            html_path,
-            maxBytes=5 * 1024 * 1024,
-            backupCount=5,
-            encoding="utf-8"
-        )
-        handler.setLevel(logging.INFO)
-        handler.setFormatter(HtmlFormatter(datefmt="%Y-%m-%d %H:%M:%S"))
-        return handler
+    def _create_file_handlers(self) -> list[logging.Handler]:
+        """Возвращает общие файловые хендлеры (app.html, app.jsonl), создавая их при первом вызове. 📄"""
+        with LoggerManager._file_lock:
+            if LoggerManager._file_handlers is None:
+                log_dir = self.get_log_dir()
+                html_path = os.path.join(log_dir, "app.html")
+                json_path = os.path.join(log_dir, LogSettings.JSON_FILE)
+                if LogSettings.ASYNC:
+                    sinks = [html_sink(html_path)]
+                    if LogSettings.JSON:
+                        sinks.append(json_sink(json_path))
+                    LoggerManager._file_handlers = [AsyncLog(sinks).handler]
+                else:
+                    handler = HtmlFileHandler(
+                        html_path,
+                        maxBytes=LogSettings.MAX_BYTES,
+                        backupCount=LogSettings.BACKUP_COUNT,
+                        encoding="utf-8"
+                    )
+                    handler.setLevel(logging.INFO)
+                    handler.setFormatter(HtmlFormatter(datefmt="%Y-%m-%d %H:%M:%S"))
+                    LoggerManager._file_handlers = [handler]
+                    if LogSettings.JSON:
+                        LoggerManager._file_handlers.append(json_sink(json_path, batch_size=1))
+            return LoggerManager._file_handlers
 
     @staticmethod
     def get_log_dir() -> str:
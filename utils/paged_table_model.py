@@ -0,0 +1,215 @@
+# utils/paged_table_model.py
+# Ленивая табличная модель Qt поверх db_init.keyset: страницы по ключу, LRU-кэш, сортировка и фильтр в SQL 📋
+#
+# Строки появляются по мере прокрутки (canFetchMore/fetchMore), в памяти — только границы
+# загруженных страниц (по одной паре значение/ключ на страницу) и последние cache_pages
+# страниц. Вытесненная страница при обращении читается заново одним запросом от своей
+# границы. «Ленивые» колонки (длинные тексты и т. п.) не входят в выборку страницы и
+# дочитываются для всей страницы разом, только когда вид их показывает.
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from PyQt6 import QtCore
+from PyQt6.QtCore import Qt
+
+from db_init.keyset import KeysetRepository
+from utils.logger import LoggerManager
+
+
+class PagedColumn(NamedTuple):
+    """
+    Колонка модели.
+    :param name: колонка таблицы
+    :param title: заголовок
+    :param lazy: не читать со страницей, дочитывать по требованию
+    :param searchable: участвует в текстовом фильтре
+    :param formatter: значение -> текст для DisplayRole
+    """
+    name: str
+    title: str
+    lazy: bool = False
+    searchable: bool = False
+    formatter: Optional[Callable[[Any], str]] = None
+
+
+class _Page:
+    """Строки одной страницы: [ключ, значение сортировки, *колонки]; ленивые — None до загрузки"""
+    __slots__ = ("rows", "lazy_loaded")
+
+    def __init__(self, rows: List[list]) -> None:
+        self.rows = rows
+        self.lazy_loaded = False
+
+
+class PagedTableModel(QtCore.QAbstractTableModel):
+    """
+    Табличная модель для больших таблиц. Ключ строки отдаётся в Qt.ItemDataRole.UserRole.
+    """
+    # Сколько строк прочитано, за сколько мс — для строки состояния и логов
+    pageLoaded = QtCore.pyqtSignal(int, float)
+
+    def __init__(self, model, columns: Sequence[PagedColumn], key: str = "id", page_size: int = 200,
+                 cache_pages: int = 32, session_factory=None, parent=None) -> None:
+        """
+        :param model: класс модели SQLAlchemy или Table
+        :param columns: колонки модели
+        :param key: уникальная колонка — ключ строки
+        :param page_size: строк на странице
+        :param cache_pages: сколько страниц держать в памяти
+        :param session_factory: контекстный менеджер сессии; по умолчанию db_init.session.get_db
+        """
+        super().__init__(parent)
+        self.logger = LoggerManager(__name__).get_logger()
+        self.model = model
+        self.columns = list(columns)
+        self.key = key
+        self.page_size = page_size
+        self.cache_pages = max(2, cache_pages)
+        if session_factory is None:
+            from db_init.session import get_db
+            session_factory = get_db
+        self.session_factory = session_factory
+        self._eager = [c.name for c in self.columns if not c.lazy]
+        self._lazy = [c.name for c in self.columns if c.lazy]
+        # позиция колонки модели в строке страницы
+        self._slot: List[int] = []
+        eager_i, lazy_i = 2, 2 + len(self._eager)
+        for column in self.columns:
+            if column.lazy:
+                self._slot.append(lazy_i)
+                lazy_i += 1
+            else:
+                self._slot.append(eager_i)
+                eager_i += 1
+        self._sort: Optional[str] = None
+        self._descending = False
+        self._filters: Dict[str, Any] = {}
+        self._reset_state()
+
+    # --- состояние ---
+
+    def _reset_state(self) -> None:
+        self._rows = 0
+        self._bounds: List[Tuple[Any, Any]] = []
+        self._cache: "OrderedDict[int, _Page]" = OrderedDict()
+        self._exhausted = False
+
+    def refresh(self) -> None:
+        """Перечитать с начала (после изменения данных, сортировки или фильтра)"""
+        self.beginResetModel()
+        self._reset_state()
+        self.endResetModel()
+        if self.canFetchMore(QtCore.QModelIndex()):
+            self.fetchMore(QtCore.QModelIndex())
+
+    def set_filter(self, search: str = "", **equals) -> None:
+        """
+        Фильтр в SQL: подстрока search в колонках с searchable=True и точные совпадения equals.
+        """
+        search_columns = [c.name for c in self.columns if c.searchable]
+        self._filters = {"search": search or None, "search_columns": search_columns, "equals": equals}
+        self.refresh()
+
+    def key_of(self, row: int) -> Any:
+        page = self._page(row // self.page_size)
+        offset = row % self.page_size
+        return page.rows[offset][0] if page is not None and offset < len(page.rows) else None
+
+    # --- чтение страниц ---
+
+    def _read(self, after: Optional[Tuple[Any, Any]]) -> List[list]:
+        start = time.perf_counter()
+        with self.session_factory() as session:
+            rows = KeysetRepository(self.model, session, self.key).page(
+                self._eager, after, self.page_size, self._sort, self._descending, **self._filters
+            )
+        lazy = [None] * len(self._lazy)
+        result = [list(row) + lazy for row in rows]
+        self.pageLoaded.emit(len(result), (time.perf_counter() - start) * 1000)
+        return result
+
+    def _remember(self, number: int, page: _Page) -> _Page:
+        self._cache[number] = page
+        self._cache.move_to_end(number)
+        while len(self._cache) > self.cache_pages:
+            self._cache.popitem(last=False)
+        return page
+
+    def _page(self, number: int) -> Optional[_Page]:
+        """Страница из кэша или заново из БД от границы предыдущей"""
+        page = self._cache.get(number)
+        if page is not None:
+            self._cache.move_to_end(number)
+            return page
+        if number >= len(self._bounds):
+            return None
+        after = self._bounds[number - 1] if number else None
+        return self._remember(number, _Page(self._read(after)))
+
+    def _load_lazy(self, page: _Page) -> None:
+        if not self._lazy or page.lazy_loaded or not page.rows:
+            return
+        with self.session_factory() as session:
+            values = KeysetRepository(self.model, session, self.key).values((r[0] for r in page.rows), self._lazy)
+        base = 2 + len(self._eager)
+        for row in page.rows:
+            row[base:] = values.get(row[0], row[base:])
+        page.lazy_loaded = True
+
+    # --- QAbstractTableModel ---
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._rows
+
+    def columnCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.columns)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.columns[section].title
+        return None
+
+    def data(self, index: QtCore.QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.UserRole):
+            return None
+        row = index.row()
+        page = self._page(row // self.page_size)
+        offset = row % self.page_size
+        if page is None or offset >= len(page.rows):
+            return None
+        values = page.rows[offset]
+        if role == Qt.ItemDataRole.UserRole:
+            return values[0]
+        column = self.columns[index.column()]
+        if column.lazy:
+            self._load_lazy(page)
+        value = values[self._slot[index.column()]]
+        if value is None:
+            return ""
+        return column.formatter(value) if column.formatter else str(value)
+
+    def canFetchMore(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> bool:
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> None:
+        if parent.isValid() or self._exhausted:
+            return
+        number = len(self._bounds)
+        rows = self._read(self._bounds[-1] if self._bounds else None)
+        if len(rows) < self.page_size:
+            self._exhausted = True
+        if not rows:
+            return
+        self.beginInsertRows(QtCore.QModelIndex(), self._rows, self._rows + len(rows) - 1)
+        self._remember(number, _Page(rows))
+        self._bounds.append((rows[-1][1], rows[-1][0]))
+        self._rows += len(rows)
+        self.endInsertRows()
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder) -> None:
+        """Сортировка в SQL; column < 0 — исходный порядок по ключу"""
+        self._sort = self.columns[column].name if column >= 0 else None
+        self._descending = order == Qt.SortOrder.DescendingOrder
+        self.refresh()
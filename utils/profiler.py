@@ -0,0 +1,427 @@
+# utils/profiler.py
+# Профилирование по требованию: запуск, действия в GUI и работа с БД в режимах cpu / sample / mem 🔬
+#
+# Выключено по умолчанию: section() возвращает пустой контекст, Qt-приложение — обычный
+# QApplication. Включается PMIS_PROFILE=cpu|sample|mem или флагом --profile. Каждый
+# участок (startup, клик, единица работы с БД) даёт отчёты в logs/profile:
+#   cpu    — .prof (pstats), .txt (дерево вызовов), .collapsed (для flamegraph.pl / speedscope);
+#   sample — .txt и .collapsed по снимкам стека раз в SAMPLE_INTERVAL, почти без замедления;
+#   mem    — .txt (прирост памяти по строкам и стекам) и .collapsed (байты по стекам).
+# Вложенные участки одного потока попадают в отчёт внешнего.
+
+import os
+import re
+import sys
+import time
+import pstats
+import cProfile
+import argparse
+import threading
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from config.settings import ProfileSettings
+from utils.logger import LoggerManager
+
+MODES = ("cpu", "sample", "mem")
+
+_UNSAFE = re.compile(r"[^\w.\-]+")
+_ADDRESS = re.compile(r" at 0x[0-9a-fA-F]+")
+
+
+def _frame_name(filename: str, line: int, name: str) -> str:
+    """Подпись функции в отчётах: «name (file.py:line)»; «;» недопустим в collapsed"""
+    if filename == "~":
+        # встроенная функция в cProfile: «<built-in method builtins.sorted>»
+        label = _ADDRESS.sub("", name).strip("<>")
+    else:
+        label = f"{name} ({os.path.basename(filename)}:{line})"
+    return label.replace(";", ",")
+
+
+class _Section:
+    """Один профилируемый участок"""
+
+    def __init__(self, profiler: "Profiler", name: str) -> None:
+        self.profiler = profiler
+        self.name = name
+        self.thread = threading.get_ident()
+        self.started = time.perf_counter()
+        self.wall = time.time()
+        self.cpu: Optional[cProfile.Profile] = None
+        self.samples: Counter = Counter()
+        self.snapshot: Optional[tracemalloc.Snapshot] = None
+
+
+class Profiler:
+    """
+    Профилировщик процесса. Один экземпляр на процесс (shared), режим задаётся при configure().
+    """
+    _shared: Optional["Profiler"] = None
+
+    def __init__(self, mode: str = "", out_dir: Optional[str] = None,
+                 min_duration: float = ProfileSettings.MIN_DURATION,
+                 interval: float = ProfileSettings.SAMPLE_INTERVAL) -> None:
+        """
+        :param mode: "cpu", "sample", "mem" или "" (выключено)
+        :param out_dir: папка отчётов (по умолчанию logs/profile)
+        :param min_duration: участки короче (секунд) не сохраняются
+        :param interval: период сэмплирования, секунд
+        """
+        if mode and mode not in MODES:
+            raise ValueError(f"Неизвестный режим профилирования: {mode} (допустимы {', '.join(MODES)})")
+        self.logger = LoggerManager(__name__).get_logger()
+        self.mode = mode
+        self.out_dir = out_dir or os.path.join(LoggerManager.get_log_dir(), ProfileSettings.FOLDER)
+        self.min_duration = min_duration
+        self.interval = interval
+        self._active: Dict[int, _Section] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        # участки режима mem, идущие сейчас (в разных потоках); tracemalloc останавливает последний
+        self._mem_sections = 0
+        self._own_tracing = False
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.mode)
+
+    @classmethod
+    def shared(cls) -> "Profiler":
+        """Профилировщик процесса (по умолчанию — режим из ProfileSettings.MODE)"""
+        if cls._shared is None:
+            cls._shared = cls(ProfileSettings.MODE)
+        return cls._shared
+
+    # --- участки ---
+
+    def section(self, name: str):
+        """Контекст участка; без профилирования — пустой"""
+        if not self.mode:
+            return nullcontext()
+        return self._section(name)
+
+    @contextmanager
+    def _section(self, name: str) -> Iterator[None]:
+        section = self.begin(name)
+        try:
+            yield
+        finally:
+            if section is not None:
+                self.end(section)
+
+    def begin(self, name: str) -> Optional[_Section]:
+        """
+        Начинает участок вручную (когда начало и конец в разных функциях).
+
+        :return: участок для end() или None — профилирование выключено или участок вложенный
+        """
+        if not self.mode:
+            return None
+        tid = threading.get_ident()
+        if tid in self._active:
+            return None
+        section = _Section(self, name)
+        if self.mode == "cpu":
+            section.cpu = cProfile.Profile()
+        elif self.mode == "mem":
+            with self._lock:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start(ProfileSettings.MEM_FRAMES)
+                    self._own_tracing = True
+                self._mem_sections += 1
+            tracemalloc.reset_peak()
+            section.snapshot = tracemalloc.take_snapshot()
+        with self._lock:
+            self._active[tid] = section
+        if self.mode == "sample":
+            self._ensure_sampler()
+        section.started = time.perf_counter()
+        if section.cpu is not None:
+            section.cpu.enable()
+        return section
+
+    def end(self, section: Optional[_Section]) -> Optional[List[str]]:
+        """
+        Завершает участок и пишет отчёты.
+
+        :return: пути отчётов или None (участок не сохранялся)
+        """
+        if section is None:
+            return None
+        if section.cpu is not None:
+            section.cpu.disable()
+        elapsed = time.perf_counter() - section.started
+        with self._lock:
+            self._active.pop(section.thread, None)
+        peak = 0
+        current = None
+        if self.mode == "mem":
+            current = tracemalloc.take_snapshot()
+            peak = tracemalloc.get_traced_memory()[1]
+            with self._lock:
+                self._mem_sections -= 1
+                if not self._mem_sections and self._own_tracing:
+                    tracemalloc.stop()
+                    self._own_tracing = False
+        if elapsed < self.min_duration:
+            return None
+        try:
+            os.makedirs(self.out_dir, exist_ok=True)
+            stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(section.wall)) + f"{int(section.wall * 1000) % 1000:03d}"
+            base = os.path.join(self.out_dir, f"{stamp}-{os.getpid()}-{_UNSAFE.sub('_', section.name)[:80]}")
+            if self.mode == "cpu":
+                files = self._write_cpu(section, base, elapsed)
+            elif self.mode == "sample":
+                files = self._write_samples(section, base, elapsed)
+            else:
+                files = self._write_mem(section, current, base, elapsed, peak)
+        except Exception as e:
+            self.logger.error(f"❌ Не удалось записать профиль «{section.name}»: {e}")
+            return None
+        self.logger.info(
+            f"🔬 Профиль «{section.name}» ({self.mode}): {elapsed:.3f} с -> {os.path.basename(base)}.*",
+            extra={"duration": elapsed, "context": {"profile": self.mode, "section": section.name, "files": files}},
+        )
+        return files
+
+    # --- сэмплирование ---
+
+    def _ensure_sampler(self) -> None:
+        self._wake.set()
+        if self._sampler is None:
+            self._sampler = threading.Thread(target=self._sample_loop, name="profiler-sampler", daemon=True)
+            self._sampler.start()
+
+    def _sample_loop(self) -> None:
+        names: Dict[object, str] = {}
+        own = threading.get_ident()
+        while True:
+            if not self._active:
+                self._wake.clear()
+                if not self._active:
+                    self._wake.wait()
+            time.sleep(self.interval)
+            frames = sys._current_frames()
+            with self._lock:
+                active = list(self._active.items())
+            for tid, section in active:
+                frame = frames.get(tid)
+                if frame is None or tid == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    label = names.get(code)
+                    if label is None:
+                        label = names[code] = _frame_name(code.co_filename, code.co_firstlineno, code.co_qualname)
+                    stack.append(label)
+                    frame = frame.f_back
+                stack.reverse()
+                section.samples[tuple(stack)] += 1
+
+    # --- отчёты ---
+
+    @staticmethod
+    def _write_collapsed(path: str, weights: Dict[Tuple[str, ...], int]) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, weight in sorted(weights.items()):
+                if weight > 0:
+                    f.write(f"{';'.join(stack)} {weight}\n")
+
+    def _cpu_tree(self, stats: pstats.Stats) -> Dict[Tuple[str, ...], float]:
+        """
+        Дерево вызовов из графа cProfile: время ребра caller -> callee делится пропорционально,
+        как у flameprof. Возвращает собственное время (секунд) по стекам.
+        """
+        raw = stats.stats
+        callees: Dict[tuple, Dict[tuple, tuple]] = {}
+        for func, (_, _, _, _, callers) in raw.items():
+            for caller, edge in callers.items():
+                callees.setdefault(caller, {})[func] = edge
+        roots = [f for f, (_, _, _, _, callers) in raw.items() if not any(c in raw and c != f for c in callers)]
+        if not roots and raw:
+            roots = [max(raw, key=lambda f: raw[f][3])]
+        total = sum(raw[f][3] for f in roots) or 1.0
+        result: Dict[Tuple[str, ...], float] = {}
+
+        def walk(func: tuple, share: float, stack: Tuple[str, ...], seen: frozenset) -> None:
+            _, _, tt, ct, _ = raw[func]
+            factor = share / ct if ct else 0.0
+            stack = stack + (_frame_name(*func),)
+            own = tt * factor
+            for callee, (_, _, _, edge_ct) in callees.get(func, {}).items():
+                part = edge_ct * factor
+                if callee in seen or callee not in raw or part < total * 1e-4 or len(stack) > 200:
+                    continue
+                walk(callee, part, stack, seen | {callee})
+            result[stack] = result.get(stack, 0.0) + own
+
+        for root in roots:
+            walk(root, raw[root][3], (), frozenset((root,)))
+        return result
+
+    @staticmethod
+    def _tree_lines(weights: Dict[Tuple[str, ...], float], unit: Callable[[float], str], limit: float) -> List[str]:
+        """Текстовое дерево: суммарный вес узла и его потомков, ветви меньше limit отсекаются"""
+        totals: Dict[Tuple[str, ...], float] = {}
+        for stack, weight in weights.items():
+            for i in range(1, len(stack) + 1):
+                totals[stack[:i]] = totals.get(stack[:i], 0.0) + weight
+        children: Dict[Tuple[str, ...], List[Tuple[str, ...]]] = {}
+        for node in totals:
+            children.setdefault(node[:-1], []).append(node)
+        lines: List[str] = []
+
+        def walk(node: Tuple[str, ...]) -> None:
+            for child in sorted(children.get(node, []), key=lambda n: -totals[n]):
+                if totals[child] < limit:
+                    continue
+                lines.append(f"{unit(totals[child]):>12}  {'  ' * (len(child) - 1)}{child[-1]}")
+                walk(child)
+
+        walk(())
+        return lines
+
+    def _write_cpu(self, section: _Section, base: str, elapsed: float) -> List[str]:
+        stats = pstats.Stats(section.cpu)
+        stats.dump_stats(base + ".prof")
+        tree = self._cpu_tree(stats)
+        self._write_collapsed(base + ".collapsed", {k: int(v * 1e6) for k, v in tree.items()})
+        total = sum(tree.values())
+        with open(base + ".txt", "w", encoding="utf-8") as f:
+            f.write(f"Участок «{section.name}»: {elapsed:.3f} с, режим cpu (cProfile)\n\n")
+            f.write("Дерево вызовов (мс, ветви от 0.5%):\n")
+            f.write("\n".join(self._tree_lines(tree, lambda s: f"{s * 1000:.1f}", total * 0.005)) + "\n\n")
+            f.write("Функции по суммарному времени:\n")
+            stats.stream = f
+            stats.sort_stats("cumulative").print_stats(ProfileSettings.TOP)
+        return [base + ".prof", base + ".txt", base + ".collapsed"]
+
+    def _write_samples(self, section: _Section, base: str, elapsed: float) -> List[str]:
+        samples = section.samples
+        self._write_collapsed(base + ".collapsed", samples)
+        count = sum(samples.values()) or 1
+        own: Counter = Counter()
+        inclusive: Counter = Counter()
+        for stack, n in samples.items():
+            own[stack[-1]] += n
+            for name in set(stack):
+                inclusive[name] += n
+        with open(base + ".txt", "w", encoding="utf-8") as f:
+            f.write(f"Участок «{section.name}»: {elapsed:.3f} с, режим sample, снимков {sum(samples.values())} "
+                    f"(период {self.interval * 1000:.1f} мс)\n\n")
+            f.write("Дерево (доля снимков, ветви от 1%):\n")
+            f.write("\n".join(self._tree_lines(samples, lambda n: f"{n / count:.1%}", count * 0.01)) + "\n\n")
+            f.write("Собственное время:\n")
+            for name, n in own.most_common(ProfileSettings.TOP):
+                f.write(f"{n / count:>8.1%}  {name}\n")
+            f.write("\nВключая вызванные:\n")
+            for name, n in inclusive.most_common(ProfileSettings.TOP):
+                f.write(f"{n / count:>8.1%}  {name}\n")
+        return [base + ".txt", base + ".collapsed"]
+
+    def _write_mem(self, section: _Section, current: tracemalloc.Snapshot, base: str,
+                   elapsed: float, peak: int) -> List[str]:
+        exclude = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+        before = section.snapshot.filter_traces(exclude)
+        after = current.filter_traces(exclude)
+        by_trace = after.compare_to(before, "traceback")
+        weights: Dict[Tuple[str, ...], int] = {}
+        for stat in by_trace:
+            if stat.size_diff > 0:
+                # кадры Traceback идут от старых к новым — как и нужно для collapsed
+                stack = tuple(f"{os.path.basename(fr.filename)}:{fr.lineno}".replace(";", ",") for fr in stat.traceback)
+                weights[stack] = weights.get(stack, 0) + stat.size_diff
+        self._write_collapsed(base + ".collapsed", weights)
+        growth = sum(s.size_diff for s in by_trace)
+        with open(base + ".txt", "w", encoding="utf-8") as f:
+            f.write(f"Участок «{section.name}»: {elapsed:.3f} с, режим mem (tracemalloc)\n")
+            f.write(f"Прирост памяти {growth / 1024:.1f} КБ, пик за участок {peak / 1024 ** 2:.1f} МБ\n\n")
+            f.write("Прирост по строкам:\n")
+            for stat in after.compare_to(before, "lineno")[:ProfileSettings.TOP]:
+                frame = stat.traceback[0]
+                f.write(f"{stat.size_diff / 1024:>10.1f} КБ {stat.count_diff:>+8}  {frame.filename}:{frame.lineno}\n")
+            f.write("\nПрирост по стекам:\n")
+            for stat in sorted(by_trace, key=lambda s: -s.size_diff)[:ProfileSettings.TOP // 4]:
+                f.write(f"{stat.size_diff / 1024:>10.1f} КБ {stat.count_diff:>+8}\n")
+                for line in stat.traceback.format()[-16:]:
+                    f.write(f"      {line}\n")
+        return [base + ".txt", base + ".collapsed"]
+
+
+def configure(mode: Optional[str] = None, **options) -> Profiler:
+    """
+    Задаёт режим профилировщика процесса.
+
+    :param mode: "cpu", "sample", "mem", "" (выключить); None — из ProfileSettings.MODE
+    :param options: параметры Profiler (out_dir, min_duration, interval)
+    """
+    Profiler._shared = Profiler(ProfileSettings.MODE if mode is None else mode, **options)
+    return Profiler._shared
+
+
+def section(name: str):
+    """Участок профилировщика процесса: with section("startup"): ..."""
+    return Profiler.shared().section(name)
+
+
+def profiled(name: Optional[str] = None) -> Callable:
+    """Декоратор участка; режим проверяется при каждом вызове, поэтому configure() можно вызвать позже"""
+    def decorator(func: Callable) -> Callable:
+        label = name or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = Profiler.shared()
+            if not profiler.mode:
+                return func(*args, **kwargs)
+            with profiler.section(label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def mode_from_argv(argv: List[str]) -> Tuple[Optional[str], List[str]]:
+    """
+    Забирает из argv флаг --profile РЕЖИМ; остальное (аргументы Qt) возвращается как есть.
+
+    :return: (режим или None, argv без флага)
+    """
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--profile", choices=MODES)
+    args, rest = parser.parse_known_args(argv[1:])
+    return args.profile, argv[:1] + rest
+
+
+# События Qt, в обработке которых срабатывают действия пользователя (clicked, triggered, ...)
+_QT_ACTION_EVENTS = ("MouseButtonRelease", "MouseButtonDblClick", "KeyPress", "Shortcut")
+
+
+def qt_application_class():
+    """
+    Класс QApplication для InitProj: при включённом профилировании — с notify(),
+    которое оборачивает обработку кликов и клавиш в участок; иначе обычный QApplication.
+    """
+    from PyQt6 import QtCore, QtWidgets
+
+    profiler = Profiler.shared()
+    if not profiler.mode:
+        return QtWidgets.QApplication
+    action_types = {getattr(QtCore.QEvent.Type, name) for name in _QT_ACTION_EVENTS}
+
+    class ProfiledApplication(QtWidgets.QApplication):
+        """QApplication, профилирующий действия пользователя"""
+
+        def notify(self, receiver, event) -> bool:
+            if event.type() not in action_types or threading.get_ident() in profiler._active:
+                return super().notify(receiver, event)
+            label = f"{type(receiver).__name__}.{receiver.objectName() or '-'}.{event.type().name}"
+            with profiler.section(label):
+                return super().notify(receiver, event)
+
+    return ProfiledApplication
@@ -0,0 +1,187 @@
+# utils/search_completer.py
+# Поиск при вводе для полей окна: задержка после нажатий, поиск в фоне, выдача порциями ⌨️
+#
+# Нажатие клавиши в потоке GUI только перезапускает таймер и отменяет уже устаревший поиск.
+# Когда ввод затих на delay_ms, запрос уходит в пул (utils/task_pool.py) с replace=True:
+# следующий запрос отменяет предыдущий. Маленький справочник (до SYNC_LIMIT строк) ищется
+# сразу — это быстрее переключения потоков. Результаты попадают во всплывающий список
+# QCompleter порциями по RENDER_CHUNK строк за проход цикла событий.
+
+import time
+from itertools import count
+from typing import Any, Iterable, List, Optional, Sequence
+
+from PyQt6 import QtCore, QtGui, QtWidgets
+
+from utils.logger import LoggerManager
+from utils.search_index import SearchHit, SearchIndex
+from utils.task_pool import Priority, TaskManager
+
+# Справочник не больше этого ищется прямо в потоке GUI
+SYNC_LIMIT: int = 1000
+# Строк списка за один проход цикла событий
+RENDER_CHUNK: int = 20
+
+# Роль элемента списка с данными строки справочника
+DATA_ROLE = QtCore.Qt.ItemDataRole.UserRole
+
+_ids = count(1)
+
+
+class SearchCompleter(QtCore.QObject):
+    """
+    Всплывающий список вариантов под QComboBox, QLineEdit или QPlainTextEdit.
+    Выбранный вариант подставляется в поле и приходит сигналом chosen(текст, данные).
+    """
+    chosen = QtCore.pyqtSignal(str, object)
+
+    def __init__(self, widget: QtWidgets.QWidget, tasks: TaskManager, delay_ms: int = 150, limit: int = 50,
+                 parent=None) -> None:
+        """
+        :param widget: поле ввода; QComboBox становится редактируемым
+        :param tasks: пул фоновых задач окна
+        :param delay_ms: пауза ввода, после которой начинается поиск
+        :param limit: сколько вариантов показывать
+        """
+        super().__init__(parent or widget)
+        self.logger = LoggerManager(__name__).get_logger()
+        self.widget = widget
+        self.tasks = tasks
+        self.limit = limit
+        self.index: Optional[SearchIndex] = None
+        self._key = ("search", next(_ids))
+        self._generation = 0
+        self._pending: List[SearchHit] = []
+        self._waiting = False  # ввод начался раньше, чем справочник загрузился
+
+        self.model = QtGui.QStandardItemModel(self)
+        self.completer = QtWidgets.QCompleter(self.model, self)
+        self.completer.setCompletionMode(QtWidgets.QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        self.completer.setMaxVisibleItems(12)
+        self.completer.activated[QtCore.QModelIndex].connect(self._activated)
+
+        self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay_ms)
+        self.timer.timeout.connect(self._search)
+
+        if isinstance(widget, QtWidgets.QComboBox):
+            widget.setEditable(True)
+            widget.setInsertPolicy(QtWidgets.QComboBox.InsertPolicy.NoInsert)
+            widget.setCompleter(None)  # свой QCompleter фильтровал бы только по началу строки
+            widget.lineEdit().textEdited.connect(self._typed)
+            self.completer.setWidget(widget.lineEdit())
+        elif isinstance(widget, QtWidgets.QLineEdit):
+            widget.textEdited.connect(self._typed)
+            self.completer.setWidget(widget)
+        else:
+            widget.textChanged.connect(self._typed)
+            self.completer.setWidget(widget)
+
+    # --- данные ---
+
+    def set_items(self, items: Iterable[Sequence]) -> None:
+        """
+        Новый справочник: строки (текст, данные[, псевдоним]). Большой индексируется в фоне.
+        """
+        items = list(items)
+        self.index = None
+        if len(items) <= SYNC_LIMIT:
+            self._indexed(SearchIndex(items))
+            return
+        self.tasks.submit(self._build, items, key=self._key + ("index",), title="индекс поиска",
+                          priority=Priority.LOW, replace=True, silent=True, on_finished=self._indexed)
+
+    @staticmethod
+    def _build(items: List[Sequence], token=None) -> SearchIndex:
+        return SearchIndex(items, token=token)
+
+    def _indexed(self, index: SearchIndex) -> None:
+        self.index = index
+        if self._waiting and not self.timer.isActive():
+            self._search()
+
+    # --- ввод ---
+
+    def text(self) -> str:
+        widget = self.widget
+        if isinstance(widget, QtWidgets.QComboBox):
+            return widget.currentText()
+        if isinstance(widget, QtWidgets.QLineEdit):
+            return widget.text()
+        return widget.toPlainText()
+
+    def set_text(self, text: str) -> None:
+        widget = self.widget
+        blocked = widget.blockSignals(True)
+        try:
+            if isinstance(widget, QtWidgets.QComboBox):
+                i = widget.findText(text)
+                if i >= 0:
+                    widget.setCurrentIndex(i)
+                else:
+                    widget.setEditText(text)
+            elif isinstance(widget, QtWidgets.QLineEdit):
+                widget.setText(text)
+            else:
+                widget.setPlainText(text)
+                widget.moveCursor(QtGui.QTextCursor.MoveOperation.End)
+        finally:
+            widget.blockSignals(blocked)
+
+    def _typed(self, *_args) -> None:
+        """На каждое нажатие — только перезапуск таймера и отмена устаревшего поиска"""
+        self._generation += 1
+        self.tasks.cancel(self._key)
+        self.timer.start()
+
+    def _search(self) -> None:
+        query = self.text().strip()
+        self._waiting = self.index is None
+        if not query or self.index is None:
+            self.completer.popup().hide()
+            return
+        generation = self._generation
+        if len(self.index) <= SYNC_LIMIT:
+            self._show(generation, self.index.search(query, self.limit))
+            return
+        started = time.perf_counter()
+        self.tasks.submit(self.index.search, query, self.limit, key=self._key, title="поиск",
+                          priority=Priority.HIGH, replace=True, silent=True,
+                          on_finished=lambda hits: self._show(generation, hits, started))
+
+    # --- выдача ---
+
+    def _show(self, generation: int, hits: List[SearchHit], started: Optional[float] = None) -> None:
+        if generation != self._generation:
+            return  # пока искали, ввод изменился
+        if started is not None:
+            self.logger.debug(f"🔎 Поиск в {len(self.index)} строках: {(time.perf_counter() - started) * 1000:.1f} мс")
+        self.model.clear()
+        self._pending = list(hits)
+        if not hits:
+            self.completer.popup().hide()
+            return
+        self._render(generation)
+        self.completer.complete(self.widget.rect())
+
+    def _render(self, generation: int) -> None:
+        if generation != self._generation:
+            return
+        chunk, self._pending = self._pending[:RENDER_CHUNK], self._pending[RENDER_CHUNK:]
+        for hit in chunk:
+            item = QtGui.QStandardItem(hit.text)
+            item.setData(hit.data, DATA_ROLE)
+            item.setEditable(False)
+            self.model.appendRow(item)
+        if self._pending:
+            QtCore.QTimer.singleShot(0, lambda: self._render(generation))
+
+    def _activated(self, index: QtCore.QModelIndex) -> None:
+        text = index.data()
+        data: Any = index.data(DATA_ROLE)
+        self._generation += 1
+        self.timer.stop()
+        self.set_text(text)
+        self.completer.popup().hide()
+        self.chosen.emit(text, data)
@@ -0,0 +1,148 @@
+# utils/search_index.py
+# Поиск по справочнику в памяти с ранжированием: начало строки, начало слова, подстрока, буквы по порядку 🔎
+#
+# Строки нормализуются один раз при построении (регистр, «ё», знаки препинания), поэтому
+# запрос — это проход по списку с оператором in. Каждое слово запроса должно найтись в
+# строке; место строки в выдаче определяет худшее из совпадений слов. Если новый запрос
+# продолжает предыдущий (дописаны буквы или слова), перебираются только прошлые
+# совпадения — при наборе по букве выборка быстро сужается. Qt не нужен: поиск можно звать из любого потока.
+
+import re
+import heapq
+import threading
+from typing import Any, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from utils.task_token import TaskToken, ensure_token
+
+# Всё, кроме букв и цифр, — разделитель слов
+_SEPARATORS = re.compile(r"[\W_]+")
+
+# Ранги совпадения слова запроса, меньший — лучше
+EXACT, PREFIX, WORD_PREFIX, SUBSTRING, SCATTERED = range(5)
+
+# Как часто проверять отмену при переборе
+CHECK_EVERY: int = 2000
+
+
+def normalize(text: str) -> str:
+    """Строка для сравнения: нижний регистр, «ё» как «е», слова через один пробел"""
+    return _SEPARATORS.sub(" ", str(text).casefold().replace("ё", "е")).strip()
+
+
+def _scattered(term: str, text: str) -> int:
+    """Позиция первой буквы, если буквы term идут в text по порядку (с пропусками); иначе -1"""
+    pos = first = text.find(term[0])
+    if pos < 0:
+        return -1
+    for char in term[1:]:
+        pos = text.find(char, pos + 1)
+        if pos < 0:
+            return -1
+    return first
+
+
+class SearchHit(NamedTuple):
+    """Результат поиска"""
+    text: str
+    data: Any
+    rank: int
+
+
+class SearchIndex:
+    """
+    Индекс справочника.
+    :param items: строки (текст, данные) или (текст, данные, псевдоним); псевдоним
+                  (краткое имя, шифр) ищется наравне с текстом, но не показывается
+    :param scattered_from: с какой длины слово ищется и «вразбивку» (буквы по порядку)
+    """
+
+    def __init__(self, items: Iterable[Sequence], scattered_from: int = 3, token: Optional[TaskToken] = None) -> None:
+        token = ensure_token(token)
+        self.scattered_from = scattered_from
+        self._texts: List[str] = []
+        self._data: List[Any] = []
+        # нормализованная строка с пробелом в начале: " " + слово — поиск начала слова
+        self._keys: List[str] = []
+        for i, item in enumerate(items):
+            if i % CHECK_EVERY == 0:
+                token.check()
+            text, data = item[0], item[1] if len(item) > 1 else None
+            alias = item[2] if len(item) > 2 and item[2] else ""
+            self._texts.append(str(text))
+            self._data.append(data)
+            self._keys.append(" " + normalize(f"{text} {alias}" if alias else text))
+        self._lock = threading.Lock()
+        self._last: Tuple[str, Optional[List[int]]] = ("", None)
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def _rank(self, term: str, key: str) -> Tuple[int, int]:
+        """(ранг, позиция) слова запроса в строке; ранг -1 — не найдено"""
+        pos = key.find(term)
+        if pos < 0:
+            if len(term) < self.scattered_from:
+                return -1, 0
+            pos = _scattered(term, key)
+            return (SCATTERED, pos) if pos >= 0 else (-1, 0)
+        if key[pos - 1] == " ":
+            if pos == 1:
+                return (EXACT if len(key) == len(term) + 1 else PREFIX), pos
+            return WORD_PREFIX, pos
+        word = key.find(" " + term, pos)
+        return (WORD_PREFIX, word + 1) if word >= 0 else (SUBSTRING, pos)
+
+    def _score(self, terms: List[str], i: int) -> Optional[Tuple[int, int, int, int]]:
+        """Ключ сортировки строки i: (худший ранг, сумма позиций, длина, порядок); None — не подходит"""
+        key = self._keys[i]
+        worst, where = EXACT, 0
+        for term in terms:
+            rank, pos = self._rank(term, key)
+            if rank < 0:
+                return None
+            worst = max(worst, rank)
+            where += pos
+        return worst, where, len(key), i
+
+    def search(self, query: str, limit: int = 50, token: Optional[TaskToken] = None) -> List[SearchHit]:
+        """
+        Лучшие limit строк по запросу. Строки, где слова запроса есть целиком, идут первыми;
+        «вразбивку» ищется, только если их меньше limit.
+
+        :param query: текст запроса; пустой — первые limit строк по порядку
+        :param token: отмена (поиск, устаревший после следующего нажатия клавиши)
+        """
+        token = ensure_token(token)
+        q = normalize(query)
+        if not q:
+            return [SearchHit(self._texts[i], self._data[i], EXACT) for i in range(min(limit, len(self)))]
+        terms = q.split(" ")
+        keys = self._keys
+        with self._lock:
+            last_query, last_found = self._last
+        # строки со всеми словами целиком: продолжение запроса только сужает прошлую выборку
+        found = last_found if last_found is not None and last_query and q.startswith(last_query) else None
+        for term in terms:
+            token.check()
+            if found is None:
+                found = [i for i, key in enumerate(keys) if term in key]
+            else:
+                found = [i for i in found if term in keys[i]]
+        with self._lock:
+            self._last = (q, found)
+
+        scored = []
+        for n, i in enumerate(found):
+            if n % CHECK_EVERY == 0:
+                token.check()
+            scored.append(self._score(terms, i))
+        if len(scored) < limit and any(len(term) >= self.scattered_from for term in terms):
+            exact = set(found)
+            for i in range(len(keys)):
+                if i % CHECK_EVERY == 0:
+                    token.check()
+                if i not in exact:
+                    score = self._score(terms, i)
+                    if score is not None:
+                        scored.append(score)
+        return [SearchHit(self._texts[i], self._data[i], rank) for rank, _, _, i in heapq.nsmallest(limit, scored)]
@@ -0,0 +1,245 @@
+# utils/task_pool.py
+# Фоновые задачи GUI на QThreadPool: приоритеты, отмена, прогресс в строку состояния 🧵
+#
+# Долгие операции (создание папок, копирование шаблонов, синхронизация журнала, индексация)
+# не должны выполняться в потоке GUI. TaskManager запускает функцию в пуле и передаёт ей
+# TaskToken (utils/task_token.py) аргументом token=; прогресс и результат приходят обратно
+# сигналами, которые Qt доставляет в поток GUI. Повторная отправка задачи с тем же ключом,
+# пока прежняя не закончилась, не запускает вторую копию, а возвращает уже идущую;
+# с replace=True прежняя отменяется (последний запрос важнее — например, поиск при вводе).
+
+import time
+from enum import IntEnum
+from itertools import count
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set
+
+from PyQt6 import QtCore
+
+from utils.logger import LoggerManager
+from utils.task_token import Cancelled, TaskToken
+
+# Номера отправок — ключи задач, аргументы которых нельзя хэшировать
+_submissions = count(1)
+
+
+class Priority(IntEnum):
+    """Приоритет в очереди QThreadPool: больший запускается раньше"""
+    LOW = -10
+    NORMAL = 0
+    HIGH = 10
+
+
+class TaskSignals(QtCore.QObject):
+    """Сигналы одной задачи (QRunnable сам сигналов иметь не может)"""
+    started = QtCore.pyqtSignal()
+    progress = QtCore.pyqtSignal(int, int, str)  # сделано, всего, текст
+    finished = QtCore.pyqtSignal(object)  # результат функции
+    failed = QtCore.pyqtSignal(str)  # текст ошибки
+    cancelled = QtCore.pyqtSignal()
+
+
+class TaskHandle(QtCore.QRunnable):
+    """
+    Задача в пуле. Результат — через on_finished/on_failed в TaskManager.submit: сигналы
+    handle.signals, подключённые после submit(), быстрая задача может испустить раньше.
+    """
+
+    def __init__(self, key: Hashable, title: str, fn: Callable[..., Any], args: tuple, kwargs: dict) -> None:
+        super().__init__()
+        self.setAutoDelete(False)  # объект живёт, пока на него ссылается TaskManager
+        self.logger = LoggerManager(__name__).get_logger()
+        self.key = key
+        self.title = title
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.silent = False
+        # вызываются в потоке GUI из TaskManager._done, см. TaskManager.submit
+        self.on_finished: List[Callable[[Any], None]] = []
+        self.on_failed: List[Callable[[str], None]] = []
+        self.signals = TaskSignals()
+        self.token = TaskToken(on_progress=self.signals.progress.emit)
+
+    @property
+    def cancelled(self) -> bool:
+        return self.token.cancelled
+
+    def cancel(self) -> None:
+        self.token.cancel()
+
+    def run(self) -> None:
+        if self.token.cancelled:
+            self.signals.cancelled.emit()
+            return
+        self.signals.started.emit()
+        start = time.perf_counter()
+        try:
+            result = self.fn(*self.args, token=self.token, **self.kwargs)
+        except Cancelled:
+            self.logger.info(f"⏹️ Задача «{self.title}» отменена через {time.perf_counter() - start:.2f} с")
+            self.signals.cancelled.emit()
+        except Exception as e:
+            self.logger.error(
+                f"❌ Задача «{self.title}» упала: {e}", exc_info=True,
+                extra={"duration": time.perf_counter() - start, "context": {"task": str(self.key)}},
+            )
+            self.signals.failed.emit(str(e))
+        else:
+            if self.token.cancelled:
+                self.signals.cancelled.emit()
+            else:
+                elapsed = time.perf_counter() - start
+                self.logger.debug(f"✅ Задача «{self.title}» выполнена за {elapsed:.2f} с")
+                self.signals.finished.emit(result)
+
+
+class TaskManager(QtCore.QObject):
+    """
+    Очередь фоновых задач окна. Функция задачи должна принимать аргумент token (TaskToken).
+    """
+    # ключ и заголовок задачи; далее — как у TaskSignals
+    taskStarted = QtCore.pyqtSignal(object, str)
+    taskProgress = QtCore.pyqtSignal(object, str, int, int, str)
+    taskFinished = QtCore.pyqtSignal(object, str, object)
+    taskFailed = QtCore.pyqtSignal(object, str, str)
+    taskCancelled = QtCore.pyqtSignal(object, str)
+    # число незавершённых задач
+    activeChanged = QtCore.pyqtSignal(int)
+
+    def __init__(self, max_threads: Optional[int] = None, parent=None) -> None:
+        """
+        :param max_threads: размер пула; по умолчанию — по числу ядер
+        """
+        super().__init__(parent)
+        self.logger = LoggerManager(__name__).get_logger()
+        self.pool = QtCore.QThreadPool(self)
+        if max_threads:
+            self.pool.setMaxThreadCount(max_threads)
+        self._tasks: Dict[Hashable, TaskHandle] = {}
+        # заменённые по replace=True, но ещё идущие в пуле: без ссылки их соберёт сборщик мусора
+        self._retired: Set[TaskHandle] = set()
+        app = QtCore.QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+
+    @property
+    def active(self) -> int:
+        return len(self._tasks)
+
+    def get(self, key: Hashable) -> Optional[TaskHandle]:
+        return self._tasks.get(key)
+
+    def submit(self, fn: Callable[..., Any], *args, key: Optional[Hashable] = None, title: str = "",
+               priority: int = Priority.NORMAL, replace: bool = False, silent: bool = False,
+               on_finished: Optional[Callable[[Any], None]] = None,
+               on_failed: Optional[Callable[[str], None]] = None, **kwargs) -> TaskHandle:
+        """
+        Ставит fn(*args, token=..., **kwargs) в очередь пула.
+
+        :param key: ключ для слияния повторов; по умолчанию (fn, args), а если в args есть
+                    списки или словари — уникальный для каждой отправки (повторы не сливаются)
+        :param title: название для строки состояния и логов
+        :param priority: Priority или любое целое
+        :param replace: отменить незавершённую задачу с тем же ключом и запустить заново
+        :param silent: не сообщать о задаче сигналами менеджера (строке состояния) — только handle.signals
+        :param on_finished: вызвать с результатом в потоке GUI; задача, заменённая по replace=True, его не вызывает
+        :param on_failed: вызвать с текстом ошибки в потоке GUI
+        :return: TaskHandle (уже идущий, если повтор слит; ему добавляются и on_finished/on_failed)
+        """
+        if key is None:
+            key = (fn, args)
+            try:
+                hash(key)
+            except TypeError:
+                key = (fn, next(_submissions))
+        title = title or getattr(fn, "__name__", "задача")
+        current = self._tasks.get(key)
+        if current is not None:
+            if not replace:
+                self.logger.debug(f"🔁 Задача «{title}» уже в работе, повтор не запускается")
+                self._add_callbacks(current, on_finished, on_failed)
+                return current
+            self.cancel(key)
+            if self._tasks.get(key) is current:
+                self._retired.add(current)
+
+        handle = TaskHandle(key, title, fn, args, kwargs)
+        handle.silent = silent
+        self._add_callbacks(handle, on_finished, on_failed)
+        # всё подключается до pool.start(): иначе быстрая задача закончится раньше подписки
+        signals = handle.signals
+        signals.started.connect(lambda: self._started(handle))
+        signals.progress.connect(lambda done, total, text: self._progress(handle, done, total, text))
+        signals.finished.connect(lambda result: self._done(handle, self.taskFinished, handle.on_finished, result))
+        signals.failed.connect(lambda error: self._done(handle, self.taskFailed, handle.on_failed, error))
+        signals.cancelled.connect(lambda: self._done(handle, self.taskCancelled, []))
+        self._tasks[key] = handle
+        self.pool.start(handle, int(priority))
+        self.activeChanged.emit(len(self._tasks))
+        return handle
+
+    @staticmethod
+    def _add_callbacks(handle: TaskHandle, on_finished: Optional[Callable], on_failed: Optional[Callable]) -> None:
+        # задача из self._tasks ещё не прошла _done (оба работают в потоке GUI), поэтому вызов не потеряется
+        if on_finished is not None:
+            handle.on_finished.append(on_finished)
+        if on_failed is not None:
+            handle.on_failed.append(on_failed)
+
+    def cancel(self, key: Hashable) -> bool:
+        """
+        Отменяет задачу: ещё не начатая снимается с очереди, идущая прервётся на ближайшем
+        token.check(). Возвращает False, если задачи с таким ключом нет.
+        """
+        handle = self._tasks.get(key)
+        if handle is None:
+            return False
+        handle.cancel()
+        if self.pool.tryTake(handle):
+            handle.signals.cancelled.emit()
+        return True
+
+    def cancel_all(self) -> None:
+        for key in list(self._tasks):
+            self.cancel(key)
+
+    def shutdown(self, timeout_ms: int = 5000) -> bool:
+        """Отменяет всё и ждёт рабочие потоки (при выходе из приложения)"""
+        self.cancel_all()
+        return self.pool.waitForDone(timeout_ms)
+
+    def _started(self, handle: TaskHandle) -> None:
+        if self._tasks.get(handle.key) is handle and not handle.silent:
+            self.taskStarted.emit(handle.key, handle.title)
+
+    def _progress(self, handle: TaskHandle, done: int, total: int, text: str) -> None:
+        if self._tasks.get(handle.key) is handle and not handle.silent:
+            self.taskProgress.emit(handle.key, handle.title, done, total, text)
+
+    def _done(self, handle: TaskHandle, signal, callbacks: List[Callable], *payload) -> None:
+        # задача, заменённая по replace=True, о себе уже не сообщает
+        if self._tasks.get(handle.key) is not handle:
+            self._retired.discard(handle)
+            return
+        del self._tasks[handle.key]
+        if not handle.silent:
+            signal.emit(handle.key, handle.title, *payload)
+        self.activeChanged.emit(len(self._tasks))
+        for callback in callbacks:
+            callback(*payload)
+
+    def bind_statusbar(self, statusbar) -> None:
+        """Показывает ход задач в QStatusBar окна"""
+
+        def others() -> str:
+            return f" (ещё задач: {len(self._tasks) - 1})" if len(self._tasks) > 1 else ""
+
+        def progress(_key, title: str, done: int, total: int, text: str) -> None:
+            amount = f"{done}/{total}" if total else str(done)
+            statusbar.showMessage(f"⏳ {title}: {amount}{' — ' + text if text else ''}{others()}")
+
+        self.taskStarted.connect(lambda _key, title: statusbar.showMessage(f"⏳ {title}…{others()}"))
+        self.taskProgress.connect(progress)
+        self.taskFinished.connect(lambda _key, title, _result: statusbar.showMessage(f"✅ {title}: готово", 5000))
+        self.taskFailed.connect(lambda _key, title, error: statusbar.showMessage(f"❌ {title}: {error}"))
+        self.taskCancelled.connect(lambda _key, title: statusbar.showMessage(f"⏹️ {title}: отменено", 5000))
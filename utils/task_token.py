@@ -0,0 +1,70 @@
+# utils/task_token.py
+# Токен задачи: отмена и прогресс для долгих функций, без зависимости от Qt 🎫
+#
+# Функция бэкенда принимает token=None, время от времени вызывает token.check() (выбросит
+# Cancelled, если задачу отменили) и token.progress(сделано, всего, текст). Кто её
+# запустил — консольная утилита, пул Qt (utils/task_pool.py) или тест — решает сам,
+# куда направить прогресс. Частые вызовы progress() дёшевы: наружу уходит не больше
+# одного сообщения за min_interval секунд, а последнее (done == total) — всегда.
+
+import time
+import threading
+from typing import Callable, Optional
+
+# колбэк прогресса: (сделано, всего, текст)
+ProgressCallback = Callable[[int, int, str], None]
+
+
+class Cancelled(Exception):
+    """Задача отменена: функция бэкенда прерывается на ближайшем check()"""
+
+
+class TaskToken:
+    """
+    Флаг отмены и канал прогресса одной задачи. Потокобезопасен: cancel() вызывают
+    из потока GUI, check() и progress() — из рабочего.
+    """
+
+    def __init__(self, on_progress: Optional[ProgressCallback] = None, min_interval: float = 0.1) -> None:
+        """
+        :param on_progress: куда отдавать прогресс; None — никуда
+        :param min_interval: не чаще одного сообщения за столько секунд
+        """
+        self.on_progress = on_progress
+        self.min_interval = min_interval
+        self._event = threading.Event()
+        self._last = 0.0
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    def check(self) -> None:
+        """Точка прерывания: выбрасывает Cancelled, если задачу отменили"""
+        if self._event.is_set():
+            raise Cancelled()
+
+    def progress(self, done: int, total: int = 0, text: str = "") -> None:
+        """
+        Сообщает ход работы и заодно проверяет отмену.
+
+        :param done: сделано единиц
+        :param total: всего единиц; 0 — неизвестно
+        :param text: что сейчас делается
+        """
+        self.check()
+        if self.on_progress is None:
+            return
+        now = time.monotonic()
+        if now - self._last < self.min_interval and not (total and done >= total):
+            return
+        self._last = now
+        self.on_progress(done, total, text)
+
+
+def ensure_token(token: Optional[TaskToken]) -> TaskToken:
+    """Токен вызывающего или пустой — чтобы в теле функции не проверять его на None"""
+    return token if token is not None else TaskToken()
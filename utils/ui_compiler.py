@@ -0,0 +1,135 @@
+# utils/ui_compiler.py
+# Формы Qt Designer, заранее скомпилированные в Python, с автоматической пересборкой 🧩
+#
+# Рядом с form.ui лежит сгенерированный form_form.py (класс Ui_*), первая строка которого —
+# хэш исходного .ui. При загрузке хэши сверяются; если .ui поменялся, модуль собирается
+# заново через PyQt6.uic. Так окно не разбирает XML при каждом запуске, а сгенерированный
+# код не отстаёт от формы. Собрать все формы заранее: python -m utils.ui_compiler
+
+import io
+import os
+import sys
+import hashlib
+import argparse
+import importlib.util
+from types import ModuleType
+from typing import List, Optional
+
+from utils.logger import LoggerManager
+
+# Корень проекта: имена модулей форм считаются от него
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+HASH_PREFIX = "# ui-hash: "
+SUFFIX = "_form"
+
+logger = LoggerManager(__name__).get_logger()
+
+
+def form_path(ui_path: str) -> str:
+    """Путь сгенерированного модуля: init_proj.ui -> init_proj_form.py"""
+    return os.path.splitext(ui_path)[0] + SUFFIX + ".py"
+
+
+def ui_hash(ui_path: str) -> str:
+    with open(ui_path, "rb") as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+
+def stored_hash(py_path: str) -> Optional[str]:
+    """Хэш .ui, из которого собран модуль; None — модуля нет или он собран не нами"""
+    try:
+        with open(py_path, "r", encoding="utf-8") as f:
+            first = f.readline().strip()
+    except OSError:
+        return None
+    return first[len(HASH_PREFIX):] if first.startswith(HASH_PREFIX) else None
+
+
+def generate(ui_path: str, digest: Optional[str] = None) -> str:
+    """Исходный код модуля формы"""
+    from PyQt6 import uic  # uic нужен только при пересборке
+
+    out = io.StringIO()
+    uic.compileUi(ui_path, out)
+    digest = digest or ui_hash(ui_path)
+    # в шапке pyuic — абсолютный путь сборщика; в репозитории он ни к чему
+    code = out.getvalue().replace(f"'{ui_path}'", f"'{os.path.basename(ui_path)}'", 1)
+    return f"{HASH_PREFIX}{digest}\n# Сгенерировано из {os.path.basename(ui_path)}, не редактировать: " \
+           f"правки вносятся в .ui\n{code}"
+
+
+def compile_form(ui_path: str, force: bool = False) -> bool:
+    """
+    Пересобирает модуль формы, если .ui изменился.
+
+    :param force: собрать, даже если хэш совпадает
+    :return: был ли модуль записан
+    """
+    py_path = form_path(ui_path)
+    digest = ui_hash(ui_path)
+    if not force and stored_hash(py_path) == digest:
+        return False
+    source = generate(ui_path, digest)
+    tmp = f"{py_path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(source)
+    os.replace(tmp, py_path)
+    logger.info(f"🧩 Форма {os.path.basename(ui_path)} собрана в {os.path.basename(py_path)}")
+    return True
+
+
+def _module_name(py_path: str) -> str:
+    rel = os.path.relpath(os.path.splitext(py_path)[0], PROJECT_ROOT)
+    return rel.replace(os.sep, ".") if not rel.startswith(os.pardir) else os.path.basename(rel)
+
+
+def load_form(ui_path: str) -> type:
+    """
+    Возвращает класс Ui_* формы из сгенерированного модуля, при необходимости пересобрав его.
+    Если записать модуль нельзя (папка только для чтения), код собирается в памяти.
+
+    :param ui_path: путь к .ui
+    """
+    py_path = form_path(ui_path)
+    name = _module_name(py_path)
+    module: Optional[ModuleType] = sys.modules.get(name)
+    if module is None:
+        try:
+            compile_form(ui_path)
+        except OSError as e:
+            logger.warning(f"⚠️ Не удалось записать {py_path}: {e}; форма собирается в памяти")
+            module = ModuleType(name)
+            exec(compile(generate(ui_path), py_path, "exec"), module.__dict__)
+        else:
+            spec = importlib.util.spec_from_file_location(name, py_path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+        sys.modules[name] = module
+    return next(value for key, value in vars(module).items() if key.startswith("Ui_") and isinstance(value, type))
+
+
+def find_forms(root: str = PROJECT_ROOT) -> List[str]:
+    """Все .ui проекта, кроме виртуальных окружений и служебных папок"""
+    forms = []
+    for current, dirs, files in os.walk(root):
+        dirs[:] = [d for d in dirs if not d.startswith(".") and d not in ("venv", "__pycache__", "logs")]
+        forms.extend(os.path.join(current, name) for name in files if name.endswith(".ui"))
+    return sorted(forms)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Сборка форм Qt Designer (.ui) в модули Python")
+    parser.add_argument("forms", nargs="*", help="файлы .ui (по умолчанию все в проекте)")
+    parser.add_argument("--force", action="store_true", help="пересобрать, даже если .ui не менялся")
+    parser.add_argument("--check", action="store_true", help="только проверить, что модули актуальны")
+    args = parser.parse_args()
+
+    stale = 0
+    for ui in args.forms or find_forms():
+        if args.check:
+            fresh = stored_hash(form_path(ui)) == ui_hash(ui)
+            stale += not fresh
+            print(f"{'✅' if fresh else '❌'} {ui}")
+        else:
+            print(f"{'🧩 собрана' if compile_form(ui, args.force) else '✅ актуальна'}: {ui}")
+    sys.exit(1 if stale else 0)
@@ -1 +1,323 @@
+# utils/word_com.py
 # Обёртка над Word: загрузка шаблона, заполнение, экспорт
+#
+# Как и utils/excel_com.py, интерфейс пакетный: все подстановки полей, закладок и
+# строки таблицы передаются одним вызовом. Файловый бэкенд OOXML правит XML документа
+# строковыми операциями — префиксы пространств имён и mc:Ignorable остаются нетронутыми.
+
+import os
+import re
+import zipfile
+import tempfile
+from bisect import bisect_right
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Set, Type, Union
+from xml.sax.saxutils import escape, unescape
+
+from config.settings import TemplateSettings
+from utils.logger import LoggerManager
+
+# Части документа, в которых ищутся поля: тело, колонтитулы, сноски
+_TEXT_PARTS = re.compile(r"^word/(document|header\d*|footer\d*|footnotes|endnotes)\.xml$")
+
+# Самые вложенные абзацы (абзацы надписей внутри абзаца обрабатываются отдельно)
+_PARAGRAPH = re.compile(r"<w:p\b(?:(?!<w:p\b).)*?</w:p>", re.S)
+_TEXT = re.compile(r"<w:t(\s[^>]*)?>([^<]*)</w:t>|<w:t(\s[^>]*)?/>")
+_RUN = re.compile(r"<w:r\b(?:(?!<w:r\b).)*?</w:r>", re.S)
+_RUN_PROPS = re.compile(r"<w:rPr\b.*?</w:rPr>", re.S)
+_ROW = re.compile(r"<w:tr\b.*?</w:tr>", re.S)
+_CELL = re.compile(r"<w:tc\b.*?</w:tc>", re.S)
+_TABLE_TAG = re.compile(r"<w:tbl>|<w:tbl\s[^>]*>|</w:tbl>")
+_EMPTY_PARAGRAPH = re.compile(r"<w:p(\s[^>]*)?/>")
+_BOOKMARK_TAG = re.compile(r"<w:bookmark(?:Start|End)\b[^>]*/>")
+_INVALID_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+Value = Union[str, int, float, None]
+
+
+def _text_xml(value: Value) -> str:
+    """Текст для <w:t>: экранирование, переводы строк — в <w:br/>"""
+    text = escape(_INVALID_XML.sub("", "" if value is None else str(value)))
+    return text.replace("\r\n", "\n").replace("\n", '</w:t><w:br/><w:t xml:space="preserve">')
+
+
+def _run_xml(value: Value, props: str = "") -> str:
+    return f'<w:r>{props}<w:t xml:space="preserve">{_text_xml(value)}</w:t></w:r>'
+
+
+def merge_split_placeholders(xml: str, pattern: re.Pattern) -> str:
+    """
+    Word режет текст абзаца на прогоны как угодно (правописание, история правок),
+    и «{{ project }}» может оказаться в трёх <w:t>. Здесь каждое поле целиком
+    переносится в <w:t>, где оно начинается; после этого поля ищутся одним regex по XML.
+    """
+    def fix(paragraph: re.Match) -> str:
+        para = paragraph.group(0)
+        segments = list(_TEXT.finditer(para))
+        if len(segments) < 2:
+            return para
+        texts = [unescape(s.group(2) or "") for s in segments]
+        joined = "".join(texts)
+        offsets = []
+        pos = 0
+        for t in texts:
+            offsets.append(pos)
+            pos += len(t)
+
+        def owner(index: int) -> int:
+            # пустые <w:t> стоят на той же позиции, что и следующий сегмент, — берётся последний
+            return bisect_right(offsets, index) - 1
+
+        changed = False
+        new = list(texts)
+        for m in reversed(list(pattern.finditer(joined))):
+            i, j = owner(m.start()), owner(m.end() - 1)
+            if i == j:
+                continue
+            changed = True
+            new[j] = new[j][m.end() - offsets[j]:]
+            for k in range(i + 1, j):
+                new[k] = ""
+            new[i] = new[i][:m.start() - offsets[i]] + m.group(0)
+        if not changed:
+            return para
+
+        out = []
+        last = 0
+        for seg, text in zip(segments, new):
+            attrs = seg.group(1) or seg.group(3) or ""
+            if "xml:space" not in attrs:
+                attrs += ' xml:space="preserve"'
+            out.append(para[last:seg.start()])
+            out.append(f"<w:t{attrs}>{escape(text)}</w:t>")
+            last = seg.end()
+        out.append(para[last:])
+        return "".join(out)
+
+    return _PARAGRAPH.sub(fix, xml)
+
+
+def _table_spans(xml: str) -> List[tuple]:
+    """Таблицы верхнего уровня: [(начало, конец)] в порядке следования"""
+    spans = []
+    depth = 0
+    start = 0
+    for m in _TABLE_TAG.finditer(xml):
+        if m.group(0) == "</w:tbl>":
+            depth -= 1
+            if depth == 0:
+                spans.append((start, m.end()))
+        else:
+            if depth == 0:
+                start = m.start()
+            depth += 1
+    return spans
+
+
+class WordBackend(ABC):
+    """
+    Документ Word с пакетными операциями: подстановка полей «{{ имя }}» и закладок,
+    заполнение таблиц из итератора строк.
+    """
+
+    def __enter__(self) -> "WordBackend":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @abstractmethod
+    def placeholders(self) -> Set[str]:
+        """Имена полей, найденных в документе"""
+
+    @abstractmethod
+    def replace_placeholders(self, values: Mapping[str, Value]) -> int:
+        """Подставляет значения полей; поля без значения остаются как есть. Возвращает число замен"""
+
+    @abstractmethod
+    def replace_bookmarks(self, values: Mapping[str, Value]) -> int:
+        """Заменяет текст внутри закладок. Возвращает число заменённых закладок"""
+
+    @abstractmethod
+    def render_table(self, rows: Iterable[Union[Sequence, Mapping]], table: Union[int, str] = 0,
+                     template_row: int = -1) -> int:
+        """
+        Заполняет таблицу размножением строки-образца.
+
+        :param rows: строки: последовательность (по ячейкам) или словарь (поля «{{ }}» в строке-образце)
+        :param table: номер таблицы в документе или имя закладки внутри неё
+        :param template_row: номер строки-образца в таблице (по умолчанию последняя)
+        :return: число добавленных строк
+        """
+
+    @abstractmethod
+    def save(self, path: Optional[str] = None) -> None:
+        """Сохраняет документ (по умолчанию поверх исходного)"""
+
+    def close(self) -> None:
+        pass
+
+
+class OoxmlDocument(WordBackend):
+    """
+    Файловый бэкенд .docx: части документа читаются один раз, правки делаются
+    в памяти, save() пишет пакет целиком одним проходом.
+    """
+
+    def __init__(self, path: str, pattern: str = TemplateSettings.PLACEHOLDER_PATTERN) -> None:
+        """
+        :param path: документ .docx (или шаблон .dotx)
+        :param pattern: regex поля с группой имени
+        """
+        self.logger = LoggerManager(__name__).get_logger()
+        self.path = path
+        self.pattern = re.compile(pattern)
+        self.parts: Dict[str, str] = {}
+        with zipfile.ZipFile(path) as zf:
+            for name in zf.namelist():
+                if _TEXT_PARTS.match(name):
+                    self.parts[name] = merge_split_placeholders(zf.read(name).decode("utf-8"), self.pattern)
+
+    def placeholders(self) -> Set[str]:
+        found = set()
+        for xml in self.parts.values():
+            found.update(m.group(1) for m in self.pattern.finditer(xml))
+        return found
+
+    def replace_placeholders(self, values: Mapping[str, Value]) -> int:
+        count = 0
+        rendered = {k: _text_xml(v) for k, v in values.items()}
+
+        def sub(m: re.Match) -> str:
+            nonlocal count
+            if m.group(1) in rendered:
+                count += 1
+                return rendered[m.group(1)]
+            return m.group(0)
+
+        for name, xml in self.parts.items():
+            self.parts[name] = self.pattern.sub(sub, xml)
+        return count
+
+    def replace_bookmarks(self, values: Mapping[str, Value]) -> int:
+        count = 0
+        for name, xml in self.parts.items():
+            for bookmark, value in values.items():
+                start = re.search(rf'<w:bookmarkStart\b[^>]*?w:name="{re.escape(bookmark)}"[^>]*/>', xml)
+                if start is None:
+                    continue
+                bm_id = re.search(r'w:id="([^"]+)"', start.group(0)).group(1)
+                end = re.compile(rf'<w:bookmarkEnd\b[^>]*?w:id="{re.escape(bm_id)}"[^>]*/>').search(xml, start.end())
+                if end is None:
+                    continue
+                inner = xml[start.end():end.start()]
+                if "</w:p>" in inner:
+                    self.logger.warning(f"⚠️ Закладка «{bookmark}» охватывает несколько абзацев — пропущена")
+                    continue
+                runs = _RUN.findall(inner)
+                props = _RUN_PROPS.search(runs[0]).group(0) if runs and _RUN_PROPS.search(runs[0]) else ""
+                rest = _RUN.sub("", inner)
+                xml = xml[:start.end()] + _run_xml(value, props) + rest + xml[end.start():]
+                count += 1
+            self.parts[name] = xml
+        return count
+
+    def _fill_cell(self, cell: str, value: Value) -> str:
+        """Текст ячейки: в первый <w:t>, остальные очищаются; пустая ячейка получает прогон"""
+        first = True
+
+        def sub(m: re.Match) -> str:
+            nonlocal first
+            if first:
+                first = False
+                return f'<w:t xml:space="preserve">{_text_xml(value)}</w:t>'
+            return "<w:t/>"
+
+        filled = _TEXT.sub(sub, cell)
+        if not first:
+            return filled
+        pos = filled.rfind("</w:p>")
+        if pos >= 0:
+            return filled[:pos] + _run_xml(value) + filled[pos:]
+        # у пустой ячейки Word часто пишет абзац без содержимого: <w:p/>
+        empty = list(_EMPTY_PARAGRAPH.finditer(filled))
+        if empty:
+            m = empty[-1]
+            return f"{filled[:m.start()]}<w:p{m.group(1) or ''}>{_run_xml(value)}</w:p>{filled[m.end():]}"
+        pos = filled.rfind("</w:tc>")
+        return f"{filled[:pos]}<w:p>{_run_xml(value)}</w:p>{filled[pos:]}"
+
+    def render_table(self, rows: Iterable[Union[Sequence, Mapping]], table: Union[int, str] = 0,
+                     template_row: int = -1) -> int:
+        xml = self.parts["word/document.xml"]
+        spans = _table_spans(xml)
+        if isinstance(table, str):
+            mark = xml.find(f'w:name="{table}"')
+            span = next((s for s in spans if s[0] <= mark < s[1]), None) if mark >= 0 else None
+            if span is None:
+                raise KeyError(f"Таблица с закладкой «{table}» не найдена в {self.path}")
+        else:
+            span = spans[table]
+        body = xml[span[0]:span[1]]
+        template_rows = list(_ROW.finditer(body))
+        sample = template_rows[template_row]
+        sample_xml = sample.group(0)
+        cells = [c.span() for c in _CELL.finditer(sample_xml)]
+
+        out = []
+        for values in rows:
+            if isinstance(values, Mapping):
+                rendered = {k: _text_xml(v) for k, v in values.items()}
+                out.append(self.pattern.sub(lambda m: rendered.get(m.group(1), m.group(0)), sample_xml))
+                continue
+            parts = []
+            last = 0
+            for (a, b), value in zip(cells, list(values) + [None] * (len(cells) - len(values))):
+                parts.append(sample_xml[last:a])
+                parts.append(self._fill_cell(sample_xml[a:b], value))
+                last = b
+            parts.append(sample_xml[last:])
+            out.append("".join(parts))
+
+        # закладки строки-образца остаются только в первой копии: id и имена в документе уникальны
+        out[1:] = [_BOOKMARK_TAG.sub("", row) for row in out[1:]]
+        body = body[:sample.start()] + "".join(out) + body[sample.end():]
+        self.parts["word/document.xml"] = xml[:span[0]] + body + xml[span[1]:]
+        return len(out)
+
+    def save(self, path: Optional[str] = None) -> None:
+        target = path or self.path
+        folder = os.path.dirname(os.path.abspath(target))
+        fd, tmp = tempfile.mkstemp(suffix=".part", dir=folder)
+        os.close(fd)
+        try:
+            with zipfile.ZipFile(self.path) as src, zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED) as dst:
+                for info in src.infolist():
+                    if info.filename in self.parts:
+                        dst.writestr(info, self.parts[info.filename].encode("utf-8"), zipfile.ZIP_DEFLATED)
+                    else:
+                        dst.writestr(info, src.read(info.filename))
+            os.replace(tmp, target)
+        except BaseException:
+            os.remove(tmp)
+            raise
+        self.path = target
+        self.logger.info(f"✅ Документ сохранён: {target}")
+
+
+# Доступные бэкенды; COM-бэкенд (win32com) регистрируется здесь же
+BACKENDS: Dict[str, Type[WordBackend]] = {"ooxml": OoxmlDocument}
+
+
+def open_document(path: str, backend: str = "ooxml") -> WordBackend:
+    """
+    Открывает документ через выбранный бэкенд.
+
+    :param path: путь к .docx
+    :param backend: имя бэкенда из BACKENDS
+    """
+    try:
+        cls = BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Неизвестный бэкенд Word: {backend}") from None
+    return cls(path)
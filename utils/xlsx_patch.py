@@ -0,0 +1,289 @@
+# utils/xlsx_patch.py
+# Точечная перезапись частей пакета .xlsx без пересборки всей книги 🩹
+#
+# Zip-архив книги сохраняется до первой изменяемой части; после неё переписываются
+# только нетронутые части (сырыми байтами, без перепаковки), новые части и центральный каталог.
+# Изменённые части ставятся в конец, поэтому следующая правка того же листа стоит ещё дешевле.
+
+import os
+import re
+import struct
+import hashlib
+import zipfile
+import tempfile
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Set, Tuple, Union
+from xml.sax.saxutils import quoteattr
+
+from utils.xlsx_reader import XlsxReader
+from utils.xlsx_writer import STYLE_DATE, STYLE_DATETIME, STYLE_HEADER
+from utils.zip_raw import member_spans, truncate, write_raw
+
+_NS_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_WORKSHEET_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"
+
+_ATTRS = re.compile(r'([\w:]+)="([^"]*)"')
+_COUNT = re.compile(r'count="\d+"')
+
+# Коды форматов, под которые подбираются стили ячеек с датами
+DATE_FORMAT = "dd.mm.yyyy"
+DATETIME_FORMAT = "dd.mm.yyyy hh:mm"
+
+Producer = Union[bytes, Callable[[BinaryIO], None]]
+
+
+def _attrs(tag: str) -> Dict[str, str]:
+    return dict(_ATTRS.findall(tag))
+
+
+def _section(xml: str, name: str) -> Optional[re.Match]:
+    """Находит <name ...>...</name> (или пустой <name .../>)"""
+    return re.search(rf"<{name}\b[^>]*?(?:/>|>(.*?)</{name}>)", xml, re.S)
+
+
+def _items(body: str, name: str) -> List[str]:
+    return re.findall(rf"<{name}\b[^>]*?(?:/>|>.*?</{name}>)", body or "", re.S)
+
+
+def _append_items(xml: str, name: str, item: str, items: List[str], before: Optional[str] = None) -> str:
+    """Дописывает элементы <item> в секцию <name> и обновляет её count; создаёт секцию при отсутствии"""
+    m = _section(xml, name)
+    if m is None:
+        block = f'<{name} count="{len(items)}">{"".join(items)}</{name}>'
+        anchor = xml.find(f"<{before}") if before else -1
+        if anchor < 0:
+            anchor = re.search(r"<styleSheet\b[^>]*>", xml).end()
+        return xml[:anchor] + block + xml[anchor:]
+    count = len(_items(m.group(1), item)) + len(items)
+    opening = re.match(rf"<{name}\b[^>]*?(?=/?>)", m.group(0)).group(0)
+    opening = _COUNT.sub(f'count="{count}"', opening) if "count=" in opening else f'{opening} count="{count}"'
+    block = f'{opening}>{m.group(1) or ""}{"".join(items)}</{name}>'
+    return xml[:m.start()] + block + xml[m.end():]
+
+
+def ensure_styles(xml: str) -> Tuple[str, Tuple[int, int, int], bool]:
+    """
+    Подбирает в styles.xml книги стили «дата», «дата-время» и «жирный заголовок»,
+    дописывая недостающие. Правка строковая: префиксы пространств имён и mc:Ignorable не трогаются.
+
+    :return: (новый XML, индексы стилей, изменён ли XML)
+    """
+    original = xml
+    formats = {a.get("formatCode"): int(a["numFmtId"])
+               for a in map(_attrs, _items((_section(xml, "numFmts") or [None, ""])[1], "numFmt"))}
+    new_formats = []
+    next_id = max([163, *formats.values()]) + 1
+    for code in (DATE_FORMAT, DATETIME_FORMAT):
+        if code not in formats:
+            formats[code] = next_id
+            new_formats.append(f"<numFmt numFmtId={quoteattr(str(next_id))} formatCode={quoteattr(code)}/>")
+            next_id += 1
+    if new_formats:
+        xml = _append_items(xml, "numFmts", "numFmt", new_formats, before="fonts")
+
+    fonts = _items(_section(xml, "fonts").group(1), "font")
+    bold = next((i for i, f in enumerate(fonts) if re.search(r'<b(?:\s+val="(?:1|true)")?\s*/>', f)), None)
+    if bold is None:
+        bold = len(fonts)
+        xml = _append_items(xml, "fonts", "font", ['<font><b/><sz val="11"/><name val="Calibri"/></font>'])
+
+    xfs = [_attrs(x.split(">", 1)[0]) for x in _items(_section(xml, "cellXfs").group(1), "xf")]
+    wanted = [(formats[DATE_FORMAT], 0), (formats[DATETIME_FORMAT], 0), (0, bold)]
+    indices = []
+    new_xfs = []
+    for fmt_id, font_id in wanted:
+        found = next((i for i, a in enumerate(xfs)
+                      if int(a.get("numFmtId", 0)) == fmt_id and int(a.get("fontId", 0)) == font_id), None)
+        if found is None:
+            found = len(xfs) + len(new_xfs)
+            new_xfs.append(f'<xf numFmtId="{fmt_id}" fontId="{font_id}" fillId="0" borderId="0" xfId="0" '
+                           f'applyNumberFormat="1" applyFont="1"/>')
+        indices.append(found)
+    if new_xfs:
+        xml = _append_items(xml, "cellXfs", "xf", new_xfs)
+    return xml, (indices[0], indices[1], indices[2]), xml != original
+
+
+def _read_span(src: BinaryIO, size: int) -> Iterator[bytes]:
+    """size байт из потока кусками по 1 МБ"""
+    while size:
+        chunk = src.read(min(size, 1 << 20))
+        if not chunk:
+            raise EOFError("Копия хвоста книги короче ожидаемого")
+        size -= len(chunk)
+        yield chunk
+
+
+class XlsxPatcher:
+    """
+    Набор правок пакета .xlsx, применяемых одной дозаписью в commit().
+    """
+
+    def __init__(self, path: str, backup_dir: Optional[str] = None) -> None:
+        """
+        :param path: книга .xlsx
+        :param backup_dir: куда класть копию хвоста книги на время записи
+        """
+        self.path = path
+        self.backup_dir = backup_dir or os.path.join(tempfile.gettempdir(), "pmis_xlsx_backup")
+        self._pending: Dict[str, Producer] = {}
+        self._removed: Set[str] = set()
+        self._texts: Dict[str, str] = {}
+        self._sheet_parts: Optional[Dict[str, str]] = None
+
+    @property
+    def sheet_parts(self) -> Dict[str, str]:
+        """Имя листа -> путь его части (читается лениво, чтобы recover() успел починить книгу)"""
+        if self._sheet_parts is None:
+            with XlsxReader(self.path) as book:
+                self._sheet_parts = book.sheet_parts
+        return self._sheet_parts
+
+    # --- чтение и правка служебных частей ---
+
+    def _text(self, name: str) -> str:
+        if name not in self._texts:
+            with zipfile.ZipFile(self.path) as zf:
+                self._texts[name] = zf.read(name).decode("utf-8")
+        return self._texts[name]
+
+    def _set_text(self, name: str, xml: str) -> None:
+        self._texts[name] = xml
+        self._pending[name] = xml.encode("utf-8")
+
+    def styles(self) -> Tuple[int, int, int]:
+        """Индексы стилей (дата, дата-время, заголовок); недостающие дописываются в styles.xml"""
+        try:
+            xml = self._text("xl/styles.xml")
+        except KeyError:
+            return STYLE_DATE, STYLE_DATETIME, STYLE_HEADER
+        xml, indices, changed = ensure_styles(xml)
+        if changed:
+            self._set_text("xl/styles.xml", xml)
+        return indices
+
+    def add_sheet(self, name: str) -> str:
+        """
+        Регистрирует в книге новый лист (workbook.xml, связи, типы содержимого).
+
+        :return: путь будущей части листа внутри пакета
+        """
+        with zipfile.ZipFile(self.path) as zf:
+            used = set(zf.namelist()) | set(self._pending)
+        n = 1
+        while f"xl/worksheets/sheet{n}.xml" in used:
+            n += 1
+        part = f"xl/worksheets/sheet{n}.xml"
+
+        rels = self._text("xl/_rels/workbook.xml.rels")
+        ids = set(re.findall(r'Id="([^"]+)"', rels))
+        k = len(ids) + 1
+        while f"rId{k}" in ids:
+            k += 1
+        rel_id = f"rId{k}"
+        rel = f'<Relationship Id="{rel_id}" Type="{_NS_REL}/worksheet" Target="worksheets/sheet{n}.xml"/>'
+        self._set_text("xl/_rels/workbook.xml.rels", rels.replace("</Relationships>", rel + "</Relationships>"))
+
+        workbook = self._text("xl/workbook.xml")
+        prefix = re.search(rf'xmlns:(\w+)="{re.escape(_NS_REL)}"', workbook).group(1)
+        sheet_id = max([0, *map(int, re.findall(r'<sheet\b[^>]*?sheetId="(\d+)"', workbook))]) + 1
+        sheet = f'<sheet name={quoteattr(name)} sheetId="{sheet_id}" {prefix}:id="{rel_id}"/>'
+        self._set_text("xl/workbook.xml", re.sub(r"</sheets>", lambda _: sheet + "</sheets>", workbook, count=1))
+
+        types = self._text("[Content_Types].xml")
+        override = f'<Override PartName="/{part}" ContentType="{_WORKSHEET_TYPE}"/>'
+        self._set_text("[Content_Types].xml", types.replace("</Types>", override + "</Types>"))
+
+        self.sheet_parts[name] = part
+        return part
+
+    def replace(self, part: str, producer: Producer) -> None:
+        """Заменяет (или добавляет) часть пакета: байты или функция, пишущая в поток"""
+        self._pending[part] = producer
+
+    def drop_calc_chain(self) -> None:
+        """
+        Убирает цепочку вычислений: после перезаписи ячеек с формулами она ссылается
+        на несуществующие формулы, и Excel предлагает «восстановить» книгу. Excel строит её заново.
+        """
+        with zipfile.ZipFile(self.path) as zf:
+            if "xl/calcChain.xml" not in zf.namelist():
+                return
+        rels = self._text("xl/_rels/workbook.xml.rels")
+        self._set_text("xl/_rels/workbook.xml.rels", re.sub(r'<Relationship\b[^>]*?calcChain\.xml"[^>]*/>', "", rels))
+        types = self._text("[Content_Types].xml")
+        self._set_text("[Content_Types].xml", re.sub(r'<Override\b[^>]*?/xl/calcChain\.xml"[^>]*/>', "", types))
+        self._removed.add("xl/calcChain.xml")
+
+    # --- запись ---
+
+    def _backup_path(self) -> str:
+        key = hashlib.sha1(os.path.normcase(os.path.abspath(self.path)).encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.backup_dir, key + ".tail")
+
+    def recover(self) -> bool:
+        """Восстанавливает книгу, если прошлая запись прервалась. Возвращает True, если было что чинить"""
+        backup = self._backup_path()
+        if not os.path.exists(backup):
+            return False
+        with open(backup, "rb") as src, open(self.path, "r+b") as dst:
+            (cut,) = struct.unpack("<Q", src.read(8))
+            dst.seek(cut)
+            dst.truncate()
+            while chunk := src.read(1 << 20):
+                dst.write(chunk)
+        os.remove(backup)
+        return True
+
+    def commit(self) -> int:
+        """
+        Применяет правки. Возвращает число байт, записанных в книгу.
+        """
+        if not self._pending and not self._removed:
+            return 0
+        os.makedirs(self.backup_dir, exist_ok=True)
+        backup = self._backup_path()
+
+        zf = zipfile.ZipFile(self.path, "a", zipfile.ZIP_DEFLATED, compresslevel=6)
+        truncated = False
+        try:
+            spans = member_spans(zf)
+            infos = sorted(zf.infolist(), key=lambda i: i.header_offset)
+            replaced = [spans[name][0] for name in spans if name in self._pending or name in self._removed]
+            cut = min(replaced, default=max((end for _, end in spans.values()), default=0))
+            keep = [i for i in infos if i.header_offset < cut]
+            moved = [i for i in infos if i.header_offset >= cut
+                     and i.filename not in self._pending and i.filename not in self._removed]
+
+            # копия хвоста: из неё же берутся нетронутые части, и по ней recover() откатит сбой
+            with open(self.path, "rb") as src, open(backup, "wb") as out:
+                out.write(struct.pack("<Q", cut))
+                src.seek(cut)
+                while chunk := src.read(1 << 20):
+                    out.write(chunk)
+
+            truncate(zf, cut, keep)
+            truncated = True
+            with open(backup, "rb") as src:
+                for info in moved:
+                    start, end = spans[info.filename]
+                    src.seek(8 + start - cut)
+                    write_raw(zf, info, _read_span(src, end - start))
+
+            for name, producer in self._pending.items():
+                with zf.open(name, "w") as out:
+                    if isinstance(producer, bytes):
+                        out.write(producer)
+                    else:
+                        producer(out)
+        except BaseException:
+            zf.close()
+            if truncated:
+                self.recover()
+            elif os.path.exists(backup):
+                os.remove(backup)
+            raise
+        zf.close()
+        os.remove(backup)
+        self._pending.clear()
+        self._removed.clear()
+        return os.path.getsize(self.path) - cut
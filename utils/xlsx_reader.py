@@ -0,0 +1,249 @@
+# utils/xlsx_reader.py
+# Потоковое чтение листов .xlsx без Excel/COM: XML листа разбирается прямо из zip 📖
+#
+# XML листа подаётся expat порциями, строки собираются колбэками без построения дерева,
+# поэтому память не растёт с числом строк (в памяти остаётся только таблица общих строк).
+
+import re
+import zipfile
+import posixpath
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from xml.parsers import expat
+from xml.etree.ElementTree import iterparse
+
+_NS_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_NS_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_NS_PKG_REL = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+# Имена элементов в виде, который отдаёт expat с namespace_separator="}"
+_ROW = f"{_NS_MAIN}}}row"
+_CELL = f"{_NS_MAIN}}}c"
+_VALUE = f"{_NS_MAIN}}}v"
+_TEXT = f"{_NS_MAIN}}}t"
+_SI = f"{_NS_MAIN}}}si"
+_PHONETIC = f"{_NS_MAIN}}}rPh"
+
+# Размер порции XML, подаваемой парсеру
+CHUNK_SIZE = 256 * 1024
+
+# Встроенные форматы чисел Excel, означающие дату/время
+_BUILTIN_DATE_FORMATS: Set[int] = {14, 15, 16, 17, 18, 19, 20, 21, 22, 27, 28, 29, 30, 31,
+                                   32, 33, 34, 35, 36, 45, 46, 47, 50, 51, 52, 53, 54, 55, 56, 57, 58}
+# Содержимое «[...]» и «"..."» в коде формата не влияет на то, дата ли это
+_FORMAT_NOISE = re.compile(r'\[[^\]]*\]|"[^"]*"|\\.')
+_DATE_TOKENS = re.compile(r'[dmyhs]', re.IGNORECASE)
+
+_CELL_REF = re.compile(r'([A-Z]+)(\d+)')
+
+
+def column_index(letters: str) -> int:
+    """«A» -> 0, «AB» -> 27"""
+    index = 0
+    for ch in letters:
+        index = index * 26 + ord(ch) - 64
+    return index - 1
+
+
+def _is_date_format(code: str) -> bool:
+    return bool(_DATE_TOKENS.search(_FORMAT_NOISE.sub("", code)))
+
+
+class XlsxReader:
+    """
+    Читатель книги .xlsx. Используется как контекстный менеджер:
+
+    with XlsxReader(path) as book:
+        for row_num, values in book.iter_rows("03 ВД"):
+            ...
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        :param path: путь к книге .xlsx
+        """
+        self.path = path
+        self._zip = zipfile.ZipFile(path)
+        self._sheets: Dict[str, str] = {}
+        self._date1904 = False
+        self._shared: Optional[List[str]] = None
+        self._date_styles: Optional[Set[int]] = None
+        self._read_workbook()
+
+    def __enter__(self) -> "XlsxReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._zip.close()
+
+    # --- служебные части книги ---
+
+    def _read_workbook(self) -> None:
+        """Имена листов и пути к их XML по workbook.xml и его связям"""
+        targets: Dict[str, str] = {}
+        with self._zip.open("xl/_rels/workbook.xml.rels") as f:
+            for _, el in iterparse(f):
+                if el.tag == f"{{{_NS_PKG_REL}}}Relationship":
+                    target = el.get("Target")
+                    if target.startswith("/"):
+                        target = target[1:]
+                    else:
+                        target = posixpath.normpath(posixpath.join("xl", target))
+                    targets[el.get("Id")] = target
+        with self._zip.open("xl/workbook.xml") as f:
+            for _, el in iterparse(f):
+                if el.tag == f"{{{_NS_MAIN}}}sheet":
+                    self._sheets[el.get("name")] = targets[el.get(f"{{{_NS_REL}}}id")]
+                elif el.tag == f"{{{_NS_MAIN}}}workbookPr":
+                    self._date1904 = el.get("date1904") in ("1", "true")
+
+    @property
+    def sheet_names(self) -> List[str]:
+        return list(self._sheets)
+
+    @property
+    def sheet_parts(self) -> Dict[str, str]:
+        """Имя листа -> путь его XML внутри пакета"""
+        return dict(self._sheets)
+
+    def _load_shared_strings(self) -> List[str]:
+        if self._shared is None:
+            shared: List[str] = []
+            self._shared = shared
+            if "xl/sharedStrings.xml" not in self._zip.namelist():
+                return shared
+            # текст строки — все её <t>, кроме фонетических подсказок <rPh>
+            parts: List[str] = []
+            depth = {"phonetic": 0}
+
+            def start(name: str, attrs: dict) -> None:
+                if name == _TEXT and not depth["phonetic"]:
+                    parser.CharacterDataHandler = parts.append
+                elif name == _PHONETIC:
+                    depth["phonetic"] += 1
+
+            def end(name: str) -> None:
+                if name == _TEXT:
+                    parser.CharacterDataHandler = None
+                elif name == _PHONETIC:
+                    depth["phonetic"] -= 1
+                elif name == _SI:
+                    shared.append("".join(parts))
+                    parts.clear()
+
+            parser = expat.ParserCreate(namespace_separator="}")
+            parser.StartElementHandler = start
+            parser.EndElementHandler = end
+            parser.buffer_text = True
+            with self._zip.open("xl/sharedStrings.xml") as f:
+                parser.ParseFile(f)
+        return self._shared
+
+    def _load_date_styles(self) -> Set[int]:
+        """Индексы стилей ячеек (атрибут s), чей числовой формат — дата"""
+        if self._date_styles is None:
+            self._date_styles = set()
+            if "xl/styles.xml" not in self._zip.namelist():
+                return self._date_styles
+            custom: Dict[int, str] = {}
+            in_cell_xfs = False
+            index = 0
+            with self._zip.open("xl/styles.xml") as f:
+                for event, el in iterparse(f, events=("start", "end")):
+                    if el.tag == f"{{{_NS_MAIN}}}numFmt" and event == "end":
+                        custom[int(el.get("numFmtId"))] = el.get("formatCode", "")
+                    elif el.tag == f"{{{_NS_MAIN}}}cellXfs":
+                        in_cell_xfs = event == "start"
+                    elif el.tag == f"{{{_NS_MAIN}}}xf" and in_cell_xfs and event == "end":
+                        fmt_id = int(el.get("numFmtId", 0))
+                        if fmt_id in _BUILTIN_DATE_FORMATS or (fmt_id in custom and _is_date_format(custom[fmt_id])):
+                            self._date_styles.add(index)
+                        index += 1
+        return self._date_styles
+
+    def _to_datetime(self, serial: float) -> datetime:
+        epoch = datetime(1904, 1, 1) if self._date1904 else datetime(1899, 12, 30)
+        return epoch + timedelta(days=serial)
+
+    # --- чтение строк ---
+
+    def _convert(self, kind: str, style: int, text: str, shared: List[str], date_styles: Set[int]):
+        """Значение ячейки по её типу (атрибут t) и стилю (атрибут s)"""
+        if kind == "s":
+            return shared[int(text)]
+        if kind in ("str", "e", "inlineStr"):
+            return text
+        if kind == "b":
+            return text == "1"
+        if kind == "d":
+            # дата в ISO 8601 (так пишут LibreOffice и некоторые генераторы)
+            return datetime.fromisoformat(text)
+        number = float(text)
+        if style in date_styles:
+            return self._to_datetime(number)
+        return int(number) if number.is_integer() else number
+
+    def iter_rows(self, sheet: str, min_row: int = 1) -> Iterator[Tuple[int, list]]:
+        """
+        Потоково отдаёт непустые строки листа.
+
+        :param sheet: имя листа
+        :param min_row: номер первой строки (с 1)
+        :return: итератор (номер строки, [значения по столбцам с A])
+        """
+        if sheet not in self._sheets:
+            raise KeyError(f"Лист «{sheet}» не найден в {self.path}")
+        shared = self._load_shared_strings()
+        date_styles = self._load_date_styles()
+
+        # expat без построения дерева: колбэки собирают строку, готовые строки копятся в ready
+        ready: List[Tuple[int, list]] = []
+        state = {"row": 0, "values": None, "col": 0, "kind": "n", "style": 0, "text": None}
+
+        def start(name: str, attrs: dict) -> None:
+            if name == _CELL:
+                ref = attrs.get("r")
+                state["col"] = column_index(_CELL_REF.match(ref).group(1)) if ref else len(state["values"])
+                state["kind"] = attrs.get("t", "n")
+                state["style"] = int(attrs.get("s", 0))
+                state["text"] = None
+            elif name == _VALUE or (name == _TEXT and state["kind"] == "inlineStr"):
+                state["text"] = state["text"] or []
+                parser.CharacterDataHandler = state["text"].append
+            elif name == _ROW:
+                state["row"] = int(attrs.get("r", state["row"] + 1))
+                state["values"] = []
+
+        def end(name: str) -> None:
+            if name == _VALUE or name == _TEXT:
+                parser.CharacterDataHandler = None
+            elif name == _CELL:
+                if not state["text"] or state["row"] < min_row:
+                    return
+                values, col = state["values"], state["col"]
+                if col >= len(values):
+                    values.extend([None] * (col - len(values) + 1))
+                values[col] = self._convert(state["kind"], state["style"], "".join(state["text"]), shared, date_styles)
+            elif name == _ROW:
+                values = state["values"]
+                while values and values[-1] is None:
+                    values.pop()
+                if values:
+                    ready.append((state["row"], values))
+
+        parser = expat.ParserCreate(namespace_separator="}")
+        parser.StartElementHandler = start
+        parser.EndElementHandler = end
+        parser.buffer_text = True
+
+        with self._zip.open(self._sheets[sheet]) as f:
+            while True:
+                chunk = f.read(CHUNK_SIZE)
+                parser.Parse(chunk, not chunk)
+                yield from ready
+                ready.clear()
+                if not chunk:
+                    break
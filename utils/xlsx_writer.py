@@ -0,0 +1,364 @@
+# utils/xlsx_writer.py
+# Потоковая запись больших листов .xlsx без Excel/COM ✍️
+#
+# Строки пишутся сразу во временный файл с XML листа, поэтому память не зависит от числа строк.
+# Ширины столбцов считаются по ходу записи и вместе с автофильтром попадают в лист при его закрытии.
+
+import os
+import math
+import re
+import zipfile
+import tempfile
+from datetime import date, datetime
+from typing import BinaryIO, Dict, Iterable, List, Optional, Sequence, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+# Предел строк листа Excel; остаток уходит на лист-продолжение «имя (2)»
+MAX_ROWS = 1_048_576
+
+# Сколько уникальных строк держать в таблице общих строк; остальные пишутся inline
+SHARED_STRINGS_LIMIT = 200_000
+
+# Предел ширины столбца в символах
+MAX_COLUMN_WIDTH = 80
+
+# Индексы стилей в styles.xml ниже (для книг, созданных XlsxWriter)
+STYLE_DATE = 1
+STYLE_DATETIME = 2
+STYLE_HEADER = 3
+
+_EPOCH = datetime(1899, 12, 30)
+_INVALID_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+_NEEDS_ESCAPE = re.compile('[&<>\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+_NS_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_NS_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+_STYLES = f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<styleSheet xmlns="{_NS_MAIN}">
+<numFmts count="2"><numFmt numFmtId="164" formatCode="dd.mm.yyyy"/><numFmt numFmtId="165" formatCode="dd.mm.yyyy hh:mm"/></numFmts>
+<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font><font><b/><sz val="11"/><name val="Calibri"/></font></fonts>
+<fills count="2"><fill><patternFill patternType="none"/></fill><fill><patternFill patternType="gray125"/></fill></fills>
+<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>
+<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>
+<cellXfs count="4">
+<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>
+<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>
+<xf numFmtId="165" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>
+<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/>
+</cellXfs>
+</styleSheet>"""
+
+
+def column_letter(index: int) -> str:
+    """0 -> «A», 27 -> «AB»"""
+    letters = ""
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def _sheet_ref(name: str) -> str:
+    """Имя листа для ссылок в формулах: кавычки, внутренние апострофы удваиваются"""
+    return "'" + name.replace("'", "''") + "'"
+
+
+def _clean(text: str) -> str:
+    if _NEEDS_ESCAPE.search(text):
+        return escape(_INVALID_XML.sub("", text))
+    return text
+
+
+class SheetBuilder:
+    """
+    Лист в процессе записи: строки рендерятся в XML и копятся во временном файле,
+    ширины столбцов считаются по ходу. Готовый XML листа отдаёт write_to().
+    """
+
+    def __init__(
+        self,
+        name: str,
+        header: Sequence[str],
+        shared: Optional[Dict[str, int]] = None,
+        shared_limit: int = 0,
+        styles: Tuple[int, int, int] = (STYLE_DATE, STYLE_DATETIME, STYLE_HEADER),
+    ) -> None:
+        """
+        :param name: имя листа
+        :param header: заголовки столбцов (первая строка)
+        :param shared: общая для книги таблица строк; без неё строки пишутся inline
+        :param shared_limit: предел таблицы общих строк
+        :param styles: индексы стилей (дата, дата-время, заголовок) в styles.xml книги
+        """
+        self.name = name
+        self.rows = 0
+        self.columns = len(header)
+        self.widths: List[int] = [0] * self.columns
+        self.shared = shared
+        self.shared_limit = shared_limit
+        self.style_date, self.style_datetime, self.style_header = styles
+        self._letters = [column_letter(i) for i in range(self.columns)]
+        self._data = tempfile.TemporaryFile(mode="w+", encoding="utf-8", newline="")
+        self._add(header, header=True)
+
+    @property
+    def full(self) -> bool:
+        return self.rows >= MAX_ROWS
+
+    def _cell(self, ref: str, value, col: int) -> str:
+        if isinstance(value, str):
+            if not value:
+                return ""
+            width = len(value)
+            index = None
+            if self.shared is not None:
+                index = self.shared.get(value)
+                if index is None and len(self.shared) < self.shared_limit:
+                    index = self.shared[value] = len(self.shared)
+            cell = (f'<c r="{ref}" t="s"><v>{index}</v></c>' if index is not None
+                    else f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{_clean(value)}</t></is></c>')
+        elif value is None:
+            return ""
+        elif isinstance(value, bool):
+            width = 5
+            cell = f'<c r="{ref}" t="b"><v>{int(value)}</v></c>'
+        elif isinstance(value, float) and not math.isfinite(value):
+            return ""  # NaN и бесконечность Excel не принимает — пустая ячейка
+        elif isinstance(value, (int, float)):
+            text = repr(value)
+            width = len(text)
+            cell = f'<c r="{ref}"><v>{text}</v></c>'
+        elif isinstance(value, datetime):
+            width = 16
+            serial = (value - _EPOCH).total_seconds() / 86400
+            cell = f'<c r="{ref}" s="{self.style_datetime}"><v>{serial}</v></c>'
+        elif isinstance(value, date):
+            width = 10
+            cell = f'<c r="{ref}" s="{self.style_date}"><v>{(value - _EPOCH.date()).days}</v></c>'
+        else:
+            return self._cell(ref, str(value), col)
+        if width > self.widths[col]:
+            self.widths[col] = width
+        return cell
+
+    def _grow(self, columns: int) -> None:
+        """Строка шире заголовка: добавляются столбцы"""
+        self._letters.extend(column_letter(i) for i in range(self.columns, columns))
+        self.widths.extend([0] * (columns - self.columns))
+        self.columns = columns
+
+    def _add(self, values: Sequence, header: bool = False) -> None:
+        if len(values) > self.columns:
+            self._grow(len(values))
+        self.rows += 1
+        r = self.rows
+        letters = self._letters
+        if header:
+            cells = "".join(
+                f'<c r="{letters[i]}{r}" t="inlineStr" s="{self.style_header}"><is><t>{_clean(str(v))}</t></is></c>'
+                for i, v in enumerate(values)
+            )
+            for i, v in enumerate(values):
+                self.widths[i] = max(self.widths[i], len(str(v)) + 3)
+        else:
+            cells = "".join(self._cell(f"{letters[i]}{r}", v, i) for i, v in enumerate(values))
+        self._data.write(f'<row r="{r}">{cells}</row>')
+
+    def add_row(self, values: Sequence) -> None:
+        """Добавляет строку данных (str, int, float, bool, date, datetime, None)"""
+        self._add(values)
+
+    @property
+    def last_cell(self) -> str:
+        return f"{column_letter(max(self.columns, 1) - 1)}{self.rows}"
+
+    def write_to(self, out: BinaryIO, selected: bool = False) -> None:
+        """Пишет XML листа: столбцы и закрепление заголовка, данные, автофильтр"""
+        last = self.last_cell
+        tab = ' tabSelected="1"' if selected else ""
+        cols = "".join(
+            f'<col min="{i + 1}" max="{i + 1}" width="{min(w + 2, MAX_COLUMN_WIDTH)}" customWidth="1"/>'
+            for i, w in enumerate(self.widths)
+        )
+        head = (
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<worksheet xmlns="{_NS_MAIN}" xmlns:r="{_NS_REL}">'
+            f'<dimension ref="A1:{last}"/>'
+            f'<sheetViews><sheetView workbookViewId="0"{tab}>'
+            f'<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/></sheetView></sheetViews>'
+            f'<sheetFormatPr defaultRowHeight="15"/>'
+            + (f"<cols>{cols}</cols>" if cols else "")
+            + "<sheetData>"
+        )
+        out.write(head.encode("utf-8"))
+        self._data.seek(0)
+        while True:
+            chunk = self._data.read(1 << 20)
+            if not chunk:
+                break
+            out.write(chunk.encode("utf-8"))
+        out.write(f'</sheetData><autoFilter ref="A1:{last}"/></worksheet>'.encode("utf-8"))
+
+    def close(self) -> None:
+        self._data.close()
+
+
+class XlsxWriter:
+    """
+    Книга .xlsx в режиме «только запись». Используется как контекстный менеджер:
+
+    with XlsxWriter(path) as book:
+        book.write_sheet("projects_docs", ["Путь", "Размер"], rows)
+    """
+
+    def __init__(self, path: str, shared_limit: int = SHARED_STRINGS_LIMIT) -> None:
+        """
+        :param path: итоговый файл; пишется во временный и подменяется при close()
+        :param shared_limit: предел таблицы общих строк
+        """
+        self.path = path
+        self.shared_limit = shared_limit
+        self._tmp = path + ".part"
+        self._zip = zipfile.ZipFile(self._tmp, "w", zipfile.ZIP_DEFLATED, compresslevel=1)
+        self._shared: Dict[str, int] = {}
+        self._sheets: List[SheetBuilder] = []
+        self._closed = False
+
+    def __enter__(self) -> "XlsxWriter":
+        return self
+
+    def __exit__(self, exc_type, *exc) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    # --- листы ---
+
+    def _new_sheet(self, name: str, header: Sequence[str]) -> SheetBuilder:
+        return SheetBuilder(name, header, shared=self._shared, shared_limit=self.shared_limit)
+
+    def write_sheet(self, name: str, header: Sequence[str], rows: Iterable[Sequence]) -> int:
+        """
+        Потоково записывает лист. Строки могут приходить прямо из курсора БД.
+
+        :param name: имя листа (при переполнении создаются «имя (2)», «имя (3)»...)
+        :param header: заголовки столбцов
+        :param rows: строки значений (str, int, float, bool, date, datetime, None)
+        :return: число записанных строк данных
+        """
+        sheet = self._new_sheet(name, header)
+        total = 0
+        number = 1
+        for values in rows:
+            if sheet.full:
+                self._finish_sheet(sheet)
+                number += 1
+                sheet = self._new_sheet(f"{name} ({number})", header)
+            sheet.add_row(values)
+            total += 1
+        self._finish_sheet(sheet)
+        return total
+
+    def _finish_sheet(self, sheet: SheetBuilder) -> None:
+        self._sheets.append(sheet)
+        index = len(self._sheets)
+        with self._zip.open(f"xl/worksheets/sheet{index}.xml", "w") as out:
+            sheet.write_to(out, selected=index == 1)
+        sheet.close()
+
+    # --- служебные части книги ---
+
+    def _write_package(self) -> None:
+        sheets = "".join(
+            f'<sheet name={quoteattr(p.name)} sheetId="{i}" r:id="rId{i}"/>' for i, p in enumerate(self._sheets, 1)
+        )
+        filters = "".join(
+            f'<definedName name="_xlnm._FilterDatabase" localSheetId="{i}" hidden="1">'
+            f"{escape(_sheet_ref(p.name))}!$A$1:${column_letter(max(p.columns, 1) - 1)}${p.rows}</definedName>"
+            for i, p in enumerate(self._sheets)
+        )
+        self._zip.writestr(
+            "xl/workbook.xml",
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<workbook xmlns="{_NS_MAIN}" xmlns:r="{_NS_REL}"><sheets>{sheets}</sheets>'
+            + (f"<definedNames>{filters}</definedNames>" if filters else "")
+            + "</workbook>",
+        )
+        n = len(self._sheets)
+        rels = "".join(
+            f'<Relationship Id="rId{i}" Type="{_NS_REL}/worksheet" Target="worksheets/sheet{i}.xml"/>'
+            for i in range(1, n + 1)
+        )
+        rels += f'<Relationship Id="rId{n + 1}" Type="{_NS_REL}/styles" Target="styles.xml"/>'
+        rels += f'<Relationship Id="rId{n + 2}" Type="{_NS_REL}/sharedStrings" Target="sharedStrings.xml"/>'
+        self._zip.writestr(
+            "xl/_rels/workbook.xml.rels",
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">{rels}</Relationships>',
+        )
+        self._zip.writestr("xl/styles.xml", _STYLES)
+
+        with self._zip.open("xl/sharedStrings.xml", "w") as out:
+            out.write(
+                f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                f'<sst xmlns="{_NS_MAIN}" uniqueCount="{len(self._shared)}">'.encode("utf-8")
+            )
+            buffer: List[str] = []
+            for text in self._shared:  # dict хранит порядок вставки = индекс строки
+                buffer.append(f'<si><t xml:space="preserve">{_clean(text)}</t></si>')
+                if len(buffer) >= 10_000:
+                    out.write("".join(buffer).encode("utf-8"))
+                    buffer.clear()
+            out.write(("".join(buffer) + "</sst>").encode("utf-8"))
+
+        overrides = "".join(
+            f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+            f'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            for i in range(1, n + 1)
+        )
+        self._zip.writestr(
+            "[Content_Types].xml",
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/styles.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+            '<Override PartName="/xl/sharedStrings.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+            f"{overrides}</Types>",
+        )
+        self._zip.writestr(
+            "_rels/.rels",
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            f'<Relationship Id="rId1" Type="{_NS_REL}/officeDocument" Target="xl/workbook.xml"/>'
+            "</Relationships>",
+        )
+
+    def close(self) -> None:
+        """Дописывает служебные части и атомарно подменяет итоговый файл"""
+        if self._closed:
+            return
+        self._closed = True
+        self._write_package()
+        self._zip.close()
+        os.replace(self._tmp, self.path)
+
+    def abort(self) -> None:
+        """Прерывает запись, итоговый файл не трогается"""
+        if self._closed:
+            return
+        self._closed = True
+        self._zip.close()
+        for sheet in self._sheets:
+            sheet.close()
+        try:
+            os.remove(self._tmp)
+        except OSError:
+            pass
@@ -0,0 +1,59 @@
+# utils/zip_raw.py
+# Перенос частей zip-пакета сырыми байтами — без распаковки и повторного сжатия 🗜️
+#
+# У zipfile нет открытого API ни для копирования сжатой части как есть, ни для обрезки
+# архива, поэтому здесь (и только здесь) используются его внутренние поля: fp, filelist,
+# NameToInfo и start_dir. Их поведение проверяет tests/test_zip_raw.py — при обновлении
+# Python он первым покажет, если zipfile изменился.
+
+import copy
+import zipfile
+from typing import Dict, Iterable, List, Tuple
+
+_INTERNALS = ("fp", "filelist", "NameToInfo", "start_dir")
+
+
+def _check(zf: zipfile.ZipFile) -> None:
+    missing = [name for name in _INTERNALS if not hasattr(zf, name)]
+    if missing:
+        raise RuntimeError(f"zipfile этой версии Python не поддерживается: нет {', '.join(missing)}")
+
+
+def member_spans(zf: zipfile.ZipFile) -> Dict[str, Tuple[int, int]]:
+    """
+    Где в файле лежит каждая часть: имя -> (начало локального заголовка, конец данных).
+    Внутри — локальный заголовок, сжатые данные и дескриптор данных, если он есть.
+    """
+    _check(zf)
+    infos = sorted(zf.infolist(), key=lambda i: i.header_offset)
+    ends = [i.header_offset for i in infos[1:]] + [zf.start_dir]
+    return {info.filename: (info.header_offset, end) for info, end in zip(infos, ends)}
+
+
+def write_raw(zf: zipfile.ZipFile, info: zipfile.ZipInfo, chunks: Iterable[bytes]) -> None:
+    """
+    Дописывает в архив, открытый на запись («w» или «a»), готовую часть: chunks — её байты
+    вместе с локальным заголовком (как в member_spans). Описание части берётся из info.
+    """
+    _check(zf)
+    info = copy.copy(info)
+    info.header_offset = zf.fp.tell()
+    for chunk in chunks:
+        zf.fp.write(chunk)
+    zf.filelist.append(info)
+    zf.NameToInfo[info.filename] = info
+    # каталог (и следующая часть, записанная самим zipfile) пишется с позиции start_dir
+    zf.start_dir = zf.fp.tell()
+
+
+def truncate(zf: zipfile.ZipFile, offset: int, keep: List[zipfile.ZipInfo]) -> None:
+    """
+    Обрезает архив, открытый в режиме «a», до offset: остаются только части keep,
+    лежащие целиком до этой позиции. Дальше можно дописывать через write_raw и zf.open(..., "w").
+    """
+    _check(zf)
+    zf.filelist = list(keep)
+    zf.NameToInfo = {info.filename: info for info in keep}
+    zf.fp.seek(offset)
+    zf.fp.truncate()
+    zf.start_dir = offset